@@ -0,0 +1,38 @@
+"""Add board_changes change log for board delta sync
+
+Revision ID: add_board_changes
+Revises: add_board_version
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_board_changes'
+down_revision = 'add_board_version'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'board_changes',
+        sa.Column('id', sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column('board_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('boards.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('version', sa.BigInteger(), nullable=False),
+        sa.Column('entity_type', sa.String(20), nullable=False),
+        sa.Column('entity_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('operation', sa.String(10), nullable=False),
+        sa.Column('changed_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    op.create_index('idx_board_changes_board_version', 'board_changes', ['board_id', 'version'])
+    op.create_index('idx_board_changes_changed_at', 'board_changes', ['changed_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_board_changes_changed_at', 'board_changes')
+    op.drop_index('idx_board_changes_board_version', 'board_changes')
+    op.drop_table('board_changes')
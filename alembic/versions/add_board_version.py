@@ -0,0 +1,25 @@
+"""Add boards.version for ETag based board polling
+
+Revision ID: add_board_version
+Revises: production_hardening
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_board_version'
+down_revision = 'production_hardening'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Monotonic per-board version, bumped on every card/column change
+    op.add_column('boards', sa.Column('version', sa.BigInteger(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    op.drop_column('boards', 'version')
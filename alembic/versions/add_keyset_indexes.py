@@ -0,0 +1,33 @@
+"""Add composite indexes for keyset pagination
+
+Revision ID: add_keyset_indexes
+Revises: add_ordering_ranks
+Create Date: 2026-10-16 18:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_keyset_indexes'
+down_revision = 'add_ordering_ranks'
+branch_labels = None
+depends_on = None
+
+# (index, table, columns): each listing's filter columns, then its (sort key, id)
+INDEXES = [
+    ('idx_cards_created_at_id', 'cards', ['created_at', 'id']),
+    ('idx_notifications_user_created', 'notifications', ['user_id', 'created_at', 'id']),
+    ('idx_comments_card_created', 'comments', ['card_id', 'created_at', 'id']),
+    ('idx_org_members_org_joined', 'organization_members', ['organization_id', 'joined_at', 'id']),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table, if_exists=True)
@@ -0,0 +1,54 @@
+"""Add metric snapshot resolution and series index, card completion time
+
+Revision ID: add_metric_snapshot_rollups
+Revises: add_project_stats
+Create Date: 2026-10-16 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_metric_snapshot_rollups'
+down_revision = 'add_project_stats'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Rows written before rollups existed are not interval samples: they get their
+    # own resolution, which the collector never rolls up, prunes or serves
+    op.add_column(
+        'metric_snapshots',
+        sa.Column('resolution', sa.String(length=10), server_default='legacy', nullable=False),
+    )
+    op.alter_column('metric_snapshots', 'resolution', server_default='minute')
+    # Nothing kept legacy rows unique per series and time; keep the newest of each
+    op.execute("""
+        DELETE FROM metric_snapshots a
+        USING metric_snapshots b
+        WHERE a.resolution = 'legacy' AND b.resolution = 'legacy'
+          AND a.organization_id = b.organization_id
+          AND a.metric_type = b.metric_type
+          AND a.snapshot_date = b.snapshot_date
+          AND (a.created_at, a.id) < (b.created_at, b.id)
+    """)
+    op.create_index(
+        'idx_metric_snapshots_series', 'metric_snapshots',
+        ['organization_id', 'metric_type', 'resolution', 'snapshot_date'],
+        unique=True,
+    )
+
+    # Completion time for the cards_completed metric; the last edit is the best
+    # estimate for cards completed before it existed
+    op.add_column('cards', sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True))
+    op.execute("UPDATE cards SET completed_at = updated_at WHERE status = 'completed'")
+    op.create_index('idx_cards_completed_at', 'cards', ['completed_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_cards_completed_at', 'cards')
+    op.drop_column('cards', 'completed_at')
+    op.drop_index('idx_metric_snapshots_series', 'metric_snapshots')
+    op.drop_column('metric_snapshots', 'resolution')
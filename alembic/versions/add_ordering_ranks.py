@@ -0,0 +1,52 @@
+"""Add fractional rank ordering keys to columns and cards
+
+Revision ID: add_ordering_ranks
+Revises: add_board_changes
+Create Date: 2026-10-16 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_ordering_ranks'
+down_revision = 'add_board_changes'
+branch_labels = None
+depends_on = None
+
+# Base-36 digits, see app.core.ordering
+DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+
+# Row n (1-based, in position order) of each parent gets n written as four
+# base-36 digits followed by "i" (keys must not end in "0"), e.g. "0001i".
+# Room for 1.6M rows per parent; the rebalancer respaces keys later.
+BACKFILL_SQL = """
+    UPDATE {table} AS t
+    SET rank = substr('{digits}', (ranked.n / 46656) % 36 + 1, 1)
+            || substr('{digits}', (ranked.n / 1296) % 36 + 1, 1)
+            || substr('{digits}', (ranked.n / 36) % 36 + 1, 1)
+            || substr('{digits}', ranked.n % 36 + 1, 1)
+            || 'i'
+    FROM (
+        SELECT id, row_number() OVER (PARTITION BY {parent} ORDER BY position, created_at, id) AS n
+        FROM {table}
+    ) AS ranked
+    WHERE t.id = ranked.id
+"""
+
+
+def upgrade() -> None:
+    for table, parent in (('columns', 'board_id'), ('cards', 'column_id')):
+        op.add_column(table, sa.Column('rank', sa.String(255), nullable=True))
+        op.execute(BACKFILL_SQL.format(table=table, parent=parent, digits=DIGITS))
+        op.alter_column(table, 'rank', nullable=False)
+    op.create_index('idx_columns_board_rank', 'columns', ['board_id', 'rank'])
+    op.create_index('idx_cards_column_rank', 'cards', ['column_id', 'rank'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_cards_column_rank', 'cards')
+    op.drop_index('idx_columns_board_rank', 'columns')
+    op.drop_column('cards', 'rank')
+    op.drop_column('columns', 'rank')
@@ -0,0 +1,56 @@
+"""Add project_stats card counters
+
+Revision ID: add_project_stats
+Revises: add_keyset_indexes
+Create Date: 2026-10-16 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_project_stats'
+down_revision = 'add_keyset_indexes'
+branch_labels = None
+depends_on = None
+
+COUNTERS = [
+    'total', 'todo', 'in_progress', 'completed',
+    'priority_low', 'priority_medium', 'priority_high', 'priority_urgent',
+]
+
+
+def upgrade() -> None:
+    op.create_table(
+        'project_stats',
+        sa.Column('project_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('projects.id', ondelete='CASCADE'), primary_key=True),
+        *(sa.Column(name, sa.Integer(), nullable=False, server_default='0') for name in COUNTERS),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    # Backfill every project; the card listeners keep the rows current from here on
+    op.execute("""
+        INSERT INTO project_stats (
+            project_id, total, todo, in_progress, completed,
+            priority_low, priority_medium, priority_high, priority_urgent
+        )
+        SELECT p.id,
+               count(c.id),
+               count(c.id) FILTER (WHERE c.status = 'todo'),
+               count(c.id) FILTER (WHERE c.status = 'in_progress'),
+               count(c.id) FILTER (WHERE c.status = 'completed'),
+               count(c.id) FILTER (WHERE c.priority = 'low'),
+               count(c.id) FILTER (WHERE c.priority = 'medium'),
+               count(c.id) FILTER (WHERE c.priority = 'high'),
+               count(c.id) FILTER (WHERE c.priority = 'urgent')
+        FROM projects p
+        LEFT JOIN boards b ON b.project_id = p.id
+        LEFT JOIN columns col ON col.board_id = b.id
+        LEFT JOIN cards c ON c.column_id = col.id
+        GROUP BY p.id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('project_stats')
@@ -6,21 +6,23 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import func, and_, or_, select
 from typing import List, Optional, Dict, Any
 from uuid import UUID
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import json
 
-from app.core.database import get_db
+from app.core.database import get_db, get_db_readonly
 from app.core.deps import get_current_active_user
+from app.database.dashboard_stats import completion_rate, dashboard_stats_query, fetch_dashboard_stats
 from app.models.user import User
 from app.models.organization import Organization, OrganizationMember
 from app.models.project import Project
 from app.models.board import Board
-from app.models.card import Card
+from app.models.card import Card, CardAssignment
 from app.models.column import Column
 from app.models.analytics import (
     AnalyticsReport, ReportExecution, DashboardWidget, 
     MetricSnapshot, DataExport, PerformanceMetric
 )
+from app.services.metric_snapshots import metric_series
 from app.schemas.analytics import (
     AnalyticsReportCreate, AnalyticsReportResponse,
     DashboardWidgetCreate, DashboardWidgetResponse,
@@ -34,7 +36,7 @@ router = APIRouter()
 @router.get("/users/activity", response_model=dict)
 async def get_users_activity(
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db_readonly),
     days: int = Query(30, description="Number of days to look back")
 ):
     """Get user activity analytics"""
@@ -77,26 +79,16 @@ async def get_users_activity(
     )
     active_users = active_users_result.scalar() or 0
 
-    # Generate activity trend (simplified)
-    activity_trend = []
-    for i in range(7):  # Last 7 days
-        day_start = end_date - timedelta(days=i+1)
-        day_end = end_date - timedelta(days=i)
-
-        day_activity = await db.execute(
-            select(func.count(Card.id)).where(
-                and_(
-                    Card.created_at >= day_start,
-                    Card.created_at < day_end
-                )
-            )
-        )
-        activity_count = day_activity.scalar() or 0
-
-        activity_trend.append({
-            "date": day_start.strftime("%Y-%m-%d"),
-            "activity": activity_count
-        })
+    # Cards created per day over the last 7 days, from the metric rollups
+    trend_end = datetime.now(timezone.utc)
+    trend_start = trend_end.replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=6)
+    daily_activity: Dict[str, int] = {}
+    for org_id in org_ids:
+        series = await metric_series(db, org_id, "cards_created", trend_start, trend_end, resolution="day")
+        for point in series["points"]:
+            day = point["timestamp"][:10]
+            daily_activity[day] = daily_activity.get(day, 0) + int(point["value"])
+    activity_trend = [{"date": day, "activity": count} for day, count in sorted(daily_activity.items())]
 
     # Get top contributors
     top_contributors_result = await db.execute(
@@ -128,7 +120,7 @@ async def get_users_activity(
     return {
         "active_users": active_users,
         "total_users": total_users,
-        "activity_trend": list(reversed(activity_trend)),  # Oldest to newest
+        "activity_trend": activity_trend,  # Oldest to newest
         "top_contributors": top_contributors,
         "period_days": days
     }
@@ -137,124 +129,34 @@ async def get_users_activity(
 @router.get("/dashboard/stats", response_model=dict)
 async def get_dashboard_stats(
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db_readonly)
 ):
     """Get dashboard statistics"""
-    # Get user's organizations
-    result = await db.execute(
-        select(OrganizationMember).where(OrganizationMember.user_id == current_user.id)
-    )
-    user_orgs = result.scalars().all()
-
-    if not user_orgs:
-        return {
-            "total_projects": 0,
-            "total_boards": 0,
-            "total_cards": 0,
-            "organizations": 0,
-            "completion_rate": 0,
-            "active_projects": 0,
-            "completed_tasks": 0,
-            "pending_tasks": 0,
-            "team_members": 0
-        }
-
-    # Get organization IDs for the user
-    org_ids = [str(org.organization_id) for org in user_orgs]
-
-    # Get real project statistics
-    total_projects_result = await db.execute(
-        select(func.count(Project.id)).where(Project.organization_id.in_(org_ids))
-    )
-    total_projects = total_projects_result.scalar() or 0
-
-    active_projects_result = await db.execute(
-        select(func.count(Project.id)).where(
-            and_(
-                Project.organization_id.in_(org_ids),
-                Project.status == 'active'
-            )
-        )
-    )
-    active_projects = active_projects_result.scalar() or 0
-
-    # Get board statistics
-    total_boards_result = await db.execute(
-        select(func.count(Board.id))
-        .select_from(Project)
-        .join(Board, Board.project_id == Project.id)
-        .where(Project.organization_id.in_(org_ids))
-    )
-    total_boards = total_boards_result.scalar() or 0
-
-    # Get card/task statistics
-    total_cards_result = await db.execute(
-        select(func.count(Card.id))
-        .select_from(Project)
-        .join(Board, Board.project_id == Project.id)
-        .join(Column, Column.board_id == Board.id)
-        .join(Card, Card.column_id == Column.id)
-        .where(Project.organization_id.in_(org_ids))
-    )
-    total_cards = total_cards_result.scalar() or 0
-
-    completed_tasks_result = await db.execute(
-        select(func.count(Card.id))
-        .select_from(Project)
-        .join(Board, Board.project_id == Project.id)
-        .join(Column, Column.board_id == Board.id)
-        .join(Card, Card.column_id == Column.id)
-        .where(
-            and_(
-                Project.organization_id.in_(org_ids),
-                Card.status == 'completed'
-            )
-        )
-    )
-    completed_tasks = completed_tasks_result.scalar() or 0
-
-    pending_tasks_result = await db.execute(
-        select(func.count(Card.id))
-        .select_from(Project)
-        .join(Board, Board.project_id == Project.id)
-        .join(Column, Column.board_id == Board.id)
-        .join(Card, Card.column_id == Column.id)
-        .where(
-            and_(
-                Project.organization_id.in_(org_ids),
-                Card.status.in_(['todo', 'in_progress'])
-            )
-        )
-    )
-    pending_tasks = pending_tasks_result.scalar() or 0
-
-    # Get team member count across all organizations
-    team_members_result = await db.execute(
-        select(func.count(func.distinct(OrganizationMember.user_id)))
-        .where(OrganizationMember.organization_id.in_(org_ids))
+    user_org_ids = select(OrganizationMember.organization_id).where(
+        OrganizationMember.user_id == current_user.id
     )
-    team_members = team_members_result.scalar() or 0
-
-    # Calculate completion rate
-    completion_rate = (completed_tasks / total_cards * 100) if total_cards > 0 else 0
+    stats = await fetch_dashboard_stats(db, dashboard_stats_query(
+        Project.organization_id.in_(user_org_ids),
+        organization_ids=user_org_ids,
+    ))
 
     return {
-        "total_projects": total_projects,
-        "total_boards": total_boards,
-        "total_cards": total_cards,
-        "organizations": len(user_orgs),
-        "completion_rate": round(completion_rate, 1),
-        "active_projects": active_projects,
-        "completed_tasks": completed_tasks,
-        "pending_tasks": pending_tasks,
-        "team_members": team_members
+        "total_projects": stats["projects"],
+        "total_boards": stats["boards"],
+        "total_cards": stats["tasks"],
+        "organizations": stats["organizations"],
+        "completion_rate": completion_rate(stats, 1),
+        "active_projects": stats["active_projects"],
+        "completed_tasks": stats["completed_tasks"],
+        "pending_tasks": stats["pending_tasks"],
+        "team_members": stats["members"]
     }
 
 
 @router.get("", response_model=dict)
 async def get_analytics_overview(
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db_readonly)
 ):
     """Get analytics overview for current user's organizations"""
     # Get user's organizations
@@ -293,7 +195,7 @@ async def get_analytics_overview(
 @router.get("/users/me", response_model=dict)
 async def get_user_analytics(
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db_readonly)
 ):
     """Get analytics for current user"""
     # Mock user analytics data
@@ -317,7 +219,7 @@ async def get_user_analytics(
 @router.get("/user", response_model=dict)
 async def get_user_analytics_alt(
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db_readonly)
 ):
     """Alternative endpoint for user analytics"""
     return await get_user_analytics(current_user, db)
@@ -327,7 +229,7 @@ async def get_user_analytics_alt(
 async def get_usage_analytics(
     period: str = Query("30d", description="Time period (7d, 30d, 90d)"),
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db_readonly)
 ):
     """Get usage analytics"""
     return {
@@ -350,7 +252,7 @@ async def get_usage_analytics(
 async def get_project_analytics(
     project_id: str,
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db_readonly)
 ):
     """Get analytics for a specific project"""
     # Mock project analytics data
@@ -380,7 +282,7 @@ async def get_organization_analytics(
     organization_id: UUID,
     date_range: Optional[str] = Query("30d", regex="^(7d|30d|90d|1y|all)$"),
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db_readonly)
 ):
     """Get comprehensive organization analytics"""
     # Check if user has access to this organization
@@ -470,11 +372,15 @@ async def get_organization_analytics(
 
 @router.get("/organizations/{organization_id}/performance", response_model=dict)
 async def get_organization_performance(
-    organization_id: str,
+    organization_id: UUID,
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db_readonly)
 ):
-    """Get organization performance analytics"""
+    """Get organization performance analytics
+
+    Counts come from the dashboard statistics, trends from the daily metric
+    snapshot rollups of the last 90 days.
+    """
     # Verify user has access to organization
     org_member_result = await db.execute(
         select(OrganizationMember)
@@ -488,33 +394,103 @@ async def get_organization_performance(
     if not org_member:
         raise HTTPException(status_code=403, detail="Access denied to organization")
 
+    stats = await fetch_dashboard_stats(db, dashboard_stats_query(
+        Project.organization_id == organization_id, organization_ids=[organization_id]
+    ))
+    completed_projects_result = await db.execute(
+        select(func.count(Project.id)).where(
+            Project.organization_id == organization_id,
+            Project.status == 'completed'
+        )
+    )
+    completed_projects = completed_projects_result.scalar() or 0
+
+    now = datetime.now(timezone.utc)
+    active_users = await metric_series(db, organization_id, "active_users", now - timedelta(days=1), now, resolution="hour")
+    trends = {
+        metric: (await metric_series(db, organization_id, metric, now - timedelta(days=90), now, resolution="day"))["points"]
+        for metric in ("cards_created", "cards_completed", "completion_rate")
+    }
+    performance_trends = []
+    for month in sorted({point["timestamp"][:7] for point in trends["cards_created"]}):
+        def month_values(metric):
+            return [
+                point["value"] for point in trends[metric]
+                if point["timestamp"].startswith(month) and point["value"] is not None
+            ]
+        rates = month_values("completion_rate")
+        performance_trends.append({
+            "month": month,
+            "score": round(sum(rates) / len(rates), 2) if rates else None,
+            "cards_created": int(sum(month_values("cards_created"))),
+            "cards_completed": int(sum(month_values("cards_completed"))),
+        })
+
+    # Assignees of the most cards completed in the last 30 days
+    top_performers_result = await db.execute(
+        select(User.id, User.first_name, User.last_name, func.count(Card.id).label('completed'))
+        .select_from(CardAssignment)
+        .join(Card, Card.id == CardAssignment.card_id)
+        .join(Column, Column.id == Card.column_id)
+        .join(Board, Board.id == Column.board_id)
+        .join(Project, Project.id == Board.project_id)
+        .join(User, User.id == CardAssignment.user_id)
+        .where(
+            Project.organization_id == organization_id,
+            Card.status == 'completed',
+            Card.updated_at >= now - timedelta(days=30)
+        )
+        .group_by(User.id, User.first_name, User.last_name)
+        .order_by(func.count(Card.id).desc())
+        .limit(5)
+    )
+
     return {
-        "organization_id": organization_id,
-        "total_projects": 25,
-        "active_projects": 18,
-        "completed_projects": 7,
-        "total_members": 45,
-        "active_members": 38,
-        "productivity_score": 87.5,
-        "project_completion_rate": 28.0,
-        "average_project_duration": "45 days",
-        "performance_trends": [
-            {"month": "2025-06", "score": 82.5, "projects": 20},
-            {"month": "2025-07", "score": 85.0, "projects": 23},
-            {"month": "2025-08", "score": 87.5, "projects": 25}
-        ],
+        "organization_id": str(organization_id),
+        "total_projects": stats["projects"],
+        "active_projects": stats["active_projects"],
+        "completed_projects": completed_projects,
+        "total_members": stats["members"],
+        "active_members": int(max(point["value"] for point in active_users["points"])),
+        "productivity_score": completion_rate(stats),
+        "project_completion_rate": round(completed_projects / stats["projects"] * 100, 2) if stats["projects"] else 0,
+        "performance_trends": performance_trends,
         "top_performers": [
-            {"user_id": "user1", "name": "John Doe", "score": 95.0},
-            {"user_id": "user2", "name": "Jane Smith", "score": 92.5},
-            {"user_id": "user3", "name": "Bob Johnson", "score": 90.0}
+            {"user_id": str(user_id), "name": f"{first_name} {last_name}", "score": completed}
+            for user_id, first_name, last_name, completed in top_performers_result.all()
         ]
     }
 
 
+@router.get("/organizations/{organization_id}/metrics/{metric_type}", response_model=dict)
+async def get_organization_metric_series(
+    organization_id: UUID,
+    metric_type: str,
+    start: Optional[datetime] = Query(None, description="Range start (default: 7 days before end)"),
+    end: Optional[datetime] = Query(None, description="Range end (default: now)"),
+    resolution: Optional[str] = Query(None, pattern="^(minute|hour|day)$", description="Bucket size (default: from the range)"),
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db_readonly)
+):
+    """Time series of one organization metric for trend charts, served from the snapshot rollups"""
+    member_result = await db.execute(
+        select(OrganizationMember).where(
+            OrganizationMember.organization_id == organization_id,
+            OrganizationMember.user_id == current_user.id
+        )
+    )
+    if not member_result.scalar_one_or_none():
+        raise HTTPException(status_code=403, detail="Access denied to organization")
+
+    end = end or datetime.now(timezone.utc)
+    start = start or end - timedelta(days=7)
+    return await metric_series(db, organization_id, metric_type, start, end, resolution=resolution)
+
+
 @router.get("/reports", response_model=List[dict])
 async def get_analytics_reports(
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db_readonly)
 ):
     """Get available analytics reports"""
     # Mock reports data
@@ -546,7 +522,7 @@ async def get_analytics_reports(
 @router.get("/widgets", response_model=List[dict])
 async def get_dashboard_widgets(
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db_readonly)
 ):
     """Get available dashboard widgets"""
     # Mock widgets data
@@ -600,7 +576,7 @@ async def get_project_analytics(
     organization_id: UUID,
     project_id: UUID,
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db_readonly)
 ):
     """Get detailed project analytics"""
     # Check if user has access to this organization
@@ -687,7 +663,7 @@ async def get_project_analytics(
 async def get_dashboard_widgets(
     organization_id: UUID,
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db_readonly)
 ):
     """Get dashboard widgets for user"""
     # Check if user has access to this organization
@@ -863,7 +839,7 @@ async def create_data_export(
 async def get_data_exports(
     organization_id: UUID,
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db_readonly)
 ):
     """Get all data exports for organization"""
     # Check if user has access to this organization
@@ -11,15 +11,17 @@ from uuid import UUID
 import uuid
 from datetime import datetime
 
+from app.core.board_versions import bump_board_versions
 from app.core.database import get_db
 from app.core.deps import get_current_active_user, require_member
 from app.core.exceptions import ValidationError, ResourceNotFoundError, InsufficientPermissionsError
+from app.core.project_stats import record_card_changes, snapshot_cards
 from app.models.user import User
 from app.models.organization import OrganizationMember
 from app.models.project import Project
 from app.models.board import Board
 from app.models.column import Column
-from app.models.card import Card, ChecklistItem
+from app.models.card import Card, ChecklistItem, stamp_completions
 from app.models.ai_automation import SmartNotification
 from app.services.ai_service import AIService
 from app.services.role_permissions import role_permissions
@@ -330,17 +332,23 @@ async def bulk_update_tasks(
                 raise InsufficientPermissionsError("Access denied to one or more tasks")
 
         # Perform bulk operation
+        before = await snapshot_cards(db, [card.id for card in cards])
         if request.operation == "update":
             await db.execute(
                 update(Card)
                 .where(Card.id.in_(request.task_ids))
                 .values(**request.updates)
             )
+            if "status" in request.updates:
+                await db.execute(stamp_completions(request.task_ids))
         elif request.operation == "delete":
             await db.execute(
                 delete(Card)
                 .where(Card.id.in_(request.task_ids))
             )
+        await record_card_changes(db, before)
+        operation = "delete" if request.operation == "delete" else "upsert"
+        await bump_board_versions(db, changes=[(card.column.board_id, "card", card.id, operation) for card in cards])
 
         await db.commit()
 
@@ -489,7 +497,7 @@ async def convert_ai_task_to_board_card(
             select(Column).where(
                 Column.board_id == board.id,
                 Column.name.ilike('%to%do%')
-            ).order_by(Column.position)
+            ).order_by(Column.rank)
         )
         todo_column = todo_column_result.scalar_one_or_none()
 
@@ -497,7 +505,7 @@ async def convert_ai_task_to_board_card(
             # If no "To Do" column, get the first column
             first_column_result = await db.execute(
                 select(Column).where(Column.board_id == board.id)
-                .order_by(Column.position)
+                .order_by(Column.rank)
             )
             todo_column = first_column_result.scalar_one_or_none()
 
@@ -2,13 +2,15 @@
 Board management endpoints
 """
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 
-from app.core.database import get_db
+from app.core.database import get_db, get_db_readonly
+from app.database import statements
 from app.core.deps import get_current_active_user
+from app.core.memberships import get_membership
 from app.core.exceptions import ResourceNotFoundError, InsufficientPermissionsError
 from app.models.user import User
 from app.models.organization import OrganizationMember
@@ -16,6 +18,7 @@ from app.models.project import Project
 from app.models.board import Board
 from app.models.column import Column
 from app.schemas.project import BoardCreate, BoardUpdate, BoardResponse
+from app.services import board_changes
 from app.services.invitation_service import InvitationService
 from app.core.exceptions import ValidationError
 from pydantic import BaseModel, Field
@@ -83,18 +86,33 @@ async def get_board(
         raise ResourceNotFoundError("Board not found")
     
     # Check access through organization membership
-    org_member_result = await db.execute(
-        select(OrganizationMember).where(
-            OrganizationMember.organization_id == board.project.organization_id,
-            OrganizationMember.user_id == current_user.id
-        )
-    )
-    if not org_member_result.scalar_one_or_none():
+    if not await get_membership(current_user.id, board.project.organization_id, db):
         raise InsufficientPermissionsError("Access denied")
     
     return BoardResponse.from_orm(board)
 
 
+@router.get("/{board_id}/changes")
+async def get_board_changes(
+    board_id: str,
+    since: Optional[int] = Query(None, ge=0, description="Board version (cursor) the client last saw"),
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db_readonly)
+):
+    """Columns, cards and assignments changed since a cursor, with tombstones for deletes
+
+    ``resync: true`` means the cursor is too old (or missing); reload the board.
+    """
+    board = (await db.execute(statements.board_with_project(board_id))).scalar_one_or_none()
+    if not board:
+        raise ResourceNotFoundError("Board not found")
+
+    if not await get_membership(current_user.id, board.project.organization_id, db):
+        raise InsufficientPermissionsError("Access denied")
+
+    return await board_changes.get_board_changes(db, board, since)
+
+
 @router.put("/{board_id}", response_model=BoardResponse)
 async def update_board(
     board_id: str,
@@ -113,13 +131,7 @@ async def update_board(
         raise ResourceNotFoundError("Board not found")
     
     # Check access and permissions
-    org_member_result = await db.execute(
-        select(OrganizationMember).where(
-            OrganizationMember.organization_id == board.project.organization_id,
-            OrganizationMember.user_id == current_user.id
-        )
-    )
-    org_member = org_member_result.scalar_one_or_none()
+    org_member = await get_membership(current_user.id, board.project.organization_id, db)
     if not org_member:
         raise InsufficientPermissionsError("Access denied")
     
@@ -155,13 +167,7 @@ async def delete_board(
         raise ResourceNotFoundError("Board not found")
     
     # Check access and permissions
-    org_member_result = await db.execute(
-        select(OrganizationMember).where(
-            OrganizationMember.organization_id == board.project.organization_id,
-            OrganizationMember.user_id == current_user.id
-        )
-    )
-    org_member = org_member_result.scalar_one_or_none()
+    org_member = await get_membership(current_user.id, board.project.organization_id, db)
     if not org_member:
         raise InsufficientPermissionsError("Access denied")
     
@@ -207,13 +213,7 @@ async def get_project_boards(
         raise ResourceNotFoundError("Project not found")
     
     # Check organization membership
-    org_member_result = await db.execute(
-        select(OrganizationMember).where(
-            OrganizationMember.organization_id == project.organization_id,
-            OrganizationMember.user_id == current_user.id
-        )
-    )
-    if not org_member_result.scalar_one_or_none():
+    if not await get_membership(current_user.id, project.organization_id, db):
         raise InsufficientPermissionsError("Access denied")
     
     # Get boards
@@ -319,13 +319,7 @@ async def create_board_flat_internal(
         raise ResourceNotFoundError("Project not found")
 
     # Check organization membership and permissions
-    org_member_result = await db.execute(
-        select(OrganizationMember).where(
-            OrganizationMember.organization_id == project.organization_id,
-            OrganizationMember.user_id == current_user.id
-        )
-    )
-    org_member = org_member_result.scalar_one_or_none()
+    org_member = await get_membership(current_user.id, project.organization_id, db)
     if not org_member:
         raise InsufficientPermissionsError("Access denied")
 
@@ -483,15 +477,8 @@ async def invite_user_to_board(
         raise HTTPException(status_code=404, detail="Board not found")
 
     # Check if user has permission to invite (admin/owner of organization)
-    org_member_result = await db.execute(
-        select(OrganizationMember).where(
-            OrganizationMember.organization_id == board.project.organization_id,
-            OrganizationMember.user_id == current_user.id,
-            OrganizationMember.role.in_(['admin', 'owner'])
-        )
-    )
-    org_member = org_member_result.scalar_one_or_none()
-    if not org_member:
+    org_member = await get_membership(current_user.id, board.project.organization_id, db)
+    if not org_member or org_member.role not in ['admin', 'owner']:
         raise HTTPException(status_code=403, detail="Insufficient permissions to invite users")
 
     # Send board invitation
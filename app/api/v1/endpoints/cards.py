@@ -2,29 +2,39 @@
 Card management endpoints
 """
 import logging
-from typing import List, Optional
-from fastapi import APIRouter, Depends, Query, HTTPException, Request, status as http_status, BackgroundTasks
+from typing import Any, Dict, List, Optional, Union
+from fastapi import APIRouter, Depends, Query, HTTPException, Request, Response, status as http_status, BackgroundTasks
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, delete
 from sqlalchemy.orm import selectinload
 
-from app.core.database import get_db
-from app.core.deps import get_current_active_user
+from app.core.board_versions import (
+    bump_board_versions, etag_matches, not_modified, project_cards_etag, set_etag
+)
+from app.core.database import get_db, get_db_readonly
+from app.core.db_routing import read_your_writes_pending
+from app.database import fast_queries, statements
+from app.database.card_views import fetch_card_views, parse_fields
+from app.core.deps import get_current_active_principal, get_current_active_user
+from app.core.memberships import get_membership
+from app.core.ordering import rank_at, rank_position
+from app.core.pagination import decode_cursor, keyset, next_cursor_headers, set_next_cursor, trim_page
+from app.core.responses import FastJSONResponse, model_list_response
 from app.core.exceptions import ResourceNotFoundError, InsufficientPermissionsError
 from app.core.permissions import can_create_cards, get_user_role_for_column
+from app.core.principal import Principal
 from app.models.user import User
-from app.models.organization import OrganizationMember
 from app.models.project import Project
 from app.models.column import Column
 from app.models.board import Board
 from app.models.card import Card, CardAssignment, ChecklistItem
 from app.models.comment import Comment
-from app.models.mention import Mention
 from app.models.attachment import Attachment
+from app.services.card_batch import CardBatchService
 from app.services.mention_service import get_mention_service
 from app.services.role_permissions import role_permissions
 from app.schemas.card import (
-    CardCreate, CardUpdate, CardResponse, CardMove, CardAssignmentResponse,
+    CardCreate, CardUpdate, CardResponse, CardMove, CardBatchRequest, CardAssignmentResponse,
     CommentCreate, CommentUpdate, CommentResponse,
     AttachmentResponse, ActivityResponse
 )
@@ -37,12 +47,7 @@ logger = logging.getLogger(__name__)
 
 async def assert_column_in_project(db: AsyncSession, column_id: str, project_id: str):
     """Validate that a column belongs to the specified project"""
-    stmt = (
-        select(Board.project_id)
-        .join(Column, Column.board_id == Board.id)
-        .where(Column.id == column_id)
-    )
-    actual_project_id = (await db.execute(stmt)).scalar_one_or_none()
+    actual_project_id = (await db.execute(statements.column_project_id(column_id))).scalar_one_or_none()
     if actual_project_id != project_id:
         raise HTTPException(
             status_code=400,
@@ -50,56 +55,68 @@ async def assert_column_in_project(db: AsyncSession, column_id: str, project_id:
         )
 
 
-@router.get("/projects/{project_id}/cards", response_model=List[CardResponse])
+@router.get("/projects/{project_id}/cards", response_model=List[Union[Dict[str, Any], CardResponse]])
 async def list_project_cards(
     project_id: str,
-    current_user: User = Depends(get_current_active_user),
+    request: Request,
+    response: Response,
+    view: str = Query("full", description="full or compact (columns and child counts only)"),
+    fields: Optional[str] = Query(None, description="Comma-separated card fields; overrides view"),
+    current_user: Principal = Depends(get_current_active_principal),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get all cards for a specific project (project-scoped)"""
+    """Get all cards for a specific project (project-scoped)
+
+    The ETag covers the versions of all the project's boards and the field
+    selection; a matching If-None-Match is answered with 304 without reading
+    the cards.
+    """
+    selected = parse_fields(view, fields)
     # Verify project access and get organization membership
     project_result = await db.execute(
-        select(Project)
-        .options(selectinload(Project.organization))
-        .where(Project.id == project_id)
+        statements.project_with_organization(project_id)
     )
     project = project_result.scalar_one_or_none()
     if not project:
         raise ResourceNotFoundError("Project not found")
 
     # Check organization membership
-    org_member_result = await db.execute(
-        select(OrganizationMember).where(
-            OrganizationMember.organization_id == project.organization_id,
-            OrganizationMember.user_id == current_user.id
-        )
-    )
-    org_member = org_member_result.scalar_one_or_none()
+    org_member = await get_membership(current_user.id, project.organization_id, db)
     if not org_member:
         raise InsufficientPermissionsError("Access denied to this project")
 
-    # Get cards through the Board→Column→Card chain for this project
-    stmt = (
-        select(Card)
-        .options(
-            selectinload(Card.column).selectinload(Column.board),
-            selectinload(Card.checklist_items),
-            selectinload(Card.assignments).selectinload(CardAssignment.user),
-            selectinload(Card.comments),
-            selectinload(Card.attachments)
-        )
-        .join(Column, Card.column_id == Column.id)
-        .join(Board, Column.board_id == Board.id)
-        .where(Board.project_id == project_id)
-        .order_by(Column.position, Card.position, Card.created_at.desc())
-    )
+    board_versions = (await db.execute(statements.project_board_versions(project_id))).all()
+    etag = project_cards_etag(project_id, board_versions, selected)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+    set_etag(response, etag)
 
-    cards = (await db.execute(stmt)).scalars().all()
-    return [CardResponse.from_orm(card) for card in cards]
+    # Get cards through the Board→Column→Card chain for this project
+    if selected:
+        cards, _ = await fetch_card_views(db, (
+            select(Card)
+            .join(Column, Card.column_id == Column.id)
+            .join(Board, Column.board_id == Board.id)
+            .where(Board.project_id == project_id)
+            .order_by(Column.rank, Card.rank)
+        ), selected)
+        cards_response = FastJSONResponse(cards)
+        set_etag(cards_response, etag)
+        return cards_response
+    cards = (await db.execute(statements.project_cards(project_id))).scalars().all()
+    # Cards come in rank order; report each one's index in its column, not the stored position
+    indexes: Dict[Any, int] = {}
+    responses = []
+    for card in cards:
+        response = CardResponse.from_orm(card)
+        response.position = indexes[card.column_id] = indexes.get(card.column_id, -1) + 1
+        responses.append(response)
+    return responses
 
 
-@router.get("/list", response_model=List[CardResponse])
+@router.get("/list", response_model=List[Union[Dict[str, Any], CardResponse]])
 async def list_cards(
+    request: Request,
     column_id: Optional[str] = Query(None, description="Filter by column ID"),
     board_id: Optional[str] = Query(None, description="Filter by board ID"),
     project_id: Optional[str] = Query(None, description="Filter by project ID"),
@@ -108,10 +125,19 @@ async def list_cards(
     priority: Optional[str] = Query(None, description="Filter by priority"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page; replaces skip"),
+    view: str = Query("full", description="full or compact (columns and child counts only)"),
+    fields: Optional[str] = Query(None, description="Comma-separated card fields; overrides view"),
+    current_user: Principal = Depends(get_current_active_principal),
+    db: AsyncSession = Depends(get_db_readonly)
 ):
-    """Get cards with optional filters - alternative endpoint"""
+    """Get cards with optional filters - alternative endpoint
+
+    Cards come in creation order; ``cursor`` continues after the previous page.
+    """
+    page_key = (Card.created_at, Card.id)
+    after = decode_cursor(cursor, page_key) if cursor else None
+    selected = parse_fields(view, fields)
     try:
         # Ensure all filter parameters are properly handled
         column_id = column_id if column_id and column_id.strip() else None
@@ -121,16 +147,27 @@ async def list_cards(
         card_status = card_status if card_status and card_status.strip() else None
         priority = priority if priority and priority.strip() else None
 
-        # Build base query with optimized eager loading
-        query = select(Card).options(
-            selectinload(Card.column)
-            .selectinload(Column.board)
-            .selectinload(Board.project),
-            selectinload(Card.assignments).selectinload(CardAssignment.user),
-            selectinload(Card.checklist_items)
-            # Remove comments and attachments for list view to improve performance
-            # These can be loaded separately when viewing individual cards
-        )
+        if not selected and fast_queries.fast_path_allowed():
+            try:
+                cards, next_cursor = trim_page(await fast_queries.list_cards(
+                    current_user.id,
+                    column_id=column_id,
+                    board_id=board_id,
+                    project_id=project_id,
+                    assigned_to=assigned_to,
+                    card_status=card_status,
+                    priority=priority,
+                    skip=skip,
+                    limit=limit + 1,
+                    after=after,
+                    replica=not read_your_writes_pending(request),
+                ), limit, lambda card: (card["created_at"], card["id"]))
+                return model_list_response(CardResponse, cards, headers=next_cursor_headers(next_cursor))
+            except fast_queries.FastPathUnavailable:
+                pass
+
+        # Build base query; relations are loaded below for the full view only
+        query = select(Card)
 
         # Apply filters
         if column_id:
@@ -144,8 +181,7 @@ async def list_cards(
         else:
             # If no specific filter, get user's organization cards
             user_org_result = await db.execute(
-                select(OrganizationMember.organization_id)
-                .where(OrganizationMember.user_id == current_user.id)
+                statements.user_organization_ids(current_user.id)
             )
             user_org_ids = [row[0] for row in user_org_result.fetchall()]
 
@@ -167,21 +203,30 @@ async def list_cards(
             query = query.where(Card.priority == priority)
 
         # Apply pagination
-        query = query.offset(skip).limit(limit)
+        query = keyset(query, page_key, after).limit(limit + 1)
+        if after is None:
+            query = query.offset(skip)
 
-        # Execute query
-        result = await db.execute(query)
-        cards = result.scalars().all()
+        if selected:
+            cards, next_cursor = await fetch_card_views(db, query, selected, limit, ("created_at", "id"))
+            return FastJSONResponse(cards, headers=next_cursor_headers(next_cursor))
+
+        # Execute query with eager loading of what CardResponse shows
+        result = await db.execute(query.add_columns(rank_position(Card)).options(
+            selectinload(Card.assignments).selectinload(CardAssignment.user),
+            selectinload(Card.checklist_items)
+        ))
+        cards, next_cursor = trim_page(result.all(), limit, lambda row: (row[0].created_at, row[0].id))
 
         # Manually construct response to avoid async issues
         response_cards = []
-        for card in cards:
+        for card, position in cards:
             card_data = {
                 'id': card.id,
                 'column_id': card.column_id,
                 'title': card.title,
                 'description': card.description,
-                'position': card.position,
+                'position': position,
                 'priority': card.priority,
                 'status': card.status,
                 'due_date': card.due_date,
@@ -227,9 +272,9 @@ async def list_cards(
                     }
                     card_data['checklist_items'].append(item_data)
 
-            response_cards.append(CardResponse(**card_data))
+            response_cards.append(card_data)
 
-        return response_cards
+        return model_list_response(CardResponse, response_cards, headers=next_cursor_headers(next_cursor))
 
     except Exception as e:
         raise HTTPException(
@@ -238,7 +283,7 @@ async def list_cards(
         )
 
 
-@router.get("/", response_model=List[CardResponse])
+@router.get("/", response_model=List[Union[Dict[str, Any], CardResponse]])
 async def get_cards(
     request: Request,
     column_id: Optional[str] = Query(None, description="Filter by column ID"),
@@ -249,10 +294,16 @@ async def get_cards(
     priority: Optional[str] = Query(None, description="Filter by priority"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    current_user: User = Depends(get_current_active_user),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page; replaces skip"),
+    view: str = Query("full", description="full or compact (columns and child counts only)"),
+    fields: Optional[str] = Query(None, description="Comma-separated card fields; overrides view"),
+    current_user: Principal = Depends(get_current_active_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Get cards with optional filters"""
+    page_key = (Card.rank, Card.created_at, Card.id)
+    after = decode_cursor(cursor, page_key) if cursor else None
+    selected = parse_fields(view, fields)
     try:
         # Ensure all filter parameters are properly handled
         column_id = column_id if column_id and column_id.strip() else None
@@ -262,22 +313,14 @@ async def get_cards(
         status = status if status and status.strip() else None
         priority = priority if priority and priority.strip() else None
 
-        # Build base query
-        query = select(Card).options(
-            selectinload(Card.column)
-            .selectinload(Column.board)
-            .selectinload(Board.project),
-            selectinload(Card.assignments).selectinload(CardAssignment.user),
-            selectinload(Card.checklist_items)
-        )
+        # Build base query; relations are loaded below for the full view only
+        query = select(Card)
 
         # If no specific filters are provided, limit to user's organizations
         if not any([column_id, board_id, project_id, assigned_to]):
             # Get user's organizations
             user_orgs_result = await db.execute(
-                select(OrganizationMember.organization_id).where(
-                    OrganizationMember.user_id == current_user.id
-                )
+                statements.user_organization_ids(current_user.id)
             )
             user_org_ids = [row[0] for row in user_orgs_result.fetchall()]
 
@@ -318,10 +361,19 @@ async def get_cards(
             query = query.where(Card.priority == priority)
 
         # Apply pagination and ordering
-        query = query.order_by(Card.position, Card.created_at).offset(skip).limit(limit)
+        query = keyset(query, page_key, after).limit(limit + 1)
+        if after is None:
+            query = query.offset(skip)
 
-        result = await db.execute(query)
-        cards = result.scalars().all()
+        if selected:
+            cards, next_cursor = await fetch_card_views(db, query, selected, limit, ("rank", "created_at", "id"))
+            return FastJSONResponse(cards, headers=next_cursor_headers(next_cursor))
+
+        result = await db.execute(query.options(
+            selectinload(Card.assignments).selectinload(CardAssignment.user),
+            selectinload(Card.checklist_items)
+        ))
+        cards, next_cursor = trim_page(result.scalars().all(), limit, lambda card: (card.rank, card.created_at, card.id))
 
         # Manually construct response to avoid async issues
         response_cards = []
@@ -377,9 +429,9 @@ async def get_cards(
                     }
                     card_data['checklist_items'].append(item_data)
 
-            response_cards.append(CardResponse(**card_data))
+            response_cards.append(card_data)
 
-        return response_cards
+        return model_list_response(CardResponse, response_cards, headers=next_cursor_headers(next_cursor))
 
     except Exception as e:
         raise HTTPException(
@@ -391,33 +443,19 @@ async def get_cards(
 @router.get("/{card_id}", response_model=CardResponse)
 async def get_card(
     card_id: str,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Get card by ID"""
     result = await db.execute(
-        select(Card)
-        .options(
-            selectinload(Card.column)
-            .selectinload(Column.board)
-            .selectinload(Board.project),
-            selectinload(Card.assignments).selectinload(CardAssignment.user),
-            selectinload(Card.checklist_items)
-        )
-        .where(Card.id == card_id)
+        statements.card_detail(card_id)
     )
     card = result.scalar_one_or_none()
     if not card:
         raise ResourceNotFoundError("Card not found")
     
     # Check access
-    org_member_result = await db.execute(
-        select(OrganizationMember).where(
-            OrganizationMember.organization_id == card.column.board.project.organization_id,
-            OrganizationMember.user_id == current_user.id
-        )
-    )
-    if not org_member_result.scalar_one_or_none():
+    if not await get_membership(current_user.id, card.column.board.project.organization_id, db):
         raise InsufficientPermissionsError("Access denied")
     
     # Format response with assignments and checklist
@@ -463,13 +501,7 @@ async def update_card(
 ):
     """Update card"""
     result = await db.execute(
-        select(Card)
-        .options(
-            selectinload(Card.column)
-            .selectinload(Column.board)
-            .selectinload(Board.project)
-        )
-        .where(Card.id == card_id)
+        statements.card_with_project(card_id)
     )
     card = result.scalar_one_or_none()
     if not card:
@@ -521,7 +553,8 @@ async def update_card(
         card.title = card_data.title
     if card_data.description is not None:
         card.description = card_data.description
-    if card_data.position is not None:
+    if card_data.position is not None and card_data.position != card.position:
+        card.rank = await rank_at(db, Card, card.column_id, card_data.position, exclude_id=card.id)
         card.position = card_data.position
     if card_data.priority is not None:
         card.priority = card_data.priority
@@ -544,7 +577,12 @@ async def update_card(
             raise InsufficientPermissionsError(validation_result['error'])
 
         # Remove existing assignments
-        await db.execute(delete(CardAssignment).where(CardAssignment.card_id == card_id))
+        removed = (await db.execute(
+            delete(CardAssignment).where(CardAssignment.card_id == card_id).returning(CardAssignment.id)
+        )).scalars().all()
+        await bump_board_versions(
+            db, changes=[(card.column.board_id, "assignment", assignment_id, "delete") for assignment_id in removed]
+        )
 
         # Add new assignments
         for user_id in card_data.assigned_to:
@@ -559,12 +597,7 @@ async def update_card(
 
     # Reload card with relationships for response
     result = await db.execute(
-        select(Card)
-        .options(
-            selectinload(Card.assignments).selectinload(CardAssignment.user),
-            selectinload(Card.checklist_items)
-        )
-        .where(Card.id == card.id)
+        statements.card_with_relations(card.id)
     )
     card_with_relations = result.scalar_one()
 
@@ -626,13 +659,7 @@ async def delete_card(
 ):
     """Delete card"""
     result = await db.execute(
-        select(Card)
-        .options(
-            selectinload(Card.column)
-            .selectinload(Column.board)
-            .selectinload(Board.project)
-        )
-        .where(Card.id == card_id)
+        statements.card_with_project(card_id)
     )
     card = result.scalar_one_or_none()
     if not card:
@@ -694,26 +721,14 @@ async def move_card(
 ):
     """Move card to different column"""
     result = await db.execute(
-        select(Card)
-        .options(
-            selectinload(Card.column)
-            .selectinload(Column.board)
-            .selectinload(Board.project)
-        )
-        .where(Card.id == card_id)
+        statements.card_with_project(card_id)
     )
     card = result.scalar_one_or_none()
     if not card:
         raise ResourceNotFoundError("Card not found")
     
     # Check access and permissions
-    org_member_result = await db.execute(
-        select(OrganizationMember).where(
-            OrganizationMember.organization_id == card.column.board.project.organization_id,
-            OrganizationMember.user_id == current_user.id
-        )
-    )
-    org_member = org_member_result.scalar_one_or_none()
+    org_member = await get_membership(current_user.id, card.column.board.project.organization_id, db)
     if not org_member:
         raise InsufficientPermissionsError("Access denied")
     
@@ -722,36 +737,21 @@ async def move_card(
     
     # Verify target column exists and belongs to same board
     target_column_result = await db.execute(
-        select(Column).where(
-            Column.id == move_data.target_column_id,
-            Column.board_id == card.column.board_id
-        )
+        statements.column_in_board(move_data.target_column_id, card.column.board_id)
     )
     if not target_column_result.scalar_one_or_none():
         raise ResourceNotFoundError("Target column not found or not in same board")
     
-    # Move card: if no explicit position is provided, append to the end
-    from sqlalchemy import func
-
     # Get target column to determine status mapping
     target_column_result = await db.execute(
-        select(Column).where(Column.id == move_data.target_column_id)
+        statements.column_by_id(move_data.target_column_id)
     )
     target_column = target_column_result.scalar_one_or_none()
     if not target_column:
         raise ResourceNotFoundError("Target column not found")
 
-    # Determine new position
-    new_position = move_data.position
-    if new_position is None:
-        # Find the current max position within the target column to append card
-        max_pos_result = await db.execute(
-            select(func.max(Card.position)).where(
-                Card.column_id == move_data.target_column_id
-            )
-        )
-        max_position = max_pos_result.scalar_one_or_none() or 0
-        new_position = (max_position or 0) + 1
+    # Key between the new neighbours (appends when no position is given); only this card is written
+    new_rank = await rank_at(db, Card, target_column.id, move_data.position, exclude_id=card.id)
 
     # Map column name to status
     def get_status_from_column_name(column_name: str) -> str:
@@ -789,7 +789,9 @@ async def move_card(
     new_status = get_status_from_column_name(target_column.name)
 
     card.column_id = move_data.target_column_id
-    card.position = new_position
+    card.rank = new_rank
+    if move_data.position is not None:
+        card.position = move_data.position
     card.status = new_status
 
     await db.commit()
@@ -802,45 +804,41 @@ async def move_card(
     }
 
 
+@router.post("/batch")
+async def batch_cards(
+    batch: CardBatchRequest,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Apply move/update/assign/unassign/delete operations to many cards in one transaction
+
+    Operations run in order; if any is invalid or not permitted, none is applied.
+    """
+    return await CardBatchService(db).apply(current_user, batch.operations)
+
+
 @router.get("/column", response_model=List[CardResponse])
 async def get_cards_by_column(
     column_id: str = Query(..., description="Column ID to filter cards"),
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Get cards for a column"""
     # Check column access
     column_result = await db.execute(
-        select(Column)
-        .options(
-            selectinload(Column.board)
-            .selectinload(Board.project)
-        )
-        .where(Column.id == column_id)
+        statements.column_with_project(column_id)
     )
     column = column_result.scalar_one_or_none()
     if not column:
         raise ResourceNotFoundError("Column not found")
 
     # Check organization membership
-    org_member_result = await db.execute(
-        select(OrganizationMember).where(
-            OrganizationMember.organization_id == column.board.project.organization_id,
-            OrganizationMember.user_id == current_user.id
-        )
-    )
-    if not org_member_result.scalar_one_or_none():
+    if not await get_membership(current_user.id, column.board.project.organization_id, db):
         raise InsufficientPermissionsError("Access denied")
 
     # Get cards
     result = await db.execute(
-        select(Card)
-        .options(
-            selectinload(Card.assignments).selectinload(CardAssignment.user),
-            selectinload(Card.checklist_items)
-        )
-        .where(Card.column_id == column_id)
-        .order_by(Card.position)
+        statements.column_cards(column_id)
     )
     cards = result.scalars().all()
 
@@ -917,12 +915,7 @@ async def create_card(
 
         # Check column access
         column_result = await db.execute(
-            select(Column)
-            .options(
-                selectinload(Column.board)
-                .selectinload(Board.project)
-            )
-            .where(Column.id == column_id)
+            statements.column_with_project(column_id)
         )
         column = column_result.scalar_one_or_none()
         if not column:
@@ -952,7 +945,6 @@ async def create_card(
         # Calculate position if not provided
         position = card_data.position
         if position is None:
-            from sqlalchemy import func
             # Find the current max position within the column to append card
             # Ensure column_id is properly converted to UUID for comparison
             try:
@@ -963,9 +955,7 @@ async def create_card(
                     column_uuid = column_id
 
                 max_pos_result = await db.execute(
-                    select(func.max(Card.position)).where(
-                        Card.column_id == column_uuid
-                    )
+                    statements.max_card_position(column_uuid)
                 )
                 max_position = max_pos_result.scalar_one_or_none()
                 # Ensure max_position is an integer, not a UUID or other type
@@ -997,6 +987,10 @@ async def create_card(
             print(f"❌ Error creating card with UUID conversion: {e}")
             raise HTTPException(status_code=400, detail=f"Invalid UUID format: {str(e)}")
 
+        if card_data.position is not None:
+            # Insert at the requested index; otherwise the card is appended on flush
+            card.rank = await rank_at(db, Card, column_uuid, card_data.position)
+
         db.add(card)
         await db.flush()  # Get the ID
 
@@ -1106,9 +1100,7 @@ async def create_card(
 
                 # Get project and organization info for notifications
                 project_result = await db.execute(
-                    select(Project)
-                    .options(selectinload(Project.organization))
-                    .where(Project.id == column.board.project.id)
+                    statements.project_with_organization(column.board.project.id)
                 )
                 project = project_result.scalar_one_or_none()
 
@@ -1116,7 +1108,7 @@ async def create_card(
                     for user_id in assignments_created:
                         # Get user details
                         user_result = await db.execute(
-                            select(User).where(User.id == user_id)
+                            statements.user_by_id(user_id)
                         )
                         assigned_user = user_result.scalar_one_or_none()
 
@@ -1183,12 +1175,7 @@ async def create_card(
 
         # Reload card with relationships for response
         result = await db.execute(
-            select(Card)
-            .options(
-                selectinload(Card.assignments).selectinload(CardAssignment.user),
-                selectinload(Card.checklist_items)
-            )
-            .where(Card.id == card.id)
+            statements.card_with_relations(card.id)
         )
         card_with_relations = result.scalar_one()
 
@@ -1306,11 +1293,7 @@ async def get_assignable_members(
         logger.info(f"🔍 Getting assignable members for card {card_id} by user {current_user.email}")
         # Get the card with project and organization info
         card_result = await db.execute(
-            select(Card)
-            .options(
-                selectinload(Card.column).selectinload(Column.board).selectinload(Board.project)
-            )
-            .where(Card.id == card_id)
+            statements.card_with_project(card_id)
         )
         card = card_result.scalar_one_or_none()
 
@@ -1321,24 +1304,14 @@ async def get_assignable_members(
         organization_id = project.organization_id
 
         # Check if current user has permission to view this card
-        user_org_result = await db.execute(
-            select(OrganizationMember).where(
-                OrganizationMember.organization_id == organization_id,
-                OrganizationMember.user_id == current_user.id
-            )
-        )
-        user_org_member = user_org_result.scalar_one_or_none()
+        user_org_member = await get_membership(current_user.id, organization_id, db)
 
         if not user_org_member:
             raise InsufficientPermissionsError("Access denied")
 
         # Get all organization members
         members_result = await db.execute(
-            select(OrganizationMember)
-            .options(selectinload(OrganizationMember.user))
-            .where(OrganizationMember.organization_id == organization_id)
-            .join(User, OrganizationMember.user_id == User.id)
-            .order_by(User.first_name, User.last_name)
+            statements.org_members_with_users(organization_id)
         )
         members = members_result.scalars().all()
 
@@ -1375,12 +1348,7 @@ async def add_comment_to_card(
     try:
         # Get the card and verify access
         card_result = await db.execute(
-            select(Card)
-            .options(
-                selectinload(Card.column).selectinload(Column.board).selectinload(Board.project),
-                selectinload(Card.assignments).selectinload(CardAssignment.user)
-            )
-            .where(Card.id == card_id)
+            statements.card_with_project_and_assignments(card_id)
         )
         card = card_result.scalar_one_or_none()
 
@@ -1443,9 +1411,7 @@ async def add_comment_to_card(
 
         # Return the comment with user info
         comment_result = await db.execute(
-            select(Comment)
-            .options(selectinload(Comment.user))
-            .where(Comment.id == comment.id)
+            statements.comment_with_user(comment.id)
         )
         comment_with_user = comment_result.scalar_one()
 
@@ -1468,18 +1434,12 @@ async def send_comment_notifications(
     try:
         # Get comment and card details
         comment_result = await db.execute(
-            select(Comment)
-            .options(selectinload(Comment.user))
-            .where(Comment.id == comment_id)
+            statements.comment_with_user(comment_id)
         )
         comment = comment_result.scalar_one_or_none()
 
         card_result = await db.execute(
-            select(Card)
-            .options(
-                selectinload(Card.column).selectinload(Column.board).selectinload(Board.project)
-            )
-            .where(Card.id == card_id)
+            statements.card_with_project(card_id)
         )
         card = card_result.scalar_one_or_none()
 
@@ -1518,11 +1478,7 @@ async def assign_user_to_card(
     try:
         # Get the card with project and organization info
         card_result = await db.execute(
-            select(Card)
-            .options(
-                selectinload(Card.column).selectinload(Column.board).selectinload(Board.project)
-            )
-            .where(Card.id == card_id)
+            statements.card_with_project(card_id)
         )
         card = card_result.scalar_one_or_none()
 
@@ -1533,13 +1489,7 @@ async def assign_user_to_card(
         organization_id = project.organization_id
 
         # Check if current user has permission to assign members
-        current_user_org_result = await db.execute(
-            select(OrganizationMember).where(
-                OrganizationMember.organization_id == organization_id,
-                OrganizationMember.user_id == current_user.id
-            )
-        )
-        current_user_org_member = current_user_org_result.scalar_one_or_none()
+        current_user_org_member = await get_membership(current_user.id, organization_id, db)
 
         if not current_user_org_member:
             raise InsufficientPermissionsError("Access denied")
@@ -1550,10 +1500,7 @@ async def assign_user_to_card(
 
         # Verify the user being assigned is in the same organization
         target_user_org_result = await db.execute(
-            select(OrganizationMember).where(
-                OrganizationMember.organization_id == organization_id,
-                OrganizationMember.user_id == user_id
-            )
+            statements.org_member(organization_id, user_id)
         )
         target_user_org_member = target_user_org_result.scalar_one_or_none()
 
@@ -1562,10 +1509,7 @@ async def assign_user_to_card(
 
         # Check if assignment already exists
         existing_assignment = await db.execute(
-            select(CardAssignment).where(
-                CardAssignment.card_id == card_id,
-                CardAssignment.user_id == user_id
-            )
+            statements.card_assignment(card_id, user_id)
         )
 
         if existing_assignment.scalar_one_or_none():
@@ -1599,11 +1543,7 @@ async def unassign_user_from_card(
     try:
         # Get the card with project and organization info
         card_result = await db.execute(
-            select(Card)
-            .options(
-                selectinload(Card.column).selectinload(Column.board).selectinload(Board.project)
-            )
-            .where(Card.id == card_id)
+            statements.card_with_project(card_id)
         )
         card = card_result.scalar_one_or_none()
 
@@ -1614,13 +1554,7 @@ async def unassign_user_from_card(
         organization_id = project.organization_id
 
         # Check if current user has permission to unassign members
-        current_user_org_result = await db.execute(
-            select(OrganizationMember).where(
-                OrganizationMember.organization_id == organization_id,
-                OrganizationMember.user_id == current_user.id
-            )
-        )
-        current_user_org_member = current_user_org_result.scalar_one_or_none()
+        current_user_org_member = await get_membership(current_user.id, organization_id, db)
 
         if not current_user_org_member:
             raise InsufficientPermissionsError("Access denied")
@@ -1631,10 +1565,7 @@ async def unassign_user_from_card(
 
         # Find and delete the assignment
         assignment_result = await db.execute(
-            select(CardAssignment).where(
-                CardAssignment.card_id == card_id,
-                CardAssignment.user_id == user_id
-            )
+            statements.card_assignment(card_id, user_id)
         )
         assignment = assignment_result.scalar_one_or_none()
 
@@ -1662,11 +1593,7 @@ async def get_mention_autocomplete(
     try:
         # Get the card with project and organization info
         card_result = await db.execute(
-            select(Card)
-            .options(
-                selectinload(Card.column).selectinload(Column.board).selectinload(Board.project)
-            )
-            .where(Card.id == card_id)
+            statements.card_with_project(card_id)
         )
         card = card_result.scalar_one_or_none()
 
@@ -1677,13 +1604,7 @@ async def get_mention_autocomplete(
         organization_id = str(project.organization_id)
 
         # Check if current user has access to this organization
-        current_user_org_result = await db.execute(
-            select(OrganizationMember).where(
-                OrganizationMember.organization_id == organization_id,
-                OrganizationMember.user_id == current_user.id
-            )
-        )
-        current_user_org_member = current_user_org_result.scalar_one_or_none()
+        current_user_org_member = await get_membership(current_user.id, organization_id, db)
 
         if not current_user_org_member:
             raise InsufficientPermissionsError("Access denied")
@@ -1705,20 +1626,27 @@ async def get_mention_autocomplete(
 @router.get("/{card_id}/activities")
 async def get_card_activities(
     card_id: str,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size; all activities when omitted"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    """Get all activities (comments, assignments, etc.) for a card"""
+    """Get all activities (comments, assignments, etc.) for a card
+
+    Oldest first. With ``limit`` (or a ``cursor``) the activities are paged
+    by ``(created_at, id)``.
+    """
+    page_key = (Comment.created_at, Comment.id)
+    after = decode_cursor(cursor, page_key) if cursor else None
+    if after is not None and limit is None:
+        limit = 50
     try:
         print(f"🔍 Getting activities for card {card_id} by user {current_user.email}")
 
         # Get the card and verify access
         card_result = await db.execute(
-            select(Card)
-            .options(
-                selectinload(Card.column).selectinload(Column.board).selectinload(Board.project)
-            )
-            .where(Card.id == card_id)
+            statements.card_with_project(card_id)
         )
         card = card_result.scalar_one_or_none()
         if not card:
@@ -1729,23 +1657,20 @@ async def get_card_activities(
         organization_id = project.organization_id
 
         # Check organization membership
-        org_member_result = await db.execute(
-            select(OrganizationMember).where(
-                OrganizationMember.organization_id == organization_id,
-                OrganizationMember.user_id == current_user.id
-            )
-        )
-        if not org_member_result.scalar_one_or_none():
+        if not await get_membership(current_user.id, organization_id, db):
             raise InsufficientPermissionsError("Access denied")
 
-        # Get all comments for this card
-        comments_result = await db.execute(
-            select(Comment)
-            .options(selectinload(Comment.user))
-            .where(Comment.card_id == card_id)
-            .order_by(Comment.created_at.asc())
-        )
-        comments = comments_result.scalars().all()
+        # Get the comments for this card
+        if limit is None:
+            comments = (await db.execute(statements.card_comments(card_id))).scalars().all()
+        else:
+            query = select(Comment).options(selectinload(Comment.user)).where(Comment.card_id == card_id)
+            comments, next_cursor = trim_page(
+                (await db.execute(keyset(query, page_key, after).limit(limit + 1))).scalars().all(),
+                limit,
+                lambda comment: (comment.created_at, comment.id),
+            )
+            set_next_cursor(response, next_cursor)
 
         # Format activities
         activities = []
@@ -1768,9 +1693,7 @@ async def get_card_activities(
 
             # Add mentions if they exist
             mentions_result = await db.execute(
-                select(Mention)
-                .options(selectinload(Mention.mentioned_user))
-                .where(Mention.comment_id == comment.id)
+                statements.comment_mentions(comment.id)
             )
             mentions = mentions_result.scalars().all()
             if mentions:
@@ -1,18 +1,21 @@
 """
 Column management endpoints
 """
+import uuid
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update, func
 from sqlalchemy.orm import selectinload
 
+from app.core.board_versions import bump_board_versions
 from app.core.database import get_db
 from app.core.deps import get_current_active_user
+from app.core.memberships import get_membership
+from app.core.ordering import evenly_spaced_keys, keys_after, rank_at
 from app.core.exceptions import ResourceNotFoundError, InsufficientPermissionsError
 from app.core.permissions import can_create_cards, get_user_role_for_column
 from app.models.user import User
-from app.models.organization import OrganizationMember
 from app.models.board import Board
 from app.models.column import Column
 from app.schemas.project import ColumnCreate, ColumnUpdate, ColumnResponse, ColumnOrderUpdate
@@ -40,13 +43,7 @@ async def get_column(
         raise ResourceNotFoundError("Column not found")
     
     # Check access
-    org_member_result = await db.execute(
-        select(OrganizationMember).where(
-            OrganizationMember.organization_id == column.board.project.organization_id,
-            OrganizationMember.user_id == current_user.id
-        )
-    )
-    if not org_member_result.scalar_one_or_none():
+    if not await get_membership(current_user.id, column.board.project.organization_id, db):
         raise InsufficientPermissionsError("Access denied")
     
     return ColumnResponse.from_orm(column)
@@ -70,13 +67,7 @@ async def update_column(
         raise ResourceNotFoundError("Column not found")
     
     # Check access and permissions
-    org_member_result = await db.execute(
-        select(OrganizationMember).where(
-            OrganizationMember.organization_id == column.board.project.organization_id,
-            OrganizationMember.user_id == current_user.id
-        )
-    )
-    org_member = org_member_result.scalar_one_or_none()
+    org_member = await get_membership(current_user.id, column.board.project.organization_id, db)
     if not org_member:
         raise InsufficientPermissionsError("Access denied")
     
@@ -86,7 +77,8 @@ async def update_column(
     # Update fields
     if column_data.name is not None:
         column.name = column_data.name
-    if column_data.position is not None:
+    if column_data.position is not None and column_data.position != column.position:
+        column.rank = await rank_at(db, Column, column.board_id, column_data.position, exclude_id=column.id)
         column.position = column_data.position
     if column_data.color is not None:
         column.color = column_data.color
@@ -114,13 +106,7 @@ async def delete_column(
         raise ResourceNotFoundError("Column not found")
 
     # Check access and permissions
-    org_member_result = await db.execute(
-        select(OrganizationMember).where(
-            OrganizationMember.organization_id == column.board.project.organization_id,
-            OrganizationMember.user_id == current_user.id
-        )
-    )
-    org_member = org_member_result.scalar_one_or_none()
+    org_member = await get_membership(current_user.id, column.board.project.organization_id, db)
     if not org_member:
         raise InsufficientPermissionsError("Access denied")
 
@@ -146,7 +132,7 @@ async def delete_column(
 
     # Get all cards in this column
     cards_result = await db.execute(
-        select(Card).where(Card.column_id == column_id)
+        select(Card).where(Card.column_id == column_id).order_by(Card.rank)
     )
     cards_to_move = cards_result.scalars().all()
 
@@ -154,7 +140,7 @@ async def delete_column(
     other_columns_result = await db.execute(
         select(Column)
         .where(Column.board_id == column.board_id, Column.id != column_id)
-        .order_by(Column.position)
+        .order_by(Column.rank)
     )
     other_columns = other_columns_result.scalars().all()
 
@@ -162,11 +148,12 @@ async def delete_column(
         # Move all cards to the first available column
         target_column = other_columns[0]
 
-        # Get the max position in the target column
+        # Get the max position and last ordering key in the target column
         max_position_result = await db.execute(
-            select(func.max(Card.position)).where(Card.column_id == target_column.id)
+            select(func.max(Card.position), func.max(Card.rank)).where(Card.column_id == target_column.id)
         )
-        max_position = max_position_result.scalar_one_or_none() or 0
+        max_position, last_rank = max_position_result.one()
+        max_position = max_position or 0
 
         # Move cards and update their status based on target column
         def get_status_from_column_name(column_name: str) -> str:
@@ -200,9 +187,11 @@ async def delete_column(
 
         new_status = get_status_from_column_name(target_column.name)
 
-        for i, card in enumerate(cards_to_move):
+        # Appended below the target column's cards, in their current order
+        for i, (card, rank) in enumerate(zip(cards_to_move, keys_after(last_rank, len(cards_to_move)))):
             card.column_id = target_column.id
             card.position = max_position + i + 1
+            card.rank = rank
             card.status = new_status
             card.updated_at = func.now()
 
@@ -235,20 +224,14 @@ async def get_board_columns(
         raise ResourceNotFoundError("Board not found")
     
     # Check organization membership
-    org_member_result = await db.execute(
-        select(OrganizationMember).where(
-            OrganizationMember.organization_id == board.project.organization_id,
-            OrganizationMember.user_id == current_user.id
-        )
-    )
-    if not org_member_result.scalar_one_or_none():
+    if not await get_membership(current_user.id, board.project.organization_id, db):
         raise InsufficientPermissionsError("Access denied")
     
     # Get columns
     result = await db.execute(
         select(Column)
         .where(Column.board_id == board_id)
-        .order_by(Column.position)
+        .order_by(Column.rank)
     )
     columns = result.scalars().all()
     
@@ -278,13 +261,7 @@ async def create_column(
         raise ResourceNotFoundError("Board not found")
     
     # Check organization membership and permissions
-    org_member_result = await db.execute(
-        select(OrganizationMember).where(
-            OrganizationMember.organization_id == board.project.organization_id,
-            OrganizationMember.user_id == current_user.id
-        )
-    )
-    org_member = org_member_result.scalar_one_or_none()
+    org_member = await get_membership(current_user.id, board.project.organization_id, db)
     if not org_member:
         raise InsufficientPermissionsError("Access denied")
     
@@ -296,6 +273,7 @@ async def create_column(
         board_id=board_id,
         name=column_data.name,
         position=column_data.position,
+        rank=await rank_at(db, Column, board.id, column_data.position),
         color=column_data.color
     )
     
@@ -352,13 +330,7 @@ async def create_column_flat(
         raise ResourceNotFoundError("Board not found")
 
     # Check organization membership and permissions
-    org_member_result = await db.execute(
-        select(OrganizationMember).where(
-            OrganizationMember.organization_id == board.project.organization_id,
-            OrganizationMember.user_id == current_user.id
-        )
-    )
-    org_member = org_member_result.scalar_one_or_none()
+    org_member = await get_membership(current_user.id, board.project.organization_id, db)
     if not org_member:
         raise InsufficientPermissionsError("Access denied")
     if org_member.role not in ['member', 'admin', 'owner']:
@@ -369,6 +341,7 @@ async def create_column_flat(
         board_id=board_id,
         name=name.strip(),
         position=position,
+        rank=await rank_at(db, Column, board.id, position),
         color=color
     )
     db.add(column)
@@ -396,26 +369,24 @@ async def reorder_columns(
     if not board:
         raise ResourceNotFoundError("Board not found")
     
-    org_member_result = await db.execute(
-        select(OrganizationMember).where(
-            OrganizationMember.organization_id == board.project.organization_id,
-            OrganizationMember.user_id == current_user.id
-        )
-    )
-    org_member = org_member_result.scalar_one_or_none()
+    org_member = await get_membership(current_user.id, board.project.organization_id, db)
     if not org_member:
         raise InsufficientPermissionsError("Access denied")
     
     if org_member.role not in ['member', 'admin', 'owner']:
         raise InsufficientPermissionsError("Insufficient permissions")
     
-    # Update column positions
-    for column_order in order_data.column_orders:
+    # Update column positions; the listed columns get fresh ordering keys in the new order
+    column_orders = sorted(order_data.column_orders, key=lambda column_order: column_order["position"])
+    for column_order, rank in zip(column_orders, evenly_spaced_keys(len(column_orders))):
         await db.execute(
             update(Column)
             .where(Column.id == column_order["id"], Column.board_id == board_id)
-            .values(position=column_order["position"])
+            .values(position=column_order["position"], rank=rank)
         )
+    await bump_board_versions(db, changes=[
+        (board.id, "column", uuid.UUID(str(column_order["id"])), "upsert") for column_order in order_data.column_orders
+    ])
     
     await db.commit()
     
@@ -443,13 +414,7 @@ async def get_column_cards(
         raise ResourceNotFoundError("Column not found")
 
     # Check organization membership
-    org_member_result = await db.execute(
-        select(OrganizationMember).where(
-            OrganizationMember.organization_id == column.board.project.organization_id,
-            OrganizationMember.user_id == current_user.id
-        )
-    )
-    if not org_member_result.scalar_one_or_none():
+    if not await get_membership(current_user.id, column.board.project.organization_id, db):
         raise InsufficientPermissionsError("Access denied")
 
     # Get cards
@@ -457,7 +422,7 @@ async def get_column_cards(
         select(Card)
         .options(selectinload(Card.assignments).selectinload(CardAssignment.user))
         .where(Card.column_id == column_id)
-        .order_by(Card.position)
+        .order_by(Card.rank)
     )
     cards = result.scalars().all()
 
@@ -10,13 +10,13 @@ from sqlalchemy.orm import selectinload
 
 from app.core.database import get_db
 from app.core.deps import get_current_active_user
+from app.database.dashboard_stats import completion_rate, dashboard_stats_query, fetch_dashboard_stats
 from app.models.user import User
-from app.models.organization import Organization, OrganizationMember
+from app.models.organization import OrganizationMember
 from app.models.project import Project
 from app.models.board import Board
 from app.models.column import Column
 from app.models.card import Card, CardAssignment
-from app.models.organization_settings import MeetingSchedule
 from app.services.organization_service import OrganizationService
 from app.middleware.role_based_access import get_accessible_projects
 
@@ -97,27 +97,10 @@ async def get_owner_dashboard(
         raise HTTPException(status_code=403, detail="Owner access required")
     
     # Get comprehensive statistics
-    stats_result = await db.execute(
-        select(
-            func.count(Project.id.distinct()).label('total_projects'),
-            func.count(OrganizationMember.id.distinct()).label('total_members'),
-            func.count(Card.id.distinct()).label('total_tasks'),
-            func.count(Card.id.distinct()).filter(Card.status == 'completed').label('completed_tasks'),
-            func.count(Card.id.distinct()).filter(Card.status.in_(['todo', 'in_progress'])).label('pending_tasks'),
-            func.count(MeetingSchedule.id.distinct()).label('total_meetings')
-        )
-        .select_from(Organization)
-        .outerjoin(Project, Project.organization_id == Organization.id)
-        .outerjoin(OrganizationMember, OrganizationMember.organization_id == Organization.id)
-        .outerjoin(Board, Board.project_id == Project.id)
-        .outerjoin(Column, Column.board_id == Board.id)
-        .outerjoin(Card, Card.column_id == Column.id)
-        .outerjoin(MeetingSchedule, MeetingSchedule.organization_id == Organization.id)
-        .where(Organization.id == organization_id)
-        .group_by(Organization.id)
-    )
-    
-    stats = stats_result.first()
+    stats = await fetch_dashboard_stats(db, dashboard_stats_query(
+        Project.organization_id == organization_id,
+        organization_ids=[organization_id],
+    ))
     
     # Get recent projects
     recent_projects_result = await db.execute(
@@ -144,13 +127,13 @@ async def get_owner_dashboard(
         'role': 'owner',
         'organization_id': organization_id,
         'stats': {
-            'total_projects': stats.total_projects if stats else 0,
-            'total_members': stats.total_members if stats else 0,
-            'total_tasks': stats.total_tasks if stats else 0,
-            'completed_tasks': stats.completed_tasks if stats else 0,
-            'pending_tasks': stats.pending_tasks if stats else 0,
-            'total_meetings': stats.total_meetings if stats else 0,
-            'completion_rate': round((stats.completed_tasks / stats.total_tasks * 100) if stats and stats.total_tasks > 0 else 0, 2)
+            'total_projects': stats['projects'],
+            'total_members': stats['members'],
+            'total_tasks': stats['tasks'],
+            'completed_tasks': stats['completed_tasks'],
+            'pending_tasks': stats['pending_tasks'],
+            'total_meetings': stats['meetings'],
+            'completion_rate': completion_rate(stats)
         },
         'recent_projects': [
             {
@@ -202,42 +185,19 @@ async def get_admin_dashboard(
     if not role:
         raise HTTPException(status_code=403, detail="Admin access required")
     
-    # Get accessible projects
-    accessible_project_ids = await get_accessible_projects(organization_id, current_user, db)
-    
-    # Get project statistics
-    if accessible_project_ids:
-        stats_result = await db.execute(
-            select(
-                func.count(Project.id.distinct()).label('accessible_projects'),
-                func.count(Card.id.distinct()).label('total_tasks'),
-                func.count(Card.id.distinct()).filter(Card.status == 'completed').label('completed_tasks'),
-                func.count(Card.id.distinct()).filter(Card.status.in_(['todo', 'in_progress'])).label('pending_tasks'),
-                func.count(Card.id.distinct()).filter(CardAssignment.user_id == current_user.id).label('my_tasks')
-            )
-            .select_from(Project)
-            .outerjoin(Board, Board.project_id == Project.id)
-            .outerjoin(Card, Card.board_id == Board.id)
-            .outerjoin(CardAssignment, CardAssignment.card_id == Card.id)
-            .where(Project.id.in_(accessible_project_ids))
-        )
-        
-        stats = stats_result.first()
-    else:
-        stats = None
-
-    # Get organization member count
-    member_count_result = await db.execute(
-        select(func.count(OrganizationMember.id))
-        .where(OrganizationMember.organization_id == organization_id)
-    )
-    total_members = member_count_result.scalar() or 0
+    # Admins and owners can access every project of the organization
+    stats = await fetch_dashboard_stats(db, dashboard_stats_query(
+        Project.organization_id == organization_id,
+        user_id=current_user.id,
+        organization_ids=[organization_id],
+    ))
 
     # Get recent tasks assigned to admin
     recent_tasks_result = await db.execute(
         select(Card)
         .join(CardAssignment, CardAssignment.card_id == Card.id)
-        .join(Board, Board.id == Card.board_id)
+        .join(Column, Column.id == Card.column_id)
+        .join(Board, Board.id == Column.board_id)
         .join(Project, Project.id == Board.project_id)
         .where(
             and_(
@@ -254,13 +214,13 @@ async def get_admin_dashboard(
         'role': role,
         'organization_id': organization_id,
         'stats': {
-            'total_projects': stats.accessible_projects if stats else 0,
-            'total_members': total_members,
-            'total_tasks': stats.total_tasks if stats else 0,
-            'completed_tasks': stats.completed_tasks if stats else 0,
-            'pending_tasks': stats.pending_tasks if stats else 0,
-            'my_tasks': stats.my_tasks if stats else 0,
-            'completion_rate': round((stats.completed_tasks / stats.total_tasks * 100) if stats and stats.total_tasks > 0 else 0, 2)
+            'total_projects': stats['projects'],
+            'total_members': stats['members'],
+            'total_tasks': stats['tasks'],
+            'completed_tasks': stats['completed_tasks'],
+            'pending_tasks': stats['pending_tasks'],
+            'my_tasks': stats['my_tasks'],
+            'completion_rate': completion_rate(stats)
         },
         'recent_tasks': [
             {
@@ -312,32 +272,18 @@ async def get_member_dashboard(
         raise HTTPException(status_code=403, detail="Organization member access required")
     
     # Get member's assigned tasks
-    tasks_result = await db.execute(
-        select(
-            func.count(Card.id.distinct()).label('total_tasks'),
-            func.count(Card.id.distinct()).filter(Card.status == 'completed').label('completed_tasks'),
-            func.count(Card.id.distinct()).filter(Card.status == 'in_progress').label('in_progress_tasks'),
-            func.count(Card.id.distinct()).filter(Card.status == 'todo').label('todo_tasks')
-        )
-        .select_from(Card)
-        .join(CardAssignment, CardAssignment.card_id == Card.id)
-        .join(Board, Board.id == Card.board_id)
-        .join(Project, Project.id == Board.project_id)
-        .where(
-            and_(
-                CardAssignment.user_id == current_user.id,
-                Project.organization_id == organization_id
-            )
-        )
-    )
-    
-    stats = tasks_result.first()
+    stats = await fetch_dashboard_stats(db, dashboard_stats_query(
+        Project.organization_id == organization_id,
+        user_id=current_user.id,
+        assigned_only=True,
+    ))
     
     # Get recent assigned tasks
     recent_tasks_result = await db.execute(
         select(Card)
         .join(CardAssignment, CardAssignment.card_id == Card.id)
-        .join(Board, Board.id == Card.board_id)
+        .join(Column, Column.id == Card.column_id)
+        .join(Board, Board.id == Column.board_id)
         .join(Project, Project.id == Board.project_id)
         .where(
             and_(
@@ -354,7 +300,8 @@ async def get_member_dashboard(
     accessible_projects_result = await db.execute(
         select(Project)
         .join(Board, Board.project_id == Project.id)
-        .join(Card, Card.board_id == Board.id)
+        .join(Column, Column.board_id == Board.id)
+        .join(Card, Card.column_id == Column.id)
         .join(CardAssignment, CardAssignment.card_id == Card.id)
         .where(
             and_(
@@ -370,11 +317,11 @@ async def get_member_dashboard(
         'role': role,
         'organization_id': organization_id,
         'stats': {
-            'total_tasks': stats.total_tasks if stats else 0,
-            'completed_tasks': stats.completed_tasks if stats else 0,
-            'in_progress_tasks': stats.in_progress_tasks if stats else 0,
-            'todo_tasks': stats.todo_tasks if stats else 0,
-            'completion_rate': round((stats.completed_tasks / stats.total_tasks * 100) if stats and stats.total_tasks > 0 else 0, 2)
+            'total_tasks': stats['tasks'],
+            'completed_tasks': stats['completed_tasks'],
+            'in_progress_tasks': stats['in_progress_tasks'],
+            'todo_tasks': stats['todo_tasks'],
+            'completion_rate': completion_rate(stats)
         },
         'recent_tasks': [
             {
@@ -429,31 +376,16 @@ async def get_dashboard_stats(
     accessible_project_ids = await get_accessible_projects(organization_id, current_user, db)
     
     # Get statistics based on accessible projects
-    if accessible_project_ids:
-        stats_result = await db.execute(
-            select(
-                func.count(Project.id.distinct()).label('projects'),
-                func.count(Card.id.distinct()).label('tasks'),
-                func.count(Card.id.distinct()).filter(Card.status == 'completed').label('completed'),
-                func.count(Card.id.distinct()).filter(Card.status.in_(['todo', 'in_progress'])).label('pending'),
-                func.count(Card.id.distinct()).filter(CardAssignment.user_id == current_user.id).label('my_tasks')
-            )
-            .select_from(Project)
-            .outerjoin(Board, Board.project_id == Project.id)
-            .outerjoin(Card, Card.board_id == Board.id)
-            .outerjoin(CardAssignment, CardAssignment.card_id == Card.id)
-            .where(Project.id.in_(accessible_project_ids))
-        )
-        
-        stats = stats_result.first()
-    else:
-        stats = None
+    stats = await fetch_dashboard_stats(db, dashboard_stats_query(
+        Project.id.in_(accessible_project_ids),
+        user_id=current_user.id,
+    ))
     
     return {
         'role': role,
-        'projects': stats.projects if stats else 0,
-        'tasks': stats.tasks if stats else 0,
-        'completed': stats.completed if stats else 0,
-        'my_tasks': stats.my_tasks if stats else 0,
-        'completion_rate': round((stats.completed / stats.tasks * 100) if stats and stats.tasks > 0 else 0, 2)
+        'projects': stats['projects'],
+        'tasks': stats['tasks'],
+        'completed': stats['completed_tasks'],
+        'my_tasks': stats['my_tasks'],
+        'completion_rate': completion_rate(stats)
     }
@@ -3,20 +3,27 @@ Comprehensive Kanban Board API Endpoints
 Handles all board, column, and card operations
 """
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, BackgroundTasks
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 from sqlalchemy import select
 from pydantic import BaseModel
 from datetime import datetime
 
-from app.core.database import get_db
-from app.core.deps import get_current_active_user
+from app.config import settings
+from app.core.board_versions import board_etag, etag_matches, not_modified, set_etag
+from app.core.database import get_db, get_db_readonly
+from app.core.db_routing import read_your_writes_pending
+from app.core.deps import get_current_active_principal, get_current_active_user
 from app.core.exceptions import ResourceNotFoundError, InsufficientPermissionsError
+from app.core.memberships import get_membership
+from app.core.principal import Principal
 from app.models.user import User
 from app.models.board import Board
+from app.models.project import Project
 from app.models.column import Column as ColumnModel
 from app.services.kanban_service import KanbanService
+from app.database import fast_queries
 
 router = APIRouter()
 
@@ -82,22 +89,64 @@ class CardResponse(BaseModel):
 @router.get("/projects/{project_id}/board", response_model=BoardResponse)
 async def get_or_create_project_board(
     project_id: str,
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    request: Request,
+    response: Response,
+    current_user: Principal = Depends(get_current_active_principal),
+    db: AsyncSession = Depends(get_db),
+    read_db: AsyncSession = Depends(get_db_readonly)
 ):
-    """Get or create a Kanban board for a project"""
+    """Get or create a Kanban board for a project
+
+    Existing boards carry a strong ETag; a matching If-None-Match is
+    answered with 304 without reading columns or cards.
+    """
     try:
-        kanban_service = KanbanService(db)
-        board = await kanban_service.get_or_create_project_board(
-            project_id=project_id,
-            user_id=str(current_user.id)
-        )
-        
-        # Get board with columns
-        board_data = await kanban_service.get_board_with_columns(
-            board_id=str(board.id),
-            user_id=str(current_user.id)
-        )
+        # Existing boards are read from a replica; only creation needs the primary
+        board_row = (await read_db.execute(
+            select(Board.id, Board.version, Project.organization_id)
+            .join(Project, Project.id == Board.project_id)
+            .where(Board.project_id == project_id)
+        )).first()
+
+        if board_row is None:
+            kanban_service = KanbanService(db)
+            board = await kanban_service.get_or_create_project_board(
+                project_id=project_id,
+                user_id=str(current_user.id)
+            )
+            board_data = await kanban_service.get_board_with_columns(
+                board_id=str(board.id),
+                user_id=str(current_user.id)
+            )
+        else:
+            board_id, version, organization_id = board_row
+            if not await get_membership(current_user.id, organization_id, read_db):
+                raise InsufficientPermissionsError("Access denied")
+            etag = board_etag(board_id, version)
+            if etag_matches(request.headers.get("if-none-match"), etag):
+                return not_modified(etag)
+            set_etag(response, etag)
+
+            if settings.board_snapshot_mode == "json":
+                snapshot = await KanbanService(read_db).get_board_snapshot_json(board_id, current_user.id)
+                if snapshot is not None:
+                    snapshot_response = Response(content=snapshot, media_type="application/json")
+                    set_etag(snapshot_response, etag)
+                    return snapshot_response
+
+            board_data = None
+            if fast_queries.fast_path_allowed():
+                try:
+                    board_data = await fast_queries.board_snapshot(
+                        board_id, current_user.id, replica=not read_your_writes_pending(request)
+                    )
+                except fast_queries.FastPathUnavailable:
+                    pass
+            if board_data is None:
+                board_data = await KanbanService(read_db).get_board_with_columns(
+                    board_id=str(board_id),
+                    user_id=str(current_user.id)
+                )
         
         # Return the board data directly to match BoardResponse schema
         return board_data
@@ -162,7 +211,7 @@ async def create_column(
 @router.get("/columns/{column_id}/cards")
 async def get_column_cards(
     column_id: str,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Get all cards in a column"""
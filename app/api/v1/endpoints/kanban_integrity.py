@@ -10,6 +10,7 @@ from pydantic import BaseModel, Field
 
 from app.core.database import get_db
 from app.core.deps import get_current_active_user
+from app.core.ordering import rank_at
 from app.models.user import User
 from app.models.board import Board
 from app.models.column import Column
@@ -77,22 +78,6 @@ class ColumnResponse(BaseModel):
     class Config:
         from_attributes = True
 
-# Utility functions for position management
-async def reorder_positions(db: AsyncSession, model_class, parent_field: str, parent_id: str):
-    """Ensure positions are contiguous starting from 1"""
-    stmt = select(model_class).where(
-        getattr(model_class, parent_field) == parent_id
-    ).order_by(model_class.position)
-    
-    result = await db.execute(stmt)
-    items = result.scalars().all()
-    
-    for i, item in enumerate(items, 1):
-        if item.position != i:
-            item.position = i
-    
-    await db.commit()
-
 # Board/Column endpoints
 @router.get("/boards/{board_id}/columns", response_model=List[ColumnResponse])
 async def get_board_columns(
@@ -101,7 +86,7 @@ async def get_board_columns(
     current_user: User = Depends(get_current_active_user)
 ):
     """Get all columns for a board"""
-    stmt = select(Column).where(Column.board_id == board_id).order_by(Column.position)
+    stmt = select(Column).where(Column.board_id == board_id).order_by(Column.rank)
     result = await db.execute(stmt)
     columns = result.scalars().all()
     return columns
@@ -122,20 +107,18 @@ async def create_column(
     if not board:
         raise HTTPException(status_code=404, detail="Board not found")
     
-    # Create column
+    # Create column; its ordering key places it at the (1-based) position without renumbering siblings
     column = Column(
         board_id=board_id,
         name=column_data.name,
-        position=column_data.position
+        position=column_data.position,
+        rank=await rank_at(db, Column, board.id, column_data.position - 1)
     )
     
     db.add(column)
     await db.commit()
     await db.refresh(column)
     
-    # Reorder positions to ensure no gaps
-    await reorder_positions(db, Column, "board_id", board_id)
-    
     return column
 
 # Card endpoints with integrity guarantees
@@ -163,6 +146,7 @@ async def create_card_with_checklist(
             title=card_data.title,
             description=card_data.description,
             position=card_data.position,
+            rank=await rank_at(db, Card, column.id, card_data.position - 1),
             assignee_id=card_data.assignee_id,
             due_date=card_data.due_date,
             created_by=current_user.id,
@@ -194,9 +178,6 @@ async def create_card_with_checklist(
         for item in checklist_items:
             await db.refresh(item)
         
-        # Reorder positions
-        await reorder_positions(db, Card, "column_id", column_id)
-        
         # Return card with checklist items
         card_response = CardResponse.from_orm(card)
         card_response.checklist_items = [ChecklistItemResponse.from_orm(item) for item in checklist_items]
@@ -214,7 +195,7 @@ async def move_card(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    """Move card to different column/position - TRANSACTIONAL REORDERING"""
+    """Move card to different column/position"""
     
     try:
         # Get card
@@ -225,19 +206,13 @@ async def move_card(
         if not card:
             raise HTTPException(status_code=404, detail="Card not found")
         
-        old_column_id = card.column_id
-        
-        # Update card position and column
+        # Update card column and ordering key; only the moved card is written
+        card.rank = await rank_at(db, Card, move_data.column_id, move_data.position - 1, exclude_id=card.id)
         card.column_id = move_data.column_id
         card.position = move_data.position
         
         await db.commit()
         
-        # Reorder positions in both old and new columns
-        if old_column_id != move_data.column_id:
-            await reorder_positions(db, Card, "column_id", old_column_id)
-        await reorder_positions(db, Card, "column_id", move_data.column_id)
-        
         await db.refresh(card)
         return card
         
@@ -2,13 +2,16 @@
 Notifications API endpoints
 """
 from typing import List, Optional, Dict, Any
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, and_, or_
 from sqlalchemy.orm import selectinload
 
 from app.core.database import get_db
-from app.core.deps import get_current_active_user
+from app.database import fast_queries
+from app.core.deps import get_current_active_principal, get_current_active_user
+from app.core.pagination import decode_cursor, keyset, set_next_cursor, trim_page
+from app.core.principal import Principal
 from app.models.user import User
 from app.models.notification import Notification, NotificationPreference
 from app.models.ai_automation import SmartNotification
@@ -17,7 +20,7 @@ from app.schemas.notification import (
     NotificationPreferenceCreate, NotificationPreferenceUpdate, NotificationPreferenceResponse
 )
 from app.services.enhanced_notification_service import EnhancedNotificationService
-from app.services.in_app_notification_service import InAppNotificationService
+from app.services.in_app_notification_service import InAppNotificationService, NOTIFICATION_PAGE_KEY
 from app.services.organization_service import OrganizationService
 
 router = APIRouter()
@@ -25,14 +28,17 @@ router = APIRouter()
 
 @router.get("/", response_model=List[NotificationResponse])
 async def get_notifications(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page; replaces skip"),
     unread_only: bool = Query(False),
     notification_type: Optional[str] = Query(None),
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Get notifications for current user"""
+    after = decode_cursor(cursor, NOTIFICATION_PAGE_KEY) if cursor else None
     try:
         # Build query
         query = select(Notification).where(Notification.user_id == current_user.id)
@@ -43,11 +49,16 @@ async def get_notifications(
         if notification_type:
             query = query.where(Notification.type == notification_type)
         
-        # Order by created_at desc and apply pagination
-        query = query.order_by(Notification.created_at.desc()).offset(skip).limit(limit)
+        # Newest first; a cursor continues after the previous page, else skip
+        query = keyset(query, NOTIFICATION_PAGE_KEY, after, descending=True).limit(limit + 1)
+        if after is None:
+            query = query.offset(skip)
         
         result = await db.execute(query)
-        notifications = result.scalars().all()
+        notifications, next_cursor = trim_page(
+            result.scalars().all(), limit, lambda notification: (notification.created_at, notification.id)
+        )
+        set_next_cursor(response, next_cursor)
         
         return notifications
         
@@ -115,7 +126,7 @@ async def create_notification(
 @router.put("/{notification_id}/read", response_model=NotificationResponse)
 async def mark_notification_read(
     notification_id: str,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Mark a notification as read"""
@@ -158,7 +169,7 @@ async def mark_notification_read(
 
 @router.put("/mark-all-read")
 async def mark_all_notifications_read(
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Mark all notifications as read for current user"""
@@ -190,7 +201,7 @@ async def mark_all_notifications_read(
 @router.delete("/{notification_id}")
 async def delete_notification(
     notification_id: str,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Delete a notification"""
@@ -229,11 +240,22 @@ async def delete_notification(
 
 @router.get("/stats")
 async def get_notification_stats(
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Get notification statistics for current user"""
     try:
+        if fast_queries.fast_path_allowed():
+            try:
+                counts = await fast_queries.notification_counts(current_user.id)
+                return {
+                    "total_notifications": counts["total"],
+                    "unread_notifications": counts["unread"],
+                    "read_notifications": counts["total"] - counts["unread"]
+                }
+            except fast_queries.FastPathUnavailable:
+                pass
+
         # Get total and unread counts
         total_result = await db.execute(
             select(func.count(Notification.id)).where(Notification.user_id == current_user.id)
@@ -270,7 +292,7 @@ async def get_enhanced_notifications(
     organization_id: Optional[str] = Query(None),
     unread_only: bool = Query(False),
     limit: int = Query(50, ge=1, le=100),
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Get enhanced notifications with organization context"""
@@ -294,7 +316,7 @@ async def get_enhanced_notifications(
 @router.post("/enhanced/{notification_id}/read")
 async def mark_enhanced_notification_read(
     notification_id: str,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Mark enhanced notification as read"""
@@ -313,7 +335,7 @@ async def mark_enhanced_notification_read(
 @router.get("/enhanced/stats/{organization_id}")
 async def get_enhanced_notification_stats(
     organization_id: str,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Get enhanced notification statistics"""
@@ -735,7 +757,7 @@ async def send_organization_wide_notification(
 @router.put("/in-app/{notification_id}/read")
 async def mark_notification_as_read(
     notification_id: str,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Mark a notification as read"""
@@ -759,7 +781,7 @@ async def mark_notification_as_read(
 @router.put("/in-app/mark-all-read")
 async def mark_all_notifications_as_read(
     organization_id: Optional[str] = None,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Mark all notifications as read for current user"""
@@ -782,21 +804,23 @@ async def get_user_notifications(
     category: Optional[str] = Query(None),
     limit: int = Query(50, ge=1, le=100),
     offset: int = Query(0, ge=0),
-    current_user: User = Depends(get_current_active_user),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page; replaces offset"),
+    current_user: Principal = Depends(get_current_active_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Get notifications for current user with filtering"""
 
     service = InAppNotificationService(db)
 
-    notifications = await service.get_user_notifications(
+    notifications, next_cursor = trim_page(await service.get_user_notifications(
         user_id=str(current_user.id),
         organization_id=organization_id,
         unread_only=unread_only,
         category=category,
-        limit=limit,
-        offset=offset
-    )
+        limit=limit + 1,
+        offset=offset,
+        after=decode_cursor(cursor, NOTIFICATION_PAGE_KEY) if cursor else None
+    ), limit, lambda notification: (notification.created_at, notification.id))
 
     # Convert to response format
     notification_data = []
@@ -818,14 +842,15 @@ async def get_user_notifications(
     return {
         "success": True,
         "notifications": notification_data,
-        "count": len(notification_data)
+        "count": len(notification_data),
+        "next_cursor": next_cursor
     }
 
 
 @router.get("/in-app/unread-count")
 async def get_unread_count(
     organization_id: Optional[str] = Query(None),
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Get count of unread notifications for current user"""
@@ -843,7 +868,7 @@ async def get_unread_count(
 @router.delete("/in-app/{notification_id}")
 async def delete_notification(
     notification_id: str,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Delete a notification"""
@@ -902,7 +927,7 @@ async def batch_create_notifications(
 @router.put("/in-app/batch-mark-read")
 async def batch_mark_notifications_as_read(
     notification_ids: List[str],
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Mark multiple notifications as read"""
@@ -917,7 +942,7 @@ async def batch_mark_notifications_as_read(
 @router.get("/in-app/statistics")
 async def get_notification_statistics(
     organization_id: Optional[str] = Query(None),
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Get notification statistics"""
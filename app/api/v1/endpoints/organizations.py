@@ -2,15 +2,17 @@
 Organization management endpoints
 """
 from typing import List, Optional
-from fastapi import APIRouter, Depends, UploadFile, File, Query, HTTPException, Request
+from fastapi import APIRouter, Depends, UploadFile, File, Query, HTTPException, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, delete, and_
 from sqlalchemy.orm import selectinload
 
 from app.core.database import get_db
 from app.core.deps import get_current_active_user, require_admin, require_member, require_admin_by_path, require_member_by_path
+from app.core.memberships import Membership
 from app.core.exceptions import ValidationError, ResourceNotFoundError, InsufficientPermissionsError
 from app.core.cache import cache_response
+from app.core.pagination import decode_cursor, keyset, set_next_cursor, trim_page
 from app.models.user import User
 from app.models.organization import Organization, OrganizationMember
 from app.models.organization_settings import OrganizationSettings
@@ -172,7 +174,7 @@ async def update_organization(
     organization_id: str,
     org_data: OrganizationUpdate,
     current_user: User = Depends(get_current_active_user),
-    org_member: OrganizationMember = Depends(require_admin_by_path),
+    org_member: Membership = Depends(require_admin_by_path),
     db: AsyncSession = Depends(get_db)
 ):
     """Update organization"""
@@ -275,7 +277,7 @@ async def upload_logo(
     organization_id: str,
     file: UploadFile = File(...),
     current_user: User = Depends(get_current_active_user),
-    org_member: OrganizationMember = Depends(require_admin_by_path),
+    org_member: Membership = Depends(require_admin_by_path),
     db: AsyncSession = Depends(get_db)
 ):
     """Upload organization logo"""
@@ -314,7 +316,7 @@ async def upload_logo(
 async def delete_logo(
     organization_id: str,
     current_user: User = Depends(get_current_active_user),
-    org_member: OrganizationMember = Depends(require_admin_by_path),
+    org_member: Membership = Depends(require_admin_by_path),
     db: AsyncSession = Depends(get_db)
 ):
     """Delete organization logo"""
@@ -340,24 +342,31 @@ async def delete_logo(
 @router.get("/{organization_id}/members", response_model=List[OrganizationMemberResponse])
 async def get_members(
     organization_id: str,
+    response: Response,
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page; replaces page"),
     current_user: User = Depends(get_current_active_user),
-    org_member: OrganizationMember = Depends(require_member_by_path),
+    org_member: Membership = Depends(require_member_by_path),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get organization members"""
-    offset = (page - 1) * limit
+    """Get organization members, in joining order"""
+    page_key = (OrganizationMember.joined_at, OrganizationMember.id)
+    after = decode_cursor(cursor, page_key) if cursor else None
 
-    result = await db.execute(
+    query = keyset(
         select(OrganizationMember)
         .options(selectinload(OrganizationMember.user))
-        .where(OrganizationMember.organization_id == organization_id)
-        .offset(offset)
-        .limit(limit)
-        .order_by(OrganizationMember.joined_at)
-    )
-    members = result.scalars().all()
+        .where(OrganizationMember.organization_id == organization_id),
+        page_key,
+        after,
+    ).limit(limit + 1)
+    if after is None:
+        query = query.offset((page - 1) * limit)
+
+    result = await db.execute(query)
+    members, next_cursor = trim_page(result.scalars().all(), limit, lambda member: (member.joined_at, member.id))
+    set_next_cursor(response, next_cursor)
 
     # Format response with user details
     response = []
@@ -385,7 +394,7 @@ async def invite_member(
     organization_id: str,
     invite_data: MemberInvite,
     current_user: User = Depends(get_current_active_user),
-    org_member: OrganizationMember = Depends(require_admin_by_path),
+    org_member: Membership = Depends(require_admin_by_path),
     db: AsyncSession = Depends(get_db)
 ):
     """Invite member to organization"""
@@ -434,7 +443,7 @@ async def remove_member(
     organization_id: str,
     user_id: str,
     current_user: User = Depends(get_current_active_user),
-    org_member: OrganizationMember = Depends(require_admin_by_path),
+    org_member: Membership = Depends(require_admin_by_path),
     db: AsyncSession = Depends(get_db)
 ):
     """Remove member from organization"""
@@ -465,7 +474,7 @@ async def update_member_role(
     user_id: str,
     role_data: MemberRoleUpdate,
     current_user: User = Depends(get_current_active_user),
-    org_member: OrganizationMember = Depends(require_admin_by_path),
+    org_member: Membership = Depends(require_admin_by_path),
     db: AsyncSession = Depends(get_db)
 ):
     """Update member role"""
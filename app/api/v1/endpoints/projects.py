@@ -9,7 +9,10 @@ from sqlalchemy.orm import selectinload
 
 from app.core.database import get_db
 from app.core.deps import get_current_active_user, get_organization_member, get_organization_member_by_path, require_member, require_member_by_path, require_organization_role
+from app.core.memberships import Membership, get_membership
+from app.core.project_stats import PRIORITY_COUNTERS, get_project_counters
 from app.core.exceptions import ValidationError, ResourceNotFoundError, InsufficientPermissionsError
+from app.database.dashboard_stats import overdue_cards_count
 from app.core.permissions import can_create_projects, get_user_role_in_organization
 from app.models.user import User
 from app.models.organization import OrganizationMember
@@ -29,20 +32,14 @@ router = APIRouter()
 
 async def check_organization_member(db: AsyncSession, organization_id: str, user_id: str):
     """Helper function to check if user is member of organization"""
-    result = await db.execute(
-        select(OrganizationMember).where(
-            OrganizationMember.organization_id == organization_id,
-            OrganizationMember.user_id == user_id
-        )
-    )
-    return result.scalar_one_or_none()
+    return await get_membership(user_id, organization_id, db)
 
 
 async def require_organization_member_query(
     organization_id: str = Query(...),
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
-) -> OrganizationMember:
+) -> Membership:
     """Dependency to require organization membership using query parameter"""
     org_member = await check_organization_member(db, organization_id, current_user.id)
     if not org_member:
@@ -457,13 +454,7 @@ async def get_project(
         raise ResourceNotFoundError("Project not found")
     
     # Check if user has access to this project's organization
-    org_member_result = await db.execute(
-        select(OrganizationMember).where(
-            OrganizationMember.organization_id == project.organization_id,
-            OrganizationMember.user_id == current_user.id
-        )
-    )
-    if not org_member_result.scalar_one_or_none():
+    if not await get_membership(current_user.id, project.organization_id, db):
         raise InsufficientPermissionsError("Access denied")
     
     return ProjectResponse.from_orm(project)
@@ -485,13 +476,7 @@ async def update_project(
         raise ResourceNotFoundError("Project not found")
     
     # Check if user has access to this project's organization
-    org_member_result = await db.execute(
-        select(OrganizationMember).where(
-            OrganizationMember.organization_id == project.organization_id,
-            OrganizationMember.user_id == current_user.id
-        )
-    )
-    org_member = org_member_result.scalar_one_or_none()
+    org_member = await get_membership(current_user.id, project.organization_id, db)
     if not org_member:
         raise InsufficientPermissionsError("Access denied")
     
@@ -534,13 +519,7 @@ async def delete_project(
         raise ResourceNotFoundError("Project not found")
     
     # Check if user has access to this project's organization
-    org_member_result = await db.execute(
-        select(OrganizationMember).where(
-            OrganizationMember.organization_id == project.organization_id,
-            OrganizationMember.user_id == current_user.id
-        )
-    )
-    org_member = org_member_result.scalar_one_or_none()
+    org_member = await get_membership(current_user.id, project.organization_id, db)
     if not org_member:
         raise InsufficientPermissionsError("Access denied")
     
@@ -566,17 +545,7 @@ async def debug_user_permissions(
     from app.services.enhanced_role_permissions import EnhancedRolePermissions
 
     # Get user's role in organization
-    result = await db.execute(
-        select(OrganizationMember.role)
-        .where(
-            and_(
-                OrganizationMember.organization_id == organization_id,
-                OrganizationMember.user_id == current_user.id
-            )
-        )
-    )
-
-    user_role = result.scalar_one_or_none()
+    user_role = await get_user_role_in_organization(current_user.id, organization_id, db)
 
     # Get organization settings
     settings_result = await db.execute(
@@ -770,19 +739,10 @@ async def get_project_stats(
     creator_has_assignments = creator_assigned_result.scalar_one_or_none() is not None
     total_members = assigned_members_count + (0 if creator_has_assignments else 1)
 
-    # Count tasks by status
-    task_counts_result = await db.execute(
-        select(Card.status, Card.id)
-        .join(Column, Column.id == Card.column_id)
-        .join(Board, Board.id == Column.board_id)
-        .where(Board.project_id == project_id)
-    )
-
-    task_counts = {"todo": 0, "in_progress": 0, "completed": 0, "total": 0}
-    for status, card_id in task_counts_result.all():
-        task_counts["total"] += 1
-        if status in task_counts:
-            task_counts[status] += 1
+    # Task counts from the maintained per-project counters; overdue is counted live
+    counters = await get_project_counters(db, project.id)
+    overdue_tasks = (await db.execute(select(overdue_cards_count([project.id])))).scalar_one()
+    task_counts = {name: counters[name] for name in ("todo", "in_progress", "completed", "total")}
 
     # Calculate pending tasks (todo + in_progress)
     pending_tasks = task_counts["todo"] + task_counts["in_progress"]
@@ -792,6 +752,10 @@ async def get_project_stats(
         "member_count": total_members,
         "task_counts": task_counts,
         "pending_tasks": pending_tasks,
+        "overdue_tasks": overdue_tasks,
+        "priority_counts": {
+            priority: counters[name] for priority, name in PRIORITY_COUNTERS.items()
+        },
         "completion_rate": round(
             (task_counts["completed"] / task_counts["total"] * 100)
             if task_counts["total"] > 0 else 0, 2
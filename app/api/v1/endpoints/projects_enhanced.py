@@ -11,6 +11,8 @@ from sqlalchemy.orm import selectinload
 from app.core.database import get_db
 from app.core.deps import get_current_active_user
 from app.core.exceptions import ValidationError, ResourceNotFoundError, InsufficientPermissionsError
+from app.core.project_stats import get_project_counters
+from app.database.dashboard_stats import overdue_cards_count
 from app.models.user import User
 from app.models.organization import OrganizationMember
 from app.models.project import Project
@@ -335,41 +337,20 @@ async def get_project_stats(
         )
     
     # Get statistics
-    stats_result = await db.execute(
-        select(
-            func.count(Card.id).label('total_cards'),
-            func.count(Card.id).filter(Card.status == 'completed').label('completed_cards'),
-            func.count(Card.id).filter(Card.status == 'in_progress').label('in_progress_cards'),
-            func.count(Card.id).filter(Card.status == 'todo').label('todo_cards'),
-            func.count(Board.id).label('total_boards')
-        )
-        .select_from(Project)
-        .outerjoin(Board, Board.project_id == Project.id)
-        .outerjoin(Card, Card.board_id == Board.id)
-        .where(Project.id == project_id)
-        .group_by(Project.id)
+    counters = await get_project_counters(db, project.id)
+    overdue_cards = (await db.execute(select(overdue_cards_count([project.id])))).scalar_one()
+    boards_result = await db.execute(
+        select(func.count(Board.id)).where(Board.project_id == project.id)
     )
-    
-    stats = stats_result.first()
-    
-    if not stats:
-        return {
-            'total_cards': 0,
-            'completed_cards': 0,
-            'in_progress_cards': 0,
-            'todo_cards': 0,
-            'total_boards': 0,
-            'completion_rate': 0.0
-        }
-    
-    completion_rate = (stats.completed_cards / stats.total_cards * 100) if stats.total_cards > 0 else 0.0
-    
+    completion_rate = (counters['completed'] / counters['total'] * 100) if counters['total'] > 0 else 0.0
+
     return {
-        'total_cards': stats.total_cards or 0,
-        'completed_cards': stats.completed_cards or 0,
-        'in_progress_cards': stats.in_progress_cards or 0,
-        'todo_cards': stats.todo_cards or 0,
-        'total_boards': stats.total_boards or 0,
+        'total_cards': counters['total'],
+        'completed_cards': counters['completed'],
+        'in_progress_cards': counters['in_progress'],
+        'todo_cards': counters['todo'],
+        'overdue_cards': overdue_cards,
+        'total_boards': boards_result.scalar() or 0,
         'completion_rate': round(completion_rate, 2)
     }
 
@@ -145,7 +145,7 @@ async def assign_task_to_members(
         column_result = await db.execute(
             select(Column)
             .where(Column.board_id == board_id)
-            .order_by(Column.position)
+            .order_by(Column.rank)
             .limit(1)
         )
         existing_column = column_result.scalar_one_or_none()
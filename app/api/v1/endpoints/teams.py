@@ -10,6 +10,7 @@ from pydantic import BaseModel
 
 from app.core.database import get_db
 from app.core.deps import get_current_active_user, require_admin, require_member, require_member_by_path, require_admin_by_path
+from app.core.memberships import Membership
 from app.core.exceptions import ResourceNotFoundError, InsufficientPermissionsError, ValidationError
 from app.models.user import User
 from app.models.organization import OrganizationMember
@@ -119,7 +120,7 @@ async def get_team_members(
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
     current_user: User = Depends(get_current_active_user),
-    org_member: OrganizationMember = Depends(require_member_by_path),
+    org_member: Membership = Depends(require_member_by_path),
     db: AsyncSession = Depends(get_db)
 ):
     """Get team members with search and filters"""
@@ -174,7 +175,7 @@ async def get_member_activity(
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
     current_user: User = Depends(get_current_active_user),
-    org_member: OrganizationMember = Depends(require_member_by_path),
+    org_member: Membership = Depends(require_member_by_path),
     db: AsyncSession = Depends(get_db)
 ):
     """Get activity for a team member"""
@@ -211,7 +212,7 @@ async def bulk_member_action(
     organization_id: str,
     bulk_request: BulkActionRequest,
     current_user: User = Depends(get_current_active_user),
-    org_member: OrganizationMember = Depends(require_admin_by_path),
+    org_member: Membership = Depends(require_admin_by_path),
     db: AsyncSession = Depends(get_db)
 ):
     """Perform bulk actions on team members"""
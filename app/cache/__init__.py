@@ -1 +1,23 @@
 # Cache package
+from app.cache.local_cache import LocalLRUCache
+from app.cache.invalidation import InvalidationBus, RedisInvalidationBus
+from app.cache.redis_cache import (
+    CacheManager,
+    build_call_key,
+    cache_manager,
+    cache_result,
+    close_cache,
+    init_cache,
+)
+
+__all__ = [
+    "CacheManager",
+    "InvalidationBus",
+    "LocalLRUCache",
+    "RedisInvalidationBus",
+    "build_call_key",
+    "cache_manager",
+    "cache_result",
+    "close_cache",
+    "init_cache",
+]
@@ -0,0 +1,217 @@
+"""
+Cross-worker cache invalidation bus
+
+Each uvicorn worker has its own L1 cache, so invalidating only the local
+process leaves other workers serving stale data until the TTL runs out. The
+bus broadcasts two kinds of messages to every worker:
+
+* ``{"scope": ..., "generation": N}`` - a namespace/tag generation bump;
+  entries stamped with an older generation are treated as misses.
+* ``{"delete": key}`` - drop a single key.
+
+The Redis implementation keeps the authoritative generation counters in a
+hash (so workers that start later or miss a message can catch up) and
+fans out messages over pub/sub. A sorted set records when each scope was
+last bumped: workers resync only the scopes bumped since their last sync,
+and counters idle for longer than ``generation_retention`` (which must
+exceed the longest cache TTL) are deleted. Generations follow the clock
+(see ``next_generation``), so a deleted counter bumped again still moves
+forward. The local implementation delivers messages in-process and is used
+when Redis is unavailable and in tests.
+"""
+import json
+import time
+import asyncio
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.cache.local_cache import next_generation
+
+logger = logging.getLogger(__name__)
+
+Message = Dict[str, Any]
+
+
+class InvalidationBus:
+    """In-process invalidation bus (single worker, tests)"""
+
+    def __init__(self, generation_retention: float = 86400):
+        self._subscribers: List[Callable[[Message], None]] = []
+        self._generations: Dict[str, int] = {}
+        self.generation_retention = generation_retention
+        self._bumped_at: Dict[str, float] = {}
+
+    def subscribe(self, callback: Callable[[Message], None]) -> None:
+        """Register a callback invoked for every message"""
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[Message], None]) -> None:
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def _dispatch(self, message: Message) -> None:
+        for callback in list(self._subscribers):
+            try:
+                callback(message)
+            except Exception as e:
+                logger.warning(f"Cache invalidation subscriber failed: {e}")
+
+    async def start(self) -> None:
+        """Replay the known generations to subscribers"""
+        for scope, generation in (await self.generations()).items():
+            self._dispatch({"scope": scope, "generation": generation})
+
+    async def stop(self) -> None:
+        pass
+
+    async def generations(self) -> Dict[str, int]:
+        """Snapshot of the authoritative generation counters"""
+        return dict(self._generations)
+
+    async def bump(self, scope: str) -> int:
+        """Advance ``scope`` and broadcast the new generation"""
+        now = time.time()
+        generation = next_generation(self._generations.get(scope, 0))
+        self._generations[scope] = generation
+        self._bumped_at[scope] = now
+        cutoff = now - self.generation_retention
+        for idle in [name for name, bumped_at in self._bumped_at.items() if bumped_at < cutoff]:
+            del self._bumped_at[idle]
+            del self._generations[idle]
+        self._dispatch({"scope": scope, "generation": generation})
+        return generation
+
+    async def publish_delete(self, key: str) -> None:
+        """Broadcast the removal of a single key"""
+        self._dispatch({"delete": key})
+
+
+# Both scripts read the clock of the Redis server, so every worker agrees on it
+_BUMP_SCRIPT = """
+local now = redis.call('TIME')
+local ms = tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000)
+local generation = math.max((tonumber(redis.call('HGET', KEYS[1], ARGV[1])) or 0) + 1, ms)
+redis.call('HSET', KEYS[1], ARGV[1], generation)
+redis.call('ZADD', KEYS[2], ms, ARGV[1])
+return generation
+"""
+
+_PRUNE_SCRIPT = """
+local now = redis.call('TIME')
+local cutoff = tonumber(now[1]) * 1000 - tonumber(ARGV[1])
+local idle = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', '(' .. cutoff, 'LIMIT', 0, 1000)
+if #idle > 0 then
+    redis.call('HDEL', KEYS[1], unpack(idle))
+    redis.call('ZREM', KEYS[2], unpack(idle))
+end
+return #idle
+"""
+
+
+class RedisInvalidationBus(InvalidationBus):
+    """Invalidation bus backed by a Redis hash and pub/sub channel"""
+
+    CHANNEL = "agno:cache:invalidate"
+    GENERATIONS_KEY = "agno:cache:generations"
+    BUMPED_AT_KEY = "agno:cache:generation_bumps"
+
+    def __init__(self, redis, resync_interval: float = 30.0, generation_retention: float = 86400):
+        super().__init__(generation_retention)
+        self.redis = redis
+        self.resync_interval = resync_interval
+        self._pubsub = None
+        self._task = None
+        self._bump_script = redis.register_script(_BUMP_SCRIPT)
+        self._prune_script = redis.register_script(_PRUNE_SCRIPT)
+        # Bump time (Redis clock, ms) up to which this worker has resynced
+        self._synced_to: Optional[float] = None
+
+    async def start(self) -> None:
+        self._pubsub = self.redis.pubsub()
+        await self._pubsub.subscribe(self.CHANNEL)
+        await self._resync()
+        self._task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._task = None
+        if self._pubsub is not None:
+            try:
+                await self._pubsub.unsubscribe(self.CHANNEL)
+                await self._pubsub.close()
+            except Exception:
+                pass
+            self._pubsub = None
+
+    async def _bumped_since(self, since: Optional[float]) -> Tuple[Dict[str, int], Optional[float]]:
+        """Generations of the scopes bumped at or after ``since`` (all when None) and the latest bump time"""
+        bumped = await self.redis.zrangebyscore(
+            self.BUMPED_AT_KEY, "-inf" if since is None else since, "+inf", withscores=True
+        )
+        if not bumped:
+            return {}, since
+        scopes = [scope.decode() if isinstance(scope, bytes) else scope for scope, _ in bumped]
+        values = await self.redis.hmget(self.GENERATIONS_KEY, scopes)
+        generations = {
+            scope: int(generation) for scope, generation in zip(scopes, values) if generation is not None
+        }
+        return generations, max(score for _, score in bumped)
+
+    async def _resync(self) -> None:
+        # Re-read the last second as well: bumps within one millisecond are not ordered
+        since = None if self._synced_to is None else self._synced_to - 1000
+        generations, self._synced_to = await self._bumped_since(since)
+        for scope, generation in generations.items():
+            self._dispatch({"scope": scope, "generation": generation})
+
+    async def generations(self) -> Dict[str, int]:
+        return (await self._bumped_since(None))[0]
+
+    async def bump(self, scope: str) -> int:
+        generation = int(await self._bump_script(
+            keys=[self.GENERATIONS_KEY, self.BUMPED_AT_KEY], args=[scope]
+        ))
+        message = {"scope": scope, "generation": generation}
+        # Apply locally right away; our own pub/sub echo is idempotent
+        self._dispatch(message)
+        await self.redis.publish(self.CHANNEL, json.dumps(message))
+        return generation
+
+    async def prune(self) -> int:
+        """Delete counters not bumped within ``generation_retention``; returns how many"""
+        return int(await self._prune_script(
+            keys=[self.GENERATIONS_KEY, self.BUMPED_AT_KEY], args=[int(self.generation_retention * 1000)]
+        ))
+
+    async def publish_delete(self, key: str) -> None:
+        message = {"delete": key}
+        self._dispatch(message)
+        await self.redis.publish(self.CHANNEL, json.dumps(message))
+
+    async def _listen(self) -> None:
+        """Apply broadcast messages; periodically catch up on missed bumps"""
+        last_sync = time.monotonic()
+        while True:
+            try:
+                message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                if message is not None:
+                    data = message.get("data")
+                    if isinstance(data, bytes):
+                        data = data.decode()
+                    self._dispatch(json.loads(data))
+
+                # Pub/sub is fire-and-forget: reconcile with the recent bumps now and then
+                if time.monotonic() - last_sync >= self.resync_interval:
+                    last_sync = time.monotonic()
+                    await self._resync()
+                    await self.prune()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Cache invalidation listener error: {e}")
+                await asyncio.sleep(1.0)
@@ -0,0 +1,334 @@
+"""
+Bounded in-process LRU cache (L1)
+
+Every worker keeps one of these in front of the shared Redis tier. The cache
+is bounded both by entry count and by an estimate of the stored bytes, so a
+worker's memory stays flat under sustained load instead of growing until
+entries happen to be read after their expiry.
+
+Keys follow the ``"<namespace>:<rest>"`` convention; the namespace is used for
+the per-namespace hit/miss/eviction counters.
+
+Invalidation is generation based: every entry is stamped with the current
+generation of its namespace and of each of its tags. Invalidating a tag or
+namespace just bumps its generation (O(1)); stale entries are discarded
+lazily when read, or fall out through normal LRU eviction. Generations follow
+the clock, so the counter of a scope that has not changed for longer than any
+entry can live is simply dropped: every entry stamped under it has expired,
+and the next bump still moves the scope forward.
+"""
+import sys
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+
+def namespace_of(key: str) -> str:
+    """Return the namespace part of a ``namespace:rest`` cache key"""
+    return key.split(":", 1)[0] if ":" in key else "default"
+
+
+def namespace_scope(namespace: str) -> str:
+    """Generation scope covering a whole namespace"""
+    return f"ns:{namespace}"
+
+
+def next_generation(current: int) -> int:
+    """Generation following ``current`` (millisecond clock, never lower than ``current + 1``)"""
+    return max(current + 1, int(time.time() * 1000))
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate the memory cost of a cached value in bytes
+
+    JSON-serializable values are measured by their encoded length, which is
+    also what they cost in Redis. Anything else (ORM objects, sets of custom
+    types) falls back to ``sys.getsizeof`` which under-counts but is still
+    bounded by the entry limit.
+    """
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.encode("utf-8", "ignore"))
+    try:
+        return len(json.dumps(value, separators=(",", ":")))
+    except (TypeError, ValueError):
+        return sys.getsizeof(value)
+
+
+@dataclass
+class CacheEntry:
+    """A single L1 entry"""
+    value: Any
+    expires_at: float
+    size: int
+    created_at: float
+    # Seconds the loader took to compute the value (used for early refresh)
+    delta: float = 0.0
+    # (scope, generation) pairs the entry was computed under
+    stamp: Tuple[Tuple[str, int], ...] = ()
+
+
+@dataclass
+class NamespaceStats:
+    """Counters kept per cache namespace"""
+    hits: int = 0
+    misses: int = 0
+    sets: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "sets": self.sets,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+            "hit_rate": round(self.hits / total * 100, 2) if total else 0.0,
+        }
+
+
+class LocalLRUCache:
+    """Size- and byte-bounded LRU cache with TTL and generation invalidation"""
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        max_bytes: int = 64 * 1024 * 1024,
+        default_ttl: int = 300,
+        generation_retention: float = 86400,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._default_ttl = default_ttl
+        self._cache: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self.generations: Dict[str, int] = {}
+        # When each scope last changed; idle scopes are dropped after generation_retention
+        self.generation_retention = generation_retention
+        self._changed_at: Dict[str, float] = {}
+        self._last_prune = time.time()
+        self._bytes = 0
+        self._stats: Dict[str, NamespaceStats] = {}
+        # Handlers run in the event loop thread, but background threads
+        # (thread pool executors) may touch the cache as well.
+        self._lock = threading.RLock()
+
+    # ------------------------------------------------------------------ helpers
+
+    def _ns_stats(self, key: str) -> NamespaceStats:
+        namespace = namespace_of(key)
+        stats = self._stats.get(namespace)
+        if stats is None:
+            stats = self._stats[namespace] = NamespaceStats()
+        return stats
+
+    def _generate_key(self, prefix: str, *args, **kwargs) -> str:
+        """Generate a namespaced cache key from arguments"""
+        key_data = f"{args}:{sorted(kwargs.items())}"
+        return f"{prefix}:{hashlib.md5(key_data.encode()).hexdigest()}"
+
+    def _remove(self, key: str) -> Optional[CacheEntry]:
+        entry = self._cache.pop(key, None)
+        if entry is None:
+            return None
+        self._bytes -= entry.size
+        return entry
+
+    def _is_current(self, entry: CacheEntry) -> bool:
+        generations = self.generations
+        for scope, generation in entry.stamp:
+            if generations.get(scope, 0) != generation:
+                return False
+        return True
+
+    def _advance(self, scope: str, generation: int) -> None:
+        now = time.time()
+        self.generations[scope] = generation
+        self._changed_at[scope] = now
+        if now - self._last_prune >= min(self.generation_retention, 60):
+            self.prune_generations(now)
+
+    def _evict_to_fit(self) -> None:
+        while self._cache and (len(self._cache) > self.max_entries or self._bytes > self.max_bytes):
+            key = next(iter(self._cache))
+            self._remove(key)
+            self._ns_stats(key).evictions += 1
+
+    # --------------------------------------------------------------- public API
+
+    def get_entry(self, key: str) -> Optional[CacheEntry]:
+        """Return the live entry for ``key`` (refreshing its LRU position)"""
+        with self._lock:
+            entry = self._cache.get(key)
+            stats = self._ns_stats(key)
+            if entry is None:
+                stats.misses += 1
+                return None
+            if time.time() >= entry.expires_at:
+                self._remove(key)
+                stats.expirations += 1
+                stats.misses += 1
+                return None
+            if not self._is_current(entry):
+                self._remove(key)
+                stats.invalidations += 1
+                stats.misses += 1
+                return None
+            self._cache.move_to_end(key)
+            stats.hits += 1
+            return entry
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get value from cache"""
+        entry = self.get_entry(key)
+        return entry.value if entry is not None else None
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[int] = None,
+        tags: Iterable[str] = (),
+        delta: float = 0.0,
+        size: Optional[int] = None,
+        stamp: Optional[Tuple[Tuple[str, int], ...]] = None,
+    ) -> bool:
+        """Set value in cache with TTL; returns False if the value can never fit
+
+        ``stamp`` should be captured with ``stamp_for`` *before* computing the
+        value, so a value loaded across an invalidation is never stored as
+        current. It defaults to the generations at the time of the call.
+        """
+        if ttl is None:
+            ttl = self._default_ttl
+        if size is None:
+            size = estimate_size(value)
+        if size > self.max_bytes:
+            return False
+
+        now = time.time()
+        entry = CacheEntry(
+            value=value,
+            expires_at=now + ttl,
+            size=size,
+            created_at=now,
+            delta=delta,
+            stamp=self.stamp_for(key, tags) if stamp is None else stamp,
+        )
+        with self._lock:
+            self._remove(key)
+            self._cache[key] = entry
+            self._bytes += size
+            self._ns_stats(key).sets += 1
+            self._evict_to_fit()
+        return True
+
+    def delete(self, key: str) -> bool:
+        """Delete key from cache"""
+        with self._lock:
+            return self._remove(key) is not None
+
+    def stamp_for(self, key: str, tags: Iterable[str] = ()) -> Tuple[Tuple[str, int], ...]:
+        """Current generations of the key's namespace and of ``tags``"""
+        generations = self.generations
+        scopes = (namespace_scope(namespace_of(key)),) + tuple(tags)
+        return tuple((scope, generations.get(scope, 0)) for scope in scopes)
+
+    def is_stamp_current(self, stamp: Iterable[Tuple[str, int]]) -> bool:
+        """Whether an externally stored stamp (e.g. from Redis) is still valid
+
+        A stamp newer than our table means we missed a broadcast; catch up.
+        """
+        current = True
+        for scope, generation in stamp:
+            known = self.generations.get(scope, 0)
+            if generation > known:
+                self._advance(scope, generation)
+            elif generation < known:
+                current = False
+        return current
+
+    def observe(self, scope: str, generation: int) -> None:
+        """Record a generation announced by another worker (never goes back)"""
+        if generation > self.generations.get(scope, 0):
+            self._advance(scope, generation)
+
+    def bump(self, scope: str) -> int:
+        """Advance a scope locally, invalidating every entry stamped with it"""
+        generation = next_generation(self.generations.get(scope, 0))
+        self._advance(scope, generation)
+        return generation
+
+    def prune_generations(self, now: Optional[float] = None) -> int:
+        """Forget scopes unchanged for ``generation_retention``; returns how many
+
+        The retention must exceed the longest TTL: entries stamped with the
+        dropped generation then read as stale, and entries stamped before the
+        scope's last change have already expired.
+        """
+        now = time.time() if now is None else now
+        cutoff = now - self.generation_retention
+        self._last_prune = now
+        idle = [scope for scope, changed_at in self._changed_at.items() if changed_at < cutoff]
+        for scope in idle:
+            del self._changed_at[scope]
+            self.generations.pop(scope, None)
+        return len(idle)
+
+    def invalidate_tags(self, *tags: str) -> None:
+        """Drop every entry carrying any of ``tags`` (this worker only)"""
+        for tag in tags:
+            self.bump(tag)
+
+    def invalidate_namespace(self, namespace: str) -> None:
+        """Drop every entry in ``namespace`` (this worker only)"""
+        self.bump(namespace_scope(namespace))
+
+    def clear(self) -> None:
+        """Clear all cache entries"""
+        with self._lock:
+            self._cache.clear()
+            self._bytes = 0
+
+    def cleanup_expired(self) -> int:
+        """Remove expired entries and return count removed"""
+        now = time.time()
+        with self._lock:
+            expired = [
+                key for key, entry in self._cache.items()
+                if now >= entry.expires_at or not self._is_current(entry)
+            ]
+            for key in expired:
+                self._remove(key)
+                self._ns_stats(key).expirations += 1
+        self.prune_generations(now)
+        return len(expired)
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._cache
+
+    @property
+    def current_bytes(self) -> int:
+        return self._bytes
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        with self._lock:
+            return {
+                "total_entries": len(self._cache),
+                "total_bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "namespaces": {ns: s.as_dict() for ns, s in self._stats.items()},
+            }
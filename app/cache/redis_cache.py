@@ -1,231 +1,542 @@
 """
-Redis Caching System for Agno WorkSphere
-Implements caching for frequently accessed data to improve API response times
+Two-tier caching system for Agno WorkSphere
+
+L1 is a bounded per-worker LRU (see ``local_cache``); L2 is a shared Redis
+instance. Redis is optional: when the client library is missing or the server
+is unreachable the manager keeps working with L1 only.
+
+Keys are namespaced (``"<namespace>:<rest>"``) and may carry tags, so related
+entries (everything about one user or organization) can be dropped together.
+Invalidation bumps a namespace/tag generation and is broadcast to every
+worker over the invalidation bus; entries are stamped with the generations
+they were computed under, and Redis keys embed their namespace generation.
+``get_or_set`` protects expensive loaders from stampedes with per-key
+single-flight and probabilistic early refresh (XFetch).
 """
 
 import json
-import pickle
+import math
+import time
+import uuid
+import random
 import asyncio
-from typing import Any, Optional, Union, Dict
-import logging
-from datetime import timedelta
 import hashlib
+import logging
+from datetime import date, datetime
+from decimal import Decimal
+from functools import wraps
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
 
-# For development, we'll use a simple in-memory cache
-# In production, this would use Redis
-class InMemoryCache:
-    """In-memory cache implementation for development"""
-    
-    def __init__(self):
-        self._cache: Dict[str, Dict[str, Any]] = {}
-        self._ttl: Dict[str, float] = {}
-        
-    async def get(self, key: str) -> Optional[Any]:
-        """Get value from cache"""
-        if key in self._cache:
-            # Check TTL
-            if key in self._ttl:
-                import time
-                if time.time() > self._ttl[key]:
-                    # Expired
-                    del self._cache[key]
-                    del self._ttl[key]
-                    return None
-            
-            return self._cache[key]['value']
-        return None
-    
-    async def set(self, key: str, value: Any, ttl: int = 300) -> bool:
-        """Set value in cache with TTL"""
-        import time
-        self._cache[key] = {'value': value}
-        if ttl > 0:
-            self._ttl[key] = time.time() + ttl
-        return True
-    
-    async def delete(self, key: str) -> bool:
-        """Delete key from cache"""
-        if key in self._cache:
-            del self._cache[key]
-            if key in self._ttl:
-                del self._ttl[key]
-            return True
-        return False
-    
-    async def clear(self) -> bool:
-        """Clear all cache"""
-        self._cache.clear()
-        self._ttl.clear()
-        return True
-    
-    def get_stats(self) -> Dict[str, Any]:
-        """Get cache statistics"""
-        import time
-        current_time = time.time()
-        active_keys = 0
-        expired_keys = 0
-        
-        for key in self._cache:
-            if key in self._ttl and current_time > self._ttl[key]:
-                expired_keys += 1
-            else:
-                active_keys += 1
-        
-        return {
-            "total_keys": len(self._cache),
-            "active_keys": active_keys,
-            "expired_keys": expired_keys,
-            "cache_type": "in_memory"
-        }
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # redis<4.2 ships no asyncio client
+    aioredis = None
+
+from app.config import settings
+from app.cache.local_cache import LocalLRUCache, namespace_scope
+from app.cache.invalidation import InvalidationBus, RedisInvalidationBus
 
 logger = logging.getLogger(__name__)
 
+REDIS_KEY_PREFIX = "agno"
+
+_MISSING = object()
+
+
+def _json_default(value: Any) -> Any:
+    """Encode the few non-JSON types our cached payloads commonly contain"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (uuid.UUID, Decimal)):
+        return str(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _key_part(value: Any) -> str:
+    """Stable representation of a call argument for key building"""
+    # ORM objects (current_user, ...) are identified by their primary key
+    identifier = getattr(value, "id", None)
+    if identifier is not None and not isinstance(value, (str, bytes, int, float, dict, list, tuple)):
+        return f"{type(value).__name__}:{identifier}"
+    return repr(value)
+
+
+def _skip_argument(value: Any) -> bool:
+    """Arguments that never influence the result (DB sessions, background tasks)"""
+    module = type(value).__module__ or ""
+    return module.startswith("sqlalchemy") or type(value).__name__ == "BackgroundTasks"
+
+
+def build_call_key(prefix: str, func: Callable, args: tuple, kwargs: dict, extra: Any = None) -> str:
+    """Build a namespaced cache key for a function call"""
+    parts = [func.__module__, func.__qualname__]
+    parts.extend(_key_part(arg) for arg in args if not _skip_argument(arg))
+    parts.extend(
+        f"{name}={_key_part(value)}"
+        for name, value in sorted(kwargs.items())
+        if not _skip_argument(value)
+    )
+    if extra is not None:
+        parts.append(json.dumps(extra, sort_keys=True, default=str))
+    digest = hashlib.md5("|".join(parts).encode()).hexdigest()
+    return f"{prefix}:{digest}"
+
+
 class CacheManager:
-    """Cache manager for frequently accessed data"""
-    
-    def __init__(self):
-        # Use in-memory cache for development
-        # In production, replace with Redis client
-        self.cache = InMemoryCache()
-        
+    """Bounded L1 + shared Redis L2 cache"""
+
+    def __init__(
+        self,
+        local: Optional[LocalLRUCache] = None,
+        early_refresh_beta: Optional[float] = None,
+        bus: Optional[InvalidationBus] = None,
+    ):
+        self.default_ttl = settings.cache_ttl
+        self.local = local or LocalLRUCache(
+            max_entries=settings.cache_l1_max_entries,
+            max_bytes=settings.cache_l1_max_bytes,
+            default_ttl=self.default_ttl,
+            generation_retention=settings.cache_generation_retention,
+        )
+        self.redis = None
+        self.beta = settings.cache_early_refresh_beta if early_refresh_beta is None else early_refresh_beta
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._background: set = set()
+        self.stats = {
+            "l2_hits": 0,
+            "l2_misses": 0,
+            "l2_stale": 0,
+            "l2_errors": 0,
+            "loads": 0,
+            "coalesced_loads": 0,
+            "early_refreshes": 0,
+            "invalidations_sent": 0,
+            "invalidations_received": 0,
+        }
+        self.bus = None
+        self._use_bus(bus or self._local_bus())
+
+    # ------------------------------------------------------------- lifecycle
+
+    @staticmethod
+    def _local_bus() -> InvalidationBus:
+        return InvalidationBus(generation_retention=settings.cache_generation_retention)
+
+    def _use_bus(self, bus: InvalidationBus) -> None:
+        if self.bus is not None:
+            self.bus.unsubscribe(self._on_invalidation)
+        self.bus = bus
+        bus.subscribe(self._on_invalidation)
+
+    def _on_invalidation(self, message: Dict[str, Any]) -> None:
+        """Apply a generation bump or key removal broadcast by any worker"""
+        if "scope" in message:
+            self.local.observe(message["scope"], int(message["generation"]))
+        elif "delete" in message:
+            self.local.delete(message["delete"])
+        else:
+            return
+        self.stats["invalidations_received"] += 1
+
     async def initialize(self):
-        """Initialize cache connection"""
-        logger.info("Cache manager initialized (in-memory)")
-        
+        """Connect the Redis tier and invalidation bus if available"""
+        if not settings.redis_cache_enabled:
+            logger.info("Cache manager initialized (L1 only, Redis tier disabled)")
+            return
+        if aioredis is None:
+            logger.warning("redis.asyncio unavailable, cache running with L1 only")
+            return
+        try:
+            client = aioredis.from_url(
+                settings.redis_url,
+                max_connections=settings.redis_max_connections,
+                socket_connect_timeout=2,
+                socket_timeout=5,
+                health_check_interval=30,
+            )
+            await client.ping()
+            bus = RedisInvalidationBus(client, generation_retention=settings.cache_generation_retention)
+            self._use_bus(bus)
+            await bus.start()
+            self.redis = client
+            logger.info("Cache manager initialized (L1 + Redis)")
+        except Exception as e:
+            logger.warning(f"Redis unavailable, cache running with L1 only: {e}")
+            self._use_bus(self._local_bus())
+            self.redis = None
+
     async def close(self):
         """Close cache connection"""
-        await self.cache.clear()
+        await self.bus.stop()
+        self.local.clear()
+        if self.redis is not None:
+            try:
+                await self.redis.close()
+            except Exception:
+                pass
+            self.redis = None
+            self._use_bus(self._local_bus())
         logger.info("Cache manager closed")
-    
-    def _generate_key(self, prefix: str, identifier: str) -> str:
-        """Generate cache key"""
-        return f"agno:{prefix}:{identifier}"
-    
+
+    # --------------------------------------------------------------- helpers
+
+    def _redis_key(self, key: str) -> str:
+        """Versioned Redis key: bumping a namespace orphans its old keys"""
+        namespace, _, rest = key.partition(":")
+        generation = self.local.generations.get(namespace_scope(namespace), 0)
+        return f"{REDIS_KEY_PREFIX}:{namespace}:v{generation}:{rest}"
+
+    def _redis_failed(self, operation: str, key: str, error: Exception) -> None:
+        self.stats["l2_errors"] += 1
+        logger.warning(f"Redis cache {operation} failed for {key}: {error}")
+
+    async def _l2_get(self, key: str) -> Optional[dict]:
+        if self.redis is None:
+            return None
+        try:
+            raw = await self.redis.get(self._redis_key(key))
+        except Exception as e:
+            self._redis_failed("get", key, e)
+            return None
+        if raw is None:
+            self.stats["l2_misses"] += 1
+            return None
+        try:
+            envelope = json.loads(raw)
+        except (TypeError, ValueError):
+            self.stats["l2_misses"] += 1
+            return None
+        if not self.local.is_stamp_current(tuple(pair) for pair in envelope.get("g", ())):
+            self.stats["l2_stale"] += 1
+            return None
+        self.stats["l2_hits"] += 1
+        return envelope
+
+    def _promote(self, key: str, envelope: dict) -> None:
+        """Copy a Redis hit into L1 for its remaining lifetime"""
+        remaining = envelope.get("x", 0) - time.time()
+        if remaining > 0:
+            self.local.set(
+                key,
+                envelope["v"],
+                ttl=remaining,
+                delta=envelope.get("d", 0.0),
+                stamp=tuple(tuple(pair) for pair in envelope.get("g", ())),
+            )
+
+    def _should_refresh_early(self, delta: float, expires_at: float) -> bool:
+        """XFetch: recompute before expiry with probability growing as it nears"""
+        if self.beta <= 0 or delta <= 0:
+            return False
+        return time.time() - delta * self.beta * math.log(random.random() or 1e-12) >= expires_at
+
+    # ------------------------------------------------------------- public API
+
+    async def get(self, key: str, default: Any = None, local_only: bool = False) -> Any:
+        """Get value from L1, falling back to Redis"""
+        entry = self.local.get_entry(key)
+        if entry is not None:
+            return entry.value
+        if local_only:
+            return default
+
+        envelope = await self._l2_get(key)
+        if envelope is None:
+            return default
+        self._promote(key, envelope)
+        return envelope["v"]
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[int] = None,
+        tags: Iterable[str] = (),
+        local_only: bool = False,
+        delta: float = 0.0,
+        stamp: Optional[Tuple[Tuple[str, int], ...]] = None,
+    ) -> bool:
+        """Store value in both tiers
+
+        ``local_only`` keeps the value in this worker (required for values
+        that cannot be serialized, e.g. ORM instances). Values that fail to
+        serialize are silently kept local as well.
+        """
+        ttl = self.default_ttl if ttl is None else ttl
+        if stamp is None:
+            stamp = self.local.stamp_for(key, tags)
+        payload = None
+        if not local_only and self.redis is not None:
+            try:
+                payload = json.dumps(
+                    {"v": value, "d": delta, "x": time.time() + ttl, "g": stamp},
+                    default=_json_default,
+                    separators=(",", ":"),
+                )
+            except (TypeError, ValueError):
+                payload = None
+
+        stored = self.local.set(key, value, ttl=ttl, delta=delta, stamp=stamp)
+        if payload is not None:
+            try:
+                await self.redis.set(self._redis_key(key), payload, ex=max(int(ttl), 1))
+                return True
+            except Exception as e:
+                self._redis_failed("set", key, e)
+        return stored
+
+    async def delete(self, key: str) -> bool:
+        """Delete key from both tiers and from every worker's L1"""
+        removed = self.local.delete(key)
+        if self.redis is not None:
+            try:
+                removed = bool(await self.redis.delete(self._redis_key(key))) or removed
+            except Exception as e:
+                self._redis_failed("delete", key, e)
+        try:
+            await self.bus.publish_delete(key)
+            self.stats["invalidations_sent"] += 1
+        except Exception as e:
+            self._redis_failed("delete broadcast", key, e)
+        return removed
+
+    async def _bump(self, scope: str) -> int:
+        try:
+            generation = await self.bus.bump(scope)
+        except Exception as e:
+            # Keep at least this worker consistent if the bus is down
+            self._redis_failed("invalidation broadcast", scope, e)
+            generation = self.local.bump(scope)
+        self.local.observe(scope, generation)
+        self.stats["invalidations_sent"] += 1
+        return generation
+
+    async def invalidate_tags(self, *tags: str) -> int:
+        """Invalidate every entry tagged with any of ``tags`` on all workers
+
+        O(1) per tag: only the tag generation changes, stale entries are
+        skipped on read. Returns the number of tags bumped.
+        """
+        for tag in tags:
+            await self._bump(tag)
+        return len(tags)
+
+    def invalidate_soon(self, keys: Iterable[str] = (), tags: Iterable[str] = ()) -> None:
+        """Invalidate from synchronous code such as ORM session events
+
+        This worker's L1 is updated immediately; Redis and the other workers
+        follow from a background task when an event loop is running.
+        """
+        keys, tags = tuple(keys), tuple(tags)
+        for key in keys:
+            self.local.delete(key)
+        self.local.invalidate_tags(*tags)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+
+        async def broadcast():
+            for key in keys:
+                await self.delete(key)
+            await self.invalidate_tags(*tags)
+
+        task = loop.create_task(broadcast())
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def invalidate_namespace(self, namespace: str) -> int:
+        """Invalidate every entry in ``namespace`` on all workers"""
+        return await self._bump(namespace_scope(namespace))
+
+    async def get_or_set(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[int] = None,
+        tags: Iterable[str] = (),
+        local_only: bool = False,
+    ) -> Any:
+        """Return the cached value for ``key`` or compute it with ``loader``
+
+        Concurrent misses for the same key share one loader call. Hits close
+        to expiry are recomputed early with a probability that grows as the
+        expiry approaches, weighted by how long the loader takes.
+        """
+        tags = tuple(tags)
+        value = _MISSING
+        refresh = False
+        entry = self.local.get_entry(key)
+        if entry is not None:
+            value = entry.value
+            refresh = self._should_refresh_early(entry.delta, entry.expires_at)
+        elif not local_only:
+            envelope = await self._l2_get(key)
+            if envelope is not None:
+                value = envelope["v"]
+                self._promote(key, envelope)
+                refresh = self._should_refresh_early(envelope.get("d", 0.0), envelope.get("x", 0))
+
+        if value is not _MISSING and not refresh:
+            return value
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            if value is not _MISSING:
+                # Someone is already refreshing; keep serving the current value
+                return value
+            self.stats["coalesced_loads"] += 1
+            return await asyncio.shield(inflight)
+
+        if value is not _MISSING:
+            self.stats["early_refreshes"] += 1
+
+        # Stamp before loading so an invalidation during the load wins
+        stamp = self.local.stamp_for(key, tags)
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            started = time.perf_counter()
+            result = await loader()
+            delta = time.perf_counter() - started
+            self.stats["loads"] += 1
+            if result is not None:
+                await self.set(key, result, ttl=ttl, local_only=local_only, delta=delta, stamp=stamp)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            # Nobody may be awaiting the future; avoid "exception never retrieved"
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        return {
+            "l1": self.local.stats(),
+            "l2": {
+                "enabled": self.redis is not None,
+                **self.stats,
+            },
+        }
+
+    async def health_check(self) -> Dict[str, Any]:
+        """Perform cache health check"""
+        if self.redis is None:
+            return {"status": "degraded", "reason": "redis_not_initialized", "stats": await self.get_stats()}
+        try:
+            start_time = time.time()
+            await self.redis.ping()
+            return {
+                "status": "healthy",
+                "response_time": f"{time.time() - start_time:.3f}s",
+                "stats": await self.get_stats(),
+            }
+        except Exception as e:
+            return {"status": "unhealthy", "reason": str(e)}
+
+    # ---------------------------------------------------- domain shortcuts
+
     async def get_user(self, user_id: str) -> Optional[Dict[str, Any]]:
         """Get user from cache"""
-        key = self._generate_key("user", user_id)
-        return await self.cache.get(key)
-    
+        return await self.get(f"user:{user_id}")
+
     async def set_user(self, user_id: str, user_data: Dict[str, Any], ttl: int = 300) -> bool:
         """Cache user data"""
-        key = self._generate_key("user", user_id)
-        return await self.cache.set(key, user_data, ttl)
-    
+        return await self.set(f"user:{user_id}", user_data, ttl, tags=(f"user:{user_id}",))
+
     async def get_organization(self, org_id: str) -> Optional[Dict[str, Any]]:
         """Get organization from cache"""
-        key = self._generate_key("org", org_id)
-        return await self.cache.get(key)
-    
+        return await self.get(f"org:{org_id}")
+
     async def set_organization(self, org_id: str, org_data: Dict[str, Any], ttl: int = 600) -> bool:
         """Cache organization data"""
-        key = self._generate_key("org", org_id)
-        return await self.cache.set(key, org_data, ttl)
-    
+        return await self.set(f"org:{org_id}", org_data, ttl, tags=(f"org:{org_id}",))
+
     async def get_user_organizations(self, user_id: str) -> Optional[list]:
         """Get user's organizations from cache"""
-        key = self._generate_key("user_orgs", user_id)
-        return await self.cache.get(key)
-    
+        return await self.get(f"user_orgs:{user_id}")
+
     async def set_user_organizations(self, user_id: str, orgs: list, ttl: int = 300) -> bool:
         """Cache user's organizations"""
-        key = self._generate_key("user_orgs", user_id)
-        return await self.cache.set(key, orgs, ttl)
-    
+        return await self.set(f"user_orgs:{user_id}", orgs, ttl, tags=(f"user:{user_id}",))
+
     async def get_organization_members(self, org_id: str) -> Optional[list]:
         """Get organization members from cache"""
-        key = self._generate_key("org_members", org_id)
-        return await self.cache.get(key)
-    
+        return await self.get(f"org_members:{org_id}")
+
     async def set_organization_members(self, org_id: str, members: list, ttl: int = 300) -> bool:
         """Cache organization members"""
-        key = self._generate_key("org_members", org_id)
-        return await self.cache.set(key, members, ttl)
-    
+        return await self.set(f"org_members:{org_id}", members, ttl, tags=(f"org:{org_id}",))
+
     async def get_projects(self, org_id: str) -> Optional[list]:
         """Get organization projects from cache"""
-        key = self._generate_key("projects", org_id)
-        return await self.cache.get(key)
-    
+        return await self.get(f"projects:{org_id}")
+
     async def set_projects(self, org_id: str, projects: list, ttl: int = 300) -> bool:
         """Cache organization projects"""
-        key = self._generate_key("projects", org_id)
-        return await self.cache.set(key, projects, ttl)
-    
+        return await self.set(f"projects:{org_id}", projects, ttl, tags=(f"org:{org_id}",))
+
     async def get_boards(self, project_id: str) -> Optional[list]:
         """Get project boards from cache"""
-        key = self._generate_key("boards", project_id)
-        return await self.cache.get(key)
-    
+        return await self.get(f"boards:{project_id}")
+
     async def set_boards(self, project_id: str, boards: list, ttl: int = 300) -> bool:
         """Cache project boards"""
-        key = self._generate_key("boards", project_id)
-        return await self.cache.set(key, boards, ttl)
-    
+        return await self.set(f"boards:{project_id}", boards, ttl, tags=(f"project:{project_id}",))
+
     async def get_dashboard_stats(self, user_id: str) -> Optional[Dict[str, Any]]:
         """Get dashboard statistics from cache"""
-        key = self._generate_key("dashboard", user_id)
-        return await self.cache.get(key)
-    
+        return await self.get(f"dashboard:{user_id}")
+
     async def set_dashboard_stats(self, user_id: str, stats: Dict[str, Any], ttl: int = 180) -> bool:
         """Cache dashboard statistics"""
-        key = self._generate_key("dashboard", user_id)
-        return await self.cache.set(key, stats, ttl)
-    
-    async def invalidate_user_cache(self, user_id: str):
+        return await self.set(f"dashboard:{user_id}", stats, ttl, tags=(f"user:{user_id}",))
+
+    async def invalidate_user_cache(self, user_id: str) -> int:
         """Invalidate all cache entries for a user"""
-        keys_to_delete = [
-            self._generate_key("user", user_id),
-            self._generate_key("user_orgs", user_id),
-            self._generate_key("dashboard", user_id)
-        ]
-        
-        for key in keys_to_delete:
-            await self.cache.delete(key)
-    
-    async def invalidate_organization_cache(self, org_id: str):
+        return await self.invalidate_tags(f"user:{user_id}")
+
+    async def invalidate_organization_cache(self, org_id: str) -> int:
         """Invalidate all cache entries for an organization"""
-        keys_to_delete = [
-            self._generate_key("org", org_id),
-            self._generate_key("org_members", org_id),
-            self._generate_key("projects", org_id)
-        ]
-        
-        for key in keys_to_delete:
-            await self.cache.delete(key)
-    
+        return await self.invalidate_tags(f"org:{org_id}")
+
+    async def invalidate_project_cache(self, project_id: str) -> int:
+        """Invalidate all cache entries for a project"""
+        return await self.invalidate_tags(f"project:{project_id}")
+
     async def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
-        return self.cache.get_stats()
+        return await self.get_stats()
+
 
 # Global cache manager instance
 cache_manager = CacheManager()
 
+
 async def init_cache():
     """Initialize cache manager"""
     await cache_manager.initialize()
 
+
 async def close_cache():
     """Close cache manager"""
     await cache_manager.close()
 
-# Decorator for caching function results
-def cache_result(prefix: str, ttl: int = 300):
-    """Decorator to cache function results"""
+
+def cache_result(prefix: str = "func", ttl: Optional[int] = None, tags: Iterable[str] = ()):
+    """Decorator to cache async function results in the shared cache"""
     def decorator(func):
+        @wraps(func)
         async def wrapper(*args, **kwargs):
-            # Generate cache key from function name and arguments
-            key_data = f"{func.__name__}:{str(args)}:{str(sorted(kwargs.items()))}"
-            cache_key = f"agno:{prefix}:{hashlib.md5(key_data.encode()).hexdigest()}"
-            
-            # Try to get from cache
-            cached_result = await cache_manager.cache.get(cache_key)
-            if cached_result is not None:
-                return cached_result
-            
-            # Execute function and cache result
-            result = await func(*args, **kwargs)
-            await cache_manager.cache.set(cache_key, result, ttl)
-            return result
-        
+            cache_key = build_call_key(prefix, func, args, kwargs)
+            return await cache_manager.get_or_set(
+                cache_key, lambda: func(*args, **kwargs), ttl=ttl, tags=tags
+            )
+
         return wrapper
     return decorator
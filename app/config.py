@@ -25,10 +25,55 @@ class Settings:
         self.db_pool_max_size = int(os.getenv("DB_POOL_MAX_SIZE", "20"))
         self.db_pool_max_queries = int(os.getenv("DB_POOL_MAX_QUERIES", "50000"))
         self.db_pool_max_inactive_time = int(os.getenv("DB_POOL_MAX_INACTIVE_TIME", "300"))
+        self.db_pool_timeout = int(os.getenv("DB_POOL_TIMEOUT", "30"))  # seconds to wait for a free connection
+        self.db_pool_recycle = int(os.getenv("DB_POOL_RECYCLE", "3600"))
+        self.db_pool_leak_threshold = int(os.getenv("DB_POOL_LEAK_THRESHOLD", "60"))  # seconds held before reported
+
+        # Per-request query tracking (count, DB time, N+1 detection)
+        self.db_query_tracking_enabled = os.getenv("DB_QUERY_TRACKING_ENABLED", "True").lower() == "true"
+        self.db_n_plus_one_threshold = int(os.getenv("DB_N_PLUS_ONE_THRESHOLD", "5"))  # same statement per request
+
+        # asyncpg fast path for hot read queries (falls back to the ORM when unavailable)
+        self.db_fast_path_enabled = os.getenv("DB_FAST_PATH_ENABLED", "True").lower() == "true"
+        self.db_fast_path_pool_size = int(os.getenv("DB_FAST_PATH_POOL_SIZE", "10"))
+
+        # Board snapshot: "json" builds the document in one SQL statement (PostgreSQL), "orm" loads models
+        self.board_snapshot_mode = os.getenv("BOARD_SNAPSHOT_MODE", "json").lower()
+        # Board change log for /boards/{id}/changes; older cursors get a full resync
+        self.board_change_retention_hours = int(os.getenv("BOARD_CHANGE_RETENTION_HOURS", "168"))
+        # Column/card ordering keys longer than this are respaced in the background
+        self.rank_rebalance_length = int(os.getenv("RANK_REBALANCE_LENGTH", "16"))
+        # Full recount of the project_stats card counters (repairs drift)
+        self.project_stats_reconcile_interval = float(os.getenv("PROJECT_STATS_RECONCILE_INTERVAL", "86400"))
+
+        # Organization metric snapshots: sampled every interval (seconds, divides an hour), rolled up to hours and days
+        self.metric_snapshot_interval = int(os.getenv("METRIC_SNAPSHOT_INTERVAL", "60"))
+        self.metric_minute_retention_hours = int(os.getenv("METRIC_MINUTE_RETENTION_HOURS", "48"))
+        self.metric_hour_retention_days = int(os.getenv("METRIC_HOUR_RETENTION_DAYS", "90"))
+        self.metric_day_retention_days = int(os.getenv("METRIC_DAY_RETENTION_DAYS", "730"))
+
+        # Read replicas (comma-separated URLs; weights in the same order)
+        replicas_str = os.getenv("DATABASE_REPLICA_URLS", "")
+        self.database_replica_urls = [url.strip() for url in replicas_str.split(',') if url.strip()]
+        weights_str = os.getenv("DATABASE_REPLICA_WEIGHTS", "")
+        self.database_replica_weights = [int(w) for w in weights_str.split(',') if w.strip()]
+        self.db_replica_strategy = os.getenv("DB_REPLICA_STRATEGY", "least_connections")  # least_connections, weighted
+        self.db_replica_retry_after = int(os.getenv("DB_REPLICA_RETRY_AFTER", "30"))  # seconds a failed replica is skipped
+        self.db_read_your_writes_window = int(os.getenv("DB_READ_YOUR_WRITES_WINDOW", "5"))  # seconds reads stick to primary
+
+        # Sessions
+        self.session_activity_flush_interval = float(os.getenv("SESSION_ACTIVITY_FLUSH_INTERVAL", "15"))
 
         # Redis Settings
         self.redis_max_connections = int(os.getenv("REDIS_MAX_CONNECTIONS", "20"))
         self.cache_ttl = int(os.getenv("CACHE_TTL", "300"))  # 5 minutes default
+        self.redis_cache_enabled = os.getenv("REDIS_CACHE_ENABLED", "True").lower() == "true"
+        self.cache_l1_max_entries = int(os.getenv("CACHE_L1_MAX_ENTRIES", "10000"))
+        self.cache_l1_max_bytes = int(os.getenv("CACHE_L1_MAX_BYTES", str(64 * 1024 * 1024)))  # 64MB per worker
+        self.cache_early_refresh_beta = float(os.getenv("CACHE_EARLY_REFRESH_BETA", "1.0"))
+        # Generation counters not bumped for this long are dropped (must exceed the longest cache TTL)
+        self.cache_generation_retention = int(os.getenv("CACHE_GENERATION_RETENTION", "86400"))
+        self.permission_cache_ttl = int(os.getenv("PERMISSION_CACHE_TTL", "300"))  # 0 disables decision caching
 
         # Authentication - require JWT_SECRET in production
         self.jwt_secret = os.getenv("JWT_SECRET")
@@ -55,6 +100,8 @@ class Settings:
 
         # Rate Limiting
         self.rate_limit_per_minute = int(os.getenv("RATE_LIMIT_PER_MINUTE", "100"))
+        self.rate_limit_backend = os.getenv("RATE_LIMIT_BACKEND", "auto")  # auto, redis, memory
+        self.rate_limit_sweep_interval = int(os.getenv("RATE_LIMIT_SWEEP_INTERVAL", "60"))
 
         # Email
         self.smtp_host = os.getenv("SMTP_HOST", "smtp.gmail.com")
@@ -94,6 +141,18 @@ class Settings:
         # Performance Settings
         self.enable_gzip = os.getenv("ENABLE_GZIP", "True").lower() == "true"
         self.gzip_minimum_size = int(os.getenv("GZIP_MINIMUM_SIZE", "1000"))
+        # Codec levels for response compression (capped by the middleware to stay cheap)
+        self.gzip_level = int(os.getenv("GZIP_LEVEL", "5"))
+        self.brotli_quality = int(os.getenv("BROTLI_QUALITY", "4"))
+        self.zstd_level = int(os.getenv("ZSTD_LEVEL", "3"))
+        # Compressible content types; entries ending in "/" match the whole type
+        compression_types_str = os.getenv(
+            "COMPRESSION_CONTENT_TYPES",
+            "application/json,text/,application/javascript,application/xml,image/svg+xml"
+        )
+        self.compression_content_types = [t.strip().lower() for t in compression_types_str.split(',') if t.strip()]
+        # Largest body of an ETagged response whose compressed form is cached for reuse (0 disables reuse)
+        self.compression_cache_max_body = int(os.getenv("COMPRESSION_CACHE_MAX_BODY", str(1024 * 1024)))
         self.request_timeout = int(os.getenv("REQUEST_TIMEOUT", "30"))
 
         # Health Check Settings
@@ -0,0 +1,212 @@
+"""
+Board versions and conditional board reads
+
+Every board has a ``version`` that only ever increases. Any ORM flush that
+adds, changes or deletes a card, column, card assignment or checklist item
+(or edits the board itself) bumps the owning board's version in the same
+transaction and writes one ``BoardChange`` row per entity at the new
+version, so ``cards.py``, ``columns.py``, ``kanban_integrity.py`` and
+``KanbanService`` need no per-endpoint bookkeeping. Bulk ``update()`` /
+``delete()`` statements are invisible to the ORM; code issuing them calls
+``bump_board_versions`` explicitly. The change log backs delta sync
+(``app.services.board_changes``).
+
+Board reads send a strong ``ETag`` derived from the version(s). A poll
+carrying a matching ``If-None-Match`` gets ``304 Not Modified`` after the
+version lookup and membership check, without reading the card tables.
+"""
+import hashlib
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import event, insert, inspect, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.responses import Response
+
+from app.models.board import Board
+from app.models.board_change import BoardChange
+from app.models.card import Card, CardAssignment, ChecklistItem
+from app.models.column import Column
+
+_boards = Board.__table__
+_columns = Column.__table__
+_cards = Card.__table__
+_changes = BoardChange.__table__
+
+# Board edits that change what board reads return
+_BOARD_ATTRIBUTES = ("name", "description", "project_id")
+
+CACHE_CONTROL = "private, no-cache"
+
+
+def _history_values(obj, attribute: str) -> Set[Any]:
+    """Current and previous values of ``attribute`` (e.g. both columns of a moved card)"""
+    state = inspect(obj)
+    history = state.attrs[attribute].history
+    # Read the loaded value only; expired attributes of deleted rows cannot be loaded
+    values = {*history.added, *history.unchanged, *history.deleted, state.dict.get(attribute)}
+    values.discard(None)
+    return values
+
+
+def _changed_entities(session) -> List[Tuple[str, Any, str, Any, str]]:
+    """(scope, scope id, entity type, entity id, operation) for every change in a flush
+
+    The scope locates the board: ``board`` ids directly, ``column`` and
+    ``card`` ids through the columns table.
+    """
+    changes = []
+    dirty, deleted = session.dirty, set(session.deleted)
+    for obj in (*session.new, *dirty, *deleted):
+        operation = "delete" if obj in deleted else "upsert"
+        if isinstance(obj, Card):
+            # Column ids rather than the card id: a deleted card's row is gone
+            current = inspect(obj).dict.get("column_id")
+            for column_id in _history_values(obj, "column_id"):
+                # The column a card moved out of sees it as deleted
+                moved_out = operation == "upsert" and column_id != current
+                changes.append(("column", column_id, "card", obj.id, "delete" if moved_out else operation))
+        elif isinstance(obj, Column):
+            for board_id in _history_values(obj, "board_id"):
+                changes.append(("board", board_id, "column", obj.id, operation))
+        elif isinstance(obj, CardAssignment):
+            for card_id in _history_values(obj, "card_id"):
+                changes.append(("card", card_id, "assignment", obj.id, operation))
+        elif isinstance(obj, ChecklistItem):
+            # Checklists are not part of board reads; report the card as changed
+            for card_id in _history_values(obj, "card_id"):
+                changes.append(("card", card_id, "card", card_id, "upsert"))
+        elif isinstance(obj, Board) and obj in dirty:
+            state = inspect(obj)
+            if any(state.attrs[name].history.has_changes() for name in _BOARD_ATTRIBUTES):
+                changes.append(("board", obj.id, "board", obj.id, "upsert"))
+    return changes
+
+
+def _resolve_boards(connection, changes) -> List[Tuple[Any, str, Any, str]]:
+    """Map scoped changes to (board id, entity type, entity id, operation)"""
+    column_ids = {scope_id for scope, scope_id, *_ in changes if scope == "column"}
+    card_ids = {scope_id for scope, scope_id, *_ in changes if scope == "card"}
+    boards = {("board", scope_id): scope_id for scope, scope_id, *_ in changes if scope == "board"}
+    if column_ids:
+        rows = connection.execute(
+            select(_columns.c.id, _columns.c.board_id).where(_columns.c.id.in_(column_ids))
+        )
+        boards.update({("column", column_id): board_id for column_id, board_id in rows})
+    if card_ids:
+        rows = connection.execute(
+            select(_cards.c.id, _columns.c.board_id)
+            .join(_columns, _columns.c.id == _cards.c.column_id)
+            .where(_cards.c.id.in_(card_ids))
+        )
+        boards.update({("card", card_id): board_id for card_id, board_id in rows})
+
+    resolved: Dict[Tuple[Any, str, Any], str] = {}
+    for scope, scope_id, entity_type, entity_id, operation in changes:
+        board_id = boards.get((scope, scope_id))
+        if board_id is None:
+            # Parent deleted in the same flush; its own change covers this one
+            continue
+        key = (board_id, entity_type, entity_id)
+        # An upsert wins over a delete on the same board (card moved between its columns)
+        if resolved.get(key) != "upsert":
+            resolved[key] = operation
+    return [(board_id, entity_type, entity_id, operation) for (board_id, entity_type, entity_id), operation in resolved.items()]
+
+
+def _record_changes(connection, changes: Sequence[Tuple[Any, str, Any, str]]) -> None:
+    """Bump the version of every board in ``changes`` and log the changes at it"""
+    board_ids = {board_id for board_id, *_ in changes}
+    if not board_ids:
+        return
+    versions = dict(connection.execute(
+        update(_boards)
+        .where(_boards.c.id.in_(board_ids))
+        .values(version=_boards.c.version + 1)
+        .returning(_boards.c.id, _boards.c.version)
+    ).all())
+    rows = [
+        {
+            "board_id": board_id,
+            "version": versions[board_id],
+            "entity_type": entity_type,
+            "entity_id": entity_id,
+            "operation": operation,
+        }
+        for board_id, entity_type, entity_id, operation in changes
+        if board_id in versions
+    ]
+    if rows:
+        connection.execute(insert(_changes), rows)
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_changed_boards(session, flush_context):
+    changes = _changed_entities(session)
+    if changes:
+        connection = session.connection()
+        _record_changes(connection, _resolve_boards(connection, changes))
+
+
+async def bump_board_versions(
+    db: AsyncSession,
+    board_ids: Iterable[Any] = (),
+    changes: Iterable[Tuple[Any, str, Any, str]] = (),
+) -> None:
+    """Record changes made by statements the ORM does not track (bulk update/delete)
+
+    ``changes`` are (board id, entity type, entity id, operation) tuples.
+    Boards in ``board_ids`` without a listed change are logged as a board
+    upsert, so clients still see a new version.
+    """
+    changes = list(changes)
+    changed_boards = {board_id for board_id, *_ in changes}
+    changes += [(board_id, "board", board_id, "upsert") for board_id in set(board_ids) - changed_boards]
+    if changes:
+        await db.run_sync(lambda session: _record_changes(session.connection(), changes))
+
+
+async def get_board_version(db: AsyncSession, board_id: Any) -> Optional[int]:
+    return (await db.execute(select(Board.version).where(Board.id == board_id))).scalar_one_or_none()
+
+
+def board_etag(board_id: Any, version: int) -> str:
+    """Strong ETag for one board's current contents"""
+    return f'"board-{board_id}-v{version}"'
+
+
+def project_cards_etag(
+    project_id: Any, board_versions: Sequence[Tuple[Any, int]], fields: Optional[Sequence[str]] = None,
+) -> str:
+    """Strong ETag over every board of a project
+
+    ``fields`` is the card field selection (``parse_fields``) the body was
+    rendered with; each selection is its own representation and gets its
+    own ETag, so a 304 never answers one view with another's body.
+    """
+    digest = hashlib.blake2b(digest_size=12)
+    for board_id, version in sorted(board_versions, key=lambda item: str(item[0])):
+        digest.update(f"{board_id}:{version};".encode())
+    digest.update(f"fields={','.join(fields) if fields is not None else '*'}".encode())
+    return f'"project-{project_id}-{digest.hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches ``etag``"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = {candidate.strip() for candidate in if_none_match.split(",")}
+    # If-None-Match uses weak comparison
+    candidates |= {candidate[2:] for candidate in candidates if candidate.startswith("W/")}
+    return etag in candidates
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+
+
+def set_etag(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
@@ -1,90 +1,24 @@
 """
-Simple in-memory caching for API responses
+Caching helpers for API responses
+
+Thin facade over the shared two-tier cache in ``app.cache``. ``cache`` is the
+bounded per-worker L1, kept for callers that need synchronous access.
 """
-import time
-import json
-import hashlib
-from typing import Any, Optional, Dict
 from functools import wraps
+
 from fastapi import Request
+from fastapi.encoders import jsonable_encoder
+
+from app.cache import build_call_key, cache_manager
+
+# Bounded in-process cache (L1 of the shared cache)
+cache = cache_manager.local
 
-class SimpleCache:
-    """Simple in-memory cache with TTL support"""
-    
-    def __init__(self):
-        self._cache: Dict[str, Dict[str, Any]] = {}
-        self._default_ttl = 300  # 5 minutes
-    
-    def _generate_key(self, prefix: str, *args, **kwargs) -> str:
-        """Generate cache key from arguments"""
-        key_data = f"{prefix}:{args}:{sorted(kwargs.items())}"
-        return hashlib.md5(key_data.encode()).hexdigest()
-    
-    def get(self, key: str) -> Optional[Any]:
-        """Get value from cache"""
-        if key in self._cache:
-            entry = self._cache[key]
-            if time.time() < entry['expires_at']:
-                return entry['value']
-            else:
-                # Expired, remove from cache
-                del self._cache[key]
-        return None
-    
-    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
-        """Set value in cache with TTL"""
-        if ttl is None:
-            ttl = self._default_ttl
-        
-        self._cache[key] = {
-            'value': value,
-            'expires_at': time.time() + ttl,
-            'created_at': time.time()
-        }
-    
-    def delete(self, key: str) -> None:
-        """Delete key from cache"""
-        if key in self._cache:
-            del self._cache[key]
-    
-    def clear(self) -> None:
-        """Clear all cache entries"""
-        self._cache.clear()
-    
-    def cleanup_expired(self) -> int:
-        """Remove expired entries and return count removed"""
-        current_time = time.time()
-        expired_keys = [
-            key for key, entry in self._cache.items()
-            if current_time >= entry['expires_at']
-        ]
-        
-        for key in expired_keys:
-            del self._cache[key]
-        
-        return len(expired_keys)
-    
-    def stats(self) -> Dict[str, Any]:
-        """Get cache statistics"""
-        current_time = time.time()
-        active_entries = sum(
-            1 for entry in self._cache.values()
-            if current_time < entry['expires_at']
-        )
-        
-        return {
-            'total_entries': len(self._cache),
-            'active_entries': active_entries,
-            'expired_entries': len(self._cache) - active_entries
-        }
-
-# Global cache instance
-cache = SimpleCache()
 
 def cached(ttl: int = 300, key_prefix: str = "default"):
     """
     Decorator for caching function results
-    
+
     Args:
         ttl: Time to live in seconds
         key_prefix: Prefix for cache key
@@ -92,27 +26,19 @@ def cached(ttl: int = 300, key_prefix: str = "default"):
     def decorator(func):
         @wraps(func)
         async def wrapper(*args, **kwargs):
-            # Generate cache key
-            cache_key = cache._generate_key(key_prefix, *args, **kwargs)
-            
-            # Try to get from cache
-            cached_result = cache.get(cache_key)
-            if cached_result is not None:
-                return cached_result
-            
-            # Execute function and cache result
-            result = await func(*args, **kwargs)
-            cache.set(cache_key, result, ttl)
-            
-            return result
-        
+            cache_key = build_call_key(key_prefix, func, args, kwargs)
+            return await cache_manager.get_or_set(cache_key, lambda: func(*args, **kwargs), ttl=ttl)
+
         return wrapper
     return decorator
 
+
 def cache_response(ttl: int = 300, key_prefix: str = "api"):
     """
     Decorator for caching API responses based on request parameters
-    
+
+    Responses are stored JSON-encoded so they can be shared across workers.
+
     Args:
         ttl: Time to live in seconds
         key_prefix: Prefix for cache key
@@ -122,57 +48,46 @@ def cache_response(ttl: int = 300, key_prefix: str = "api"):
         async def wrapper(*args, **kwargs):
             # Extract request if available
             request = None
-            for arg in args:
+            for arg in list(args) + list(kwargs.values()):
                 if isinstance(arg, Request):
                     request = arg
                     break
-            
-            # Generate cache key from function name and parameters
-            cache_key_data = {
-                'function': func.__name__,
-                'args': str(args),
-                'kwargs': {k: str(v) for k, v in kwargs.items() if k != 'db'},  # Exclude db session
-                'query_params': dict(request.query_params) if request else {}
-            }
-            
-            cache_key = cache._generate_key(key_prefix, json.dumps(cache_key_data, sort_keys=True))
-            
-            # Try to get from cache
-            cached_result = cache.get(cache_key)
-            if cached_result is not None:
-                return cached_result
-            
-            # Execute function and cache result
-            result = await func(*args, **kwargs)
-            
-            # Only cache successful responses (not exceptions)
-            if result is not None:
-                cache.set(cache_key, result, ttl)
-            
-            return result
-        
+
+            query_params = sorted(request.query_params.multi_items()) if request else []
+            cache_key = build_call_key(
+                key_prefix,
+                func,
+                tuple(arg for arg in args if not isinstance(arg, Request)),
+                {k: v for k, v in kwargs.items() if not isinstance(v, Request)},
+                extra=query_params,
+            )
+
+            async def load():
+                result = await func(*args, **kwargs)
+                # Only cache successful responses (not exceptions)
+                return jsonable_encoder(result) if result is not None else None
+
+            return await cache_manager.get_or_set(cache_key, load, ttl=ttl)
+
         return wrapper
     return decorator
 
-def invalidate_cache_pattern(pattern: str) -> int:
+
+async def invalidate_cache_pattern(pattern: str) -> int:
     """
-    Invalidate cache entries matching a pattern
-    
+    Invalidate cache entries in a namespace (the ``key_prefix`` used above)
+
+    The namespace generation is bumped and broadcast to every worker, so the
+    cost does not depend on the number of cached entries.
+
     Args:
-        pattern: Pattern to match against cache keys
-        
+        pattern: Namespace of the entries to drop
+
     Returns:
-        Number of entries invalidated
+        The new namespace generation
     """
-    keys_to_delete = [
-        key for key in cache._cache.keys()
-        if pattern in key
-    ]
-    
-    for key in keys_to_delete:
-        cache.delete(key)
-    
-    return len(keys_to_delete)
+    return await cache_manager.invalidate_namespace(pattern)
+
 
 # Cache cleanup task (should be run periodically)
 async def cleanup_cache():
@@ -3,27 +3,28 @@ Database configuration and session management
 """
 import asyncio
 from typing import AsyncGenerator
+from fastapi import Request
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy import MetaData, text
 
 from app.config import settings
+from app.core.db_pool import engine_options, instrument_engine
+from app.core.db_routing import Replica, ReplicaRouter, read_your_writes_pending
 
 
-# Database engine with minimal, safe configuration
-engine = create_async_engine(
-    settings.database_url,
+# Database engine; pool sizing comes from DB_POOL_* settings
+ENGINE_OPTIONS = dict(
     echo=False,  # Disable SQL logging for performance
-    pool_pre_ping=True,
-    pool_recycle=3600,  # 1 hour
-    pool_size=5,  # Conservative pool size
-    max_overflow=10,  # Conservative overflow
-    pool_timeout=30,
     # Minimal connect_args to avoid PostgreSQL parameter issues
-    connect_args={}
+    connect_args={},
+    **engine_options(),
 )
 
+engine = create_async_engine(settings.database_url, **ENGINE_OPTIONS)
+instrument_engine(engine, "primary")
+
 # Session factory
 async_session_factory = sessionmaker(
     engine,
@@ -31,6 +32,26 @@ async_session_factory = sessionmaker(
     expire_on_commit=False,
 )
 
+
+def _build_replicas():
+    replicas = []
+    for index, url in enumerate(settings.database_replica_urls):
+        replica_engine = create_async_engine(url, **ENGINE_OPTIONS)
+        name = replica_engine.url.host or f"replica-{index}"
+        instrument_engine(replica_engine, f"replica:{name}")
+        weights = settings.database_replica_weights
+        replicas.append(Replica(
+            name=name,
+            session_factory=sessionmaker(replica_engine, class_=AsyncSession, expire_on_commit=False),
+            weight=weights[index] if index < len(weights) else 1,
+            engine=replica_engine,
+        ))
+    return replicas
+
+
+# Routes read-only sessions to replicas, falling back to the primary
+replica_router = ReplicaRouter(async_session_factory, _build_replicas())
+
 # Base class for models
 Base = declarative_base(
     metadata=MetaData(
@@ -60,6 +81,16 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+async def get_db_readonly(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency to get a read-only session, served by a read replica when
+    one is configured and reachable. Never committed. Clients that wrote
+    within the read-your-writes window are served by the primary.
+    """
+    async with replica_router.session(use_primary=read_your_writes_pending(request)) as session:
+        yield session
+
+
 async def init_db():
     """
     Initialize database tables with robust error handling
@@ -95,3 +126,4 @@ async def close_db():
     Close database connections
     """
     await engine.dispose()
+    await replica_router.dispose()
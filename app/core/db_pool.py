@@ -0,0 +1,228 @@
+"""
+Connection pool sizing and instrumentation
+
+``engine_options()`` builds the SQLAlchemy pool arguments from settings
+(``DB_POOL_MIN_SIZE`` persistent connections, up to ``DB_POOL_MAX_SIZE``
+including overflow). ``instrument_engine()`` records, per pool:
+
+- checkout wait time (time spent in ``pool.connect()``, including waiting
+  for a free connection and opening new ones)
+- checkouts, checkout timeouts and checkouts served from overflow
+- connections held longer than ``DB_POOL_LEAK_THRESHOLD`` seconds, which
+  are logged once and counted as leaked
+- compiled statement cache hits and misses for every executed statement
+
+Everything is exported to Prometheus and summarised by ``pool_stats()`` for
+the performance monitor.
+"""
+import logging
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import event
+from sqlalchemy.engine.default import CacheStats
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+POOL_CHECKOUT_WAIT = Histogram(
+    'db_pool_checkout_wait_seconds', 'Time spent acquiring a pooled connection', ['pool'],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+POOL_CHECKOUTS = Counter('db_pool_checkouts_total', 'Pooled connection checkouts', ['pool'])
+POOL_OVERFLOW_CHECKOUTS = Counter(
+    'db_pool_overflow_checkouts_total', 'Checkouts made while the pool was using overflow connections', ['pool'],
+)
+POOL_TIMEOUTS = Counter('db_pool_checkout_timeouts_total', 'Checkouts that timed out waiting for a connection', ['pool'])
+POOL_LEAKED = Counter('db_pool_leaked_connections_total', 'Connections held longer than the leak threshold', ['pool'])
+STATEMENT_CACHE = Counter(
+    'db_statement_cache_total', 'Executed statements by compiled cache outcome', ['pool', 'outcome'],
+)
+POOL_CONNECTIONS = Gauge('db_pool_connections', 'Pooled connections by state', ['pool', 'state'])
+
+
+def engine_options() -> Dict[str, Any]:
+    """Pool arguments for create_async_engine, from settings"""
+    pool_size = max(settings.db_pool_min_size, 1)
+    return dict(
+        poolclass=InstrumentedAsyncPool,
+        pool_size=pool_size,
+        max_overflow=max(settings.db_pool_max_size - pool_size, 0),
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=True,
+    )
+
+
+class PoolMetrics:
+    """Checkout statistics for one pool"""
+
+    def __init__(self, name: str, leak_threshold: Optional[float] = None, scan_interval: float = 10.0):
+        self.name = name
+        self.leak_threshold = settings.db_pool_leak_threshold if leak_threshold is None else leak_threshold
+        self.scan_interval = scan_interval
+        self.pool: Optional[AsyncAdaptedQueuePool] = None
+        self.checkouts = 0
+        self.overflow_checkouts = 0
+        self.timeouts = 0
+        self.leaked = 0
+        self.wait_times = deque(maxlen=1000)
+        self.statement_cache = {"hit": 0, "miss": 0, "uncached": 0}
+        self._held: Dict[int, float] = {}
+        self._reported: set = set()
+        self._last_scan = time.monotonic()
+
+    # ------------------------------------------------------------ recording
+
+    def record_wait(self, seconds: float, overflow: bool) -> None:
+        self.checkouts += 1
+        self.wait_times.append(seconds)
+        POOL_CHECKOUTS.labels(pool=self.name).inc()
+        POOL_CHECKOUT_WAIT.labels(pool=self.name).observe(seconds)
+        if overflow:
+            self.overflow_checkouts += 1
+            POOL_OVERFLOW_CHECKOUTS.labels(pool=self.name).inc()
+
+    def record_timeout(self) -> None:
+        self.timeouts += 1
+        POOL_TIMEOUTS.labels(pool=self.name).inc()
+
+    def on_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        cache_hit = getattr(context, "cache_hit", None)
+        if cache_hit is CacheStats.CACHE_HIT:
+            outcome = "hit"
+        elif cache_hit is CacheStats.CACHE_MISS:
+            outcome = "miss"
+        else:
+            # text(), DDL and statements without a cache key
+            outcome = "uncached"
+        self.statement_cache[outcome] += 1
+        STATEMENT_CACHE.labels(pool=self.name, outcome=outcome).inc()
+
+    def on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        now = time.monotonic()
+        self._held[id(connection_record)] = now
+        if now - self._last_scan >= self.scan_interval:
+            self.find_leaks(now)
+
+    def on_checkin(self, dbapi_connection, connection_record) -> None:
+        key = id(connection_record)
+        self._held.pop(key, None)
+        self._reported.discard(key)
+
+    def find_leaks(self, now: Optional[float] = None) -> List[float]:
+        """Ages of connections held past the leak threshold; new ones are logged"""
+        now = time.monotonic() if now is None else now
+        self._last_scan = now
+        ages = []
+        for key, checked_out_at in list(self._held.items()):
+            age = now - checked_out_at
+            if age < self.leak_threshold:
+                continue
+            ages.append(age)
+            if key not in self._reported:
+                self._reported.add(key)
+                self.leaked += 1
+                POOL_LEAKED.labels(pool=self.name).inc()
+                logger.warning(f"Connection from pool '{self.name}' checked out for {age:.0f}s, possible leak")
+        return ages
+
+    # ------------------------------------------------------------ reporting
+
+    def connection_counts(self) -> Dict[str, int]:
+        pool = self.pool
+        if pool is None:
+            return {"checked_out": 0, "idle": 0, "overflow": 0}
+        return {
+            "checked_out": pool.checkedout(),
+            "idle": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        waits = sorted(self.wait_times)
+        counts = self.connection_counts()
+        size = self.pool.size() if self.pool else 0
+        max_overflow = max(self.pool._max_overflow, 0) if self.pool else 0
+        capacity = size + max_overflow
+        cached = self.statement_cache["hit"] + self.statement_cache["miss"]
+        return {
+            "pool": self.name,
+            "size": size,
+            "max_overflow": max_overflow,
+            **counts,
+            "utilization": (counts["checked_out"] / capacity * 100) if capacity else 0.0,
+            "checkouts": self.checkouts,
+            "overflow_checkouts": self.overflow_checkouts,
+            "timeouts": self.timeouts,
+            "leaked": self.leaked,
+            "long_held": len(self.find_leaks()),
+            "checkout_wait_avg_ms": (sum(waits) / len(waits) * 1000) if waits else 0.0,
+            "checkout_wait_p95_ms": waits[min(int(len(waits) * 0.95), len(waits) - 1)] * 1000 if waits else 0.0,
+            "checkout_wait_max_ms": waits[-1] * 1000 if waits else 0.0,
+            "statement_cache_hits": self.statement_cache["hit"],
+            "statement_cache_misses": self.statement_cache["miss"],
+            "statement_cache_hit_ratio": (self.statement_cache["hit"] / cached) if cached else 0.0,
+        }
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that times ``connect()`` for its PoolMetrics"""
+
+    metrics: Optional[PoolMetrics] = None
+
+    def connect(self):
+        metrics = self.metrics
+        if metrics is None:
+            return super().connect()
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            metrics.record_timeout()
+            raise
+        metrics.record_wait(time.perf_counter() - start, self.overflow() > 0)
+        return connection
+
+    def recreate(self):
+        # engine.dispose() replaces the pool; keep reporting into the same metrics
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        if self.metrics is not None:
+            self.metrics.pool = pool
+        return pool
+
+
+# Metrics of all instrumented pools by name
+pool_registry: Dict[str, PoolMetrics] = {}
+
+
+def instrument_engine(engine, name: str) -> PoolMetrics:
+    """Attach PoolMetrics and its pool and statement listeners to an engine"""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    metrics = PoolMetrics(name)
+    pool = sync_engine.pool
+    if isinstance(pool, InstrumentedAsyncPool):
+        pool.metrics = metrics
+    metrics.pool = pool
+    event.listen(sync_engine, "checkout", metrics.on_checkout)
+    event.listen(sync_engine, "checkin", metrics.on_checkin)
+    event.listen(sync_engine, "after_cursor_execute", metrics.on_cursor_execute)
+
+    for state in ("checked_out", "idle", "overflow"):
+        POOL_CONNECTIONS.labels(pool=name, state=state).set_function(
+            lambda state=state: metrics.connection_counts()[state]
+        )
+
+    pool_registry[name] = metrics
+    return metrics
+
+
+def pool_stats() -> Dict[str, Dict[str, Any]]:
+    """Snapshot of every instrumented pool"""
+    return {name: metrics.snapshot() for name, metrics in pool_registry.items()}
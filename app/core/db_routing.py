@@ -0,0 +1,226 @@
+"""
+Read replica routing
+
+``get_db_readonly`` sessions are served by a read replica chosen by least
+connections (or weighted random), falling back to the next replica and
+finally the primary when a replica cannot be reached. A replica that fails
+is skipped for ``db_replica_retry_after`` seconds.
+
+Read-your-writes: when a request writes through the primary, the response
+carries a short-lived ``db_rw_until`` cookie and ``X-DB-Read-After`` header.
+Reads that present either one before it expires go to the primary, so a
+client never reads a replica that has not caught up with its own commit.
+"""
+import asyncio
+import logging
+import random
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Callable, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+READ_AFTER_COOKIE = "db_rw_until"
+READ_AFTER_HEADER = "x-db-read-after"
+
+# Per-request write marker, installed by ReadYourWritesMiddleware
+_write_marker: ContextVar[Optional[Dict[str, bool]]] = ContextVar("db_write_marker", default=None)
+
+
+def mark_write() -> None:
+    """Note that the current request wrote to the primary"""
+    marker = _write_marker.get()
+    if marker is not None:
+        marker["wrote"] = True
+
+
+def session_has_writes(session) -> bool:
+    """True if the session flushed or executed writes in its transaction"""
+    session = getattr(session, "sync_session", session)
+    return bool(session.info.get("wrote") or session.new or session.dirty or session.deleted)
+
+
+@event.listens_for(Session, "after_flush")
+def _flush_wrote(session, flush_context):
+    if session.new or session.dirty or session.deleted:
+        session.info["wrote"] = True
+        mark_write()
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _statement_wrote(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
+        mark_write()
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _transaction_ended(session, transaction):
+    if transaction.parent is None:
+        session.info.pop("wrote", None)
+
+
+def read_your_writes_pending(conn: HTTPConnection, now: Optional[float] = None) -> bool:
+    """True if the client wrote recently enough that replicas may lag behind"""
+    value = conn.headers.get(READ_AFTER_HEADER) or conn.cookies.get(READ_AFTER_COOKIE)
+    if not value:
+        return False
+    try:
+        until = float(value)
+    except ValueError:
+        return False
+    now = time.time() if now is None else now
+    # Ignore values further out than the window so clients cannot pin the primary
+    return now < until <= now + settings.db_read_your_writes_window
+
+
+class ReadYourWritesMiddleware:
+    """Pure ASGI middleware that tags responses of writing requests"""
+
+    def __init__(self, app: ASGIApp, window: Optional[int] = None):
+        self.app = app
+        self.window = settings.db_read_your_writes_window if window is None else window
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self.window <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        marker = {"wrote": False}
+
+        async def send_with_marker(message: Message) -> None:
+            if message["type"] == "http.response.start" and marker["wrote"]:
+                until = f"{time.time() + self.window:.3f}".encode()
+                message["headers"] = [
+                    *message.get("headers", ()),
+                    (READ_AFTER_HEADER.encode(), until),
+                    (b"set-cookie", b"%s=%s; Max-Age=%d; Path=/; HttpOnly; SameSite=Lax"
+                        % (READ_AFTER_COOKIE.encode(), until, self.window)),
+                ]
+            await send(message)
+
+        token = _write_marker.set(marker)
+        try:
+            await self.app(scope, receive, send_with_marker)
+        finally:
+            _write_marker.reset(token)
+
+
+class Replica:
+    """One read replica and its routing state"""
+
+    def __init__(self, name: str, session_factory: Callable[[], AsyncSession], weight: int = 1, engine=None):
+        self.name = name
+        self.session_factory = session_factory
+        self.weight = max(int(weight), 1)
+        self.engine = engine
+        self.in_use = 0
+        self.down_until = 0.0
+
+    def is_available(self, now: float) -> bool:
+        return now >= self.down_until
+
+
+class ReplicaRouter:
+    """Chooses a replica for each read-only session"""
+
+    def __init__(
+        self,
+        primary_factory: Callable[[], AsyncSession],
+        replicas: Optional[List[Replica]] = None,
+        strategy: Optional[str] = None,
+        retry_after: Optional[int] = None,
+    ):
+        self.primary_factory = primary_factory
+        self.replicas = replicas or []
+        self.strategy = strategy or settings.db_replica_strategy
+        self.retry_after = settings.db_replica_retry_after if retry_after is None else retry_after
+        self.stats = {"replica_reads": 0, "primary_reads": 0, "sticky_reads": 0, "fallbacks": 0}
+
+    def candidates(self, now: Optional[float] = None) -> List[Replica]:
+        """Available replicas in the order they should be tried"""
+        now = time.monotonic() if now is None else now
+        up = [replica for replica in self.replicas if replica.is_available(now)]
+        if self.strategy == "weighted":
+            ordered = []
+            while up:
+                replica = random.choices(up, weights=[r.weight for r in up])[0]
+                ordered.append(replica)
+                up.remove(replica)
+            return ordered
+        return sorted(up, key=lambda replica: replica.in_use / replica.weight)
+
+    def mark_down(self, replica: Replica, error: Exception) -> None:
+        replica.down_until = time.monotonic() + self.retry_after
+        self.stats["fallbacks"] += 1
+        logger.warning(f"Read replica {replica.name} unavailable, skipping for {self.retry_after}s: {error}")
+
+    async def _open_replica(self) -> Optional[tuple]:
+        for replica in self.candidates():
+            session = replica.session_factory()
+            try:
+                # Check out a connection now so a dead replica fails here, not mid-query
+                await session.connection()
+            except (DBAPIError, OSError, asyncio.TimeoutError) as e:
+                await session.close()
+                self.mark_down(replica, e)
+                continue
+            return session, replica
+        return None
+
+    @asynccontextmanager
+    async def session(self, use_primary: bool = False) -> AsyncIterator[AsyncSession]:
+        """Read-only session; never committed"""
+        opened = None
+        if use_primary:
+            self.stats["sticky_reads"] += 1
+        elif self.replicas:
+            opened = await self._open_replica()
+
+        if opened is None:
+            session, replica = self.primary_factory(), None
+            self.stats["primary_reads"] += 1
+        else:
+            session, replica = opened
+            replica.in_use += 1
+            self.stats["replica_reads"] += 1
+        session.info["replica"] = replica.name if replica else None
+
+        try:
+            yield session
+        finally:
+            if replica is not None:
+                replica.in_use -= 1
+            await session.rollback()
+            await session.close()
+
+    def get_stats(self) -> Dict:
+        now = time.monotonic()
+        return {
+            **self.stats,
+            "strategy": self.strategy,
+            "replicas": [
+                {
+                    "name": replica.name,
+                    "weight": replica.weight,
+                    "in_use": replica.in_use,
+                    "available": replica.is_available(now),
+                }
+                for replica in self.replicas
+            ],
+        }
+
+    async def dispose(self) -> None:
+        for replica in self.replicas:
+            if replica.engine is not None:
+                await replica.engine.dispose()
@@ -11,14 +11,37 @@ from app.core.database import get_db
 from app.core.security import verify_token
 from app.core.exceptions import AuthenticationError, InsufficientPermissionsError
 from app.models.user import User
-from app.models.organization import OrganizationMember
 from app.services.session_service import SessionService
+from app.core.principal import Principal
+from app.core.memberships import Membership, MembershipMap, get_membership, load_memberships
 from app.config import settings
 
 
 security = HTTPBearer(auto_error=False)
 
 
+async def get_current_principal(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+    db: AsyncSession = Depends(get_db)
+) -> Principal:
+    """
+    Resolve the bearer session token to a cached principal.
+    No database round trip when the principal is cached.
+    """
+    if not credentials:
+        raise AuthenticationError("Authentication required")
+
+    try:
+        session_service = SessionService(db)
+        principal = await session_service.get_principal(credentials.credentials)
+    except Exception as e:
+        raise AuthenticationError(str(e))
+
+    if not principal:
+        raise AuthenticationError("Invalid or expired session")
+    return principal
+
+
 async def get_current_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
     x_mock_user_id: Optional[str] = Header(None),
@@ -27,6 +50,11 @@ async def get_current_user(
     """
     Get current authenticated user using database sessions
     For development, supports mock user ID header
+
+    The session is resolved through the principal cache; the user row is
+    then loaded by primary key into this request's DB session, because
+    handlers read and modify ORM attributes beyond the principal. Use
+    ``get_current_principal`` when only the identity is needed.
     """
     # Development mode: use mock user ID if provided
     if x_mock_user_id:
@@ -49,22 +77,17 @@ async def get_current_user(
         return mock_user
     
     # Production mode: require valid session token
-    if not credentials:
-        raise AuthenticationError("Authentication required")
+    principal = await get_current_principal(credentials, db)
 
     try:
-        # Use session service to validate session token
-        session_service = SessionService(db)
-        session = await session_service.validate_session(credentials.credentials)
-
-        if not session or not session.user:
-            raise AuthenticationError("Invalid or expired session")
-
-        return session.user
-
+        user = await db.get(User, principal.user_id)
     except Exception as e:
         raise AuthenticationError(str(e))
 
+    if not user:
+        raise AuthenticationError("Invalid or expired session")
+    return user
+
 
 async def get_current_active_user(
     current_user: User = Depends(get_current_user)
@@ -79,43 +102,52 @@ async def get_current_active_user(
     return current_user
 
 
+async def get_current_active_principal(
+    principal: Principal = Depends(get_current_principal)
+) -> Principal:
+    """Get current active principal (identity only, no user row load)"""
+    # In development mode, skip email verification requirement
+    if settings.environment == "development" or settings.debug:
+        return principal
+
+    if not principal.email_verified:
+        raise AuthenticationError("Email not verified")
+    return principal
+
+
 async def get_organization_member(
     organization_id: str = Header(None, alias="X-Organization-ID"),
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
-) -> Optional[OrganizationMember]:
+) -> Optional[Membership]:
     """Get organization member for current user"""
     if not organization_id:
         return None
 
-    result = await db.execute(
-        select(OrganizationMember).where(
-            OrganizationMember.organization_id == organization_id,
-            OrganizationMember.user_id == current_user.id
-        )
-    )
-    return result.scalar_one_or_none()
+    return await get_membership(current_user.id, organization_id, db)
 
 
 async def get_organization_member_by_path(
     organization_id: str,
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
-) -> Optional[OrganizationMember]:
+) -> Optional[Membership]:
     """Get organization member for current user using path parameter"""
-    result = await db.execute(
-        select(OrganizationMember).where(
-            OrganizationMember.organization_id == organization_id,
-            OrganizationMember.user_id == current_user.id
-        )
-    )
-    return result.scalar_one_or_none()
+    return await get_membership(current_user.id, organization_id, db)
+
+
+async def get_memberships(
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+) -> MembershipMap:
+    """The current user's organization roles, loaded once per request"""
+    return await load_memberships(current_user.id, db)
 
 
 def require_organization_role(required_roles: list[str]):
     """Dependency factory to require specific organization roles"""
     async def check_role(
-        org_member: Optional[OrganizationMember] = Depends(get_organization_member)
+        org_member: Optional[Membership] = Depends(get_organization_member)
     ):
         if not org_member:
             raise InsufficientPermissionsError("Organization membership required")
@@ -4,12 +4,16 @@ Structured logging configuration for production
 import json
 import logging
 import sys
+from contextvars import ContextVar
 from datetime import datetime
 from typing import Any, Dict
 from pythonjsonlogger import jsonlogger
 
 from app.config import settings
 
+# Id of the request being handled (set by RequestIDMiddleware)
+request_id_var: ContextVar[str] = ContextVar("request_id", default="")
+
 
 class SecurityFilter(logging.Filter):
     """Filter to remove sensitive information from logs"""
@@ -55,6 +59,17 @@ class SecurityFilter(logging.Filter):
         return sanitized
 
 
+class RequestContextFilter(logging.Filter):
+    """Attach the current request id to log records"""
+
+    def filter(self, record):
+        if not hasattr(record, 'request_id'):
+            request_id = request_id_var.get()
+            if request_id:
+                record.request_id = request_id
+        return True
+
+
 class CustomJSONFormatter(jsonlogger.JsonFormatter):
     """Custom JSON formatter with additional fields"""
     
@@ -114,6 +129,7 @@ def setup_logging():
     # Add security filter to prevent sensitive data leakage
     security_filter = SecurityFilter()
     console_handler.addFilter(security_filter)
+    console_handler.addFilter(RequestContextFilter())
     
     # Add handler to root logger
     root_logger.addHandler(console_handler)
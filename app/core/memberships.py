@@ -0,0 +1,160 @@
+"""
+Per-user organization membership map
+
+Permission checks need "what is this user's role in organization X" on
+nearly every request. ``load_memberships`` answers all of them with one
+``MembershipMap`` (organization id -> role, plus the user's current
+organization context), which is:
+
+- memoized on the request's ``AsyncSession`` (``session.info``), so each
+  request loads it at most once per session
+- shared across workers through ``cache_manager`` for
+  ``MEMBERSHIP_CACHE_TTL`` seconds
+
+Writes to ``OrganizationMember`` or ``UserOrganizationContext`` through the
+ORM drop the affected users' maps after commit. Bulk ``update()``/``delete()``
+statements are not seen and expire with the TTL.
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.cache import cache_manager
+from app.core.principal import principal_user_tag
+from app.models.organization import OrganizationMember
+from app.models.organization_settings import UserOrganizationContext
+
+MEMBERSHIP_CACHE_TTL = 60
+
+_SESSION_KEY = "memberships"
+_CHANGED_KEY = "membership_changes"
+
+
+def membership_cache_key(user_id: Any) -> str:
+    return f"memberships:{user_id}"
+
+
+@dataclass(frozen=True)
+class Membership:
+    """A user's role in one organization (duck-types ``OrganizationMember.role``)"""
+    organization_id: str
+    user_id: str
+    role: str
+
+
+class MembershipMap:
+    """Every organization a user belongs to, with their role"""
+
+    def __init__(self, user_id: Any, roles: Dict[str, str], context_organization_id: Optional[str] = None):
+        self.user_id = str(user_id)
+        self.roles = roles
+        self.context_organization_id = context_organization_id
+
+    def role_in(self, organization_id: Any) -> Optional[str]:
+        if organization_id is None:
+            return None
+        return self.roles.get(str(organization_id))
+
+    def get(self, organization_id: Any) -> Optional[Membership]:
+        role = self.role_in(organization_id)
+        if role is None:
+            return None
+        return Membership(str(organization_id), self.user_id, role)
+
+    def __contains__(self, organization_id: Any) -> bool:
+        return self.role_in(organization_id) is not None
+
+    @property
+    def organization_ids(self):
+        return list(self.roles)
+
+    @property
+    def current_organization_id(self) -> Optional[str]:
+        """The selected organization, if the user is still a member of it"""
+        if self.context_organization_id in self.roles:
+            return self.context_organization_id
+        return None
+
+    def to_cache(self) -> Dict[str, Any]:
+        return {"roles": self.roles, "context": self.context_organization_id}
+
+    @classmethod
+    def from_cache(cls, user_id: Any, data: Dict[str, Any]) -> "MembershipMap":
+        return cls(user_id, dict(data["roles"]), data.get("context"))
+
+
+async def _query_memberships(user_id: Any, db: AsyncSession) -> Dict[str, Any]:
+    rows = await db.execute(
+        select(OrganizationMember.organization_id, OrganizationMember.role)
+        .where(OrganizationMember.user_id == user_id)
+        .order_by(OrganizationMember.joined_at)
+    )
+    context = await db.execute(
+        select(UserOrganizationContext.current_organization_id)
+        .where(UserOrganizationContext.user_id == user_id)
+    )
+    context_organization_id = context.scalar_one_or_none()
+    return {
+        "roles": {str(organization_id): role for organization_id, role in rows.all()},
+        "context": str(context_organization_id) if context_organization_id else None,
+    }
+
+
+async def load_memberships(user_id: Any, db: AsyncSession) -> MembershipMap:
+    """The user's membership map: session memo, then shared cache, then database"""
+    memo = db.info.setdefault(_SESSION_KEY, {})
+    key = str(user_id)
+    memberships = memo.get(key)
+    if memberships is not None:
+        return memberships
+
+    data = await cache_manager.get_or_set(
+        membership_cache_key(key),
+        lambda: _query_memberships(user_id, db),
+        ttl=MEMBERSHIP_CACHE_TTL,
+        tags=(principal_user_tag(key),),
+    )
+    memberships = MembershipMap.from_cache(key, data)
+    memo[key] = memberships
+    return memberships
+
+
+async def get_membership(user_id: Any, organization_id: Any, db: AsyncSession) -> Optional[Membership]:
+    """The user's membership in one organization, or None"""
+    return (await load_memberships(user_id, db)).get(organization_id)
+
+
+async def invalidate_memberships(user_ids: Iterable[Any]) -> None:
+    """Drop cached membership maps on every worker"""
+    for user_id in user_ids:
+        await cache_manager.delete(membership_cache_key(user_id))
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_membership_changes(session, flush_context):
+    changed = {
+        str(obj.user_id)
+        for obj in (*session.new, *session.dirty, *session.deleted)
+        if isinstance(obj, (OrganizationMember, UserOrganizationContext)) and obj.user_id is not None
+    }
+    if changed:
+        session.info.setdefault(_CHANGED_KEY, set()).update(changed)
+        memo = session.info.get(_SESSION_KEY)
+        if memo:
+            for user_id in changed:
+                memo.pop(user_id, None)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    changed = session.info.pop(_CHANGED_KEY, None)
+    if changed:
+        cache_manager.invalidate_soon(keys=[membership_cache_key(user_id) for user_id in changed])
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_membership_changes(session):
+    session.info.pop(_CHANGED_KEY, None)
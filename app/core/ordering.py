@@ -0,0 +1,207 @@
+"""
+Fractional ordering keys for columns and cards
+
+Columns and cards are ordered by ``rank``, a base-36 string of digits and
+lowercase letters (which sort the same under byte-wise and locale-aware
+collations, so ``ORDER BY rank`` needs no special collation). A key is read as the fraction ``0.<digits>`` so there
+is always room between two keys: moving a card computes one key between its
+new neighbours and writes only the moved row, instead of renumbering every
+sibling's integer ``position``.
+
+Keys never end in ``"0"`` (``"a"`` and ``"a0"`` would be the same fraction),
+and inserting repeatedly at one spot makes them longer.
+``RankRebalancer`` (``app.services.rank_rebalancer``) respaces a column's
+or board's keys once one grows past ``rank_rebalance_length``.
+
+The integer ``position`` is kept for API compatibility: clients still send
+the target index, and reads report each row's index in rank order
+(``rank_position``), never the stored column, which goes stale as soon as
+a sibling moves.
+"""
+from typing import Any, List, Optional
+
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, aliased
+
+from app.models.card import Card
+from app.models.column import Column
+
+DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+_INDEX = {digit: index for index, digit in enumerate(DIGITS)}
+
+
+def _digit(key: str, index: int) -> int:
+    return _INDEX[key[index]] if index < len(key) else 0
+
+
+def _validate(key: str) -> None:
+    if not key or key[-1] == "0" or any(char not in _INDEX for char in key):
+        raise ValueError(f"Invalid ordering key: {key!r}")
+
+
+def _midpoint(low: str, high: Optional[str]) -> str:
+    """Shortest key strictly between ``low`` and ``high`` (``""``/None are open ends)"""
+    if high is not None:
+        # Keep the common prefix
+        prefix = 0
+        while prefix < len(high) and _digit(low, prefix) == _INDEX[high[prefix]]:
+            prefix += 1
+        if prefix:
+            return high[:prefix] + _midpoint(low[prefix:], high[prefix:])
+    low_digit = _digit(low, 0)
+    high_digit = _INDEX[high[0]] if high is not None else BASE
+    if high_digit - low_digit > 1:
+        return DIGITS[(low_digit + high_digit) // 2]
+    # Adjacent first digits: ``high`` truncated to one digit still sorts above ``low`` if it is longer
+    if high is not None and len(high) > 1:
+        return high[:1]
+    return DIGITS[low_digit] + _midpoint(low[1:], None)
+
+
+def key_after(key: str) -> str:
+    """Short key after ``key``, e.g. for appending to a column"""
+    for index, char in enumerate(key):
+        if char != "z":
+            return key[:index] + DIGITS[_INDEX[char] + 1]
+    # All "z": extend with the smallest digit, leaving the most room for further appends
+    return key + DIGITS[1]
+
+
+def key_before(key: str) -> str:
+    """Short key before ``key``, e.g. for prepending to a column"""
+    for index, char in enumerate(key):
+        if _INDEX[char] > 1:
+            return key[:index] + DIGITS[_INDEX[char] - 1]
+    return _midpoint("", key)
+
+
+def key_between(before: Optional[str], after: Optional[str]) -> str:
+    """A key sorting after ``before`` and before ``after`` (None means no neighbour)"""
+    for key in (before, after):
+        if key is not None:
+            _validate(key)
+    if before is not None and after is not None and before >= after:
+        raise ValueError(f"Ordering keys out of order: {before!r} >= {after!r}")
+    if before is None and after is None:
+        return DIGITS[BASE // 2]
+    if after is None:
+        return key_after(before)
+    if before is None:
+        return key_before(after)
+    return _midpoint(before, after)
+
+
+def keys_after(before: Optional[str], count: int) -> List[str]:
+    """``count`` increasing keys after ``before``"""
+    keys = []
+    for _ in range(count):
+        before = key_between(before, None)
+        keys.append(before)
+    return keys
+
+
+def evenly_spaced_keys(count: int) -> List[str]:
+    """``count`` increasing keys of equal length spread over the whole key space"""
+    width = 1
+    while BASE ** width <= count:
+        width += 1
+    space = BASE ** width
+    keys = []
+    for index in range(1, count + 1):
+        value = index * space // (count + 1)
+        digits = []
+        for _ in range(width):
+            value, digit = divmod(value, BASE)
+            digits.append(DIGITS[digit])
+        keys.append("".join(reversed(digits)).rstrip("0"))
+    return keys
+
+
+# ------------------------------------------------------------------ placement
+
+def _siblings(model):
+    """Parent key of ``Card`` (its column) or ``Column`` (its board)"""
+    if model is Card:
+        return Card.column_id
+    if model is Column:
+        return Column.board_id
+    raise TypeError(f"{model!r} has no ordering key")
+
+
+def rank_position(model):
+    """Index of a ``Card``/``Column`` row among its siblings in rank order
+
+    A correlated count over the parent/rank index, for statements reporting
+    ``position``.
+    """
+    siblings = aliased(model)
+    parent = _siblings(model)
+    return (
+        select(func.count())
+        .select_from(siblings)
+        .where(getattr(siblings, parent.key) == parent, siblings.rank < model.rank)
+        .correlate(model)
+        .scalar_subquery()
+    )
+
+
+async def rank_at(db: AsyncSession, model, parent_id: Any, index: Optional[int], exclude_id: Any = None) -> str:
+    """Key placing a row at ``index`` among its siblings (None or past the end appends)
+
+    ``exclude_id`` is the row being moved, so its current key is not one of
+    the neighbours. Reads at most two keys; the caller writes one row.
+    """
+    conditions = [_siblings(model) == parent_id]
+    if exclude_id is not None:
+        conditions.append(model.id != exclude_id)
+
+    if index is not None and index > 0:
+        neighbours = (await db.execute(
+            select(model.rank).where(*conditions).order_by(model.rank).offset(index - 1).limit(2)
+        )).scalars().all()
+        if neighbours:
+            return key_between(neighbours[0], neighbours[1] if len(neighbours) > 1 else None)
+    elif index is not None:
+        first = (await db.execute(
+            select(model.rank).where(*conditions).order_by(model.rank).limit(1)
+        )).scalar_one_or_none()
+        return key_between(None, first)
+
+    last = (await db.execute(select(func.max(model.rank)).where(*conditions))).scalar_one_or_none()
+    return key_between(last, None)
+
+
+# ------------------------------------------------------------------ new rows
+
+@event.listens_for(Session, "before_flush")
+def _rank_new_rows(session, flush_context, instances):
+    """Append new cards/columns created without a ``rank`` to their parent
+
+    New rows of one parent keep the order of their ``position`` values.
+    """
+    pending = {}
+    for obj in session.new:
+        if isinstance(obj, (Card, Column)) and obj.rank is None:
+            state = inspect(obj).dict
+            parent_id = state.get(_siblings(type(obj)).key)
+            if parent_id is None:
+                # Parent assigned through the relationship (``Column(board=board)``)
+                parent = state.get("board" if isinstance(obj, Column) else "column")
+                parent_id = parent.id if parent is not None else None
+            pending.setdefault((type(obj), parent_id), []).append(obj)
+    if not pending:
+        return
+
+    connection = session.connection()
+    for (model, parent_id), objs in pending.items():
+        last = None
+        if parent_id is not None:
+            last = connection.execute(
+                select(func.max(model.rank)).where(_siblings(model) == parent_id)
+            ).scalar_one_or_none()
+        objs.sort(key=lambda obj: obj.position if obj.position is not None else 0)
+        for obj, key in zip(objs, keys_after(last, len(objs))):
+            obj.rank = key
+
@@ -0,0 +1,108 @@
+"""
+Keyset (cursor) pagination
+
+``OFFSET n`` makes the database walk and discard ``n`` rows, so deep pages
+of large listings get slower and shift when rows are inserted meanwhile.
+Keyset pagination orders by a unique key instead (e.g. ``(created_at, id)``)
+and continues strictly after the last row of the previous page, which a
+matching composite index answers with one range scan at any depth.
+
+Cursors are opaque to clients: the last row's key values as base64url
+JSON. A listing fetches ``limit + 1`` rows; when the extra row exists the
+response carries the cursor of the page's last row, in the
+``X-Next-Cursor`` header for list responses or a ``next_cursor`` field.
+Offset parameters stay supported as a fallback and return the same
+header, so clients can switch to cursors after any page.
+"""
+import base64
+import json
+import uuid
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+from sqlalchemy import Select, literal, tuple_
+from starlette.responses import Response
+
+from app.core.exceptions import ValidationError
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+T = TypeVar("T")
+
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+def _python_value(value: Any, column) -> Any:
+    """Convert a decoded JSON value back to the Python type of ``column``"""
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if value is None or isinstance(value, python_type):
+        return value
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is uuid.UUID:
+        return uuid.UUID(value)
+    return python_type(value)
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Opaque cursor for the key ``values`` of a page's last row"""
+    data = json.dumps([_json_value(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: Sequence[Any]) -> List[Any]:
+    """Key values of ``cursor``, typed like ``columns``; ValidationError when malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("wrong number of key values")
+        return [_python_value(value, column) for value, column in zip(values, columns)]
+    except (ValueError, TypeError) as e:
+        raise ValidationError("Invalid pagination cursor", {"cursor": cursor, "error": str(e)})
+
+
+def keyset(
+    query: Select,
+    columns: Sequence[Any],
+    after: Optional[Sequence[Any]],
+    descending: bool = False,
+) -> Select:
+    """Order ``query`` by ``columns``, continuing after the key ``after`` when given
+
+    The last column must make the key unique (normally the primary key).
+    """
+    if after is not None:
+        key = tuple_(*columns)
+        bound = tuple_(*(literal(value, column.type) for value, column in zip(after, columns)))
+        query = query.where(key < bound if descending else key > bound)
+    order = [column.desc() if descending else column.asc() for column in columns]
+    return query.order_by(*order)
+
+
+def trim_page(rows: Sequence[T], limit: int, key: Callable[[T], Sequence[Any]]) -> Tuple[List[T], Optional[str]]:
+    """Trim ``rows`` fetched with ``limit + 1`` to the page and the next page's cursor"""
+    rows = list(rows)
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(key(rows[-1]))
+
+
+def set_next_cursor(response: Response, cursor: Optional[str]) -> None:
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
+
+
+def next_cursor_headers(cursor: Optional[str]) -> Dict[str, str]:
+    """Headers for a response the endpoint builds itself"""
+    return {NEXT_CURSOR_HEADER: cursor} if cursor else {}
@@ -4,15 +4,12 @@ Role-based permission checking utilities
 from typing import Optional
 from fastapi import HTTPException, status, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 
 from app.core.database import get_db
 from app.core.deps import get_current_active_user
+from app.core.memberships import load_memberships
 from app.models.user import User
-from app.models.organization import OrganizationMember
-from app.models.project import Project
-from app.models.board import Board
-from app.models.column import Column
+from app.database import fast_queries, statements
 
 
 class PermissionError(HTTPException):
@@ -29,14 +26,8 @@ async def get_user_role_in_organization(
     db: AsyncSession
 ) -> Optional[str]:
     """Get user's role in a specific organization"""
-    result = await db.execute(
-        select(OrganizationMember.role).where(
-            OrganizationMember.user_id == user_id,
-            OrganizationMember.organization_id == organization_id
-        )
-    )
-    role = result.scalar_one_or_none()
-    return role
+    memberships = await load_memberships(user_id, db)
+    return memberships.role_in(organization_id)
 
 
 async def get_user_role_for_project(
@@ -45,8 +36,14 @@ async def get_user_role_for_project(
     db: AsyncSession
 ) -> Optional[str]:
     """Get user's role for a specific project (via organization)"""
+    if fast_queries.fast_path_allowed(db):
+        try:
+            return await fast_queries.membership_role(user_id, "project", project_id)
+        except fast_queries.FastPathUnavailable:
+            pass
+
     result = await db.execute(
-        select(Project.organization_id).where(Project.id == project_id)
+        statements.project_organization_id(project_id)
     )
     organization_id = result.scalar_one_or_none()
     
@@ -62,10 +59,14 @@ async def get_user_role_for_board(
     db: AsyncSession
 ) -> Optional[str]:
     """Get user's role for a specific board (via project -> organization)"""
+    if fast_queries.fast_path_allowed(db):
+        try:
+            return await fast_queries.membership_role(user_id, "board", board_id)
+        except fast_queries.FastPathUnavailable:
+            pass
+
     result = await db.execute(
-        select(Project.organization_id)
-        .join(Board, Board.project_id == Project.id)
-        .where(Board.id == board_id)
+        statements.board_organization_id(board_id)
     )
     organization_id = result.scalar_one_or_none()
     
@@ -81,11 +82,14 @@ async def get_user_role_for_column(
     db: AsyncSession
 ) -> Optional[str]:
     """Get user's role for a specific column (via board -> project -> organization)"""
+    if fast_queries.fast_path_allowed(db):
+        try:
+            return await fast_queries.membership_role(user_id, "column", column_id)
+        except fast_queries.FastPathUnavailable:
+            pass
+
     result = await db.execute(
-        select(Project.organization_id)
-        .join(Board, Board.project_id == Project.id)
-        .join(Column, Column.board_id == Board.id)
-        .where(Column.id == column_id)
+        statements.column_organization_id(column_id)
     )
     organization_id = result.scalar_one_or_none()
     
@@ -0,0 +1,80 @@
+"""
+Authenticated principal
+
+A compact, immutable snapshot of "who is calling" resolved from a session
+token. Unlike the ``UserSession`` ORM object it is not bound to any
+``AsyncSession``, so it can be cached in the shared cache and reused across
+requests and workers.
+"""
+import hashlib
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+
+def principal_cache_key(session_token: str) -> str:
+    """Cache key for a session token (the raw token is never stored)"""
+    return f"principal:{hashlib.sha256(session_token.encode()).hexdigest()}"
+
+
+def principal_user_tag(user_id: Any) -> str:
+    """Cache tag covering every principal of a user"""
+    return f"user:{user_id}"
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Authenticated user identity bound to one session"""
+    user_id: uuid.UUID
+    email: str
+    email_verified: bool
+    session_id: uuid.UUID
+    expires_at: datetime
+    last_activity: datetime
+
+    @property
+    def id(self) -> uuid.UUID:
+        """Alias so code written against ``current_user.id`` keeps working"""
+        return self.user_id
+
+    def is_expired(self, now: Optional[datetime] = None) -> bool:
+        """Check if the underlying session is expired"""
+        return (now or datetime.utcnow()) > self.expires_at
+
+    def seconds_until_expiry(self, now: Optional[datetime] = None) -> float:
+        return (self.expires_at - (now or datetime.utcnow())).total_seconds()
+
+    def with_activity(self, last_activity: datetime) -> "Principal":
+        """Copy with a new last-activity timestamp"""
+        return Principal(
+            user_id=self.user_id,
+            email=self.email,
+            email_verified=self.email_verified,
+            session_id=self.session_id,
+            expires_at=self.expires_at,
+            last_activity=last_activity,
+        )
+
+    def to_cache(self) -> Dict[str, Any]:
+        """Serialize for the shared cache"""
+        return {
+            "user_id": str(self.user_id),
+            "email": self.email,
+            "email_verified": self.email_verified,
+            "session_id": str(self.session_id),
+            "expires_at": self.expires_at.isoformat(),
+            "last_activity": self.last_activity.isoformat(),
+        }
+
+    @classmethod
+    def from_cache(cls, data: Dict[str, Any]) -> "Principal":
+        """Rebuild from ``to_cache`` output"""
+        return cls(
+            user_id=uuid.UUID(data["user_id"]),
+            email=data["email"],
+            email_verified=bool(data["email_verified"]),
+            session_id=uuid.UUID(data["session_id"]),
+            expires_at=datetime.fromisoformat(data["expires_at"]),
+            last_activity=datetime.fromisoformat(data["last_activity"]),
+        )
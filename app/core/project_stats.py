@@ -0,0 +1,219 @@
+"""
+Per-project card counters
+
+``project_stats`` holds one row per project with its card totals by status
+and by priority, so dashboards and project statistics
+read one row per project instead of counting cards. Like board versions
+(``app.core.board_versions``) the rows are maintained by ORM flush
+listeners in the same transaction as the card write, so ``cards.py``,
+``kanban_integrity.py`` and ``KanbanService`` need no bookkeeping:
+``before_flush`` reads the stored state of changed and deleted cards,
+``after_flush`` reads the new state, and the difference is applied with one
+``UPDATE ... SET total = total + :delta`` per project. A project without a
+row yet (every project gets one when its first card is written) first gets
+an all-zero row, inserted with ``ON CONFLICT DO NOTHING``, and then takes
+its delta like any other. Two transactions writing a project's first cards
+at once therefore both land: the second one's insert waits for the first's
+row and its update adds to it.
+
+Bulk ``update()`` / ``delete()`` statements are invisible to the ORM; code
+issuing them takes ``snapshot_cards`` of the affected cards before and
+passes it to ``record_card_changes`` after.
+
+Overdue cards are not counted here: that number changes with the clock, not
+with writes, so dashboards count it live (``app.database.dashboard_stats``).
+The reconciler (``app.services.project_stats_reconciler``) recounts every
+project periodically and repairs any drift.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import bindparam, event, func, inspect, select, update
+from sqlalchemy import insert as sql_insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.board import Board
+from app.models.card import Card
+from app.models.column import Column
+from app.models.project import Project
+from app.models.project_stats import ProjectStats
+
+_stats = ProjectStats.__table__
+_projects = Project.__table__
+_boards = Board.__table__
+_columns = Column.__table__
+_cards = Card.__table__
+
+STATUS_COUNTERS = ("todo", "in_progress", "completed")
+PRIORITY_COUNTERS = {priority: f"priority_{priority}" for priority in ("low", "medium", "high", "urgent")}
+COUNTERS = ("total", *STATUS_COUNTERS, *PRIORITY_COUNTERS.values())
+
+# Card attributes the counters depend on (``column`` for moves through the relationship)
+_TRACKED_ATTRIBUTES = ("column_id", "column", "status", "priority")
+
+# Card ids per IN list, to stay well under driver bind parameter limits
+CHUNK_SIZE = 5000
+
+_INFO_KEY = "project_stats_before"
+
+# (project id, status, priority)
+CardState = Tuple[Any, Optional[str], Optional[str]]
+
+
+def _counters(state: CardState) -> List[str]:
+    """Counters a card in ``state`` contributes to"""
+    _, status, priority = state
+    names = ["total"]
+    if status in STATUS_COUNTERS:
+        names.append(status)
+    if priority in PRIORITY_COUNTERS:
+        names.append(PRIORITY_COUNTERS[priority])
+    return names
+
+
+def count_query(project_ids: Any):
+    """Counters of the projects in ``project_ids`` (a list or subquery), counted from their cards"""
+    card = _cards.c
+    return (
+        select(
+            _projects.c.id.label("project_id"),
+            func.count(card.id).label("total"),
+            *(func.count(card.id).filter(card.status == status).label(status) for status in STATUS_COUNTERS),
+            *(
+                func.count(card.id).filter(card.priority == priority).label(name)
+                for priority, name in PRIORITY_COUNTERS.items()
+            ),
+        )
+        .select_from(
+            _projects
+            .outerjoin(_boards, _boards.c.project_id == _projects.c.id)
+            .outerjoin(_columns, _columns.c.board_id == _boards.c.id)
+            .outerjoin(_cards, _cards.c.column_id == _columns.c.id)
+        )
+        .where(_projects.c.id.in_(project_ids))
+        .group_by(_projects.c.id)
+    )
+
+
+def _insert_zero_rows(connection, project_ids: Iterable[Any]) -> None:
+    """Create all-zero rows for ``project_ids``; a row another transaction created first is left alone"""
+    rows = [{"project_id": project_id} for project_id in project_ids]
+    if not rows:
+        return
+    dialect = connection.dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        insert = (postgresql if dialect == "postgresql" else sqlite).insert
+        statement = insert(_stats).on_conflict_do_nothing(index_elements=[_stats.c.project_id])
+    else:
+        statement = sql_insert(_stats)
+    connection.execute(statement, rows)
+
+
+def _card_states(connection, card_ids: Iterable[Any]) -> Dict[Any, CardState]:
+    """Stored state of the cards in ``card_ids``; deleted cards are absent"""
+    card_ids = list(card_ids)
+    states: Dict[Any, CardState] = {}
+    for start in range(0, len(card_ids), CHUNK_SIZE):
+        rows = connection.execute(
+            select(_cards.c.id, _boards.c.project_id, _cards.c.status, _cards.c.priority)
+            .join(_columns, _columns.c.id == _cards.c.column_id)
+            .join(_boards, _boards.c.id == _columns.c.board_id)
+            .where(_cards.c.id.in_(card_ids[start:start + CHUNK_SIZE]))
+        )
+        states.update({card_id: tuple(state) for card_id, *state in rows})
+    return states
+
+
+_apply_deltas = (
+    update(_stats)
+    .where(_stats.c.project_id == bindparam("stats_project_id"))
+    .values({
+        **{name: _stats.c[name] + bindparam(f"delta_{name}") for name in COUNTERS},
+        "updated_at": func.now(),
+    })
+)
+
+
+def _apply_changes(connection, before: Dict[Any, CardState], after: Dict[Any, CardState]) -> None:
+    """Move the counters of every project from the ``before`` to the ``after`` card states"""
+    changed = [
+        (before.get(card_id), after.get(card_id))
+        for card_id in {*before, *after}
+        if before.get(card_id) != after.get(card_id)
+    ]
+    if not changed:
+        return
+    project_ids = {state[0] for pair in changed for state in pair if state is not None}
+    existing = set(connection.execute(
+        select(_stats.c.project_id).where(_stats.c.project_id.in_(project_ids))
+    ).scalars())
+    # Deltas go to every project, including those whose row is created here
+    _insert_zero_rows(connection, project_ids - existing)
+
+    deltas: Dict[Any, Dict[str, int]] = {}
+    for old, new in changed:
+        for state, sign in ((old, -1), (new, 1)):
+            if state is None:
+                continue
+            counters = deltas.setdefault(state[0], dict.fromkeys(COUNTERS, 0))
+            for name in _counters(state):
+                counters[name] += sign
+    rows = [
+        {"stats_project_id": project_id, **{f"delta_{name}": delta for name, delta in counters.items()}}
+        for project_id, counters in deltas.items()
+        if any(counters.values())
+    ]
+    if rows:
+        connection.execute(_apply_deltas, rows)
+
+
+def _has_tracked_changes(obj: Card) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[name].history.has_changes() for name in _TRACKED_ATTRIBUTES)
+
+
+@event.listens_for(Session, "before_flush")
+def _read_changed_cards(session, flush_context, instances):
+    deleted = [inspect(obj).identity[0] for obj in session.deleted if isinstance(obj, Card)]
+    dirty = [
+        inspect(obj).identity[0] for obj in session.dirty
+        if isinstance(obj, Card) and obj not in session.deleted and _has_tracked_changes(obj)
+    ]
+    if deleted or dirty:
+        session.info[_INFO_KEY] = (_card_states(session.connection(), [*deleted, *dirty]), dirty)
+    else:
+        session.info.pop(_INFO_KEY, None)
+
+
+@event.listens_for(Session, "after_flush")
+def _count_changed_cards(session, flush_context):
+    before, dirty = session.info.pop(_INFO_KEY, ({}, []))
+    new = [obj.id for obj in session.new if isinstance(obj, Card)]
+    if before or new:
+        connection = session.connection()
+        _apply_changes(connection, before, _card_states(connection, [*new, *dirty]))
+
+
+async def snapshot_cards(db: AsyncSession, card_ids: Iterable[Any]) -> Dict[Any, CardState]:
+    """State of ``card_ids`` before a bulk statement; pass it to ``record_card_changes`` after"""
+    card_ids = list(card_ids)
+    return await db.run_sync(lambda session: _card_states(session.connection(), card_ids))
+
+
+async def record_card_changes(db: AsyncSession, before: Dict[Any, CardState]) -> None:
+    """Apply a bulk update or delete of the cards in ``before`` to their projects' counters"""
+    if before:
+        def apply(session):
+            connection = session.connection()
+            _apply_changes(connection, before, _card_states(connection, before))
+
+        await db.run_sync(apply)
+
+
+async def get_project_counters(db: AsyncSession, project_id: Any) -> Dict[str, Any]:
+    """Counters of one project; a project that never had cards has no row and reads as zeros"""
+    row = (await db.execute(
+        select(ProjectStats).where(ProjectStats.project_id == project_id)
+    )).scalar_one_or_none()
+    return {name: getattr(row, name) if row else 0 for name in COUNTERS}
@@ -0,0 +1,134 @@
+"""
+Per-request SQL query tracking
+
+``QueryTrackingMiddleware`` gives every HTTP request a ``RequestQueries``
+record in a context variable. Engine-level ``before/after_cursor_execute``
+listeners add each statement the request runs: query count, total DB time
+and a normalized fingerprint (literals and placeholders replaced by ``?``).
+
+A fingerprint executed ``DB_N_PLUS_ONE_THRESHOLD`` or more times within one
+request is flagged as a likely N+1 and logged. Per-route totals go to
+``PerformanceMonitor.record_queries``; in debug mode the response also gets
+a ``Server-Timing`` header (``db;dur=12.3;desc="7 queries"``).
+"""
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.monitoring.performance_monitor import PerformanceMonitor, performance_monitor
+
+logger = logging.getLogger(__name__)
+
+_request_queries: ContextVar[Optional["RequestQueries"]] = ContextVar("request_queries", default=None)
+
+_COMMENTS = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+_STRINGS = re.compile(r"'(?:[^']|'')*'")
+_PLACEHOLDERS = re.compile(r"\$\d+|%\(\w+\)s|%s|(?<!:):\w+|\?")
+_NUMBERS = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LISTS = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.I)
+_SPACES = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    """Normalize SQL so executions differing only in values compare equal"""
+    sql = _COMMENTS.sub(" ", statement)
+    sql = _STRINGS.sub("?", sql)
+    sql = _PLACEHOLDERS.sub("?", sql)
+    sql = _NUMBERS.sub("?", sql)
+    sql = _IN_LISTS.sub("IN (?)", sql)
+    return _SPACES.sub(" ", sql).strip()
+
+
+class RequestQueries:
+    """Statements executed while serving one request"""
+
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        self.fingerprints: Counter = Counter()
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.total_time += duration
+        self.fingerprints[fingerprint(statement)] += 1
+
+    def repeated(self, threshold: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Fingerprints executed at least ``threshold`` times (likely N+1)"""
+        threshold = settings.db_n_plus_one_threshold if threshold is None else threshold
+        return [(fp, n) for fp, n in self.fingerprints.most_common() if n >= threshold]
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.total_time * 1000:.1f};desc="{self.count} queries"'
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _request_queries.get() is not None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    queries = _request_queries.get()
+    if queries is None:
+        return
+    starts = conn.info.get("query_start")
+    if not starts:
+        # Tracking began while this statement was already running
+        return
+    queries.record(statement, time.perf_counter() - starts.pop())
+
+
+class QueryTrackingMiddleware:
+    """Pure ASGI middleware collecting the queries of each request"""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        monitor: Optional[PerformanceMonitor] = None,
+        server_timing: Optional[bool] = None,
+    ):
+        self.app = app
+        self.monitor = monitor or performance_monitor
+        self.server_timing = settings.debug if server_timing is None else server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        queries = RequestQueries()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start" and self.server_timing:
+                message["headers"] = [
+                    *message.get("headers", ()),
+                    (b"server-timing", queries.server_timing().encode("latin-1")),
+                ]
+            await send(message)
+
+        token = _request_queries.set(queries)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_queries.reset(token)
+            if queries.count:
+                self._report(scope, queries)
+
+    def _report(self, scope: Scope, queries: RequestQueries) -> None:
+        route = getattr(scope.get("route"), "path", None) or "unmatched"
+        repeated = queries.repeated()
+        for statement, times in repeated:
+            logger.warning(
+                f"Possible N+1 on {scope['method']} {route}: statement ran {times} times "
+                f"in one request: {statement[:200]}"
+            )
+        self.monitor.record_queries(route, scope["method"], queries.count, queries.total_time, repeated)
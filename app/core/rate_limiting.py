@@ -1,38 +1,222 @@
 """
-Simple rate limiting middleware for production security
+Rate limiting for production security
+
+Limits are enforced with GCRA (generic cell rate algorithm): each key stores
+a single "theoretical arrival time", so state is O(1) per key regardless of
+the request rate. The Redis backend evaluates GCRA atomically in a Lua
+script and shares quotas across all workers; the in-memory backend is used
+when Redis is unavailable and in tests.
+
+Requests are keyed by integration API key, authenticated user or client IP
+(in that order). User quotas scale with the organization's billing tier.
 """
 import time
-from collections import defaultdict, deque
-from typing import Dict, Tuple
-from fastapi import HTTPException, Request
+import math
+import hashlib
+import logging
+import asyncio
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from sqlalchemy import select, and_
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.cache import cache_manager
 from app.config import settings
+from app.core.principal import principal_cache_key
 
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """``requests`` per ``window`` seconds, allowing bursts of ``requests``"""
+    requests: int
+    window: int
+
+    @property
+    def emission_interval(self) -> float:
+        return self.window / self.requests
+
+
+@dataclass
+class RateLimitResult:
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float
+    reset_after: float
+
+
+def gcra(tat: Optional[float], now: float, limit: RateLimit) -> Tuple[RateLimitResult, Optional[float]]:
+    """
+    Evaluate one request against a GCRA state
+
+    Returns the result and the new theoretical arrival time (``None`` when
+    the request is rejected and the state must not change).
+    """
+    interval = limit.emission_interval
+    tat = max(tat if tat is not None else now, now)
+    new_tat = tat + interval
+    allow_at = new_tat - interval * limit.requests
+    if now < allow_at:
+        reset_after = tat - now
+        return RateLimitResult(False, limit.requests, 0, allow_at - now, reset_after), None
+    reset_after = new_tat - now
+    remaining = max(limit.requests - math.ceil(reset_after / interval - 1e-9), 0)
+    return RateLimitResult(True, limit.requests, remaining, 0.0, reset_after), new_tat
+
+
+class MemoryRateLimitBackend:
+    """Per-process GCRA state (single worker, tests)"""
+
+    name = "memory"
 
-class RateLimiter:
-    """Simple in-memory rate limiter with sliding window"""
-    
     def __init__(self):
-        # Store requests per client IP and endpoint
-        self.requests: Dict[str, deque] = defaultdict(lambda: deque())
+        self._tat: Dict[str, float] = {}
+
+    async def hit(self, key: str, limit: RateLimit) -> RateLimitResult:
+        now = time.time()
+        result, new_tat = gcra(self._tat.get(key), now, limit)
+        if new_tat is not None:
+            self._tat[key] = new_tat
+        return result
+
+    async def sweep(self) -> int:
+        """Drop keys whose bucket has fully drained (idle clients)"""
+        now = time.time()
+        idle = [key for key, tat in self._tat.items() if tat <= now]
+        for key in idle:
+            del self._tat[key]
+        return len(idle)
+
+    def __len__(self) -> int:
+        return len(self._tat)
+
+
+# GCRA in Redis; KEYS[1] = key, ARGV = emission interval (ms), burst.
+# Uses the Redis clock so every worker agrees on "now"; idle keys expire
+# on their own through PX.
+GCRA_LUA = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local interval = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then tat = now end
+local new_tat = tat + interval
+local allow_at = new_tat - interval * burst
+if now < allow_at then
+  return {0, allow_at - now, tat - now}
+end
+redis.call('SET', KEYS[1], new_tat, 'PX', math.max(math.ceil(new_tat - now), 1))
+return {1, 0, new_tat - now}
+"""
+
+
+class RedisRateLimitBackend:
+    """Shared GCRA state in Redis, evaluated atomically in Lua"""
+
+    name = "redis"
+    prefix = "agno:ratelimit:"
+
+    def __init__(self, redis):
+        self.redis = redis
+        self._script = redis.register_script(GCRA_LUA)
+
+    async def hit(self, key: str, limit: RateLimit) -> RateLimitResult:
+        interval_ms = limit.emission_interval * 1000
+        allowed, retry_ms, reset_ms = await self._script(
+            keys=[self.prefix + key], args=[interval_ms, limit.requests]
+        )
+        reset_after = float(reset_ms) / 1000
+        if not allowed:
+            return RateLimitResult(False, limit.requests, 0, float(retry_ms) / 1000, reset_after)
+        remaining = max(limit.requests - math.ceil(reset_after / limit.emission_interval - 1e-9), 0)
+        return RateLimitResult(True, limit.requests, remaining, 0.0, reset_after)
+
+    async def sweep(self) -> int:
+        # Keys carry their own expiry
+        return 0
+
+
+# Per-minute quota multiplier applied to RATE_LIMIT_PER_MINUTE by billing tier
+TIER_MULTIPLIERS = {
+    "free": 1,
+    "basic": 3,
+    "premium": 10,
+    "enterprise": 30,
+}
+
+
+class RateLimiter:
+    """GCRA rate limiter keyed by API key, user or IP"""
+
+    def __init__(self, backend=None):
+        self.backend = backend or MemoryRateLimitBackend()
         self.blocked_ips: Dict[str, float] = {}  # IP -> unblock_time
-        
-        # Rate limits per endpoint type - Set to very high limits for development
+        self._sweeper: Optional[asyncio.Task] = None
+
+        # Rate limits per endpoint type for unauthenticated (IP keyed) traffic
+        # Set to very high limits for development
         self.limits = {
-            'auth_login': {'requests': 10000, 'window': 300},      # 10000 requests per 5 minutes
-            'auth_register': {'requests': 10000, 'window': 3600},   # 10000 requests per hour
-            'general': {'requests': 10000, 'window': 60},         # 10000 requests per minute
-            'upload': {'requests': 10000, 'window': 60},           # 10000 uploads per minute
+            'auth_login': RateLimit(requests=10000, window=300),      # 10000 requests per 5 minutes
+            'auth_register': RateLimit(requests=10000, window=3600),  # 10000 requests per hour
+            'general': RateLimit(requests=10000, window=60),          # 10000 requests per minute
+            'upload': RateLimit(requests=10000, window=60),           # 10000 uploads per minute
+            # API keys not in the cache cost a database query each
+            'api_key_lookup': RateLimit(requests=60, window=60),
         }
-    
-    def _get_client_key(self, request: Request, endpoint_type: str) -> str:
-        """Generate unique key for client and endpoint"""
+
+    # ------------------------------------------------------------ lifecycle
+
+    async def start(self, redis=None) -> None:
+        """Pick the backend and start the idle-key sweeper"""
+        if redis is not None and settings.rate_limit_backend in ("auto", "redis"):
+            self.backend = RedisRateLimitBackend(redis)
+        elif settings.rate_limit_backend == "redis":
+            logger.warning("Redis rate limit backend requested but Redis is unavailable, using memory")
+        if self._sweeper is None:
+            self._sweeper = asyncio.create_task(self._sweep_loop())
+        logger.info(f"Rate limiter started ({self.backend.name} backend)")
+
+    async def stop(self) -> None:
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            try:
+                await self._sweeper
+            except asyncio.CancelledError:
+                pass
+            self._sweeper = None
+
+    async def sweep(self) -> int:
+        """Drop idle limiter keys and expired IP blocks"""
+        now = time.time()
+        for ip in [ip for ip, until in self.blocked_ips.items() if until <= now]:
+            del self.blocked_ips[ip]
+        return await self.backend.sweep()
+
+    async def _sweep_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.sleep(settings.rate_limit_sweep_interval)
+                await self.sweep()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Rate limiter sweep failed: {e}")
+
+    # ------------------------------------------------------------- identity
+
+    def _get_client_ip(self, request: Request) -> str:
         # Use X-Forwarded-For if behind proxy, otherwise client IP
         client_ip = request.headers.get('X-Forwarded-For', '').split(',')[0].strip()
         if not client_ip:
             client_ip = request.client.host if request.client else 'unknown'
-        
-        return f"{client_ip}:{endpoint_type}"
-    
+        return client_ip
+
     def _get_endpoint_type(self, path: str) -> str:
         """Determine endpoint type for rate limiting"""
         if '/auth/login' in path:
@@ -43,77 +227,163 @@ class RateLimiter:
             return 'upload'
         else:
             return 'general'
-    
-    def _cleanup_old_requests(self, client_key: str, window: int):
-        """Remove requests outside the time window"""
-        current_time = time.time()
-        requests = self.requests[client_key]
-        
-        # Remove old requests
-        while requests and current_time - requests[0] > window:
-            requests.popleft()
-    
+
+    async def _api_key_limit(self, request: Request, api_key: str) -> Optional[Tuple[str, RateLimit]]:
+        """Quota of an integration API key (requests per hour), cached
+
+        Keys missing from the cache (unknown keys are cached as misses too)
+        are only looked up while the client IP's lookup quota has room, so a
+        stream of random keys cannot turn into a stream of queries.
+        """
+        key_hash = hashlib.sha256(api_key.encode()).hexdigest()
+        cache_key = f"rate_api_key:{key_hash}"
+
+        async def load():
+            from app.core.database import async_session_factory
+            from app.models.integrations import APIKey
+
+            async with async_session_factory() as db:
+                result = await db.execute(
+                    select(APIKey.id, APIKey.rate_limit).where(
+                        and_(APIKey.key_hash == key_hash, APIKey.is_active == True)
+                    )
+                )
+                row = result.one_or_none()
+            return {"id": str(row.id), "rate_limit": row.rate_limit} if row else {}
+
+        info = await cache_manager.get(cache_key)
+        if info is None:
+            lookup_key = f"ip:{self._get_client_ip(request)}:api_key_lookup"
+            if not (await self.backend.hit(lookup_key, self.limits['api_key_lookup'])).allowed:
+                return None
+            try:
+                info = await cache_manager.get_or_set(cache_key, load, ttl=300)
+            except Exception as e:
+                logger.warning(f"Rate limit API key lookup failed: {e}")
+                return None
+        if not info:
+            return None
+        return f"key:{info['id']}", RateLimit(requests=max(int(info["rate_limit"]), 1), window=3600)
+
+    async def _tier_for(self, user_id: str, organization_id: Optional[str]) -> str:
+        """Billing tier of the caller's organization (or own subscription), cached"""
+        async def load():
+            from app.core.database import async_session_factory
+            from app.models.billing import Subscription, SubscriptionStatus
+            from app.models.organization import OrganizationMember
+
+            query = select(Subscription.tier).where(Subscription.status == SubscriptionStatus.ACTIVE)
+            if organization_id:
+                # Only honour the header for organizations the user belongs to
+                query = query.join(
+                    OrganizationMember,
+                    and_(
+                        OrganizationMember.organization_id == Subscription.organization_id,
+                        OrganizationMember.user_id == user_id,
+                    ),
+                ).where(Subscription.organization_id == organization_id)
+            else:
+                query = query.where(Subscription.user_id == user_id)
+            async with async_session_factory() as db:
+                result = await db.execute(query.order_by(Subscription.created_at.desc()).limit(1))
+                tier = result.scalar_one_or_none()
+            return getattr(tier, "value", tier) or "free"
+
+        try:
+            return await cache_manager.get_or_set(
+                f"rate_tier:{user_id}:{organization_id or '-'}", load, ttl=600, tags=(f"user:{user_id}",)
+            )
+        except Exception as e:
+            logger.warning(f"Rate limit tier lookup failed: {e}")
+            return "free"
+
+    async def _user_limit(self, request: Request) -> Optional[Tuple[str, RateLimit]]:
+        """Quota of the authenticated user; only uses already-cached principals"""
+        authorization = request.headers.get("Authorization", "")
+        if not authorization.lower().startswith("bearer "):
+            return None
+
+        cached = await cache_manager.get(principal_cache_key(authorization[7:].strip()))
+        if not cached:
+            # Not resolved yet; the IP quota applies until auth caches it
+            return None
+        user_id = cached["user_id"]
+        tier = await self._tier_for(user_id, request.headers.get("X-Organization-ID"))
+        per_minute = settings.rate_limit_per_minute * TIER_MULTIPLIERS.get(tier, 1)
+        return f"user:{user_id}", RateLimit(requests=per_minute, window=60)
+
+    async def _resolve(self, request: Request, endpoint_type: str) -> Tuple[str, RateLimit]:
+        """Pick the quota key: API key, then user, then client IP"""
+        if endpoint_type == 'general':
+            api_key = request.headers.get("X-API-Key")
+            if api_key:
+                resolved = await self._api_key_limit(request, api_key)
+                if resolved:
+                    return resolved
+            resolved = await self._user_limit(request)
+            if resolved:
+                return resolved
+        client_ip = self._get_client_ip(request)
+        return f"ip:{client_ip}:{endpoint_type}", self.limits.get(endpoint_type, self.limits['general'])
+
+    # ---------------------------------------------------------------- check
+
     def _is_ip_blocked(self, client_ip: str) -> bool:
         """Check if IP is temporarily blocked"""
-        if client_ip in self.blocked_ips:
-            if time.time() < self.blocked_ips[client_ip]:
-                return True
-            else:
-                # Unblock expired IPs
-                del self.blocked_ips[client_ip]
+        until = self.blocked_ips.get(client_ip)
+        if until is None:
+            return False
+        if time.time() < until:
+            return True
+        # Unblock expired IPs
+        del self.blocked_ips[client_ip]
         return False
-    
+
     def _block_ip(self, client_ip: str, duration: int = 3600):
         """Temporarily block an IP address"""
         self.blocked_ips[client_ip] = time.time() + duration
-    
-    def check_rate_limit(self, request: Request) -> Tuple[bool, Dict]:
+
+    async def check_rate_limit(self, request: Request) -> Tuple[bool, Dict]:
         """
         Check if request should be rate limited
-        
+
         Returns:
             (allowed: bool, info: dict)
         """
         endpoint_type = self._get_endpoint_type(request.url.path)
-        client_key = self._get_client_key(request, endpoint_type)
-        client_ip = client_key.split(':')[0]
-        
+        client_ip = self._get_client_ip(request)
+
         # Check if IP is blocked
         if self._is_ip_blocked(client_ip):
             return False, {
                 'error': 'IP temporarily blocked',
                 'retry_after': int(self.blocked_ips[client_ip] - time.time())
             }
-        
-        # Get rate limit config
-        limit_config = self.limits.get(endpoint_type, self.limits['general'])
-        max_requests = limit_config['requests']
-        window = limit_config['window']
-        
-        # Clean up old requests
-        self._cleanup_old_requests(client_key, window)
-        
-        # Check current request count
-        current_requests = len(self.requests[client_key])
-        
-        if current_requests >= max_requests:
+
+        try:
+            key, limit = await self._resolve(request, endpoint_type)
+            result = await self.backend.hit(key, limit)
+        except Exception as e:
+            # Fail open: a limiter outage must not take the API down
+            logger.warning(f"Rate limiter backend error: {e}")
+            return True, {}
+
+        if not result.allowed:
             # Block IP if too many auth failures
             if endpoint_type in ['auth_login', 'auth_register']:
                 self._block_ip(client_ip, 3600)  # Block for 1 hour
-            
+
             return False, {
                 'error': 'Rate limit exceeded',
-                'limit': max_requests,
-                'window': window,
-                'retry_after': window
+                'limit': limit.requests,
+                'window': limit.window,
+                'retry_after': max(int(math.ceil(result.retry_after)), 1)
             }
-        
-        # Add current request
-        self.requests[client_key].append(time.time())
-        
+
         return True, {
-            'requests_remaining': max_requests - current_requests - 1,
-            'reset_time': int(time.time() + window)
+            'limit': limit.requests,
+            'requests_remaining': result.remaining,
+            'reset_time': int(time.time() + result.reset_after)
         }
 
 
@@ -121,60 +391,77 @@ class RateLimiter:
 rate_limiter = RateLimiter()
 
 
-async def rate_limit_middleware(request: Request, call_next):
-    """Rate limiting middleware"""
-    
-    # Skip rate limiting for health checks and docs
-    skip_paths = ['/api/v1/healthz', '/api/v1/readyz', '/docs', '/redoc', '/openapi.json']
-    if any(skip_path in request.url.path for skip_path in skip_paths):
-        return await call_next(request)
-    
-    # Check rate limit
-    allowed, info = rate_limiter.check_rate_limit(request)
-    
-    if not allowed:
-        # Return 429 Too Many Requests
-        raise HTTPException(
-            status_code=429,
-            detail={
-                'error': info.get('error', 'Rate limit exceeded'),
-                'message': 'Too many requests. Please try again later.',
-                'retry_after': info.get('retry_after', 60)
-            },
-            headers={'Retry-After': str(info.get('retry_after', 60))}
+class RateLimitMiddleware:
+    """Pure ASGI rate limiting middleware
+
+    Rejected requests are answered directly with 429; allowed responses get
+    ``X-RateLimit-*`` headers added to their start message, so the body is
+    streamed through untouched.
+    """
+
+    skip_paths = ('/api/v1/healthz', '/api/v1/readyz', '/docs', '/redoc', '/openapi.json')
+
+    def __init__(self, app: ASGIApp, limiter: Optional[RateLimiter] = None):
+        self.app = app
+        self.limiter = limiter or rate_limiter
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(self.skip_paths):
+            await self.app(scope, receive, send)
+            return
+
+        allowed, info = await self.limiter.check_rate_limit(Request(scope))
+
+        if not allowed:
+            retry_after = info.get('retry_after', 60)
+            response = JSONResponse(
+                status_code=429,
+                content={
+                    'detail': {
+                        'error': info.get('error', 'Rate limit exceeded'),
+                        'message': 'Too many requests. Please try again later.',
+                        'retry_after': retry_after
+                    }
+                },
+                headers={'Retry-After': str(retry_after)}
+            )
+            await response(scope, receive, send)
+            return
+
+        if 'requests_remaining' not in info:
+            await self.app(scope, receive, send)
+            return
+
+        rate_headers = (
+            (b'x-ratelimit-limit', str(info['limit']).encode()),
+            (b'x-ratelimit-remaining', str(info['requests_remaining']).encode()),
+            (b'x-ratelimit-reset', str(info['reset_time']).encode()),
         )
-    
-    # Add rate limit headers to response
-    response = await call_next(request)
-    
-    if 'requests_remaining' in info:
-        response.headers['X-RateLimit-Remaining'] = str(info['requests_remaining'])
-        response.headers['X-RateLimit-Reset'] = str(info['reset_time'])
-    
-    return response
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), *rate_headers]
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
 
 
 def get_rate_limit_status() -> Dict:
     """Get current rate limiting statistics"""
     current_time = time.time()
-    
-    # Count active clients per endpoint type
-    active_clients = defaultdict(int)
-    total_requests = 0
-    
-    for client_key, requests in rate_limiter.requests.items():
-        if requests:  # Has recent requests
-            endpoint_type = client_key.split(':')[1]
-            active_clients[endpoint_type] += 1
-            total_requests += len(requests)
-    
+    backend = rate_limiter.backend
+
     # Count blocked IPs
-    blocked_ips = sum(1 for unblock_time in rate_limiter.blocked_ips.values() 
+    blocked_ips = sum(1 for unblock_time in rate_limiter.blocked_ips.values()
                      if unblock_time > current_time)
-    
+
     return {
-        'active_clients': dict(active_clients),
-        'total_active_requests': total_requests,
+        'backend': backend.name,
+        'tracked_keys': len(backend) if isinstance(backend, MemoryRateLimitBackend) else None,
         'blocked_ips': blocked_ips,
-        'rate_limits': rate_limiter.limits
+        'rate_limits': {
+            name: {'requests': limit.requests, 'window': limit.window}
+            for name, limit in rate_limiter.limits.items()
+        },
+        'tier_multipliers': TIER_MULTIPLIERS,
     }
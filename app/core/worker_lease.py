@@ -0,0 +1,108 @@
+"""
+Single-worker leases for periodic background jobs
+
+Every API worker starts the same background services (change log pruning,
+ordering key rebalancing, counter reconciliation, metric sampling).
+``WorkerLease.run`` keeps them from doing each job's work side by side:
+
+* With Redis, the first worker to run the job takes ``agno:lease:<name>``
+  for ``ttl`` seconds and renews it on each of its runs. The other workers
+  skip their runs until the holder stops renewing and the lease expires,
+  so one worker runs the job per interval.
+* Without Redis, each run holds a PostgreSQL transaction-level advisory
+  lock. That only excludes runs that overlap: workers whose timers are
+  apart still each run the job once per interval, one after the other.
+  The jobs using the lease are idempotent, so this costs repeated work,
+  not wrong results.
+* On other databases (SQLite in tests) every run goes ahead.
+"""
+import logging
+import uuid
+import zlib
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from sqlalchemy import text
+
+from app.cache import cache_manager
+from app.core.database import async_session_factory
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Take the lease when it is free, or renew it when this worker holds it
+_ACQUIRE_SCRIPT = """
+local holder = redis.call('GET', KEYS[1])
+if holder and holder ~= ARGV[1] then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[1], 'PX', ARGV[2])
+return 1
+"""
+
+
+class WorkerLease:
+    """Lets one worker at a time run a named periodic job"""
+
+    KEY_PREFIX = "agno:lease:"
+
+    def __init__(self, name: str, ttl: float, session_factory=async_session_factory, redis=None):
+        self.name = name
+        self.ttl = ttl
+        self.session_factory = session_factory
+        # Defaults to the cache's client, which only exists once the cache is initialized
+        self._redis = redis
+        self._scripts = {}
+        self.token = uuid.uuid4().hex
+        self.lock_id = zlib.crc32(name.encode())
+        self.stats = {"runs": 0, "skipped": 0}
+
+    @property
+    def key(self) -> str:
+        return f"{self.KEY_PREFIX}{self.name}"
+
+    def _script(self, redis):
+        script = self._scripts.get(id(redis))
+        if script is None:
+            script = self._scripts[id(redis)] = redis.register_script(_ACQUIRE_SCRIPT)
+        return script
+
+    async def _redis_lease(self) -> Optional[bool]:
+        """Whether this worker holds the Redis lease; None when Redis is unavailable"""
+        redis = self._redis if self._redis is not None else cache_manager.redis
+        if redis is None:
+            return None
+        try:
+            return bool(await self._script(redis)(keys=[self.key], args=[self.token, int(self.ttl * 1000)]))
+        except Exception as e:
+            logger.warning(f"Lease {self.name} unavailable in Redis, using the database lock: {e}")
+            return None
+
+    async def run(self, job: Callable[[], Awaitable[T]]) -> Optional[T]:
+        """Run ``job`` on this worker unless another one holds the lease; None when skipped"""
+        held = await self._redis_lease()
+        if held is not None:
+            return await self._run(job) if held else self._skip()
+
+        async with self.session_factory() as db:
+            if db.bind.dialect.name != "postgresql":
+                return await self._run(job)
+            locked = (await db.execute(
+                text("SELECT pg_try_advisory_xact_lock(:lock_id)"), {"lock_id": self.lock_id}
+            )).scalar()
+            if not locked:
+                return self._skip()
+            try:
+                return await self._run(job)
+            finally:
+                # Ending the transaction releases the lock
+                await db.rollback()
+
+    async def _run(self, job: Callable[[], Awaitable[T]]) -> T:
+        self.stats["runs"] += 1
+        return await job()
+
+    def _skip(self) -> None:
+        self.stats["skipped"] += 1
+        logger.debug(f"Skipping {self.name}, another worker holds its lease")
+        return None
@@ -0,0 +1,147 @@
+"""
+Board snapshot built by PostgreSQL as one JSON document
+
+``get_or_create_project_board`` used to load Board -> Columns -> Cards ->
+Assignments -> Users through four ``selectinload`` layers and rebuild the
+nested dict in Python. ``BOARD_SNAPSHOT_SQL`` builds the same document with
+``json_build_object``/``json_agg`` in a single statement, ordered the way
+``KanbanService.get_board_with_columns`` orders it, and returns it as text
+so the endpoint can send the bytes without decoding them.
+
+The membership check runs in the same statement (``role`` is NULL when the
+user is not a member of the board's organization).
+
+Columns and cards are ordered by ``rank`` and report their index in that
+order as ``position``, and assignments by ``assigned_at``, like the ORM
+path. Timestamps are formatted in SQL (``_timestamp``) exactly as the ORM
+and asyncpg paths format them with ``json_timestamp``, whatever the
+session time zone; the documents differ only in PostgreSQL's whitespace.
+"""
+import uuid
+from typing import Optional
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import InsufficientPermissionsError, ResourceNotFoundError
+
+
+def _timestamp(column: str) -> str:
+    """SQL rendering ``column`` in UTC like ``app.core.responses.json_timestamp``
+
+    Independent of the session time zone: seconds, the fraction without
+    trailing zeros (none when it is zero) and a ``+00:00`` offset; NULL stays NULL.
+    """
+    return (
+        f"rtrim(rtrim(to_char({column} AT TIME ZONE 'UTC', 'YYYY-MM-DD\"T\"HH24:MI:SS.US'), '0'), '.')"
+        " || '+00:00'"
+    )
+
+
+BOARD_SNAPSHOT_SQL = text(f"""
+    SELECT om.role, json_build_object(
+        'id', b.id,
+        'name', b.name,
+        'description', b.description,
+        'project_id', b.project_id,
+        'columns', COALESCE((
+            SELECT json_agg(json_build_object(
+                'id', col.id,
+                'name', col.name,
+                'position', col.ordinal,
+                'rank', col.rank,
+                'color', col.color,
+                'board_id', col.board_id,
+                'cards', COALESCE((
+                    SELECT json_agg(json_build_object(
+                        'id', c.id,
+                        'title', c.title,
+                        'description', c.description,
+                        'priority', c.priority,
+                        'status', c.status,
+                        'position', c.ordinal,
+                        'rank', c.rank,
+                        'column_id', c.column_id,
+                        'created_by', c.created_by,
+                        'created_at', {_timestamp('c.created_at')},
+                        'updated_at', {_timestamp('c.updated_at')},
+                        'due_date', {_timestamp('c.due_date')},
+                        'labels', CASE WHEN c.labels IS NULL OR json_typeof(c.labels) = 'null'
+                                       THEN '[]'::json ELSE c.labels END,
+                        'assignments', COALESCE((
+                            SELECT json_agg(json_build_object(
+                                'id', a.id,
+                                'user_id', a.user_id,
+                                'assigned_by', a.assigned_by,
+                                'assigned_at', {_timestamp('a.assigned_at')},
+                                'user', json_build_object(
+                                    'id', u.id,
+                                    'email', u.email,
+                                    'first_name', u.first_name,
+                                    'last_name', u.last_name,
+                                    'full_name', concat_ws(' ', u.first_name, u.last_name)
+                                )
+                            ) ORDER BY a.assigned_at, a.id)
+                            FROM card_assignments a
+                            JOIN users u ON u.id = a.user_id
+                            WHERE a.card_id = c.id
+                        ), '[]'::json)
+                    ) ORDER BY c.ordinal)
+                    FROM (
+                        SELECT *, row_number() OVER (ORDER BY rank) - 1 AS ordinal
+                        FROM cards
+                        WHERE column_id = col.id
+                    ) c
+                ), '[]'::json)
+            ) ORDER BY col.ordinal)
+            FROM (
+                SELECT *, row_number() OVER (ORDER BY rank) - 1 AS ordinal
+                FROM columns
+                WHERE board_id = b.id
+            ) col
+        ), '[]'::json),
+        'created_at', {_timestamp('b.created_at')},
+        'updated_at', {_timestamp('b.updated_at')}
+    )::text AS snapshot
+    FROM boards b
+    JOIN projects p ON p.id = b.project_id
+    LEFT JOIN organization_members om
+        ON om.organization_id = p.organization_id AND om.user_id = :user_id
+    WHERE b.id = :board_id
+""").bindparams(
+    bindparam("board_id", type_=UUID(as_uuid=True)),
+    bindparam("user_id", type_=UUID(as_uuid=True)),
+)
+
+
+def supports_json_snapshot(db: AsyncSession) -> bool:
+    """JSON aggregation needs PostgreSQL; other databases use the ORM path"""
+    bind = db.bind
+    return bind is not None and bind.dialect.name == "postgresql"
+
+
+def _as_uuid(value) -> uuid.UUID:
+    if isinstance(value, uuid.UUID):
+        return value
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        raise ResourceNotFoundError("Board not found")
+
+
+async def board_snapshot_json(db: AsyncSession, board_id, user_id) -> Optional[bytes]:
+    """The board document as UTF-8 JSON, or None when the database cannot build it"""
+    if not supports_json_snapshot(db):
+        return None
+
+    result = await db.execute(
+        BOARD_SNAPSHOT_SQL,
+        {"board_id": _as_uuid(board_id), "user_id": _as_uuid(user_id)},
+    )
+    row = result.first()
+    if row is None:
+        raise ResourceNotFoundError("Board not found")
+    if row.role is None:
+        raise InsufficientPermissionsError("Access denied")
+    return row.snapshot.encode("utf-8")
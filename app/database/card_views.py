@@ -0,0 +1,170 @@
+"""
+Sparse fieldsets for card lists
+
+Card list endpoints return full ``CardResponse`` objects by default, which
+means loading every card as an ORM entity plus its assignees and checklist.
+List views rarely need all of that. ``view=compact`` or ``fields=a,b,c``
+selects only the named card columns, computes child counts as correlated
+``count(*)`` subqueries in the same statement, and loads assignees or
+checklist items (one ``IN`` query each) only when they are asked for.
+
+The endpoints build their filtered ``select(Card)`` as usual and hand it to
+``fetch_card_views``, which swaps the selected columns and keeps the
+filters, joins, ordering and limits.
+"""
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import ValidationError
+from app.core.ordering import rank_position
+from app.core.pagination import trim_page
+from app.models.card import Card, CardAssignment, ChecklistItem
+from app.models.comment import Comment
+from app.models.user import User
+
+CARD_VIEWS = ("full", "compact")
+
+# Card columns selectable with fields=; position is the index in rank order
+CARD_COLUMNS = {
+    name: rank_position(Card).label(name) if name == "position" else getattr(Card, name)
+    for name in (
+        "id", "column_id", "title", "description", "position", "rank", "priority", "status",
+        "due_date", "created_by", "created_at", "updated_at", "labels",
+    )
+}
+
+# Child counts, computed in the card statement
+CARD_COUNTS = {
+    "checklist_total": select(func.count())
+    .where(ChecklistItem.card_id == Card.id)
+    .correlate(Card)
+    .scalar_subquery(),
+    "checklist_completed": select(func.count())
+    .where(ChecklistItem.card_id == Card.id, ChecklistItem.completed.is_(True))
+    .correlate(Card)
+    .scalar_subquery(),
+    "comment_count": select(func.count())
+    .where(Comment.card_id == Card.id)
+    .correlate(Card)
+    .scalar_subquery(),
+}
+
+# Child collections, loaded with one extra query each
+CARD_RELATIONS = ("assignments", "checklist_items")
+
+CARD_FIELDS = (*CARD_COLUMNS, *CARD_COUNTS, *CARD_RELATIONS)
+
+COMPACT_FIELDS = (
+    "id", "column_id", "title", "position", "rank", "priority", "status", "due_date", "labels",
+    "checklist_total", "checklist_completed", "comment_count",
+)
+
+
+def parse_fields(view: str = "full", fields: Optional[str] = None) -> Optional[Tuple[str, ...]]:
+    """Field names to return, or None for full ``CardResponse`` objects
+
+    ``fields`` (comma separated) takes precedence over ``view``. ``id`` is
+    always returned.
+    """
+    if view not in CARD_VIEWS:
+        raise ValidationError(f"Invalid view '{view}'", {"allowed": list(CARD_VIEWS)})
+    if fields:
+        names = [name.strip() for name in fields.split(",") if name.strip()]
+        unknown = [name for name in names if name not in CARD_FIELDS]
+        if unknown:
+            raise ValidationError(f"Unknown card fields: {', '.join(unknown)}", {"allowed": list(CARD_FIELDS)})
+        return tuple(dict.fromkeys(["id", *names]))
+    if view == "compact":
+        return COMPACT_FIELDS
+    return None
+
+
+def card_projection(query: Select, fields: Sequence[str]) -> Select:
+    """``query``, a filtered ``select(Card)``, reduced to the columns and counts in ``fields``"""
+    columns = [CARD_COLUMNS["id"]]
+    for name in fields:
+        if name in CARD_COLUMNS and name != "id":
+            columns.append(CARD_COLUMNS[name])
+        elif name in CARD_COUNTS:
+            columns.append(CARD_COUNTS[name].label(name))
+    return query.with_only_columns(*columns, maintain_column_froms=True)
+
+
+async def _assignments(db: AsyncSession, card_ids: List[Any]) -> Dict[Any, List[Dict[str, Any]]]:
+    rows = (await db.execute(
+        select(CardAssignment, User)
+        .join(User, User.id == CardAssignment.user_id)
+        .where(CardAssignment.card_id.in_(card_ids))
+    )).all()
+    by_card: Dict[Any, List[Dict[str, Any]]] = {}
+    for assignment, user in rows:
+        by_card.setdefault(assignment.card_id, []).append({
+            "id": assignment.id,
+            "user_id": assignment.user_id,
+            "assigned_by": assignment.assigned_by,
+            "assigned_at": assignment.assigned_at,
+            "user": {
+                "id": str(user.id),
+                "email": user.email,
+                "first_name": user.first_name,
+                "last_name": user.last_name,
+                "avatar_url": user.avatar_url,
+            },
+        })
+    return by_card
+
+
+async def _checklist_items(db: AsyncSession, card_ids: List[Any]) -> Dict[Any, List[Dict[str, Any]]]:
+    items = (await db.execute(
+        select(ChecklistItem)
+        .where(ChecklistItem.card_id.in_(card_ids))
+        .order_by(ChecklistItem.position)
+    )).scalars().all()
+    by_card: Dict[Any, List[Dict[str, Any]]] = {}
+    for item in items:
+        by_card.setdefault(item.card_id, []).append({
+            "id": str(item.id),
+            "text": item.text,
+            "completed": item.completed,
+            "position": item.position,
+            "ai_generated": item.ai_generated,
+            "confidence": item.confidence,
+            "metadata": item.ai_metadata,
+            "created_at": item.created_at.isoformat() if item.created_at else None,
+            "updated_at": item.updated_at.isoformat() if item.updated_at else None,
+        })
+    return by_card
+
+
+async def fetch_card_views(
+    db: AsyncSession,
+    query: Select,
+    fields: Sequence[str],
+    limit: Optional[int] = None,
+    page_key: Sequence[str] = (),
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Cards of ``query`` as dicts holding only ``fields``, and the next page's cursor
+
+    For keyset pages ``query`` fetches ``limit + 1`` rows ordered by the
+    card columns named in ``page_key`` (see ``app.core.pagination``).
+    """
+    selected = tuple(dict.fromkeys([*fields, *page_key]))
+    cards = [dict(row) for row in (await db.execute(card_projection(query, selected))).mappings().all()]
+    next_cursor = None
+    if limit is not None:
+        cards, next_cursor = trim_page(cards, limit, lambda card: [card[name] for name in page_key])
+    for name in set(selected) - set(fields):
+        for card in cards:
+            del card[name]
+    card_ids = [card["id"] for card in cards]
+    for name, loader in (("assignments", _assignments), ("checklist_items", _checklist_items)):
+        if name in fields:
+            by_card = await loader(db, card_ids) if card_ids else {}
+            for card in cards:
+                card[name] = by_card.get(card["id"], [])
+    if "labels" in fields:
+        for card in cards:
+            card["labels"] = card["labels"] or []
+    return cards, next_cursor
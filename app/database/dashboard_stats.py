@@ -0,0 +1,146 @@
+"""
+Dashboard statistics in one statement
+
+The dashboards report how many projects, boards and cards (by status, and
+assigned to the viewer) a set of projects holds. Counting each number with
+its own ``count()`` query repeats the Project→Board→Column→Card join chain
+per number, and joining members and meetings into the same chain multiplies
+the rows so that only ``count(DISTINCT ...)`` gives the right answer.
+
+``dashboard_stats_query`` builds one statement instead: a CTE for the
+projects in scope, aggregated once with ``count(*) FILTER (WHERE ...)``,
+and the other counts (boards, members, meetings) as scalar subqueries next
+to it. Card counts are sums of the maintained ``project_stats`` counters
+(``app.core.project_stats``), one row per project; only the viewer's own
+cards are read from the card tables, starting from their assignments.
+Overdue cards depend on the clock rather than on writes, so they are
+counted live (``overdue_cards_count``) from the ``due_date`` index.
+Every dashboard builds its scope filter and runs it with
+``fetch_dashboard_stats``.
+"""
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy import Select, func, literal, select, true
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.board import Board
+from app.models.card import Card, CardAssignment
+from app.models.column import Column
+from app.models.organization import OrganizationMember
+from app.models.organization_settings import MeetingSchedule
+from app.models.project import Project
+from app.models.project_stats import ProjectStats
+
+PENDING_STATUSES = ("todo", "in_progress")
+
+
+def overdue_cards_count(project_ids: Any, now: Optional[datetime] = None) -> Any:
+    """Scalar subquery counting open cards past their due date in ``project_ids`` (a list or a subquery)"""
+    now = datetime.now(timezone.utc) if now is None else now
+    return (
+        select(func.count())
+        .select_from(Card)
+        .join(Column, Column.id == Card.column_id)
+        .join(Board, Board.id == Column.board_id)
+        .where(Board.project_id.in_(project_ids), Card.due_date < now, Card.status != "completed")
+        .scalar_subquery()
+    )
+
+
+def dashboard_stats_query(
+    projects_where: Any,
+    user_id: Any = None,
+    assigned_only: bool = False,
+    organization_ids: Any = None,
+) -> Select:
+    """One-row statistics for the projects matching ``projects_where``
+
+    Columns: ``projects``, ``active_projects``, ``boards``, ``tasks``,
+    ``completed_tasks``, ``pending_tasks``, ``in_progress_tasks``,
+    ``todo_tasks``, ``overdue_tasks`` and ``my_tasks`` (cards assigned to
+    ``user_id``). With ``assigned_only`` the card counts cover only those
+    cards. With ``organization_ids`` (a list or a subquery) also
+    ``organizations``, ``members`` (distinct users) and ``meetings``.
+    """
+    if assigned_only and user_id is None:
+        raise ValueError("assigned_only needs a user_id")
+    now = datetime.now(timezone.utc)
+    projects = select(Project.id, Project.status).where(projects_where).cte("dashboard_projects")
+    project_totals = select(
+        func.count().label("projects"),
+        func.count().filter(projects.c.status == "active").label("active_projects"),
+    ).select_from(projects).cte("dashboard_project_totals")
+
+    if user_id is not None:
+        assigned = (
+            select(Card.status, Card.due_date)
+            .select_from(CardAssignment)
+            .join(Card, Card.id == CardAssignment.card_id)
+            .join(Column, Column.id == Card.column_id)
+            .join(Board, Board.id == Column.board_id)
+            .join(projects, projects.c.id == Board.project_id)
+            .where(CardAssignment.user_id == user_id)
+            .cte("dashboard_assigned_cards")
+        )
+        my_tasks = select(func.count()).select_from(assigned).scalar_subquery()
+    else:
+        my_tasks = literal(0)
+
+    if assigned_only:
+        open_status = assigned.c.status != "completed"
+        card_totals = select(
+            func.count().label("tasks"),
+            func.count().filter(assigned.c.status == "completed").label("completed_tasks"),
+            func.count().filter(assigned.c.status.in_(PENDING_STATUSES)).label("pending_tasks"),
+            func.count().filter(assigned.c.status == "in_progress").label("in_progress_tasks"),
+            func.count().filter(assigned.c.status == "todo").label("todo_tasks"),
+            func.count().filter(open_status, assigned.c.due_date < now).label("overdue_tasks"),
+            func.count().label("my_tasks"),
+        ).select_from(assigned).cte("dashboard_card_totals")
+    else:
+        stats = ProjectStats.__table__
+
+        def total(name):
+            return func.coalesce(func.sum(stats.c[name]), 0)
+
+        card_totals = select(
+            total("total").label("tasks"),
+            total("completed").label("completed_tasks"),
+            (total("todo") + total("in_progress")).label("pending_tasks"),
+            total("in_progress").label("in_progress_tasks"),
+            total("todo").label("todo_tasks"),
+            overdue_cards_count(select(projects.c.id), now).label("overdue_tasks"),
+            my_tasks.label("my_tasks"),
+        ).select_from(projects.join(stats, stats.c.project_id == projects.c.id)).cte("dashboard_card_totals")
+
+    columns = [
+        *project_totals.c,
+        select(func.count()).select_from(Board).join(projects, Board.project_id == projects.c.id)
+        .scalar_subquery().label("boards"),
+        *card_totals.c,
+    ]
+    if organization_ids is not None:
+        in_organizations = OrganizationMember.organization_id.in_(organization_ids)
+        columns += [
+            select(func.count(func.distinct(OrganizationMember.organization_id))).where(in_organizations)
+            .scalar_subquery().label("organizations"),
+            select(func.count(func.distinct(OrganizationMember.user_id))).where(in_organizations)
+            .scalar_subquery().label("members"),
+            select(func.count()).select_from(MeetingSchedule)
+            .where(MeetingSchedule.organization_id.in_(organization_ids))
+            .scalar_subquery().label("meetings"),
+        ]
+    return select(*columns).select_from(project_totals.join(card_totals, true()))
+
+
+async def fetch_dashboard_stats(db: AsyncSession, query: Select) -> Dict[str, int]:
+    row = (await db.execute(query)).mappings().one()
+    return {name: value or 0 for name, value in row.items()}
+
+
+def completion_rate(stats: Dict[str, int], digits: Optional[int] = 2) -> float:
+    """Completed share of ``tasks`` in percent"""
+    if not stats["tasks"]:
+        return 0
+    return round(stats["completed_tasks"] / stats["tasks"] * 100, digits)
@@ -0,0 +1,423 @@
+"""
+asyncpg fast path for the hottest read queries
+
+Hand-written SQL run directly on the asyncpg pool from ``connection_pool``.
+asyncpg prepares every statement on first use and keeps it in the
+connection's statement cache, so repeated calls skip parsing and planning.
+Rows are turned into plain dicts/lists that serialise straight to JSON, with
+no ORM identity map or object hydration.
+
+Every function raises ``FastPathUnavailable`` when the pool is not running
+or the query fails; callers then run their SQLAlchemy query instead. Reads
+here go through a separate connection, so callers must not use the fast
+path inside a session that has already written (see ``fast_path_allowed``).
+Functions taking ``replica`` read from the replica pool when it is
+running; callers pass it for requests their read-only session would also
+serve from a replica.
+"""
+import logging
+from typing import Any, Dict, List, Optional, Sequence
+from uuid import UUID
+
+import asyncpg
+
+from app.config import settings
+from app.core.db_routing import session_has_writes
+from app.core.exceptions import InsufficientPermissionsError, ResourceNotFoundError
+from app.core.responses import json_timestamp
+from app.database.connection_pool import db_pool
+from app.models.user import display_name
+
+logger = logging.getLogger(__name__)
+
+stats = {"queries": 0, "fallbacks": 0}
+
+
+class FastPathUnavailable(Exception):
+    """The asyncpg fast path cannot serve this query; use the ORM"""
+
+
+def fast_path_allowed(session=None) -> bool:
+    """Whether a caller holding ``session`` may read through the fast path"""
+    if not settings.db_fast_path_enabled or db_pool.pool is None:
+        return False
+    return session is None or not session_has_writes(session)
+
+
+class _connection:
+    """Acquire a pool connection, translating failures to FastPathUnavailable"""
+
+    def __init__(self, replica: bool = False):
+        self.replica = replica
+
+    async def __aenter__(self) -> asyncpg.Connection:
+        if not fast_path_allowed():
+            raise FastPathUnavailable("asyncpg pool not initialized")
+        pool = db_pool.replica_pool if self.replica and db_pool.replica_pool is not None else db_pool.pool
+        self._ctx = pool.acquire()
+        try:
+            return await self._ctx.__aenter__()
+        except (asyncpg.PostgresError, asyncpg.InterfaceError, OSError) as e:
+            stats["fallbacks"] += 1
+            raise FastPathUnavailable(str(e)) from e
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self._ctx.__aexit__(exc_type, exc, tb)
+        if exc_type is not None and issubclass(exc_type, (asyncpg.PostgresError, asyncpg.InterfaceError, OSError)):
+            stats["fallbacks"] += 1
+            logger.warning(f"Fast path query failed, falling back to ORM: {exc}")
+            raise FastPathUnavailable(str(exc)) from exc
+        if exc_type is None:
+            stats["queries"] += 1
+        return False
+
+
+def _uuid(value) -> Optional[UUID]:
+    if value is None or isinstance(value, UUID):
+        return value
+    try:
+        return UUID(str(value))
+    except ValueError as e:
+        # Leave malformed ids to the ORM path and its existing error handling
+        raise FastPathUnavailable(f"invalid id {value!r}") from e
+
+
+def _iso(value) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+# ---------------------------------------------------------------- membership
+
+MEMBERSHIP_ROLE_SQL = """
+    SELECT role FROM organization_members
+    WHERE user_id = $1 AND organization_id = $2
+"""
+
+BOARD_ROLE_SQL = """
+    SELECT om.role
+    FROM boards b
+    JOIN projects p ON p.id = b.project_id
+    JOIN organization_members om ON om.organization_id = p.organization_id AND om.user_id = $1
+    WHERE b.id = $2
+"""
+
+PROJECT_ROLE_SQL = """
+    SELECT om.role
+    FROM projects p
+    JOIN organization_members om ON om.organization_id = p.organization_id AND om.user_id = $1
+    WHERE p.id = $2
+"""
+
+COLUMN_ROLE_SQL = """
+    SELECT om.role
+    FROM columns col
+    JOIN boards b ON b.id = col.board_id
+    JOIN projects p ON p.id = b.project_id
+    JOIN organization_members om ON om.organization_id = p.organization_id AND om.user_id = $1
+    WHERE col.id = $2
+"""
+
+_ROLE_SQL = {
+    "organization": MEMBERSHIP_ROLE_SQL,
+    "project": PROJECT_ROLE_SQL,
+    "board": BOARD_ROLE_SQL,
+    "column": COLUMN_ROLE_SQL,
+}
+
+
+async def membership_role(user_id, scope: str, scope_id) -> Optional[str]:
+    """Role of a user in the organization owning an organization/project/board/column"""
+    async with _connection() as conn:
+        return await conn.fetchval(_ROLE_SQL[scope], _uuid(user_id), _uuid(scope_id))
+
+
+# ---------------------------------------------------------------- notifications
+
+NOTIFICATION_COUNTS_SQL = """
+    SELECT count(*) AS total, count(*) FILTER (WHERE NOT read) AS unread
+    FROM notifications
+    WHERE user_id = $1
+"""
+
+
+async def notification_counts(user_id) -> Dict[str, int]:
+    """Total and unread notification counts in one round trip"""
+    async with _connection() as conn:
+        row = await conn.fetchrow(NOTIFICATION_COUNTS_SQL, _uuid(user_id))
+    return {"total": row["total"], "unread": row["unread"]}
+
+
+# ---------------------------------------------------------------- board snapshot
+
+BOARD_SQL = """
+    SELECT b.id, b.name, b.description, b.project_id, b.created_at, b.updated_at, om.role
+    FROM boards b
+    JOIN projects p ON p.id = b.project_id
+    LEFT JOIN organization_members om ON om.organization_id = p.organization_id AND om.user_id = $2
+    WHERE b.id = $1
+    LIMIT 1
+"""
+
+BOARD_COLUMNS_SQL = """
+    SELECT id, name, rank, color, board_id
+    FROM columns
+    WHERE board_id = $1
+    ORDER BY rank
+"""
+
+BOARD_CARDS_SQL = """
+    SELECT c.id, c.title, c.description, c.priority, c.status, c.rank, c.column_id,
+           c.created_by, c.created_at, c.updated_at, c.due_date, c.labels
+    FROM cards c
+    JOIN columns col ON col.id = c.column_id
+    WHERE col.board_id = $1
+    ORDER BY c.column_id, c.rank
+"""
+
+BOARD_ASSIGNMENTS_SQL = """
+    SELECT a.id, a.card_id, a.user_id, a.assigned_by, a.assigned_at,
+           u.email, u.first_name, u.last_name
+    FROM card_assignments a
+    JOIN cards c ON c.id = a.card_id
+    JOIN columns col ON col.id = c.column_id
+    JOIN users u ON u.id = a.user_id
+    WHERE col.board_id = $1
+    ORDER BY a.assigned_at, a.id
+"""
+
+
+async def board_snapshot(board_id, user_id, replica: bool = False) -> Dict[str, Any]:
+    """Board with columns, cards and assignees, shaped like KanbanService.get_board_with_columns"""
+    board_id = _uuid(board_id)
+    async with _connection(replica) as conn:
+        board = await conn.fetchrow(BOARD_SQL, board_id, _uuid(user_id))
+        if board is None:
+            raise ResourceNotFoundError("Board not found")
+        if board["role"] is None:
+            raise InsufficientPermissionsError("Access denied")
+        columns = await conn.fetch(BOARD_COLUMNS_SQL, board_id)
+        cards = await conn.fetch(BOARD_CARDS_SQL, board_id)
+        assignments = await conn.fetch(BOARD_ASSIGNMENTS_SQL, board_id)
+
+    assignments_by_card: Dict[UUID, List[Dict[str, Any]]] = {}
+    for a in assignments:
+        assignments_by_card.setdefault(a["card_id"], []).append({
+            "id": str(a["id"]),
+            "user_id": str(a["user_id"]),
+            "assigned_by": str(a["assigned_by"]) if a["assigned_by"] else None,
+            "assigned_at": json_timestamp(a["assigned_at"]),
+            "user": {
+                "id": str(a["user_id"]),
+                "email": a["email"],
+                "first_name": a["first_name"],
+                "last_name": a["last_name"],
+                "full_name": display_name(a["first_name"], a["last_name"]),
+            },
+        })
+
+    cards_by_column: Dict[UUID, List[Dict[str, Any]]] = {}
+    for card in cards:
+        column_cards = cards_by_column.setdefault(card["column_id"], [])
+        column_cards.append({
+            "id": str(card["id"]),
+            "title": card["title"],
+            "description": card["description"],
+            "priority": card["priority"],
+            "status": card["status"],
+            "position": len(column_cards),
+            "rank": card["rank"],
+            "column_id": str(card["column_id"]),
+            "created_by": str(card["created_by"]),
+            "created_at": json_timestamp(card["created_at"]),
+            "updated_at": json_timestamp(card["updated_at"]),
+            "due_date": json_timestamp(card["due_date"]),
+            "labels": card["labels"] or [],
+            "assignments": assignments_by_card.get(card["id"], []),
+        })
+
+    return {
+        "id": str(board["id"]),
+        "name": board["name"],
+        "description": board["description"],
+        "project_id": str(board["project_id"]),
+        "columns": [
+            {
+                "id": str(col["id"]),
+                "name": col["name"],
+                "position": index,
+                "rank": col["rank"],
+                "color": col["color"],
+                "board_id": str(col["board_id"]),
+                "cards": cards_by_column.get(col["id"], []),
+            }
+            for index, col in enumerate(columns)
+        ],
+        "created_at": json_timestamp(board["created_at"]),
+        "updated_at": json_timestamp(board["updated_at"]),
+    }
+
+
+# ---------------------------------------------------------------- card list
+
+# position is the index in rank order, like the board reads (app.core.ordering)
+CARD_LIST_COLUMNS = """
+    SELECT c.id, c.column_id, c.title, c.description,
+           (SELECT count(*) FROM cards s WHERE s.column_id = c.column_id AND s.rank < c.rank) AS position,
+           c.priority, c.status, c.due_date, c.created_by, c.created_at, c.updated_at, c.labels
+    FROM cards c
+"""
+
+CARD_ASSIGNMENTS_SQL = """
+    SELECT a.id, a.card_id, a.user_id, a.assigned_by, a.assigned_at,
+           u.email, u.first_name, u.last_name, u.avatar_url
+    FROM card_assignments a
+    JOIN users u ON u.id = a.user_id
+    WHERE a.card_id = ANY($1::uuid[])
+"""
+
+CARD_CHECKLIST_SQL = """
+    SELECT id, card_id, text, completed, position, ai_generated, confidence, ai_metadata,
+           created_at, updated_at
+    FROM checklist_items
+    WHERE card_id = ANY($1::uuid[])
+    ORDER BY card_id, position
+"""
+
+
+def build_card_list_sql(
+    scope: str,
+    assigned: bool = False,
+    with_status: bool = False,
+    with_priority: bool = False,
+    after_cursor: bool = False,
+) -> str:
+    """SQL for one filter combination; each distinct text is prepared once per connection
+
+    Rows come in ``(created_at, id)`` order. With ``after_cursor`` the last
+    two parameters before the limit are the key of the previous page's
+    last row; otherwise they are the offset.
+    """
+    joins, where = [], []
+    if scope == "column":
+        where.append("c.column_id = $1")
+    elif scope == "board":
+        joins.append("JOIN columns col ON col.id = c.column_id")
+        where.append("col.board_id = $1")
+    elif scope == "project":
+        joins.append("JOIN columns col ON col.id = c.column_id")
+        joins.append("JOIN boards b ON b.id = col.board_id")
+        where.append("b.project_id = $1")
+    else:
+        # $1 is the requesting user: cards of their organizations only
+        joins.append("JOIN columns col ON col.id = c.column_id")
+        joins.append("JOIN boards b ON b.id = col.board_id")
+        joins.append("JOIN projects p ON p.id = b.project_id")
+        where.append(
+            "p.organization_id IN (SELECT organization_id FROM organization_members WHERE user_id = $1)"
+        )
+
+    params = 1
+    if assigned:
+        params += 1
+        where.append(f"EXISTS (SELECT 1 FROM card_assignments a WHERE a.card_id = c.id AND a.user_id = ${params})")
+    if with_status:
+        params += 1
+        where.append(f"c.status = ${params}")
+    if with_priority:
+        params += 1
+        where.append(f"c.priority = ${params}")
+    if after_cursor:
+        where.append(f"(c.created_at, c.id) > (${params + 1}, ${params + 2})")
+        page = f"LIMIT ${params + 3}"
+    else:
+        page = f"OFFSET ${params + 1} LIMIT ${params + 2}"
+
+    return (
+        CARD_LIST_COLUMNS
+        + "".join(f"    {join}\n" for join in joins)
+        + "    WHERE " + " AND ".join(where)
+        + f"\n    ORDER BY c.created_at, c.id\n    {page}\n"
+    )
+
+
+async def list_cards(
+    user_id,
+    column_id=None,
+    board_id=None,
+    project_id=None,
+    assigned_to=None,
+    card_status: Optional[str] = None,
+    priority: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+    after: Optional[Sequence[Any]] = None,
+    replica: bool = False,
+) -> List[Dict[str, Any]]:
+    """Cards matching the filters of GET /cards/list, shaped like CardResponse
+
+    ``after`` is a decoded ``(created_at, id)`` cursor and replaces ``skip``.
+    """
+    if column_id:
+        scope, scope_id = "column", column_id
+    elif board_id:
+        scope, scope_id = "board", board_id
+    elif project_id:
+        scope, scope_id = "project", project_id
+    else:
+        scope, scope_id = "organizations", user_id
+
+    sql = build_card_list_sql(scope, bool(assigned_to), bool(card_status), bool(priority), after is not None)
+    args: List[Any] = [_uuid(scope_id)]
+    if assigned_to:
+        args.append(_uuid(assigned_to))
+    if card_status:
+        args.append(card_status)
+    if priority:
+        args.append(priority)
+    args.extend([*after, limit] if after is not None else [skip, limit])
+
+    async with _connection(replica) as conn:
+        cards = await conn.fetch(sql, *args)
+        card_ids = [card["id"] for card in cards]
+        assignments: Sequence = await conn.fetch(CARD_ASSIGNMENTS_SQL, card_ids) if card_ids else []
+        checklist: Sequence = await conn.fetch(CARD_CHECKLIST_SQL, card_ids) if card_ids else []
+
+    assignments_by_card: Dict[UUID, List[Dict[str, Any]]] = {}
+    for a in assignments:
+        assignments_by_card.setdefault(a["card_id"], []).append({
+            "id": a["id"],
+            "user_id": a["user_id"],
+            "assigned_by": a["assigned_by"],
+            "assigned_at": a["assigned_at"],
+            "user": {
+                "id": str(a["user_id"]),
+                "email": a["email"],
+                "first_name": a["first_name"],
+                "last_name": a["last_name"],
+                "avatar_url": a["avatar_url"],
+            },
+        })
+
+    checklist_by_card: Dict[UUID, List[Dict[str, Any]]] = {}
+    for item in checklist:
+        checklist_by_card.setdefault(item["card_id"], []).append({
+            "id": str(item["id"]),
+            "text": item["text"],
+            "completed": item["completed"],
+            "position": item["position"],
+            "ai_generated": item["ai_generated"],
+            "confidence": item["confidence"],
+            "metadata": item["ai_metadata"],
+            "created_at": _iso(item["created_at"]),
+            "updated_at": _iso(item["updated_at"]),
+        })
+
+    return [
+        {
+            **dict(card),
+            "labels": card["labels"] or [],
+            "assignments": assignments_by_card.get(card["id"], []),
+            "checklist_items": checklist_by_card.get(card["id"], []),
+        }
+        for card in cards
+    ]
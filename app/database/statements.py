@@ -0,0 +1,286 @@
+"""
+Cached statements for the most frequent ORM selects
+
+Each function returns a ``lambda_stmt``. SQLAlchemy builds the statement and
+its cache key from the lambda's code location once; later calls only swap
+in the new bound values and reuse the compiled SQL from the engine's
+compiled cache, instead of rebuilding the ``select()``/``selectinload()``
+construct and computing a fresh cache key on every request.
+
+Rules for adding statements here:
+
+- the shape must be fixed; queries with optional filters stay inline
+- arguments may only be used as bound values (ids, names), never to change
+  the structure (joins, columns, limits)
+
+Compile cache hits and misses are counted per engine by
+``app.core.db_pool`` (``db_statement_cache_total``).
+"""
+from sqlalchemy import func, lambda_stmt, select
+from sqlalchemy.orm import selectinload
+from sqlalchemy.sql.lambdas import StatementLambdaElement
+
+from app.models.board import Board
+from app.models.card import Card, CardAssignment
+from app.models.column import Column
+from app.models.comment import Comment
+from app.models.mention import Mention
+from app.models.organization import OrganizationMember
+from app.models.project import Project
+from app.models.user import User
+
+
+# ---------------------------------------------------------------- membership
+
+def org_member(organization_id, user_id) -> StatementLambdaElement:
+    return lambda_stmt(lambda: select(OrganizationMember).where(
+        OrganizationMember.organization_id == organization_id,
+        OrganizationMember.user_id == user_id,
+    ))
+
+
+def org_member_role(organization_id, user_id) -> StatementLambdaElement:
+    return lambda_stmt(lambda: select(OrganizationMember.role).where(
+        OrganizationMember.user_id == user_id,
+        OrganizationMember.organization_id == organization_id,
+    ))
+
+
+def org_members_with_users(organization_id) -> StatementLambdaElement:
+    return lambda_stmt(lambda: (
+        select(OrganizationMember)
+        .options(selectinload(OrganizationMember.user))
+        .join(User, OrganizationMember.user_id == User.id)
+        .where(OrganizationMember.organization_id == organization_id)
+        .order_by(User.first_name, User.last_name)
+    ))
+
+
+def user_organization_ids(user_id) -> StatementLambdaElement:
+    return lambda_stmt(lambda: select(OrganizationMember.organization_id).where(
+        OrganizationMember.user_id == user_id
+    ))
+
+
+def project_organization_id(project_id) -> StatementLambdaElement:
+    return lambda_stmt(lambda: select(Project.organization_id).where(Project.id == project_id))
+
+
+def board_organization_id(board_id) -> StatementLambdaElement:
+    return lambda_stmt(lambda: (
+        select(Project.organization_id)
+        .join(Board, Board.project_id == Project.id)
+        .where(Board.id == board_id)
+    ))
+
+
+def column_organization_id(column_id) -> StatementLambdaElement:
+    return lambda_stmt(lambda: (
+        select(Project.organization_id)
+        .join(Board, Board.project_id == Project.id)
+        .join(Column, Column.board_id == Board.id)
+        .where(Column.id == column_id)
+    ))
+
+
+def column_project_id(column_id) -> StatementLambdaElement:
+    return lambda_stmt(lambda: (
+        select(Board.project_id)
+        .join(Column, Column.board_id == Board.id)
+        .where(Column.id == column_id)
+    ))
+
+
+# ---------------------------------------------------------- users, projects
+
+def user_by_id(user_id) -> StatementLambdaElement:
+    return lambda_stmt(lambda: select(User).where(User.id == user_id))
+
+
+def project_by_id(project_id) -> StatementLambdaElement:
+    return lambda_stmt(lambda: select(Project).where(Project.id == project_id))
+
+
+def project_with_organization(project_id) -> StatementLambdaElement:
+    return lambda_stmt(lambda: (
+        select(Project)
+        .options(selectinload(Project.organization))
+        .where(Project.id == project_id)
+    ))
+
+
+# ------------------------------------------------------------------- boards
+
+def board_for_project(project_id) -> StatementLambdaElement:
+    return lambda_stmt(lambda: select(Board).where(Board.project_id == project_id))
+
+
+def project_board_versions(project_id) -> StatementLambdaElement:
+    return lambda_stmt(lambda: select(Board.id, Board.version).where(Board.project_id == project_id))
+
+
+def board_with_project(board_id) -> StatementLambdaElement:
+    return lambda_stmt(lambda: (
+        select(Board)
+        .options(selectinload(Board.project))
+        .where(Board.id == board_id)
+    ))
+
+
+def board_with_cards(board_id) -> StatementLambdaElement:
+    """Board, project, columns, cards and card assignees"""
+    return lambda_stmt(lambda: (
+        select(Board)
+        .options(
+            selectinload(Board.project),
+            selectinload(Board.columns).selectinload(Column.cards)
+            .selectinload(Card.assignments).selectinload(CardAssignment.user),
+        )
+        .where(Board.id == board_id)
+    ))
+
+
+# ------------------------------------------------------------------ columns
+
+def column_by_id(column_id) -> StatementLambdaElement:
+    return lambda_stmt(lambda: select(Column).where(Column.id == column_id))
+
+
+def column_in_board(column_id, board_id) -> StatementLambdaElement:
+    return lambda_stmt(lambda: select(Column).where(
+        Column.id == column_id,
+        Column.board_id == board_id,
+    ))
+
+
+def column_with_project(column_id) -> StatementLambdaElement:
+    return lambda_stmt(lambda: (
+        select(Column)
+        .options(selectinload(Column.board).selectinload(Board.project))
+        .where(Column.id == column_id)
+    ))
+
+
+def max_column_position(board_id) -> StatementLambdaElement:
+    return lambda_stmt(lambda: select(func.max(Column.position)).where(Column.board_id == board_id))
+
+
+# -------------------------------------------------------------------- cards
+
+def card_with_project(card_id) -> StatementLambdaElement:
+    """Card with its column, board and project (for permission checks)"""
+    return lambda_stmt(lambda: (
+        select(Card)
+        .options(selectinload(Card.column).selectinload(Column.board).selectinload(Board.project))
+        .where(Card.id == card_id)
+    ))
+
+
+def card_with_project_and_assignments(card_id) -> StatementLambdaElement:
+    return lambda_stmt(lambda: (
+        select(Card)
+        .options(
+            selectinload(Card.column).selectinload(Column.board).selectinload(Board.project),
+            selectinload(Card.assignments).selectinload(CardAssignment.user),
+        )
+        .where(Card.id == card_id)
+    ))
+
+
+def card_detail(card_id) -> StatementLambdaElement:
+    """Card with its project chain, assignees and checklist"""
+    return lambda_stmt(lambda: (
+        select(Card)
+        .options(
+            selectinload(Card.column).selectinload(Column.board).selectinload(Board.project),
+            selectinload(Card.assignments).selectinload(CardAssignment.user),
+            selectinload(Card.checklist_items),
+        )
+        .where(Card.id == card_id)
+    ))
+
+
+def card_with_assignments(card_id) -> StatementLambdaElement:
+    return lambda_stmt(lambda: (
+        select(Card)
+        .options(selectinload(Card.assignments).selectinload(CardAssignment.user))
+        .where(Card.id == card_id)
+    ))
+
+
+def card_with_relations(card_id) -> StatementLambdaElement:
+    """Card with assignees and checklist (response payload)"""
+    return lambda_stmt(lambda: (
+        select(Card)
+        .options(
+            selectinload(Card.assignments).selectinload(CardAssignment.user),
+            selectinload(Card.checklist_items),
+        )
+        .where(Card.id == card_id)
+    ))
+
+
+def column_cards(column_id) -> StatementLambdaElement:
+    """Cards of a column in rank order, with assignees and checklist"""
+    return lambda_stmt(lambda: (
+        select(Card)
+        .options(
+            selectinload(Card.assignments).selectinload(CardAssignment.user),
+            selectinload(Card.checklist_items),
+        )
+        .where(Card.column_id == column_id)
+        .order_by(Card.rank)
+    ))
+
+
+def project_cards(project_id) -> StatementLambdaElement:
+    """Every card of a project in board order, with the relations CardResponse shows"""
+    return lambda_stmt(lambda: (
+        select(Card)
+        .options(
+            selectinload(Card.checklist_items),
+            selectinload(Card.assignments).selectinload(CardAssignment.user),
+        )
+        .join(Column, Card.column_id == Column.id)
+        .join(Board, Column.board_id == Board.id)
+        .where(Board.project_id == project_id)
+        .order_by(Column.rank, Card.rank)
+    ))
+
+
+def max_card_position(column_id) -> StatementLambdaElement:
+    return lambda_stmt(lambda: select(func.max(Card.position)).where(Card.column_id == column_id))
+
+
+def card_assignment(card_id, user_id) -> StatementLambdaElement:
+    return lambda_stmt(lambda: select(CardAssignment).where(
+        CardAssignment.card_id == card_id,
+        CardAssignment.user_id == user_id,
+    ))
+
+
+# ----------------------------------------------------------------- comments
+
+def comment_with_user(comment_id) -> StatementLambdaElement:
+    return lambda_stmt(lambda: (
+        select(Comment)
+        .options(selectinload(Comment.user))
+        .where(Comment.id == comment_id)
+    ))
+
+
+def card_comments(card_id) -> StatementLambdaElement:
+    return lambda_stmt(lambda: (
+        select(Comment)
+        .options(selectinload(Comment.user))
+        .where(Comment.card_id == card_id)
+        .order_by(Comment.created_at.asc(), Comment.id.asc())
+    ))
+
+
+def comment_mentions(comment_id) -> StatementLambdaElement:
+    return lambda_stmt(lambda: (
+        select(Mention)
+        .options(selectinload(Mention.mentioned_user))
+        .where(Mention.comment_id == comment_id)
+    ))
@@ -8,14 +8,25 @@ from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from starlette.middleware.httpsredirect import HTTPSRedirectMiddleware
-from fastapi.responses import JSONResponse
 
 from app.config import settings
 from app.core.exceptions import APIException
 from app.api.v1.router import api_router
-from app.core.database import init_db
+from app.core.database import init_db, close_db
+from app.database.connection_pool import init_database, close_database
+from app.core.db_routing import ReadYourWritesMiddleware
+from app.core.query_tracking import QueryTrackingMiddleware
+from app.cache import init_cache, close_cache, cache_manager
+from app.services.board_changes import board_change_pruner
+from app.services.metric_snapshots import metric_snapshot_collector
+from app.services.project_stats_reconciler import project_stats_reconciler
+from app.services.rank_rebalancer import rank_rebalancer
+from app.services.session_activity import session_activity_flusher
 from app.core.logging import setup_logging, get_logger
-from app.core.rate_limiting import rate_limit_middleware
+from app.core.rate_limiting import RateLimitMiddleware, rate_limiter
+from app.core.responses import FastJSONResponse
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.request_context import RequestIDMiddleware, TimingMiddleware
 
 # Configure structured logging
 setup_logging()
@@ -35,10 +46,32 @@ async def lifespan(app: FastAPI):
         logger.error("Server will continue but database operations may fail")
         logger.error("Please run: python setup_postgres.py to setup the database")
 
+    await init_cache()
+    if settings.db_fast_path_enabled:
+        try:
+            await init_database()
+        except Exception as e:
+            logger.warning(f"asyncpg fast path disabled, using the ORM for all reads: {e}")
+    await rate_limiter.start(redis=cache_manager.redis)
+    await session_activity_flusher.start()
+    await board_change_pruner.start()
+    await rank_rebalancer.start()
+    await project_stats_reconciler.start()
+    await metric_snapshot_collector.start()
+
     yield
 
     # Shutdown
     logger.info("Shutting down Agno WorkSphere API...")
+    await metric_snapshot_collector.stop()
+    await project_stats_reconciler.stop()
+    await rank_rebalancer.stop()
+    await board_change_pruner.stop()
+    await session_activity_flusher.stop()
+    await rate_limiter.stop()
+    await close_cache()
+    await close_database()
+    await close_db()
 
 
 # Create FastAPI app
@@ -49,11 +82,29 @@ app = FastAPI(
     docs_url="/docs" if settings.debug else None,
     redoc_url="/redoc" if settings.debug else None,
     lifespan=lifespan,
+    # orjson rendering for every endpoint without its own response class
+    default_response_class=FastJSONResponse,
 )
 
-# Add HTTPS redirect middleware only in production
-if settings.environment == "production":
-    app.add_middleware(HTTPSRedirectMiddleware)
+# Middleware stack. Everything here is pure ASGI (no BaseHTTPMiddleware /
+# @app.middleware("http")), so responses are never buffered or re-wrapped.
+# add_middleware() puts the last-added middleware outermost, so they are
+# registered innermost-first. Resulting order for a request:
+#
+#   RequestID -> Timing -> Compression -> Monitoring -> HTTPSRedirect -> TrustedHost
+#     -> CORS -> RateLimit -> QueryTracking -> ReadYourWrites -> app
+#
+# CORS sits outside the rate limiter so browsers can read 429 responses.
+
+# Replica read-your-writes marker (innermost)
+app.add_middleware(ReadYourWritesMiddleware)
+
+# Per-request query count / DB time / N+1 detection (Server-Timing in debug)
+if settings.db_query_tracking_enabled:
+    app.add_middleware(QueryTrackingMiddleware)
+
+# Rate limiting
+app.add_middleware(RateLimitMiddleware)
 
 # Add CORS middleware with proper dev/prod configuration
 logger.info(f"CORS allowed origins: {settings.allowed_origins}")
@@ -88,24 +139,29 @@ if trusted_hosts and trusted_hosts[0]:
 else:
     app.add_middleware(TrustedHostMiddleware, allowed_hosts=["*"])  # Allow all in dev
 
-# Add rate limiting middleware (after CORS)
-app.middleware("http")(rate_limit_middleware)
+# Add HTTPS redirect middleware only in production
+if settings.environment == "production":
+    app.add_middleware(HTTPSRedirectMiddleware)
+
+# Request metrics
+if settings.enable_metrics:
+    from app.monitoring import MonitoringMiddleware, get_prometheus_metrics
+    app.add_middleware(MonitoringMiddleware)
+    app.add_api_route("/metrics", get_prometheus_metrics, include_in_schema=False)
 
+# Response compression (ENABLE_GZIP; brotli/zstd when installed)
+if settings.enable_gzip:
+    app.add_middleware(CompressionMiddleware)
 
-@app.middleware("http")
-async def add_process_time_header(request: Request, call_next):
-    """Add processing time header to responses"""
-    start_time = time.time()
-    response = await call_next(request)
-    process_time = time.time() - start_time
-    response.headers["X-Process-Time"] = str(process_time)
-    return response
+# Timing and request id (outermost)
+app.add_middleware(TimingMiddleware)
+app.add_middleware(RequestIDMiddleware)
 
 
 @app.exception_handler(APIException)
 async def api_exception_handler(request: Request, exc: APIException):
     """Handle custom API exceptions"""
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=exc.status_code,
         content={
             "success": False,
@@ -136,7 +192,7 @@ async def general_exception_handler(request: Request, exc: Exception):
     print(f"📍 Request: {request.method} {request.url.path}")
     print(f"📋 Traceback:\n{traceback.format_exc()}")
 
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=500,
         content={
             "success": False,
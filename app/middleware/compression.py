@@ -0,0 +1,292 @@
+"""
+Response compression middleware
+
+Pure ASGI, like the rest of the stack. The encoding is negotiated from
+``Accept-Encoding`` (q-values honoured; zstd, then brotli, then gzip on
+ties). brotli and zstd are used only when their packages (``brotli``,
+``zstandard``) are installed. A response is compressed when:
+
+- its content type is in ``COMPRESSION_CONTENT_TYPES``
+- it is not already encoded and its status has a body
+- a complete body is at least ``GZIP_MINIMUM_SIZE`` bytes (streamed bodies
+  are always compressed)
+
+Complete bodies are compressed in one call, in a worker thread when they
+are large so the event loop keeps serving. Streamed bodies are compressed
+chunk by chunk, each flushed so clients see data as it is produced.
+Levels are capped at ``MAX_LEVELS`` whatever the configuration says.
+
+The compressed body of a response carrying an ``ETag`` (a body that is
+likely to be sent again) is kept in the cache layer (``cache_manager``,
+namespace ``compressed``) and reused instead of being compressed again, so
+it shows up in the cache statistics and ``invalidate_namespace`` drops it.
+Entries stay in the worker's L1: fetching a body from Redis costs about
+as much as compressing it again. The key is a digest of the body the app
+produced, never the ETag or URL, so a hit always carries exactly those
+bytes; hashing costs a fraction of compressing. Bodies larger than
+``COMPRESSION_CACHE_MAX_BODY`` are not kept. Board reads (versioned ETags)
+are the main beneficiary. Compressed responses get a weak ``W/`` ETag,
+which ``etag_matches`` accepts in If-None-Match.
+"""
+import hashlib
+import zlib
+from typing import Dict, Optional, Sequence, Tuple
+
+import anyio
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.cache import CacheManager, cache_manager
+from app.config import settings
+
+try:
+    import brotli
+except ImportError:  # optional codec
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional codec
+    zstandard = None
+
+# Server preference when the client accepts several encodings equally
+PREFERENCE = ("zstd", "br", "gzip")
+
+# Highest level used per codec; beyond these the CPU cost grows much faster
+# than the size saving
+MAX_LEVELS = {"gzip": 6, "br": 5, "zstd": 6}
+
+# Complete bodies at least this large are compressed off the event loop
+THREAD_THRESHOLD = 256 * 1024
+
+# Lifetime of reused compressed bodies; the body digest in the key keeps them exact
+CACHE_TTL = 3600
+
+NO_BODY_STATUSES = {204, 304}
+
+
+class _Compressor:
+    """Streaming compressor for one encoding"""
+
+    def __init__(self, encoding: str, level: int):
+        self.encoding = encoding
+        if encoding == "gzip":
+            self._obj = zlib.compressobj(level, zlib.DEFLATED, 31)
+        elif encoding == "br":
+            self._obj = brotli.Compressor(quality=level)
+        else:
+            self._obj = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress a chunk and flush it, so the client can decode it now"""
+        if self.encoding == "gzip":
+            return self._obj.compress(data) + self._obj.flush(zlib.Z_SYNC_FLUSH)
+        if self.encoding == "br":
+            return self._obj.process(data) + self._obj.flush()
+        return self._obj.compress(data) + self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._obj.finish()
+        return self._obj.flush()
+
+
+def compress(data: bytes, encoding: str, level: int) -> bytes:
+    """One-shot compression of a complete body"""
+    if encoding == "gzip":
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+        return compressor.compress(data) + compressor.flush()
+    if encoding == "br":
+        return brotli.compress(data, quality=level)
+    return zstandard.ZstdCompressor(level=level).compress(data)
+
+
+def available_encodings() -> Tuple[str, ...]:
+    return tuple(
+        encoding for encoding in PREFERENCE
+        if encoding == "gzip"
+        or (encoding == "br" and brotli is not None)
+        or (encoding == "zstd" and zstandard is not None)
+    )
+
+
+def negotiate(accept_encoding: str, available: Sequence[str]) -> Optional[str]:
+    """Best available encoding for an Accept-Encoding header, or None"""
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip()
+        if not name:
+            continue
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name] = weight
+
+    best, best_weight = None, 0.0
+    for encoding in available:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def is_compressible(content_type: str, allowed: Sequence[str]) -> bool:
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    if not media_type:
+        return False
+    if media_type.endswith(("+json", "+xml")):
+        return True
+    return any(
+        media_type.startswith(entry) if entry.endswith("/") else media_type == entry
+        for entry in allowed
+    )
+
+
+class CompressionMiddleware:
+    """Negotiated gzip / brotli / zstd compression of response bodies"""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: Optional[int] = None,
+        levels: Optional[Dict[str, int]] = None,
+        content_types: Optional[Sequence[str]] = None,
+        cache: Optional[CacheManager] = None,
+        cache_max_body: Optional[int] = None,
+    ):
+        self.app = app
+        self.minimum_size = settings.gzip_minimum_size if minimum_size is None else minimum_size
+        configured = {"gzip": settings.gzip_level, "br": settings.brotli_quality, "zstd": settings.zstd_level}
+        configured.update(levels or {})
+        self.levels = {
+            encoding: max(1, min(level, MAX_LEVELS[encoding])) for encoding, level in configured.items()
+        }
+        self.content_types = settings.compression_content_types if content_types is None else content_types
+        self.encodings = available_encodings()
+        self.cache_max_body = settings.compression_cache_max_body if cache_max_body is None else cache_max_body
+        # Reuse is off when no body may be kept
+        self.cache = (cache or cache_manager) if self.cache_max_body > 0 else None
+        self.stats = {"compressed": 0, "streamed": 0, "reused": 0, "bytes_in": 0, "bytes_out": 0}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""), self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await _Responder(self, scope, encoding, send).run(receive)
+
+    async def compress_body(self, body: bytes, encoding: str) -> bytes:
+        level = self.levels[encoding]
+        if len(body) >= THREAD_THRESHOLD:
+            return await anyio.to_thread.run_sync(compress, body, encoding, level)
+        return compress(body, encoding, level)
+
+
+class _Responder:
+    """Per-request state: holds the response start until the first body chunk"""
+
+    def __init__(self, middleware: CompressionMiddleware, scope: Scope, encoding: str, send: Send):
+        self.middleware = middleware
+        self.scope = scope
+        self.encoding = encoding
+        self.send = send
+        self.start: Optional[Message] = None
+        # None until decided; then "identity", "whole" or "stream"
+        self.mode: Optional[str] = None
+        self.compressor: Optional[_Compressor] = None
+
+    async def run(self, receive: Receive) -> None:
+        await self.middleware.app(self.scope, receive, self.send_wrapper)
+
+    def _cache_key(self, headers: MutableHeaders, body: bytes) -> Optional[str]:
+        middleware = self.middleware
+        if middleware.cache is None or "etag" not in headers or len(body) > middleware.cache_max_body:
+            return None
+        digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+        return f"compressed:{self.encoding}:{digest}"
+
+    def _encoded_headers(self, headers: MutableHeaders) -> None:
+        headers["Content-Encoding"] = self.encoding
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
+
+    async def send_wrapper(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            headers = MutableHeaders(raw=message.setdefault("headers", []))
+            eligible = (
+                message["status"] not in NO_BODY_STATUSES
+                and "content-encoding" not in headers
+                and is_compressible(headers.get("content-type", ""), self.middleware.content_types)
+            )
+            if eligible:
+                headers.add_vary_header("Accept-Encoding")
+            else:
+                self.mode = "identity"
+                await self.send(message)
+            return
+
+        if message["type"] != "http.response.body" or self.mode == "identity":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.mode is None:
+            headers = MutableHeaders(raw=self.start["headers"])
+            if not more_body:
+                await self._send_whole(headers, body)
+                return
+            # Streaming: length unknown up front, compress as chunks arrive
+            self.mode = "stream"
+            self.compressor = _Compressor(self.encoding, self.middleware.levels[self.encoding])
+            self._encoded_headers(headers)
+            del headers["content-length"]
+            self.middleware.stats["streamed"] += 1
+            await self.send(self.start)
+
+        data = self.compressor.compress(body) if body else b""
+        if not more_body:
+            data += self.compressor.finish()
+        self.middleware.stats["bytes_in"] += len(body)
+        self.middleware.stats["bytes_out"] += len(data)
+        await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+    async def _send_whole(self, headers: MutableHeaders, body: bytes) -> None:
+        self.mode = "whole"
+        middleware = self.middleware
+        if len(body) < middleware.minimum_size:
+            await self.send(self.start)
+            await self.send({"type": "http.response.body", "body": body})
+            return
+
+        cache_key = self._cache_key(headers, body)
+        compressed = await middleware.cache.get(cache_key, local_only=True) if cache_key else None
+        if compressed is not None:
+            middleware.stats["reused"] += 1
+        else:
+            compressed = await middleware.compress_body(body, self.encoding)
+            if cache_key:
+                await middleware.cache.set(cache_key, compressed, ttl=CACHE_TTL, local_only=True)
+
+        if len(compressed) >= len(body):
+            await self.send(self.start)
+            await self.send({"type": "http.response.body", "body": body})
+            return
+
+        self._encoded_headers(headers)
+        headers["Content-Length"] = str(len(compressed))
+        middleware.stats["compressed"] += 1
+        middleware.stats["bytes_in"] += len(body)
+        middleware.stats["bytes_out"] += len(compressed)
+        await self.send(self.start)
+        await self.send({"type": "http.response.body", "body": compressed})
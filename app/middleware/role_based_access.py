@@ -9,11 +9,26 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
 from app.core.deps import get_current_active_user
+from app.core.memberships import load_memberships
 from app.models.user import User
 from app.services.enhanced_role_permissions import EnhancedRolePermissions, Permission
 from app.services.organization_service import OrganizationService
 
 
+async def _current_organization_id(current_user: User, db: AsyncSession) -> str:
+    """The user's selected organization, from the membership map when possible"""
+    memberships = await load_memberships(current_user.id, db)
+    organization_id = memberships.current_organization_id
+    if not organization_id and memberships.organization_ids:
+        # No valid selection yet; let the service pick and persist one
+        org_service = OrganizationService(db)
+        organization_id = await org_service.get_current_organization(str(current_user.id))
+
+    if not organization_id:
+        raise HTTPException(status_code=400, detail="No organization context")
+    return organization_id
+
+
 def require_permission(permission: Permission, resource_param: Optional[str] = None):
     """Decorator to require specific permission for endpoint access"""
     def decorator(func: Callable):
@@ -40,11 +55,7 @@ def require_permission(permission: Permission, resource_param: Optional[str] = N
             
             # Get current organization if not provided
             if not organization_id:
-                org_service = OrganizationService(db)
-                organization_id = await org_service.get_current_organization(str(current_user.id))
-                
-                if not organization_id:
-                    raise HTTPException(status_code=400, detail="No organization context")
+                organization_id = await _current_organization_id(current_user, db)
             
             # Check permission
             permissions = EnhancedRolePermissions(db)
@@ -84,15 +95,11 @@ def require_role(required_roles: list):
             
             # Get current organization if not provided
             if not organization_id:
-                org_service = OrganizationService(db)
-                organization_id = await org_service.get_current_organization(str(current_user.id))
-                
-                if not organization_id:
-                    raise HTTPException(status_code=400, detail="No organization context")
+                organization_id = await _current_organization_id(current_user, db)
             
             # Check role
-            permissions = EnhancedRolePermissions(db)
-            user_role = await permissions.get_user_role(str(current_user.id), str(organization_id))
+            memberships = await load_memberships(current_user.id, db)
+            user_role = memberships.role_in(organization_id)
             
             if user_role not in required_roles:
                 raise HTTPException(
@@ -119,11 +126,8 @@ class RoleBasedAccessMiddleware:
         db: AsyncSession
     ) -> bool:
         """Check if user has access to organization"""
-        if not self.permissions:
-            self.permissions = EnhancedRolePermissions(db)
-        
-        role = await self.permissions.get_user_role(user_id, organization_id)
-        return role is not None
+        memberships = await load_memberships(user_id, db)
+        return organization_id in memberships
     
     async def check_project_access(
         self, 
@@ -7,7 +7,9 @@ from .organization_settings import (
     OrganizationSettings, UserOrganizationContext, InvitationToken, MeetingSchedule
 )
 from .project import Project
+from .project_stats import ProjectStats
 from .board import Board
+from .board_change import BoardChange
 from .column import Column
 from .card import Card, ChecklistItem, CardAssignment
 from .comment import Comment
@@ -33,7 +35,9 @@ __all__ = [
     "Registration",
     "Organization", "OrganizationMember",
     "Project",
+    "ProjectStats",
     "Board",
+    "BoardChange",
     "Column",
     "Card",
     "ChecklistItem",
@@ -1,7 +1,7 @@
 """
 Analytics and reporting models
 """
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Integer, Float, Boolean
+from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Integer, Float, Boolean, Index
 from sqlalchemy.dialects.postgresql import UUID, JSON
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -98,9 +98,15 @@ class MetricSnapshot(Base):
     metric_value = Column(Float, nullable=False)
     metric_unit = Column(String(50), nullable=True)  # count, percentage, hours, etc.
     dimensions = Column(JSON, nullable=True)  # Additional dimensions like project_id, user_id, etc.
-    snapshot_date = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    resolution = Column(String(10), default='minute', server_default='minute', nullable=False)  # minute, hour, day
+    snapshot_date = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)  # Start of the bucket
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
+    __table_args__ = (
+        # One value per series and bucket; also serves time-range reads
+        Index('idx_metric_snapshots_series', 'organization_id', 'metric_type', 'resolution', 'snapshot_date', unique=True),
+    )
+
     # Relationships
     organization = relationship("Organization")
 
@@ -1,7 +1,7 @@
 """
 Board model
 """
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey
+from sqlalchemy import BigInteger, Column, String, Text, DateTime, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -20,11 +20,13 @@ class Board(Base):
     created_by = Column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    # Bumped by every change to the board's columns and cards (see app.core.board_versions)
+    version = Column(BigInteger, nullable=False, default=0, server_default='0')
 
     # Relationships
     project = relationship("Project", back_populates="boards")
     creator = relationship("User", foreign_keys=[created_by])
-    columns = relationship("Column", back_populates="board", cascade="all, delete-orphan", order_by="Column.position")
+    columns = relationship("Column", back_populates="board", cascade="all, delete-orphan", order_by="Column.rank")
 
     def __repr__(self):
         return f"<Board(id={self.id}, name={self.name})>"
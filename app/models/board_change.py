@@ -0,0 +1,29 @@
+"""
+Board change log model
+"""
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Index, Integer, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class BoardChange(Base):
+    """One entity created, updated or deleted at a board version (see app.core.board_versions)"""
+    __tablename__ = "board_changes"
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    board_id = Column(UUID(as_uuid=True), ForeignKey('boards.id', ondelete='CASCADE'), nullable=False)
+    version = Column(BigInteger, nullable=False)
+    entity_type = Column(String(20), nullable=False)  # board, column, card, assignment
+    entity_id = Column(UUID(as_uuid=True), nullable=False)
+    operation = Column(String(10), nullable=False)  # upsert, delete
+    changed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index('idx_board_changes_board_version', 'board_id', 'version'),
+        Index('idx_board_changes_changed_at', 'changed_at'),
+    )
+
+    def __repr__(self):
+        return f"<BoardChange(board_id={self.board_id}, version={self.version}, {self.operation} {self.entity_type})>"
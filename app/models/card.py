@@ -1,7 +1,9 @@
 """
 Card and card assignment models
 """
-from sqlalchemy import Column, String, Text, Integer, DateTime, ForeignKey, UniqueConstraint, Boolean, JSON
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, String, Text, Integer, DateTime, ForeignKey, UniqueConstraint, Boolean, JSON, Index, case, event, update
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -18,14 +20,24 @@ class Card(Base):
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
     position = Column(Integer, nullable=False)
+    rank = Column(String(255), nullable=False)  # Fractional ordering key within the column (app.core.ordering)
     priority = Column(String(20), default='medium', nullable=False)
     status = Column(String(20), default='todo', nullable=False)  # todo, in_progress, completed
     due_date = Column(DateTime(timezone=True), nullable=True)
+    completed_at = Column(DateTime(timezone=True), nullable=True)  # Set when status becomes completed, cleared when reopened
     labels = Column(JSON, nullable=True, default=list)  # List of label strings or objects
     created_by = Column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
+    __table_args__ = (
+        Index('idx_cards_column_rank', 'column_id', 'rank'),
+        # Keyset pagination of card listings (app.core.pagination)
+        Index('idx_cards_created_at_id', 'created_at', 'id'),
+        # Completions per time window (app.services.metric_snapshots)
+        Index('idx_cards_completed_at', 'completed_at'),
+    )
+
     # Relationships
     column = relationship("Column", back_populates="cards")
     creator = relationship("User", foreign_keys=[created_by])
@@ -38,6 +50,32 @@ class Card(Base):
         return f"<Card(id={self.id}, title={self.title})>"
 
 
+@event.listens_for(Card.status, "set")
+def _stamp_completion(card, value, oldvalue, initiator):
+    """Keep ``completed_at`` in step with ORM status writes (bulk statements: ``stamp_completions``)"""
+    if value != "completed":
+        card.completed_at = None
+    elif card.completed_at is None:
+        card.completed_at = datetime.now(timezone.utc)
+
+
+def stamp_completions(card_ids):
+    """Statement bringing ``completed_at`` of ``card_ids`` in step with their status
+
+    Code writing ``status`` with a bulk ``update()`` runs it afterwards, since
+    the ``Card.status`` listener only sees ORM writes.
+    """
+    return (
+        update(Card)
+        .where(Card.id.in_(card_ids))
+        .values(completed_at=case(
+            (Card.status == "completed", func.coalesce(Card.completed_at, func.now())),
+            else_=None,
+        ))
+        .execution_options(synchronize_session=False)
+    )
+
+
 class CardAssignment(Base):
     __tablename__ = "card_assignments"
 
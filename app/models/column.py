@@ -1,7 +1,7 @@
 """
 Column model
 """
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -17,13 +17,18 @@ class Column(Base):
     board_id = Column(UUID(as_uuid=True), ForeignKey('boards.id', ondelete='CASCADE'), nullable=False)
     name = Column(String(255), nullable=False)
     position = Column(Integer, nullable=False)
+    rank = Column(String(255), nullable=False)  # Fractional ordering key within the board (app.core.ordering)
     color = Column(String(7), nullable=True)  # Hex color code
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
+    __table_args__ = (
+        Index('idx_columns_board_rank', 'board_id', 'rank'),
+    )
+
     # Relationships
     board = relationship("Board", back_populates="columns")
-    cards = relationship("Card", back_populates="column", cascade="all, delete-orphan", order_by="Card.position")
+    cards = relationship("Card", back_populates="column", cascade="all, delete-orphan", order_by="Card.rank")
 
     def __repr__(self):
         return f"<Column(id={self.id}, name={self.name}, position={self.position})>"
@@ -1,7 +1,7 @@
 """
 Comment model
 """
-from sqlalchemy import Column, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Text, DateTime, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -20,6 +20,11 @@ class Comment(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
+    __table_args__ = (
+        # Keyset pagination of card activities (app.core.pagination)
+        Index('idx_comments_card_created', 'card_id', 'created_at', 'id'),
+    )
+
     # Relationships
     card = relationship("Card", back_populates="comments")
     user = relationship("User")
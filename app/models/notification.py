@@ -1,7 +1,7 @@
 """
 Notification models
 """
-from sqlalchemy import Column, String, Text, Boolean, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, String, Text, Boolean, DateTime, ForeignKey, JSON, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -27,6 +27,11 @@ class Notification(Base):
     read_at = Column(DateTime(timezone=True), nullable=True)
     expires_at = Column(DateTime(timezone=True), nullable=True)
 
+    __table_args__ = (
+        # Keyset pagination of a user's notifications, newest first (app.core.pagination)
+        Index('idx_notifications_user_created', 'user_id', 'created_at', 'id'),
+    )
+
     # Relationships
     user = relationship("User", back_populates="notifications")
     organization = relationship("Organization")
@@ -1,7 +1,7 @@
 """
 Organization and organization member models
 """
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey, CheckConstraint, UniqueConstraint, Boolean, JSON
+from sqlalchemy import Column, String, Text, DateTime, ForeignKey, CheckConstraint, UniqueConstraint, Boolean, JSON, Index
 from sqlalchemy.dialects.postgresql import UUID, ARRAY
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -67,6 +67,8 @@ class OrganizationMember(Base):
     __table_args__ = (
         CheckConstraint("role IN ('viewer', 'member', 'admin', 'owner')", name='valid_role'),
         UniqueConstraint('organization_id', 'user_id', name='unique_org_user'),
+        # Keyset pagination of the member list (app.core.pagination)
+        Index('idx_org_members_org_joined', 'organization_id', 'joined_at', 'id'),
     )
 
     # Relationships
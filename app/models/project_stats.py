@@ -0,0 +1,27 @@
+"""
+Project card counters model
+"""
+from sqlalchemy import Column, DateTime, ForeignKey, Integer
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class ProjectStats(Base):
+    """Card counts of one project, maintained on every card write (see app.core.project_stats)"""
+    __tablename__ = "project_stats"
+
+    project_id = Column(UUID(as_uuid=True), ForeignKey('projects.id', ondelete='CASCADE'), primary_key=True)
+    total = Column(Integer, nullable=False, default=0, server_default='0')
+    todo = Column(Integer, nullable=False, default=0, server_default='0')
+    in_progress = Column(Integer, nullable=False, default=0, server_default='0')
+    completed = Column(Integer, nullable=False, default=0, server_default='0')
+    priority_low = Column(Integer, nullable=False, default=0, server_default='0')
+    priority_medium = Column(Integer, nullable=False, default=0, server_default='0')
+    priority_high = Column(Integer, nullable=False, default=0, server_default='0')
+    priority_urgent = Column(Integer, nullable=False, default=0, server_default='0')
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<ProjectStats(project_id={self.project_id}, total={self.total})>"
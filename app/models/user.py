@@ -10,6 +10,11 @@ import uuid
 from app.core.database import Base
 
 
+def display_name(first_name, last_name) -> str:
+    """Full name for API payloads; a missing last name is left out (like SQL ``concat_ws``)"""
+    return " ".join(part for part in (first_name, last_name) if part is not None)
+
+
 class User(Base):
     __tablename__ = "users"
 
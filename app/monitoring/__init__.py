@@ -5,14 +5,13 @@ Provides metrics collection, health checks, performance tracking, and alerting
 """
 import time
 import psutil
-import asyncio
 from typing import Dict, Any, List, Optional
-from datetime import datetime, timedelta
+from datetime import datetime
 from collections import defaultdict, deque
 import structlog
 from prometheus_client import Counter, Histogram, Gauge, generate_latest, CONTENT_TYPE_LATEST
-from fastapi import Request, Response
-from app.config import settings
+from fastapi import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 logger = structlog.get_logger()
 
@@ -256,28 +255,42 @@ system_monitor = SystemMonitor()
 alert_manager = AlertManager()
 
 # Middleware for request monitoring
-async def monitoring_middleware(request: Request, call_next):
-    """Middleware to monitor requests"""
-    start_time = time.time()
-    
-    # Extract endpoint pattern
-    endpoint = request.url.path
-    method = request.method
-    
-    try:
-        response = await call_next(request)
-        status_code = response.status_code
-        
-    except Exception as e:
+class MonitoringMiddleware:
+    """Pure ASGI middleware recording request count, duration and errors
+
+    Requests are labelled by route template (``/api/v1/cards/{card_id}``)
+    rather than raw path so metric cardinality stays bounded.
+    """
+
+    def __init__(self, app: ASGIApp, collector: Optional[MetricsCollector] = None):
+        self.app = app
+        self.collector = collector or metrics_collector
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
         status_code = 500
-        logger.error("Request failed", endpoint=endpoint, error=str(e))
-        raise
-    
-    finally:
-        duration = time.time() - start_time
-        metrics_collector.record_request(method, endpoint, status_code, duration)
-    
-    return response
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            status_code = 500
+            logger.error("Request failed", endpoint=scope["path"], error=str(e))
+            raise
+        finally:
+            route = scope.get("route")
+            endpoint = getattr(route, "path", None) or "unmatched"
+            duration = time.perf_counter() - start_time
+            self.collector.record_request(scope["method"], endpoint, status_code, duration)
 
 # Health check functions
 async def database_health_check():
@@ -14,6 +14,8 @@ import logging
 from dataclasses import dataclass, asdict
 import threading
 
+from app.core.db_pool import pool_stats
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -39,6 +41,13 @@ class PerformanceMetrics:
     db_connections_idle: int
     db_query_avg_time: float
     db_pool_utilization: float
+    db_pool_overflow: int
+    db_pool_checkouts: int
+    db_pool_checkout_wait_avg_ms: float
+    db_pool_checkout_wait_p95_ms: float
+    db_pool_checkout_timeouts: int
+    db_pool_leaked_connections: int
+    db_statement_cache_hit_ratio: float
     
     # Cache Metrics
     cache_hit_rate: float
@@ -64,6 +73,10 @@ class PerformanceMonitor:
         self.retention_hours = retention_hours
         self.metrics_history: deque = deque(maxlen=retention_hours * 60)  # 1 minute intervals
         self.request_metrics: Dict[str, deque] = defaultdict(lambda: deque(maxlen=1000))
+        self.route_queries: Dict[str, Dict[str, Any]] = defaultdict(lambda: {
+            "requests": 0, "queries": 0, "db_time": 0.0, "max_queries": 0,
+            "n_plus_one_requests": 0, "repeated_statements": defaultdict(int),
+        })
         self.alert_thresholds = self._default_thresholds()
         self.is_monitoring = False
         self.monitor_task = None
@@ -87,6 +100,7 @@ class PerformanceMonitor:
             "cpu_usage": {"warning": 70, "critical": 90},          # percentage
             "memory_usage": {"warning": 80, "critical": 95},       # percentage
             "db_pool_utilization": {"warning": 80, "critical": 95}, # percentage
+            "db_pool_checkout_wait_p95_ms": {"warning": 50, "critical": 500},  # milliseconds
             "cache_hit_rate": {"warning": 0.80, "critical": 0.60}, # 80% warning, 60% critical
             "requests_per_second": {"warning": 100, "critical": 200}
         }
@@ -153,11 +167,12 @@ class PerformanceMonitor:
         disk = psutil.disk_usage('/')
         network = psutil.net_io_counters()
         
-        # Database metrics (mock values - would integrate with actual DB monitoring)
-        db_connections_active = 5  # Would get from actual pool
-        db_connections_idle = 15   # Would get from actual pool
+        # Database metrics from the primary connection pool
+        pool = pool_stats().get("primary", {})
+        db_connections_active = pool.get("checked_out", 0)
+        db_connections_idle = pool.get("idle", 0)
         db_query_avg_time = 10.5   # Would calculate from query logs
-        db_pool_utilization = (db_connections_active / (db_connections_active + db_connections_idle)) * 100
+        db_pool_utilization = pool.get("utilization", 0.0)
         
         return PerformanceMetrics(
             timestamp=timestamp,
@@ -169,6 +184,13 @@ class PerformanceMonitor:
             db_connections_idle=db_connections_idle,
             db_query_avg_time=db_query_avg_time,
             db_pool_utilization=db_pool_utilization,
+            db_pool_overflow=pool.get("overflow", 0),
+            db_pool_checkouts=pool.get("checkouts", 0),
+            db_pool_checkout_wait_avg_ms=pool.get("checkout_wait_avg_ms", 0.0),
+            db_pool_checkout_wait_p95_ms=pool.get("checkout_wait_p95_ms", 0.0),
+            db_pool_checkout_timeouts=pool.get("timeouts", 0),
+            db_pool_leaked_connections=pool.get("leaked", 0),
+            db_statement_cache_hit_ratio=pool.get("statement_cache_hit_ratio", 0.0),
             cache_hit_rate=cache_hit_rate,
             cache_miss_rate=cache_miss_rate,
             cache_size=len(self.request_metrics),
@@ -208,6 +230,7 @@ class PerformanceMonitor:
             ("cpu_usage", metrics.cpu_usage),
             ("memory_usage", metrics.memory_usage),
             ("db_pool_utilization", metrics.db_pool_utilization),
+            ("db_pool_checkout_wait_p95_ms", metrics.db_pool_checkout_wait_p95_ms),
             ("cache_hit_rate", metrics.cache_hit_rate),
             ("requests_per_second", metrics.requests_per_second)
         ]
@@ -267,6 +290,39 @@ class PerformanceMonitor:
                 "status_code": status_code
             })
     
+    def record_queries(self, endpoint: str, method: str, query_count: int, db_time: float,
+                       repeated: List[tuple]):
+        """Record the SQL queries one request ran (see app.core.query_tracking)"""
+        with self._lock:
+            stats = self.route_queries[f"{method}:{endpoint}"]
+            stats["requests"] += 1
+            stats["queries"] += query_count
+            stats["db_time"] += db_time
+            stats["max_queries"] = max(stats["max_queries"], query_count)
+            if repeated:
+                stats["n_plus_one_requests"] += 1
+                for statement, times in repeated:
+                    stats["repeated_statements"][statement] = max(stats["repeated_statements"][statement], times)
+    
+    def get_route_query_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-route query counts and DB time, busiest routes first"""
+        with self._lock:
+            routes = {key: dict(stats, repeated_statements=dict(stats["repeated_statements"]))
+                      for key, stats in self.route_queries.items()}
+        
+        result = {}
+        for key, stats in sorted(routes.items(), key=lambda item: item[1]["queries"], reverse=True):
+            requests = stats["requests"]
+            result[key] = {
+                "requests": requests,
+                "avg_queries": stats["queries"] / requests,
+                "max_queries": stats["max_queries"],
+                "avg_db_time_ms": stats["db_time"] / requests * 1000,
+                "n_plus_one_requests": stats["n_plus_one_requests"],
+                "repeated_statements": stats["repeated_statements"],
+            }
+        return result
+    
     def record_cache_hit(self):
         """Record cache hit"""
         with self._lock:
@@ -316,6 +372,10 @@ class PerformanceMonitor:
             "last_request": max(r["timestamp"] for r in requests)
         }
     
+    def get_pool_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Live connection pool statistics for every instrumented engine"""
+        return pool_stats()
+    
     def export_metrics(self, format: str = "json") -> str:
         """Export metrics in specified format"""
         current_metrics = self.get_current_metrics()
@@ -83,6 +83,78 @@ class CardMove(BaseModel):
         return v
 
 
+CARD_BATCH_OPERATIONS = ('move', 'update', 'assign', 'unassign', 'delete')
+CARD_BATCH_MAX_OPERATIONS = 500
+
+
+class CardBatchOperation(BaseModel):
+    """One operation of POST /cards/batch
+
+    move: target_column_id (same board), optional position
+    update: any of title, description, priority, due_date, labels
+    assign / unassign: user_ids
+    delete: no fields
+    """
+    op: str
+    card_id: UUID
+    target_column_id: Optional[UUID] = None
+    position: Optional[int] = None
+    title: Optional[str] = None
+    description: Optional[str] = None
+    priority: Optional[str] = None
+    due_date: Optional[datetime] = None
+    labels: Optional[list] = None
+    user_ids: Optional[List[UUID]] = None
+
+    @validator('op')
+    def validate_op(cls, v):
+        if v not in CARD_BATCH_OPERATIONS:
+            raise ValueError(f"Operation must be one of {', '.join(CARD_BATCH_OPERATIONS)}")
+        return v
+
+    @validator('position')
+    def validate_position(cls, v):
+        if v is not None and v < 0:
+            raise ValueError('Position must be non-negative')
+        return v
+
+    @validator('title')
+    def validate_title(cls, v):
+        if v is not None and not v.strip():
+            raise ValueError('Card title cannot be empty')
+        return v.strip() if v else v
+
+    @validator('priority')
+    def validate_priority(cls, v):
+        if v is not None and v not in ['low', 'medium', 'high', 'urgent']:
+            raise ValueError('Priority must be low, medium, high, or urgent')
+        return v
+
+    @validator('target_column_id', always=True)
+    def validate_target_column(cls, v, values):
+        if values.get('op') == 'move' and v is None:
+            raise ValueError('target_column_id is required for move')
+        return v
+
+    @validator('user_ids', always=True)
+    def validate_user_ids(cls, v, values):
+        if values.get('op') in ('assign', 'unassign') and not v:
+            raise ValueError('user_ids is required for assign and unassign')
+        return v
+
+
+class CardBatchRequest(BaseModel):
+    operations: List[CardBatchOperation]
+
+    @validator('operations')
+    def validate_operations(cls, v):
+        if not v:
+            raise ValueError('At least one operation is required')
+        if len(v) > CARD_BATCH_MAX_OPERATIONS:
+            raise ValueError(f'At most {CARD_BATCH_MAX_OPERATIONS} operations per batch')
+        return v
+
+
 class CardAssignmentResponse(BaseModel):
     id: UUID
     user_id: UUID
@@ -0,0 +1,236 @@
+"""
+Board delta sync
+
+``get_board_changes`` answers "what changed on this board since cursor N"
+from the ``board_changes`` log written by ``app.core.board_versions``. The
+cursor is the board version the client last saw. The response lists the
+current state of every column, card and assignment created or updated
+after the cursor, plus tombstones (ids) for deleted ones; several changes
+to one entity collapse into its latest state.
+
+Entries older than ``board_change_retention_hours`` are pruned by
+``BoardChangePruner``, on one worker at a time (``app.core.worker_lease``).
+A cursor older than the oldest retained entry (or newer than the board)
+cannot be answered incrementally; the response then has ``resync: true``
+and the client reloads the board snapshot.
+
+Columns and cards carry their ``rank`` ordering key and, as ``position``,
+their current index in rank order; clients merging a delta order by
+``rank``, since the positions of unchanged siblings shift too.
+
+Deleting a column or card also deletes its cards/assignments through
+``ON DELETE CASCADE``; those are not listed separately, clients drop them
+with their parent's tombstone.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.core.database import async_session_factory
+from app.core.ordering import rank_position
+from app.core.responses import json_timestamp
+from app.core.worker_lease import WorkerLease
+from app.models.board import Board
+from app.models.board_change import BoardChange
+from app.models.card import Card, CardAssignment
+from app.models.column import Column
+from app.models.user import User, display_name
+
+logger = logging.getLogger(__name__)
+
+ENTITY_TYPES = ("column", "card", "assignment")
+
+
+def _column_dict(column: Column, position: int) -> Dict[str, Any]:
+    return {
+        "id": str(column.id),
+        "name": column.name,
+        "position": position,
+        "rank": column.rank,
+        "color": column.color,
+        "board_id": str(column.board_id),
+    }
+
+
+def _card_dict(card: Card, position: int) -> Dict[str, Any]:
+    return {
+        "id": str(card.id),
+        "title": card.title,
+        "description": card.description,
+        "priority": card.priority,
+        "status": card.status,
+        "position": position,
+        "rank": card.rank,
+        "column_id": str(card.column_id),
+        "created_by": str(card.created_by),
+        "created_at": json_timestamp(card.created_at),
+        "updated_at": json_timestamp(card.updated_at),
+        "due_date": json_timestamp(card.due_date),
+        "labels": card.labels or [],
+    }
+
+
+def _assignment_dict(assignment: CardAssignment, user: User) -> Dict[str, Any]:
+    return {
+        "id": str(assignment.id),
+        "card_id": str(assignment.card_id),
+        "user_id": str(assignment.user_id),
+        "assigned_by": str(assignment.assigned_by) if assignment.assigned_by else None,
+        "assigned_at": json_timestamp(assignment.assigned_at),
+        "user": {
+            "id": str(user.id),
+            "email": user.email,
+            "first_name": user.first_name,
+            "last_name": user.last_name,
+            "full_name": display_name(user.first_name, user.last_name),
+        },
+    }
+
+
+def _resync(board: Board) -> Dict[str, Any]:
+    return {"board_id": str(board.id), "cursor": board.version, "resync": True}
+
+
+async def get_board_changes(db: AsyncSession, board: Board, since: Optional[int]) -> Dict[str, Any]:
+    """Columns, cards and assignments changed on ``board`` after version ``since``"""
+    current = board.version
+    if since is None or since > current:
+        return _resync(board)
+
+    changes = {"board_id": str(board.id), "cursor": current, "resync": False, "board_changed": False}
+    for entity_type in ENTITY_TYPES:
+        changes[f"{entity_type}s"] = []
+    changes["deleted"] = {f"{entity_type}s": [] for entity_type in ENTITY_TYPES}
+    if since == current:
+        return changes
+
+    oldest = (await db.execute(
+        select(func.min(BoardChange.version)).where(BoardChange.board_id == board.id)
+    )).scalar_one_or_none()
+    if oldest is None or oldest > since + 1:
+        # Versions after the cursor were pruned (or predate the change log)
+        return _resync(board)
+
+    rows = (await db.execute(
+        select(BoardChange.entity_type, BoardChange.entity_id, BoardChange.operation)
+        .where(
+            BoardChange.board_id == board.id,
+            BoardChange.version > since,
+            BoardChange.version <= current,
+        )
+        .order_by(BoardChange.id)
+    )).all()
+
+    # Latest operation per entity
+    latest: Dict[tuple, str] = {}
+    for entity_type, entity_id, operation in rows:
+        latest[(entity_type, entity_id)] = operation
+
+    upserts: Dict[str, List[Any]] = {entity_type: [] for entity_type in ENTITY_TYPES}
+    deleted: Dict[str, set] = {entity_type: set() for entity_type in ENTITY_TYPES}
+    for (entity_type, entity_id), operation in latest.items():
+        if entity_type == "board":
+            changes["board_changed"] = True
+        elif operation == "delete":
+            deleted[entity_type].add(entity_id)
+        else:
+            upserts[entity_type].append(entity_id)
+
+    found = set()
+    if upserts["column"]:
+        columns = (await db.execute(
+            select(Column, rank_position(Column))
+            .where(Column.id.in_(upserts["column"]), Column.board_id == board.id)
+            .order_by(Column.rank)
+        )).all()
+        changes["columns"] = [_column_dict(column, position) for column, position in columns]
+        found.update(("column", column.id) for column, _ in columns)
+    if upserts["card"]:
+        cards = (await db.execute(
+            select(Card, rank_position(Card))
+            .join(Column, Column.id == Card.column_id)
+            .where(Card.id.in_(upserts["card"]), Column.board_id == board.id)
+            .order_by(Card.rank)
+        )).all()
+        changes["cards"] = [_card_dict(card, position) for card, position in cards]
+        found.update(("card", card.id) for card, _ in cards)
+    if upserts["assignment"]:
+        assignments = (await db.execute(
+            select(CardAssignment, User)
+            .join(User, User.id == CardAssignment.user_id)
+            .join(Card, Card.id == CardAssignment.card_id)
+            .join(Column, Column.id == Card.column_id)
+            .where(CardAssignment.id.in_(upserts["assignment"]), Column.board_id == board.id)
+        )).all()
+        changes["assignments"] = [_assignment_dict(assignment, user) for assignment, user in assignments]
+        found.update(("assignment", assignment.id) for assignment, _ in assignments)
+
+    # Upserted entities that are gone now were deleted (or moved off the board) after the cursor
+    for entity_type, entity_ids in upserts.items():
+        deleted[entity_type].update(entity_id for entity_id in entity_ids if (entity_type, entity_id) not in found)
+    changes["deleted"] = {
+        f"{entity_type}s": sorted(str(entity_id) for entity_id in entity_ids)
+        for entity_type, entity_ids in deleted.items()
+    }
+    return changes
+
+
+class BoardChangePruner:
+    """Periodically deletes change log entries older than the retention window"""
+
+    def __init__(self, session_factory=async_session_factory, interval: float = 3600, retention_hours: Optional[int] = None):
+        self.session_factory = session_factory
+        self.interval = interval
+        self.retention_hours = settings.board_change_retention_hours if retention_hours is None else retention_hours
+        self._task: Optional[asyncio.Task] = None
+        # Only one worker prunes each interval
+        self.lease = WorkerLease("board_change_pruner", ttl=interval * 1.5, session_factory=session_factory)
+        self.stats = {"runs": 0, "rows_deleted": 0, "errors": 0}
+
+    async def prune(self) -> int:
+        """Delete expired entries; returns the number of rows removed"""
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=self.retention_hours)
+        try:
+            async with self.session_factory() as db:
+                result = await db.execute(delete(BoardChange).where(BoardChange.changed_at < cutoff))
+                await db.commit()
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.warning(f"Board change log pruning failed: {e}")
+            return 0
+        self.stats["runs"] += 1
+        self.stats["rows_deleted"] += result.rowcount or 0
+        return result.rowcount or 0
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info("Board change log pruner started")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.sleep(self.interval)
+                await self.lease.run(self.prune)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Board change log pruner error: {e}")
+
+
+# Global pruner instance
+board_change_pruner = BoardChangePruner()
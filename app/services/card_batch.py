@@ -0,0 +1,353 @@
+"""
+Batch card operations (``POST /cards/batch``)
+
+A multi-select drag used to send one ``PUT /cards/{id}/move`` per card,
+each loading the card, checking membership and the target column and
+committing on its own. ``CardBatchService.apply`` runs a whole list of
+move/update/assign/unassign/delete operations as one transaction:
+
+- the cards (with board, project and organization) load in one query and
+  the target columns in another;
+- the user's memberships come from the membership cache and every affected
+  project is authorized once;
+- operations are applied in order in memory, then written as one bulk
+  card ``UPDATE`` (``UPDATE ... FROM (VALUES ...)`` on PostgreSQL, ORM bulk
+  update by primary key elsewhere), one assignment insert, one assignment
+  delete and one card delete;
+- board versions and the change log are bumped once for the whole batch,
+  the project card counters are adjusted once,
+  the transaction commits once, and each affected board gets one coalesced
+  ``task_update`` event.
+
+Moves get fractional ordering keys (``app.core.ordering``) computed against
+the target columns' keys, read in one query. Any invalid operation rejects
+the whole batch before anything is written.
+"""
+import logging
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Sequence, Set, Tuple
+
+from sqlalchemy import JSON, DateTime, Integer, String, Text, cast, delete, func, insert, select, tuple_, update, values
+from sqlalchemy import column as sql_column
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.board_versions import bump_board_versions
+from app.core.exceptions import InsufficientPermissionsError, ResourceNotFoundError, ValidationError
+from app.core.memberships import load_memberships
+from app.core.ordering import key_between
+from app.core.project_stats import record_card_changes, snapshot_cards
+from app.models.board import Board
+from app.models.card import Card, CardAssignment, stamp_completions
+from app.models.column import Column
+from app.models.organization import OrganizationMember
+from app.models.project import Project
+from app.schemas.card import CardBatchOperation
+from app.services.kanban_service import status_for_column
+
+logger = logging.getLogger(__name__)
+
+WRITE_ROLES = ('member', 'admin', 'owner')
+ASSIGNING_ROLES = ('owner', 'admin')
+UPDATE_FIELDS = ('title', 'description', 'priority', 'due_date', 'labels')
+
+# Card columns a batch can write, with the types VALUES rows are cast to
+_VALUE_COLUMNS = (
+    ('column_id', UUID(as_uuid=True)),
+    ('rank', String(255)),
+    ('position', Integer()),
+    ('status', String(20)),
+    ('title', String(255)),
+    ('description', Text()),
+    ('priority', String(20)),
+    ('due_date', DateTime(timezone=True)),
+    ('labels', JSON(none_as_null=True)),
+)
+
+
+@dataclass
+class _CardState:
+    """A card as loaded, plus the changes the batch makes to it"""
+    id: uuid.UUID
+    column_id: uuid.UUID
+    created_by: uuid.UUID
+    board_id: uuid.UUID
+    project_id: uuid.UUID
+    organization_id: uuid.UUID
+    data_protected: bool
+    pending_sign_off: bool
+    changes: Dict[str, Any] = field(default_factory=dict)
+
+
+def values_update(updated: Sequence[_CardState]):
+    """UPDATE cards SET ... FROM (VALUES ...) AS batch WHERE cards.id = batch.id, one row per card"""
+    batch = values(
+        sql_column('id', UUID(as_uuid=True)),
+        *(sql_column(name, type_) for name, type_ in _VALUE_COLUMNS),
+        name='batch',
+    ).data([
+        (card.id, *(card.changes.get(name) for name, _ in _VALUE_COLUMNS))
+        for card in updated
+    ])
+    return (
+        update(Card)
+        .where(Card.id == batch.c.id)
+        .values({
+            # NULL (unchanged) entries leave the column untyped; cast back before COALESCE
+            name: func.coalesce(cast(batch.c[name], type_), getattr(Card, name))
+            for name, type_ in _VALUE_COLUMNS
+        })
+        .execution_options(synchronize_session=False)
+    )
+
+
+class CardBatchService:
+    """Applies POST /cards/batch operations in one transaction"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def _load_cards(self, card_ids: Set[uuid.UUID]) -> Dict[uuid.UUID, _CardState]:
+        rows = (await self.db.execute(
+            select(
+                Card.id, Card.column_id, Card.created_by,
+                Column.board_id, Board.project_id, Project.organization_id,
+                Project.data_protected, Project.sign_off_requested, Project.sign_off_approved,
+            )
+            .join(Column, Column.id == Card.column_id)
+            .join(Board, Board.id == Column.board_id)
+            .join(Project, Project.id == Board.project_id)
+            .where(Card.id.in_(card_ids))
+        )).all()
+        cards = {}
+        for row in rows:
+            cards[row.id] = _CardState(
+                id=row.id,
+                column_id=row.column_id,
+                created_by=row.created_by,
+                board_id=row.board_id,
+                project_id=row.project_id,
+                organization_id=row.organization_id,
+                data_protected=bool(row.data_protected),
+                pending_sign_off=bool(row.sign_off_requested and not row.sign_off_approved),
+            )
+        return cards
+
+    async def _authorize(self, user_id: Any, cards: Dict[uuid.UUID, _CardState]) -> Dict[uuid.UUID, str]:
+        """The user's role in each affected project (one membership lookup)"""
+        memberships = await load_memberships(user_id, self.db)
+        roles = {}
+        for card in cards.values():
+            if card.project_id in roles:
+                continue
+            role = memberships.role_in(card.organization_id)
+            if role is None:
+                raise InsufficientPermissionsError("Access denied")
+            if role not in WRITE_ROLES:
+                raise InsufficientPermissionsError("Insufficient permissions")
+            roles[card.project_id] = role
+        return roles
+
+    async def apply(self, user, operations: Sequence[CardBatchOperation]) -> Dict[str, Any]:
+        """Validate and apply ``operations`` in order; all or nothing"""
+        cards = await self._load_cards({operation.card_id for operation in operations})
+        missing = {operation.card_id for operation in operations} - cards.keys()
+        if missing:
+            raise ResourceNotFoundError(f"Cards not found: {', '.join(sorted(str(card_id) for card_id in missing))}")
+        roles = await self._authorize(user.id, cards)
+
+        target_ids = {operation.target_column_id for operation in operations if operation.op == 'move'}
+        columns = {}
+        siblings: Dict[uuid.UUID, List[Tuple[str, uuid.UUID]]] = {}
+        if target_ids:
+            columns = {row.id: row for row in (await self.db.execute(
+                select(Column.id, Column.name, Column.board_id).where(Column.id.in_(target_ids))
+            )).all()}
+            for column_id, card_id, rank in (await self.db.execute(
+                select(Card.column_id, Card.id, Card.rank).where(Card.column_id.in_(target_ids)).order_by(Card.rank)
+            )).all():
+                siblings.setdefault(column_id, []).append((rank, card_id))
+
+        assigned: Set[Tuple[uuid.UUID, uuid.UUID]] = set()
+        assignment_cards = {operation.card_id for operation in operations if operation.op in ('assign', 'unassign')}
+        if assignment_cards:
+            assigned = set((await self.db.execute(
+                select(CardAssignment.card_id, CardAssignment.user_id)
+                .where(CardAssignment.card_id.in_(assignment_cards))
+            )).all())
+        initial_assigned = set(assigned)
+        await self._check_assignees(operations, cards)
+
+        deleted: Set[uuid.UUID] = set()
+        for operation in operations:
+            card = cards[operation.card_id]
+            role = roles[card.project_id]
+            if card.id in deleted:
+                raise ValidationError(f"Card {card.id} is deleted earlier in the batch")
+            if operation.op == 'move':
+                self._move(card, operation, columns, siblings)
+            elif operation.op == 'update':
+                self._check_owner(card, role, user.id, "modify")
+                if card.data_protected and card.pending_sign_off and role != 'owner':
+                    raise InsufficientPermissionsError("Limited updates allowed during sign-off review")
+                card.changes.update({
+                    name: getattr(operation, name)
+                    for name in UPDATE_FIELDS
+                    if getattr(operation, name) is not None
+                })
+            elif operation.op in ('assign', 'unassign'):
+                if role not in ASSIGNING_ROLES and any(user_id != user.id for user_id in operation.user_ids):
+                    raise InsufficientPermissionsError("Only owners and admins can assign tasks to other members")
+                pairs = {(card.id, user_id) for user_id in operation.user_ids}
+                assigned = assigned | pairs if operation.op == 'assign' else assigned - pairs
+            else:
+                self._check_owner(card, role, user.id, "delete")
+                if card.data_protected and role != 'owner':
+                    raise InsufficientPermissionsError("Cannot delete card: Project data is protected")
+                if card.data_protected and card.pending_sign_off:
+                    raise InsufficientPermissionsError("Cannot delete card: Project is pending sign-off approval")
+                deleted.add(card.id)
+                for keys in siblings.values():
+                    keys[:] = [(rank, card_id) for rank, card_id in keys if card_id != card.id]
+
+        assigned = {(card_id, user_id) for card_id, user_id in assigned if card_id not in deleted}
+        initial_assigned = {(card_id, user_id) for card_id, user_id in initial_assigned if card_id not in deleted}
+        updated = [card for card in cards.values() if card.changes and card.id not in deleted]
+        changes = await self._write(user.id, cards, updated, deleted, initial_assigned, assigned)
+        await self.db.commit()
+
+        versions = await self._board_versions({card.board_id for card in cards.values()})
+        await self._notify(user.id, cards, changes, versions)
+        return {
+            "success": True,
+            "applied": len(operations),
+            "updated": sorted(str(card.id) for card in updated),
+            "deleted": sorted(str(card_id) for card_id in deleted),
+            "boards": [{"board_id": str(board_id), "version": version} for board_id, version in versions.items()],
+        }
+
+    @staticmethod
+    def _check_owner(card: _CardState, role: str, user_id: Any, action: str) -> None:
+        # Members may only change cards they created (EnhancedRolePermissions.can_modify_resource)
+        if role == 'member' and card.created_by != user_id:
+            raise InsufficientPermissionsError(f"You can only {action} cards you created")
+
+    @staticmethod
+    def _move(card: _CardState, operation: CardBatchOperation, columns, siblings) -> None:
+        target = columns.get(operation.target_column_id)
+        if target is None or target.board_id != card.board_id:
+            raise ResourceNotFoundError("Target column not found or not in same board")
+        for keys in siblings.values():
+            keys[:] = [(rank, card_id) for rank, card_id in keys if card_id != card.id]
+        keys = siblings.setdefault(target.id, [])
+        index = len(keys) if operation.position is None else min(operation.position, len(keys))
+        before = keys[index - 1][0] if index else None
+        after = keys[index][0] if index < len(keys) else None
+        rank = key_between(before, after)
+        keys.insert(index, (rank, card.id))
+
+        card.column_id = target.id
+        card.changes.update(column_id=target.id, rank=rank, status=status_for_column(target.name))
+        if operation.position is not None:
+            card.changes["position"] = operation.position
+
+    async def _check_assignees(self, operations: Sequence[CardBatchOperation], cards: Dict[uuid.UUID, _CardState]) -> None:
+        """Assignees must belong to the card's organization (one query)"""
+        wanted = {
+            (cards[operation.card_id].organization_id, user_id)
+            for operation in operations if operation.op == 'assign'
+            for user_id in operation.user_ids
+        }
+        if not wanted:
+            return
+        found = set((await self.db.execute(
+            select(OrganizationMember.organization_id, OrganizationMember.user_id).where(
+                OrganizationMember.organization_id.in_({organization_id for organization_id, _ in wanted}),
+                OrganizationMember.user_id.in_({user_id for _, user_id in wanted}),
+            )
+        )).all())
+        outsiders = {user_id for _, user_id in wanted - found}
+        if outsiders:
+            raise ValidationError(
+                "Users are not members of this organization",
+                details={"user_ids": sorted(str(user_id) for user_id in outsiders)},
+            )
+
+    async def _update_cards(self, updated: List[_CardState]) -> None:
+        if self.db.bind.dialect.name == "postgresql":
+            await self.db.execute(values_update(updated))
+        else:
+            await self.db.execute(update(Card), [{"id": card.id, **card.changes} for card in updated])
+
+    async def _write(self, user_id, cards, updated, deleted, initial_assigned, assigned) -> List[Tuple[Any, str, Any, str]]:
+        """Issue the bulk statements; returns the change log entries"""
+        changes = [(card.board_id, "card", card.id, "upsert") for card in updated]
+        before = await snapshot_cards(self.db, [*(card.id for card in updated), *deleted])
+        if updated:
+            await self._update_cards(updated)
+            moved = [card.id for card in updated if "status" in card.changes]
+            if moved:
+                await self.db.execute(stamp_completions(moved))
+
+        removed = initial_assigned - assigned
+        if removed:
+            removed_ids = (await self.db.execute(
+                delete(CardAssignment)
+                .where(tuple_(CardAssignment.card_id, CardAssignment.user_id).in_(removed))
+                .returning(CardAssignment.card_id, CardAssignment.id)
+            )).all()
+            changes += [(cards[card_id].board_id, "assignment", assignment_id, "delete") for card_id, assignment_id in removed_ids]
+
+        added = [
+            {"id": uuid.uuid4(), "card_id": card_id, "user_id": assignee_id, "assigned_by": user_id}
+            for card_id, assignee_id in sorted(assigned - initial_assigned, key=str)
+        ]
+        if added:
+            await self.db.execute(insert(CardAssignment), added)
+            changes += [(cards[row["card_id"]].board_id, "assignment", row["id"], "upsert") for row in added]
+
+        if deleted:
+            await self.db.execute(
+                delete(Card).where(Card.id.in_(deleted)).execution_options(synchronize_session=False)
+            )
+            changes += [(cards[card_id].board_id, "card", card_id, "delete") for card_id in deleted]
+
+        await bump_board_versions(self.db, changes=changes)
+        await record_card_changes(self.db, before)
+        return changes
+
+    async def _board_versions(self, board_ids: Set[uuid.UUID]) -> Dict[uuid.UUID, int]:
+        return dict((await self.db.execute(
+            select(Board.id, Board.version).where(Board.id.in_(board_ids))
+        )).all())
+
+    async def _notify(self, user_id, cards, changes, versions) -> None:
+        """One task_update per changed board instead of one per card"""
+        from app.services.websocket_manager import manager
+
+        projects = {card.board_id: card.project_id for card in cards.values()}
+        changed_boards: Dict[uuid.UUID, Dict[str, Set[str]]] = {}
+        for board_id, entity_type, entity_id, operation in changes:
+            board = changed_boards.setdefault(board_id, {"cards": set(), "deleted_cards": set(), "assignments": set()})
+            if entity_type == "assignment":
+                board["assignments"].add(str(entity_id))
+            elif operation == "delete":
+                board["deleted_cards"].add(str(entity_id))
+            else:
+                board["cards"].add(str(entity_id))
+
+        for board_id, board in changed_boards.items():
+            try:
+                await manager.broadcast_task_update(
+                    task_update={
+                        "action": "batch_updated",
+                        "board_id": str(board_id),
+                        "version": versions.get(board_id),
+                        **{key: sorted(ids) for key, ids in board.items()},
+                    },
+                    project_id=str(projects[board_id]),
+                    exclude_user=str(user_id),
+                )
+            except Exception as e:
+                logger.warning(f"Failed to send batch update for board {board_id}: {e}")
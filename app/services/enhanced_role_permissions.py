@@ -2,10 +2,14 @@
 Enhanced Role-Based Access Control Service
 Comprehensive role permissions for owner/admin/member with specific operation restrictions
 """
-from typing import Dict, List, Optional, Any
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, List, Optional, Tuple
 from enum import Enum
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import event, inspect, select, and_
+from sqlalchemy.orm import Session
+
+from app.cache import cache_manager
+from app.config import settings
 
 from app.models.user import User
 from app.models.organization import OrganizationMember
@@ -15,6 +19,7 @@ from app.models.card import Card, CardAssignment
 from app.models.board import Board
 from app.models.column import Column
 from app.core.exceptions import InsufficientPermissionsError
+from app.core.memberships import load_memberships
 
 
 class Permission(Enum):
@@ -77,136 +82,185 @@ class Permission(Enum):
     MANAGE_NOTIFICATION_SETTINGS = "manage_notification_settings"
 
 
+# Define role permissions
+_ROLE_PERMISSION_SETS = {
+    'owner': {
+        # Organization Management
+        Permission.CREATE_ORGANIZATION,
+        Permission.MANAGE_ORGANIZATION,
+        Permission.DELETE_ORGANIZATION,
+        Permission.UPDATE_ORG_SETTINGS,
+        
+        # Project Management
+        Permission.CREATE_PROJECT,
+        Permission.VIEW_ALL_PROJECTS,
+        Permission.UPDATE_PROJECT,
+        Permission.DELETE_PROJECT,
+        
+        # Member Management
+        Permission.INVITE_ADMIN,
+        Permission.INVITE_MEMBER,
+        Permission.PROMOTE_TO_ADMIN,
+        Permission.PROMOTE_TO_MEMBER,
+        Permission.DEMOTE_ADMIN,
+        Permission.DEMOTE_MEMBER,
+        Permission.REMOVE_MEMBER,
+        
+        # Task Management
+        Permission.CREATE_TASK,
+        Permission.ASSIGN_TASK,
+        Permission.VIEW_ALL_TASKS,
+        Permission.UPDATE_TASK,
+        Permission.DELETE_TASK,
+        
+        # Meeting Management
+        Permission.SCHEDULE_MEETING,
+        Permission.SCHEDULE_TEAM_MEETING,
+        Permission.SCHEDULE_INDIVIDUAL_MEETING,
+        Permission.JOIN_MEETING,
+        Permission.CANCEL_MEETING,
+        
+        # Kanban Board Operations
+        Permission.CREATE_BOARD,
+        Permission.UPDATE_BOARD,
+        Permission.DELETE_BOARD,
+        Permission.CREATE_COLUMN,
+        Permission.UPDATE_COLUMN,
+        Permission.DELETE_COLUMN,
+        Permission.CREATE_CARD,
+        Permission.UPDATE_OWN_CARD,
+        Permission.UPDATE_ANY_CARD,
+        Permission.DELETE_OWN_CARD,
+        Permission.DELETE_ANY_CARD,
+        Permission.MOVE_CARD,
+        
+        # Notification Management
+        Permission.SEND_NOTIFICATION,
+        Permission.VIEW_ALL_NOTIFICATIONS,
+        Permission.MANAGE_NOTIFICATION_SETTINGS,
+    },
+    
+    'admin': {
+        # Project Management (if allowed by org settings)
+        Permission.VIEW_ALL_PROJECTS,
+        Permission.UPDATE_PROJECT,
+        
+        # Member Management (limited)
+        Permission.INVITE_MEMBER,
+        Permission.PROMOTE_TO_MEMBER,
+        Permission.DEMOTE_MEMBER,
+        
+        # Task Management
+        Permission.CREATE_TASK,
+        Permission.ASSIGN_TASK,
+        Permission.VIEW_ALL_TASKS,
+        Permission.UPDATE_TASK,
+        Permission.DELETE_TASK,
+        
+        # Meeting Management (if allowed by org settings)
+        Permission.JOIN_MEETING,
+        
+        # Kanban Board Operations
+        Permission.CREATE_BOARD,
+        Permission.UPDATE_BOARD,
+        Permission.CREATE_COLUMN,
+        Permission.UPDATE_COLUMN,
+        Permission.CREATE_CARD,
+        Permission.UPDATE_OWN_CARD,
+        Permission.UPDATE_ANY_CARD,
+        Permission.DELETE_OWN_CARD,
+        Permission.DELETE_ANY_CARD,
+        Permission.MOVE_CARD,
+        
+        # Notification Management
+        Permission.SEND_NOTIFICATION,
+        Permission.VIEW_ALL_NOTIFICATIONS,
+    },
+    
+    'member': {
+        # Project Management
+        Permission.VIEW_ASSIGNED_PROJECTS,
+
+        # Task Management
+        Permission.VIEW_ASSIGNED_TASKS,
+        Permission.ACCEPT_TASK,
+        Permission.UPDATE_OWN_CARD,  # Only own assigned cards
+
+        # Meeting Management
+        Permission.JOIN_MEETING,
+
+        # Kanban Board Operations (limited to own content)
+        Permission.CREATE_BOARD,  # Can create boards
+        Permission.UPDATE_BOARD,  # Only own boards (checked in _check_resource_permission)
+        Permission.DELETE_BOARD,  # Only own boards (checked in _check_resource_permission)
+        Permission.CREATE_CARD,  # Can create cards
+        Permission.UPDATE_OWN_CARD,  # Only own cards
+        Permission.DELETE_OWN_CARD,  # Only own cards
+        Permission.MOVE_CARD,  # Only own cards
+    },
+    
+    'viewer': {
+        # Very limited permissions
+        Permission.VIEW_ASSIGNED_PROJECTS,
+        Permission.VIEW_ASSIGNED_TASKS,
+        Permission.JOIN_MEETING,
+    }
+}
+
+# Precomputed once at import; membership tests are all check_permission needs
+ROLE_PERMISSIONS: Dict[str, FrozenSet[Permission]] = {
+    role: frozenset(permissions) for role, permissions in _ROLE_PERMISSION_SETS.items()
+}
+
+# Permissions further restricted by OrganizationSettings
+CONDITIONAL_PERMISSIONS: FrozenSet[Permission] = frozenset({
+    Permission.CREATE_PROJECT,
+    Permission.SCHEDULE_MEETING,
+    Permission.SCHEDULE_TEAM_MEETING,
+})
+
+CARD_OWNERSHIP_PERMISSIONS: FrozenSet[Permission] = frozenset({
+    Permission.UPDATE_OWN_CARD,
+    Permission.DELETE_OWN_CARD,
+    Permission.UPDATE_ANY_CARD,
+    Permission.DELETE_ANY_CARD,
+})
+
+BOARD_OWNERSHIP_PERMISSIONS: FrozenSet[Permission] = frozenset({
+    Permission.UPDATE_BOARD,
+    Permission.DELETE_BOARD,
+})
+
+
+def permission_org_tag(organization_id: Any) -> str:
+    return f"perm_org:{organization_id}"
+
+
+def permission_user_tag(user_id: Any) -> str:
+    return f"perm_user:{user_id}"
+
+
+def permission_resource_tag(resource_id: Any) -> str:
+    return f"perm_resource:{resource_id}"
+
+
+def permission_projects_tag(scope_id: Any) -> str:
+    """Accessible project lists of an organization or a user"""
+    return f"perm_projects:{scope_id}"
+
+
+# Resources members may only modify when they created them
+OWNED_RESOURCES = {"card": Card, "board": Board}
+
+
 class EnhancedRolePermissions:
     """Enhanced role-based permission system"""
     
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, decision_ttl: Optional[int] = None):
         self.db = db
-        
-        # Define role permissions
-        self.role_permissions = {
-            'owner': {
-                # Organization Management
-                Permission.CREATE_ORGANIZATION,
-                Permission.MANAGE_ORGANIZATION,
-                Permission.DELETE_ORGANIZATION,
-                Permission.UPDATE_ORG_SETTINGS,
-                
-                # Project Management
-                Permission.CREATE_PROJECT,
-                Permission.VIEW_ALL_PROJECTS,
-                Permission.UPDATE_PROJECT,
-                Permission.DELETE_PROJECT,
-                
-                # Member Management
-                Permission.INVITE_ADMIN,
-                Permission.INVITE_MEMBER,
-                Permission.PROMOTE_TO_ADMIN,
-                Permission.PROMOTE_TO_MEMBER,
-                Permission.DEMOTE_ADMIN,
-                Permission.DEMOTE_MEMBER,
-                Permission.REMOVE_MEMBER,
-                
-                # Task Management
-                Permission.CREATE_TASK,
-                Permission.ASSIGN_TASK,
-                Permission.VIEW_ALL_TASKS,
-                Permission.UPDATE_TASK,
-                Permission.DELETE_TASK,
-                
-                # Meeting Management
-                Permission.SCHEDULE_MEETING,
-                Permission.SCHEDULE_TEAM_MEETING,
-                Permission.SCHEDULE_INDIVIDUAL_MEETING,
-                Permission.JOIN_MEETING,
-                Permission.CANCEL_MEETING,
-                
-                # Kanban Board Operations
-                Permission.CREATE_BOARD,
-                Permission.UPDATE_BOARD,
-                Permission.DELETE_BOARD,
-                Permission.CREATE_COLUMN,
-                Permission.UPDATE_COLUMN,
-                Permission.DELETE_COLUMN,
-                Permission.CREATE_CARD,
-                Permission.UPDATE_OWN_CARD,
-                Permission.UPDATE_ANY_CARD,
-                Permission.DELETE_OWN_CARD,
-                Permission.DELETE_ANY_CARD,
-                Permission.MOVE_CARD,
-                
-                # Notification Management
-                Permission.SEND_NOTIFICATION,
-                Permission.VIEW_ALL_NOTIFICATIONS,
-                Permission.MANAGE_NOTIFICATION_SETTINGS,
-            },
-            
-            'admin': {
-                # Project Management (if allowed by org settings)
-                Permission.VIEW_ALL_PROJECTS,
-                Permission.UPDATE_PROJECT,
-                
-                # Member Management (limited)
-                Permission.INVITE_MEMBER,
-                Permission.PROMOTE_TO_MEMBER,
-                Permission.DEMOTE_MEMBER,
-                
-                # Task Management
-                Permission.CREATE_TASK,
-                Permission.ASSIGN_TASK,
-                Permission.VIEW_ALL_TASKS,
-                Permission.UPDATE_TASK,
-                Permission.DELETE_TASK,
-                
-                # Meeting Management (if allowed by org settings)
-                Permission.JOIN_MEETING,
-                
-                # Kanban Board Operations
-                Permission.CREATE_BOARD,
-                Permission.UPDATE_BOARD,
-                Permission.CREATE_COLUMN,
-                Permission.UPDATE_COLUMN,
-                Permission.CREATE_CARD,
-                Permission.UPDATE_OWN_CARD,
-                Permission.UPDATE_ANY_CARD,
-                Permission.DELETE_OWN_CARD,
-                Permission.DELETE_ANY_CARD,
-                Permission.MOVE_CARD,
-                
-                # Notification Management
-                Permission.SEND_NOTIFICATION,
-                Permission.VIEW_ALL_NOTIFICATIONS,
-            },
-            
-            'member': {
-                # Project Management
-                Permission.VIEW_ASSIGNED_PROJECTS,
-
-                # Task Management
-                Permission.VIEW_ASSIGNED_TASKS,
-                Permission.ACCEPT_TASK,
-                Permission.UPDATE_OWN_CARD,  # Only own assigned cards
-
-                # Meeting Management
-                Permission.JOIN_MEETING,
-
-                # Kanban Board Operations (limited to own content)
-                Permission.CREATE_BOARD,  # Can create boards
-                Permission.UPDATE_BOARD,  # Only own boards (checked in _check_resource_permission)
-                Permission.DELETE_BOARD,  # Only own boards (checked in _check_resource_permission)
-                Permission.CREATE_CARD,  # Can create cards
-                Permission.UPDATE_OWN_CARD,  # Only own cards
-                Permission.DELETE_OWN_CARD,  # Only own cards
-                Permission.MOVE_CARD,  # Only own cards
-            },
-            
-            'viewer': {
-                # Very limited permissions
-                Permission.VIEW_ASSIGNED_PROJECTS,
-                Permission.VIEW_ASSIGNED_TASKS,
-                Permission.JOIN_MEETING,
-            }
-        }
+        self.role_permissions = ROLE_PERMISSIONS
+        # Seconds a resource or settings dependent decision is reused; 0 disables
+        self.decision_ttl = settings.permission_cache_ttl if decision_ttl is None else decision_ttl
 
     async def check_permission(
         self, 
@@ -215,45 +269,74 @@ class EnhancedRolePermissions:
         permission: Permission,
         resource_id: Optional[str] = None
     ) -> bool:
-        """Check if user has specific permission in organization"""
+        """Check if user has specific permission in organization
+
+        Decisions that only depend on the role are answered from
+        ``ROLE_PERMISSIONS``. Decisions that also depend on organization
+        settings or on a resource are cached in this worker for
+        ``decision_ttl`` seconds and dropped when memberships, settings,
+        projects, boards or cards they depend on change.
+        """
         try:
             # Get user's role in organization
             role = await self.get_user_role(user_id, organization_id)
             if not role:
                 return False
-            
-            # Get base permissions for role
-            base_permissions = self.role_permissions.get(role, set())
-            
+
             # Check if permission is in base permissions
-            if permission not in base_permissions:
+            if permission not in self.role_permissions.get(role, frozenset()):
                 return False
-            
-            # Apply organization settings for conditional permissions
-            if permission in [Permission.CREATE_PROJECT, Permission.SCHEDULE_MEETING, Permission.SCHEDULE_TEAM_MEETING]:
-                return await self._check_conditional_permission(organization_id, role, permission)
-            
-            # Apply resource-specific checks
-            if resource_id:
-                return await self._check_resource_permission(user_id, organization_id, permission, resource_id)
-            
-            return True
-            
+
+            if permission not in CONDITIONAL_PERMISSIONS and not resource_id:
+                return True
+
+            return await self._cached_decision(
+                f"perm:{organization_id}:{user_id}:{role}:{permission.value}:{resource_id or '-'}",
+                lambda: self._decide(user_id, organization_id, role, permission, resource_id),
+                organization_id,
+                user_id,
+                resource_id,
+            )
+
         except Exception:
             return False
 
+    async def _decide(
+        self,
+        user_id: str,
+        organization_id: str,
+        role: str,
+        permission: Permission,
+        resource_id: Optional[str],
+    ) -> bool:
+        # Apply organization settings for conditional permissions
+        if permission in CONDITIONAL_PERMISSIONS:
+            return await self._check_conditional_permission(organization_id, role, permission)
+
+        # Apply resource-specific checks
+        return await self._check_resource_permission(user_id, role, permission, resource_id)
+
+    async def _cached_decision(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        organization_id: str,
+        user_id: str,
+        resource_id: Optional[str] = None,
+        extra_tags: Tuple[str, ...] = (),
+    ) -> Any:
+        if self.decision_ttl <= 0:
+            return await loader()
+        tags = [permission_org_tag(organization_id), permission_user_tag(user_id), *extra_tags]
+        if resource_id:
+            tags.append(permission_resource_tag(resource_id))
+        # Decisions are cheap to recompute and vary per worker; keep them in L1
+        return await cache_manager.get_or_set(key, loader, ttl=self.decision_ttl, tags=tags, local_only=True)
+
     async def get_user_role(self, user_id: str, organization_id: str) -> Optional[str]:
         """Get user's role in organization"""
-        result = await self.db.execute(
-            select(OrganizationMember.role)
-            .where(
-                and_(
-                    OrganizationMember.user_id == user_id,
-                    OrganizationMember.organization_id == organization_id
-                )
-            )
-        )
-        return result.scalar_one_or_none()
+        memberships = await load_memberships(user_id, self.db)
+        return memberships.role_in(organization_id)
 
     async def get_user_permissions(self, user_id: str, organization_id: str) -> List[str]:
         """Get all permissions for user in organization"""
@@ -261,7 +344,7 @@ class EnhancedRolePermissions:
         if not role:
             return []
         
-        base_permissions = self.role_permissions.get(role, set())
+        base_permissions = self.role_permissions.get(role, frozenset())
         permissions = []
         
         for permission in base_permissions:
@@ -308,6 +391,19 @@ class EnhancedRolePermissions:
     async def get_accessible_projects(self, user_id: str, organization_id: str) -> List[str]:
         """Get list of project IDs user can access"""
         role = await self.get_user_role(user_id, organization_id)
+        if role is None:
+            return []
+
+        return await self._cached_decision(
+            f"perm_projects:{organization_id}:{user_id}:{role}",
+            lambda: self._query_accessible_projects(user_id, organization_id, role),
+            organization_id,
+            user_id,
+            # Also changes when projects are created or the user's card assignments change
+            extra_tags=(permission_projects_tag(organization_id), permission_projects_tag(user_id)),
+        )
+
+    async def _query_accessible_projects(self, user_id: str, organization_id: str, role: str) -> List[str]:
 
         if role in ['owner', 'admin', 'member']:
             # Can access all projects in organization
@@ -373,52 +469,45 @@ class EnhancedRolePermissions:
     async def _check_resource_permission(
         self,
         user_id: str,
-        organization_id: str,
+        role: str,
         permission: Permission,
         resource_id: str
     ) -> bool:
         """Check resource-specific permissions"""
-        from app.models.card import Card
-        from app.models.board import Board
-
         # For card operations, check ownership for members
-        if permission in [Permission.UPDATE_OWN_CARD, Permission.DELETE_OWN_CARD, Permission.UPDATE_ANY_CARD, Permission.DELETE_ANY_CARD]:
-            user_role = await self.get_user_role(user_id, organization_id)
-
+        if permission in CARD_OWNERSHIP_PERMISSIONS:
             # Owners and admins can modify any card
-            if user_role in ['owner', 'admin']:
+            if role in ['owner', 'admin']:
                 return True
 
             # Members can only modify cards they created
-            if user_role == 'member':
-                result = await self.db.execute(
-                    select(Card).where(Card.id == resource_id)
-                )
-                card = result.scalar_one_or_none()
-                return card is not None and str(card.created_by) == user_id
+            if role == 'member':
+                return await self._is_creator(user_id, Card, resource_id)
 
             return False
 
         # For board operations, check ownership for members
-        if permission in [Permission.UPDATE_BOARD, Permission.DELETE_BOARD]:
-            user_role = await self.get_user_role(user_id, organization_id)
-
+        if permission in BOARD_OWNERSHIP_PERMISSIONS:
             # Owners and admins can modify any board
-            if user_role in ['owner', 'admin']:
+            if role in ['owner', 'admin']:
                 return True
 
             # Members can only modify boards they created
-            if user_role == 'member':
-                result = await self.db.execute(
-                    select(Board).where(Board.id == resource_id)
-                )
-                board = result.scalar_one_or_none()
-                return board is not None and str(board.created_by) == user_id
+            if role == 'member':
+                return await self._is_creator(user_id, Board, resource_id)
 
             return False
 
         return True
 
+    async def _is_creator(self, user_id: str, model, resource_id: str) -> bool:
+        """Whether ``user_id`` created the card or board ``resource_id``"""
+        result = await self.db.execute(
+            select(model.created_by).where(model.id == resource_id)
+        )
+        created_by = result.scalar_one_or_none()
+        return created_by is not None and str(created_by) == str(user_id)
+
     async def can_view_resource(
         self,
         user_id: str,
@@ -454,22 +543,86 @@ class EnhancedRolePermissions:
             return True
 
         # Members can only modify resources they created
-        if user_role == 'member':
-            if resource_type == 'card':
-                from app.models.card import Card
-                result = await self.db.execute(
-                    select(Card).where(Card.id == resource_id)
-                )
-                card = result.scalar_one_or_none()
-                return card is not None and str(card.created_by) == user_id
-
-            elif resource_type == 'board':
-                from app.models.board import Board
-                result = await self.db.execute(
-                    select(Board).where(Board.id == resource_id)
-                )
-                board = result.scalar_one_or_none()
-                return board is not None and str(board.created_by) == user_id
+        if user_role == 'member' and resource_type in OWNED_RESOURCES:
+            return await self._cached_decision(
+                f"perm_creator:{user_id}:{resource_type}:{resource_id}",
+                lambda: self._is_creator(user_id, OWNED_RESOURCES[resource_type], resource_id),
+                organization_id,
+                user_id,
+                resource_id,
+            )
 
         # Viewers cannot modify anything
         return False
+
+
+# Updates to these objects only matter when the listed attributes change
+_DECIDING_ATTRIBUTES = {
+    OrganizationMember: ("organization_id", "user_id", "role"),
+    CardAssignment: ("card_id", "user_id"),
+    Project: ("organization_id", "created_by"),
+    Board: ("created_by",),
+    Card: ("created_by",),
+}
+
+
+def _permission_tags(obj, is_new: bool = False) -> List[str]:
+    """Cached decisions that a flushed object may change
+
+    Inserted rows only change project lists and settings defaults: the role
+    is part of every decision key, and no decision was cached for a card or
+    board that did not exist yet.
+    """
+    if isinstance(obj, CardAssignment):
+        # Viewers see the projects of the cards they are assigned to
+        return [permission_projects_tag(user_id) for user_id in _current_and_previous(obj, "user_id")]
+    if isinstance(obj, OrganizationSettings):
+        return [permission_org_tag(obj.organization_id)]
+    if isinstance(obj, Project) and is_new:
+        return [permission_projects_tag(obj.organization_id)]
+    if is_new:
+        return []
+    if isinstance(obj, OrganizationMember):
+        return [permission_user_tag(user_id) for user_id in _current_and_previous(obj, "user_id")]
+    if isinstance(obj, Project):
+        # A project moved between organizations affects both
+        return [permission_org_tag(org_id) for org_id in _current_and_previous(obj, "organization_id")]
+    if isinstance(obj, (Card, Board)):
+        return [permission_resource_tag(obj.id)]
+    return []
+
+
+def _current_and_previous(obj, attribute: str) -> set:
+    previous = inspect(obj).attrs[attribute].history.deleted
+    return {value for value in (getattr(obj, attribute), *previous) if value}
+
+
+def _deciding_attributes_changed(obj) -> bool:
+    attributes = _DECIDING_ATTRIBUTES.get(type(obj))
+    if attributes is None:
+        return True
+    state = inspect(obj)
+    return any(state.attrs[name].history.has_changes() for name in attributes)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_permission_changes(session, flush_context):
+    tags = {tag for obj in session.new for tag in _permission_tags(obj, is_new=True)}
+    for obj in [*session.deleted, *filter(_deciding_attributes_changed, session.dirty)]:
+        tags.update(_permission_tags(obj))
+    if tags:
+        session.info.setdefault("permission_changes", set()).update(tags)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_permissions_after_commit(session):
+    tags = session.info.pop("permission_changes", None)
+    if tags:
+        cache_manager.invalidate_soon(tags=tags)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_permission_changes(session, transaction):
+    # Runs after after_commit; anything left belongs to a rolled back transaction
+    if transaction.parent is None:
+        session.info.pop("permission_changes", None)
@@ -15,6 +15,10 @@ from app.models.project import Project
 from app.models.card import Card
 from app.models.notification import Notification
 from app.core.exceptions import ValidationError
+from app.core.pagination import keyset
+
+# Keyset ordering of notification listings (newest first)
+NOTIFICATION_PAGE_KEY = (Notification.created_at, Notification.id)
 
 
 class InAppNotificationService:
@@ -496,9 +500,14 @@ class InAppNotificationService:
         unread_only: bool = False,
         category: Optional[str] = None,
         limit: int = 50,
-        offset: int = 0
+        offset: int = 0,
+        after: Optional[List[Any]] = None
     ) -> List[Notification]:
-        """Get notifications for a user with filtering options"""
+        """Get notifications for a user with filtering options
+
+        Newest first, by ``(created_at, id)``. ``after`` is a decoded cursor
+        (see ``app.core.pagination``) and replaces ``offset``.
+        """
 
         query = select(Notification).where(Notification.user_id == user_id)
 
@@ -519,8 +528,9 @@ class InAppNotificationService:
             )
         )
 
-        query = query.order_by(Notification.created_at.desc())
-        query = query.offset(offset).limit(limit)
+        query = keyset(query, NOTIFICATION_PAGE_KEY, after, descending=True).limit(limit)
+        if after is None:
+            query = query.offset(offset)
 
         result = await self.db.execute(query)
         return result.scalars().all()
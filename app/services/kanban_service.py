@@ -6,16 +6,49 @@ import uuid
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete, func
-from sqlalchemy.orm import selectinload
+from sqlalchemy import delete
 
-from app.models.project import Project
 from app.models.board import Board
 from app.models.column import Column as ColumnModel
 from app.models.card import Card, CardAssignment, ChecklistItem
-from app.models.user import User
-from app.models.organization import OrganizationMember
+from app.models.user import User, display_name
+from app.core.board_versions import bump_board_versions
 from app.core.exceptions import ResourceNotFoundError, InsufficientPermissionsError
+from app.core.responses import json_timestamp
+from app.core.ordering import rank_at
+from app.core.project_stats import record_card_changes, snapshot_cards
+from app.database import statements
+from app.database.board_snapshot import board_snapshot_json
+
+
+# Standard column name to status mapping
+COLUMN_STATUSES = {
+    'to-do': 'todo',
+    'todo': 'todo',
+    'to do': 'todo',
+    'backlog': 'todo',
+    'new': 'todo',
+    'in progress': 'in_progress',
+    'in-progress': 'in_progress',
+    'progress': 'in_progress',
+    'doing': 'in_progress',
+    'active': 'in_progress',
+    'working': 'in_progress',
+    'review': 'in_progress',  # Review is still work in progress
+    'testing': 'in_progress',
+    'qa': 'in_progress',
+    'done': 'completed',
+    'complete': 'completed',
+    'completed': 'completed',
+    'finished': 'completed',
+    'closed': 'completed',
+    'resolved': 'completed'
+}
+
+
+def status_for_column(column_name: str) -> str:
+    """Card status implied by the column a card is in"""
+    return COLUMN_STATUSES.get(column_name.lower().strip(), 'todo')
 
 
 class KanbanService:
@@ -34,7 +67,7 @@ class KanbanService:
         
         # Check if project exists and user has access
         project_result = await self.db.execute(
-            select(Project).where(Project.id == project_id)
+            statements.project_by_id(project_id)
         )
         project = project_result.scalar_one_or_none()
         if not project:
@@ -42,10 +75,7 @@ class KanbanService:
         
         # Check user permissions
         org_member_result = await self.db.execute(
-            select(OrganizationMember).where(
-                OrganizationMember.organization_id == project.organization_id,
-                OrganizationMember.user_id == user_id
-            )
+            statements.org_member(project.organization_id, user_id)
         )
         org_member = org_member_result.scalar_one_or_none()
         if not org_member:
@@ -53,7 +83,7 @@ class KanbanService:
         
         # Check if board already exists
         board_result = await self.db.execute(
-            select(Board).where(Board.project_id == project_id)
+            statements.board_for_project(project_id)
         )
         existing_board = board_result.scalar_one_or_none()
         
@@ -97,13 +127,7 @@ class KanbanService:
         """Get board with all its columns and verify user access"""
         
         board_result = await self.db.execute(
-            select(Board)
-            .options(
-                selectinload(Board.project),
-                selectinload(Board.columns).selectinload(ColumnModel.cards)
-                .selectinload(Card.assignments).selectinload(CardAssignment.user)
-            )
-            .where(Board.id == board_id)
+            statements.board_with_cards(board_id)
         )
         board = board_result.scalar_one_or_none()
         if not board:
@@ -111,17 +135,15 @@ class KanbanService:
         
         # Check user permissions
         org_member_result = await self.db.execute(
-            select(OrganizationMember).where(
-                OrganizationMember.organization_id == board.project.organization_id,
-                OrganizationMember.user_id == user_id
-            )
+            statements.org_member(board.project.organization_id, user_id)
         )
         org_member = org_member_result.scalar_one_or_none()
         if not org_member:
             raise InsufficientPermissionsError("Access denied")
         
-        # Sort columns by position
-        columns = sorted(board.columns, key=lambda x: x.position)
+        # Sort by ordering key; "position" reports the index in that order. Rendered
+        # like the JSON snapshot (assignments by assigned_at, PostgreSQL timestamps)
+        columns = sorted(board.columns, key=lambda x: x.rank)
         
         return {
             "id": str(board.id),
@@ -132,7 +154,8 @@ class KanbanService:
                 {
                     "id": str(col.id),
                     "name": col.name,
-                    "position": col.position,
+                    "position": col_index,
+                    "rank": col.rank,
                     "color": col.color,
                     "board_id": str(col.board_id),
                     "cards": [
@@ -142,39 +165,47 @@ class KanbanService:
                             "description": card.description,
                             "priority": card.priority,
                             "status": card.status,
-                            "position": card.position,
+                            "position": card_index,
+                            "rank": card.rank,
                             "column_id": str(card.column_id),
                             "created_by": str(card.created_by),
-                            "created_at": card.created_at.isoformat(),
-                            "updated_at": card.updated_at.isoformat(),
-                            "due_date": card.due_date.isoformat() if card.due_date else None,
+                            "created_at": json_timestamp(card.created_at),
+                            "updated_at": json_timestamp(card.updated_at),
+                            "due_date": json_timestamp(card.due_date),
                             "labels": card.labels or [],
                             "assignments": [
                                 {
                                     "id": str(assignment.id),
                                     "user_id": str(assignment.user_id),
                                     "assigned_by": str(assignment.assigned_by) if assignment.assigned_by else None,
-                                    "assigned_at": assignment.assigned_at.isoformat() if assignment.assigned_at else None,
+                                    "assigned_at": json_timestamp(assignment.assigned_at),
                                     "user": {
                                         "id": str(assignment.user.id),
                                         "email": assignment.user.email,
                                         "first_name": assignment.user.first_name,
                                         "last_name": assignment.user.last_name,
-                                        "full_name": f"{assignment.user.first_name} {assignment.user.last_name}"
+                                        "full_name": display_name(assignment.user.first_name, assignment.user.last_name)
                                     }
                                 }
-                                for assignment in card.assignments
+                                for assignment in sorted(card.assignments, key=lambda x: (x.assigned_at, x.id))
                             ] if hasattr(card, 'assignments') and card.assignments else []
                         }
-                        for card in sorted(col.cards, key=lambda x: x.position)
+                        for card_index, card in enumerate(sorted(col.cards, key=lambda x: x.rank))
                     ]
                 }
-                for col in columns
+                for col_index, col in enumerate(columns)
             ],
-            "created_at": board.created_at.isoformat(),
-            "updated_at": board.updated_at.isoformat()
+            "created_at": json_timestamp(board.created_at),
+            "updated_at": json_timestamp(board.updated_at)
         }
     
+    async def get_board_snapshot_json(self, board_id: str, user_id: str) -> Optional[bytes]:
+        """Board document from ``get_board_with_columns`` as JSON bytes built in one query
+
+        Returns None when the database cannot build it (not PostgreSQL).
+        """
+        return await board_snapshot_json(self.db, board_id, user_id)
+
     async def create_column(
         self, 
         board_id: str, 
@@ -186,9 +217,7 @@ class KanbanService:
         
         # Verify board exists and user has access
         board_result = await self.db.execute(
-            select(Board)
-            .options(selectinload(Board.project))
-            .where(Board.id == board_id)
+            statements.board_with_project(board_id)
         )
         board = board_result.scalar_one_or_none()
         if not board:
@@ -196,10 +225,7 @@ class KanbanService:
         
         # Check user permissions
         org_member_result = await self.db.execute(
-            select(OrganizationMember).where(
-                OrganizationMember.organization_id == board.project.organization_id,
-                OrganizationMember.user_id == user_id
-            )
+            statements.org_member(board.project.organization_id, user_id)
         )
         org_member = org_member_result.scalar_one_or_none()
         if not org_member:
@@ -207,7 +233,7 @@ class KanbanService:
         
         # Get next position
         max_position_result = await self.db.execute(
-            select(func.max(ColumnModel.position)).where(ColumnModel.board_id == board_id)
+            statements.max_column_position(board_id)
         )
         max_position = max_position_result.scalar_one_or_none() or -1
 
@@ -238,11 +264,7 @@ class KanbanService:
         
         # Verify column exists and user has access
         column_result = await self.db.execute(
-            select(ColumnModel)
-            .options(
-                selectinload(ColumnModel.board).selectinload(Board.project)
-            )
-            .where(ColumnModel.id == column_id)
+            statements.column_with_project(column_id)
         )
         column = column_result.scalar_one_or_none()
         if not column:
@@ -250,10 +272,7 @@ class KanbanService:
         
         # Check user permissions
         org_member_result = await self.db.execute(
-            select(OrganizationMember).where(
-                OrganizationMember.organization_id == column.board.project.organization_id,
-                OrganizationMember.user_id == user_id
-            )
+            statements.org_member(column.board.project.organization_id, user_id)
         )
         org_member = org_member_result.scalar_one_or_none()
         if not org_member:
@@ -261,13 +280,7 @@ class KanbanService:
         
         # Get cards
         cards_result = await self.db.execute(
-            select(Card)
-            .options(
-                selectinload(Card.assignments).selectinload(CardAssignment.user),
-                selectinload(Card.checklist_items)
-            )
-            .where(Card.column_id == column_id)
-            .order_by(Card.position)
+            statements.column_cards(column_id)
         )
         cards = cards_result.scalars().all()
         
@@ -277,7 +290,7 @@ class KanbanService:
                 "column_id": str(card.column_id),
                 "title": card.title,
                 "description": card.description,
-                "position": card.position,
+                "position": index,
                 "priority": card.priority,
                 "status": card.status,
                 "due_date": card.due_date.isoformat() if card.due_date else None,
@@ -303,7 +316,7 @@ class KanbanService:
                     for item in card.checklist_items
                 ]
             }
-            for card in cards
+            for index, card in enumerate(cards)
         ]
 
     async def create_card(
@@ -321,11 +334,7 @@ class KanbanService:
 
         # Verify column exists and user has access
         column_result = await self.db.execute(
-            select(ColumnModel)
-            .options(
-                selectinload(ColumnModel.board).selectinload(Board.project)
-            )
-            .where(ColumnModel.id == column_id)
+            statements.column_with_project(column_id)
         )
         column = column_result.scalar_one_or_none()
         if not column:
@@ -333,10 +342,7 @@ class KanbanService:
 
         # Check user permissions
         org_member_result = await self.db.execute(
-            select(OrganizationMember).where(
-                OrganizationMember.organization_id == column.board.project.organization_id,
-                OrganizationMember.user_id == user_id
-            )
+            statements.org_member(column.board.project.organization_id, user_id)
         )
         org_member = org_member_result.scalar_one_or_none()
         if not org_member:
@@ -344,7 +350,7 @@ class KanbanService:
 
         # Get next position in column
         max_position_result = await self.db.execute(
-            select(func.max(Card.position)).where(Card.column_id == column_id)
+            statements.max_card_position(column_id)
         )
         max_position = max_position_result.scalar_one_or_none() or -1
 
@@ -369,10 +375,7 @@ class KanbanService:
             for assignee_id in assigned_to:
                 # Verify assignee exists and is in the organization
                 assignee_result = await self.db.execute(
-                    select(OrganizationMember).where(
-                        OrganizationMember.organization_id == column.board.project.organization_id,
-                        OrganizationMember.user_id == assignee_id
-                    )
+                    statements.org_member(column.board.project.organization_id, assignee_id)
                 )
                 if assignee_result.scalar_one_or_none():
                     assignment = CardAssignment(
@@ -387,11 +390,7 @@ class KanbanService:
 
         # Return card with assignments
         card_with_assignments = await self.db.execute(
-            select(Card)
-            .options(
-                selectinload(Card.assignments).selectinload(CardAssignment.user)
-            )
-            .where(Card.id == card.id)
+            statements.card_with_assignments(card.id)
         )
         card = card_with_assignments.scalar_one()
 
@@ -420,33 +419,7 @@ class KanbanService:
 
     def _get_status_from_column_name(self, column_name: str) -> str:
         """Map column name to card status"""
-        column_name_lower = column_name.lower().strip()
-
-        # Standard column name to status mapping
-        status_mapping = {
-            'to-do': 'todo',
-            'todo': 'todo',
-            'to do': 'todo',
-            'backlog': 'todo',
-            'new': 'todo',
-            'in progress': 'in_progress',
-            'in-progress': 'in_progress',
-            'progress': 'in_progress',
-            'doing': 'in_progress',
-            'active': 'in_progress',
-            'working': 'in_progress',
-            'review': 'in_progress',  # Review is still work in progress
-            'testing': 'in_progress',
-            'qa': 'in_progress',
-            'done': 'completed',
-            'complete': 'completed',
-            'completed': 'completed',
-            'finished': 'completed',
-            'closed': 'completed',
-            'resolved': 'completed'
-        }
-
-        return status_mapping.get(column_name_lower, 'todo')
+        return status_for_column(column_name)
 
     async def move_card(
         self,
@@ -459,13 +432,7 @@ class KanbanService:
 
         # Get card with current column info
         card_result = await self.db.execute(
-            select(Card)
-            .options(
-                selectinload(Card.column)
-                .selectinload(ColumnModel.board)
-                .selectinload(Board.project)
-            )
-            .where(Card.id == card_id)
+            statements.card_with_project(card_id)
         )
         card = card_result.scalar_one_or_none()
         if not card:
@@ -473,11 +440,7 @@ class KanbanService:
 
         # Get target column
         target_column_result = await self.db.execute(
-            select(ColumnModel)
-            .options(
-                selectinload(ColumnModel.board).selectinload(Board.project)
-            )
-            .where(ColumnModel.id == target_column_id)
+            statements.column_with_project(target_column_id)
         )
         target_column = target_column_result.scalar_one_or_none()
         if not target_column:
@@ -485,29 +448,23 @@ class KanbanService:
 
         # Check user permissions
         org_member_result = await self.db.execute(
-            select(OrganizationMember).where(
-                OrganizationMember.organization_id == card.column.board.project.organization_id,
-                OrganizationMember.user_id == user_id
-            )
+            statements.org_member(card.column.board.project.organization_id, user_id)
         )
         org_member = org_member_result.scalar_one_or_none()
         if not org_member:
             raise InsufficientPermissionsError("Access denied")
 
-        # Determine new position
-        if position is None:
-            max_position_result = await self.db.execute(
-                select(func.max(Card.position)).where(Card.column_id == target_column_id)
-            )
-            max_position = max_position_result.scalar_one_or_none() or -1
-            position = max_position + 1
+        # Key between the new neighbours (appends when no position is given); only this card is written
+        rank = await rank_at(self.db, Card, target_column.id, position, exclude_id=card.id)
 
         # Update card column, position, and status based on target column
         old_status = card.status
         new_status = self._get_status_from_column_name(target_column.name)
 
         card.column_id = target_column_id
-        card.position = position
+        card.rank = rank
+        if position is not None:
+            card.position = position
         card.status = new_status
         card.updated_at = datetime.utcnow()
 
@@ -528,14 +485,7 @@ class KanbanService:
 
         # Get card with access verification
         card_result = await self.db.execute(
-            select(Card)
-            .options(
-                selectinload(Card.column)
-                .selectinload(ColumnModel.board)
-                .selectinload(Board.project),
-                selectinload(Card.assignments).selectinload(CardAssignment.user)
-            )
-            .where(Card.id == card_id)
+            statements.card_with_project_and_assignments(card_id)
         )
         card = card_result.scalar_one_or_none()
         if not card:
@@ -543,10 +493,7 @@ class KanbanService:
 
         # Check user permissions
         org_member_result = await self.db.execute(
-            select(OrganizationMember).where(
-                OrganizationMember.organization_id == card.column.board.project.organization_id,
-                OrganizationMember.user_id == user_id
-            )
+            statements.org_member(card.column.board.project.organization_id, user_id)
         )
         org_member = org_member_result.scalar_one_or_none()
         if not org_member:
@@ -593,13 +540,7 @@ class KanbanService:
 
         # Get card with access verification
         card_result = await self.db.execute(
-            select(Card)
-            .options(
-                selectinload(Card.column)
-                .selectinload(ColumnModel.board)
-                .selectinload(Board.project)
-            )
-            .where(Card.id == card_id)
+            statements.card_with_project(card_id)
         )
         card = card_result.scalar_one_or_none()
         if not card:
@@ -607,10 +548,7 @@ class KanbanService:
 
         # Check user permissions
         org_member_result = await self.db.execute(
-            select(OrganizationMember).where(
-                OrganizationMember.organization_id == card.column.board.project.organization_id,
-                OrganizationMember.user_id == user_id
-            )
+            statements.org_member(card.column.board.project.organization_id, user_id)
         )
         org_member = org_member_result.scalar_one_or_none()
         if not org_member:
@@ -632,7 +570,12 @@ class KanbanService:
         if assigned_to is not None:
             try:
                 # Delete existing assignments
-                await self.db.execute(delete(CardAssignment).where(CardAssignment.card_id == card.id))
+                removed = (await self.db.execute(
+                    delete(CardAssignment).where(CardAssignment.card_id == card.id).returning(CardAssignment.id)
+                )).scalars().all()
+                await bump_board_versions(self.db, changes=[
+                    (card.column.board_id, "assignment", assignment_id, "delete") for assignment_id in removed
+                ])
 
                 # Add new assignments
                 for assignee_id in assigned_to:
@@ -680,12 +623,7 @@ class KanbanService:
 
         # Reload card with checklist items and assignments
         card_result = await self.db.execute(
-            select(Card)
-            .options(
-                selectinload(Card.checklist_items),
-                selectinload(Card.assignments).selectinload(CardAssignment.user)
-            )
-            .where(Card.id == card_id)
+            statements.card_with_relations(card_id)
         )
         updated_card = card_result.scalar_one()
 
@@ -732,13 +670,7 @@ class KanbanService:
 
         # Get card with access verification
         card_result = await self.db.execute(
-            select(Card)
-            .options(
-                selectinload(Card.column)
-                .selectinload(ColumnModel.board)
-                .selectinload(Board.project)
-            )
-            .where(Card.id == card_id)
+            statements.card_with_project(card_id)
         )
         card = card_result.scalar_one_or_none()
         if not card:
@@ -746,17 +678,18 @@ class KanbanService:
 
         # Check user permissions
         org_member_result = await self.db.execute(
-            select(OrganizationMember).where(
-                OrganizationMember.organization_id == card.column.board.project.organization_id,
-                OrganizationMember.user_id == user_id
-            )
+            statements.org_member(card.column.board.project.organization_id, user_id)
         )
         org_member = org_member_result.scalar_one_or_none()
         if not org_member:
             raise InsufficientPermissionsError("Access denied")
 
         # Delete card (cascade will handle assignments, comments, etc.)
+        before = await snapshot_cards(self.db, [card.id])
         await self.db.execute(delete(Card).where(Card.id == card_id))
+        await record_card_changes(self.db, before)
+        # Assignments go with the card (ON DELETE CASCADE); its tombstone covers them
+        await bump_board_versions(self.db, changes=[(card.column.board_id, "card", card.id, "delete")])
         await self.db.commit()
 
         return True
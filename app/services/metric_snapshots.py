@@ -0,0 +1,386 @@
+"""
+Organization metric snapshots and downsampled time series
+
+Trend charts used to count cards per day on every request, or returned
+fixed numbers. ``MetricSnapshotCollector`` samples a few per-organization
+metrics every ``METRIC_SNAPSHOT_INTERVAL`` seconds into ``metric_snapshots``
+and rolls them up into coarser buckets as the buckets end:
+
+- ``minute`` samples are kept ``METRIC_MINUTE_RETENTION_HOURS``
+- ``hour`` rollups are kept ``METRIC_HOUR_RETENTION_DAYS``
+- ``day`` rollups are kept ``METRIC_DAY_RETENTION_DAYS``
+
+Each metric says how its samples combine: cards created and completed are
+flows and are summed, ``active_users`` keeps the peak and
+``completion_rate`` the mean. Finer rows are pruned only once they have
+been rolled up. Rows are unique per organization, metric, resolution and
+bucket start, and every write skips existing rows; one worker at a time
+runs the collector (``app.core.worker_lease``), and a worker taking over
+still writes each bucket once. Rows written before rollups existed have
+the ``legacy`` resolution and are neither rolled up nor served.
+
+``metric_series`` serves a time range from one resolution and fills the
+tail that is not rolled up yet from the finer rows.
+"""
+import asyncio
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.core.database import async_session_factory
+from app.core.exceptions import ValidationError
+from app.core.worker_lease import WorkerLease
+from app.models.analytics import MetricSnapshot
+from app.models.board import Board
+from app.models.card import Card
+from app.models.column import Column
+from app.models.organization import OrganizationMember
+from app.models.project import Project
+from app.models.project_stats import ProjectStats
+from app.models.session import UserSession
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Metric:
+    name: str
+    unit: str
+    # How samples combine into a coarser bucket: sum, max or avg
+    aggregate: str
+    # Value of a bucket without samples (rows are only written for non-empty samples)
+    empty: Optional[float]
+
+
+METRICS = {
+    "cards_created": Metric("Cards created", "count", "sum", 0),
+    "cards_completed": Metric("Cards completed", "count", "sum", 0),
+    "active_users": Metric("Active users", "count", "max", 0),
+    "completion_rate": Metric("Completion rate", "percentage", "avg", None),
+}
+
+RESOLUTIONS = ("minute", "hour", "day")
+BUCKET_LENGTHS = {"hour": timedelta(hours=1), "day": timedelta(days=1)}
+
+# Most points one series request may return
+MAX_POINTS = 2000
+
+# Rollup buckets written per resolution and run, so a long outage catches up gradually
+MAX_ROLLUPS_PER_RUN = 48
+
+_AGGREGATES = {"sum": sum, "max": max, "avg": lambda values: sum(values) / len(values)}
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _utc(value: datetime) -> datetime:
+    # SQLite returns naive datetimes; everything is stored in UTC
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _floor(value: datetime, length: timedelta) -> datetime:
+    """Start of the UTC-aligned bucket of ``length`` containing ``value``"""
+    return _EPOCH + (_utc(value) - _EPOCH) // length * length
+
+
+def bucket_length(resolution: str) -> timedelta:
+    if resolution == "minute":
+        return timedelta(seconds=settings.metric_snapshot_interval)
+    return BUCKET_LENGTHS[resolution]
+
+
+def retention(resolution: str) -> timedelta:
+    if resolution == "minute":
+        return timedelta(hours=settings.metric_minute_retention_hours)
+    if resolution == "hour":
+        return timedelta(days=settings.metric_hour_retention_days)
+    return timedelta(days=settings.metric_day_retention_days)
+
+
+def sample_queries(start: datetime, end: datetime) -> Dict[str, Any]:
+    """(organization id, value) per organization for every metric, over the window [start, end)"""
+    org_cards = (
+        select(Project.organization_id, func.count(Card.id))
+        .select_from(Card)
+        .join(Column, Column.id == Card.column_id)
+        .join(Board, Board.id == Column.board_id)
+        .join(Project, Project.id == Board.project_id)
+        .group_by(Project.organization_id)
+    )
+    return {
+        "cards_created": org_cards.where(Card.created_at >= start, Card.created_at < end),
+        "cards_completed": org_cards.where(Card.completed_at >= start, Card.completed_at < end),
+        # Session activity is stored as naive UTC
+        "active_users": (
+            select(OrganizationMember.organization_id, func.count(func.distinct(UserSession.user_id)))
+            .join(UserSession, UserSession.user_id == OrganizationMember.user_id)
+            .where(UserSession.last_activity >= start.replace(tzinfo=None))
+            .group_by(OrganizationMember.organization_id)
+        ),
+        "completion_rate": (
+            select(
+                Project.organization_id,
+                func.sum(ProjectStats.completed) * 100.0 / func.sum(ProjectStats.total),
+            )
+            .join(ProjectStats, ProjectStats.project_id == Project.id)
+            .group_by(Project.organization_id)
+            .having(func.sum(ProjectStats.total) > 0)
+        ),
+    }
+
+
+def _row(organization_id, metric_type: str, resolution: str, bucket: datetime, value) -> Dict[str, Any]:
+    metric = METRICS[metric_type]
+    return {
+        "organization_id": organization_id,
+        "metric_type": metric_type,
+        "metric_name": metric.name,
+        "metric_unit": metric.unit,
+        "metric_value": float(value),
+        "resolution": resolution,
+        "snapshot_date": bucket,
+    }
+
+
+async def _insert(db: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+    """Insert snapshot rows, skipping buckets another worker already wrote"""
+    if not rows:
+        return
+    dialect = db.bind.dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        statement = (postgresql if dialect == "postgresql" else sqlite).insert(MetricSnapshot).on_conflict_do_nothing()
+    else:
+        statement = insert(MetricSnapshot)
+    await db.execute(statement, rows)
+
+
+async def _latest_bucket(db: AsyncSession, resolution: str, *criteria) -> Optional[datetime]:
+    latest = (await db.execute(
+        select(func.max(MetricSnapshot.snapshot_date)).where(MetricSnapshot.resolution == resolution, *criteria)
+    )).scalar()
+    return _utc(latest) if latest is not None else None
+
+
+class MetricSnapshotCollector:
+    """Samples organization metrics on a fixed interval and downsamples them as they age"""
+
+    def __init__(self, session_factory=async_session_factory):
+        self.session_factory = session_factory
+        self._task: Optional[asyncio.Task] = None
+        # Only one worker samples and rolls up each interval
+        self.lease = WorkerLease(
+            "metric_snapshot_collector",
+            ttl=bucket_length("minute").total_seconds() * 1.5,
+            session_factory=session_factory,
+        )
+        self.stats = {"runs": 0, "samples": 0, "rollups": 0, "rows_pruned": 0, "errors": 0}
+
+    async def collect(self, now: Optional[datetime] = None) -> int:
+        """Sample every metric over the last complete interval; returns the number of samples
+
+        A bucket another worker already sampled is left as it is.
+        """
+        interval = bucket_length("minute")
+        end = _floor(now or datetime.now(timezone.utc), interval)
+        start = end - interval
+        async with self.session_factory() as db:
+            rows = []
+            for metric_type, query in sample_queries(start, end).items():
+                rows += [
+                    _row(organization_id, metric_type, "minute", start, value)
+                    for organization_id, value in (await db.execute(query)).all()
+                ]
+            await _insert(db, rows)
+            await db.commit()
+        self.stats["runs"] += 1
+        self.stats["samples"] += len(rows)
+        return len(rows)
+
+    async def _roll_up(self, db: AsyncSession, finer: str, coarser: str, now: datetime) -> int:
+        """Write the ended ``coarser`` buckets not written yet; returns how many"""
+        length = bucket_length(coarser)
+        latest = await _latest_bucket(db, coarser)
+        criteria = [MetricSnapshot.resolution == finer]
+        if latest is not None:
+            criteria.append(MetricSnapshot.snapshot_date >= latest + length)
+        # Start at the first finer row after the last rollup, skipping gaps without samples
+        first = (await db.execute(select(func.min(MetricSnapshot.snapshot_date)).where(*criteria))).scalar()
+        if first is None:
+            return 0
+
+        written = 0
+        bucket = _floor(first, length)
+        while bucket + length <= now and written < MAX_ROLLUPS_PER_RUN:
+            samples = (await db.execute(
+                select(MetricSnapshot.organization_id, MetricSnapshot.metric_type, MetricSnapshot.metric_value)
+                .where(
+                    MetricSnapshot.resolution == finer,
+                    MetricSnapshot.snapshot_date >= bucket,
+                    MetricSnapshot.snapshot_date < bucket + length,
+                )
+            )).all()
+            series = defaultdict(list)
+            for organization_id, metric_type, value in samples:
+                if metric_type in METRICS:
+                    series[organization_id, metric_type].append(value)
+            await _insert(db, [
+                _row(organization_id, metric_type, coarser, bucket, _AGGREGATES[METRICS[metric_type].aggregate](values))
+                for (organization_id, metric_type), values in series.items()
+            ])
+            await db.commit()
+            written += 1
+            bucket += length
+        return written
+
+    async def _prune(self, db: AsyncSession, now: datetime) -> int:
+        """Delete rows past their retention; finer rows only once they are rolled up"""
+        deleted = 0
+        for finer, coarser in zip(RESOLUTIONS, RESOLUTIONS[1:] + (None,)):
+            cutoff = now - retention(finer)
+            if coarser is not None:
+                latest = await _latest_bucket(db, coarser)
+                if latest is None:
+                    continue
+                cutoff = min(cutoff, latest + bucket_length(coarser))
+            result = await db.execute(
+                delete(MetricSnapshot).where(MetricSnapshot.resolution == finer, MetricSnapshot.snapshot_date < cutoff)
+            )
+            deleted += result.rowcount or 0
+        await db.commit()
+        return deleted
+
+    async def downsample(self, now: Optional[datetime] = None) -> int:
+        """Roll ended buckets up to hours and days and prune expired rows; returns the buckets written"""
+        now = now or datetime.now(timezone.utc)
+        async with self.session_factory() as db:
+            written = 0
+            for finer, coarser in zip(RESOLUTIONS, RESOLUTIONS[1:]):
+                written += await self._roll_up(db, finer, coarser, now)
+            pruned = await self._prune(db, now)
+        self.stats["rollups"] += written
+        self.stats["rows_pruned"] += pruned
+        return written
+
+    async def _collect_and_downsample(self) -> None:
+        await self.collect()
+        await self.downsample()
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info("Metric snapshot collector started")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                # Wake just after each interval boundary, so every sample covers a whole interval
+                now = datetime.now(timezone.utc)
+                next_boundary = _floor(now, bucket_length("minute")) + bucket_length("minute")
+                await asyncio.sleep((next_boundary - now).total_seconds() + 1)
+                await self.lease.run(self._collect_and_downsample)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.error(f"Metric snapshot collector error: {e}")
+
+
+def choose_resolution(start: datetime, end: datetime, now: Optional[datetime] = None) -> str:
+    """Finest resolution still retained at ``start`` that keeps the range within ``MAX_POINTS``"""
+    now = now or datetime.now(timezone.utc)
+    for resolution in RESOLUTIONS[:-1]:
+        if start >= now - retention(resolution) and (end - start) / bucket_length(resolution) <= MAX_POINTS:
+            return resolution
+    return RESOLUTIONS[-1]
+
+
+async def _read_series(
+    db: AsyncSession, organization_id: Any, metric_type: str, resolution: str, start: datetime, end: datetime
+) -> Dict[datetime, float]:
+    """Bucket values at ``resolution``, the tail past its last rollup filled from the finer rows"""
+    length = bucket_length(resolution)
+    series_of = (MetricSnapshot.organization_id == organization_id, MetricSnapshot.metric_type == metric_type)
+    rows = (await db.execute(
+        select(MetricSnapshot.snapshot_date, MetricSnapshot.metric_value)
+        .where(*series_of, MetricSnapshot.resolution == resolution)
+        .where(MetricSnapshot.snapshot_date >= start, MetricSnapshot.snapshot_date < end)
+    )).all()
+    points = {_utc(bucket): value for bucket, value in rows}
+    if resolution == RESOLUTIONS[0]:
+        return points
+
+    latest = await _latest_bucket(db, resolution, *series_of)
+    tail_start = max(start, latest + length) if latest is not None else start
+    if tail_start < end:
+        finer = RESOLUTIONS[RESOLUTIONS.index(resolution) - 1]
+        tail = defaultdict(list)
+        for bucket, value in (await _read_series(db, organization_id, metric_type, finer, tail_start, end)).items():
+            tail[_floor(bucket, length)].append(value)
+        combine = _AGGREGATES[METRICS[metric_type].aggregate]
+        points.update({bucket: combine(values) for bucket, values in tail.items()})
+    return points
+
+
+async def metric_series(
+    db: AsyncSession,
+    organization_id: Any,
+    metric_type: str,
+    start: datetime,
+    end: datetime,
+    resolution: Optional[str] = None,
+) -> Dict[str, Any]:
+    """One metric of one organization over [start, end), one point per bucket
+
+    ``resolution`` defaults to ``choose_resolution``. Buckets without
+    samples read as the metric's empty value.
+    """
+    if metric_type not in METRICS:
+        raise ValidationError(f"Unknown metric '{metric_type}'")
+    start, end = _utc(start), _utc(end)
+    if end <= start:
+        raise ValidationError("end must be after start")
+    resolution = resolution or choose_resolution(start, end)
+    if resolution not in RESOLUTIONS:
+        raise ValidationError(f"Unknown resolution '{resolution}'")
+    length = bucket_length(resolution)
+    start = _floor(start, length)
+    if (end - start) / length > MAX_POINTS:
+        raise ValidationError(f"Range too long for {resolution} resolution (at most {MAX_POINTS} points)")
+
+    values = await _read_series(db, organization_id, metric_type, resolution, start, end)
+    metric = METRICS[metric_type]
+    points = []
+    bucket = start
+    while bucket < end:
+        value = values.get(bucket, metric.empty)
+        points.append({"timestamp": bucket.isoformat(), "value": round(value, 2) if value is not None else None})
+        bucket += length
+    return {
+        "metric": metric_type,
+        "name": metric.name,
+        "unit": metric.unit,
+        "resolution": resolution,
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "points": points,
+    }
+
+
+# Global collector instance
+metric_snapshot_collector = MetricSnapshotCollector()
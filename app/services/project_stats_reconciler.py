@@ -0,0 +1,121 @@
+"""
+Nightly recount of the project card counters
+
+``project_stats`` rows are maintained incrementally (``app.core.project_stats``),
+so a write path that bypasses the listeners, a manual fix in the database or
+a bug leaves them drifted until something recounts. ``ProjectStatsReconciler``
+walks every project in id order, ``BATCH_SIZE`` per transaction, recounts
+their cards and rewrites the rows that differ. One worker at a time runs it
+(``app.core.worker_lease``).
+
+Each batch locks its rows before counting, so a card write that commits
+meanwhile either is counted or applies its delta after the batch commits.
+"""
+import asyncio
+import logging
+from typing import Any, Optional, Sequence
+
+from sqlalchemy import select
+
+from app.config import settings
+from app.core.database import async_session_factory
+from app.core.project_stats import COUNTERS, count_query
+from app.core.worker_lease import WorkerLease
+from app.models.project import Project
+from app.models.project_stats import ProjectStats
+
+logger = logging.getLogger(__name__)
+
+# Projects recounted per transaction
+BATCH_SIZE = 500
+
+
+class ProjectStatsReconciler:
+    """Periodically recounts every project's card counters and repairs drift"""
+
+    def __init__(self, session_factory=async_session_factory, interval: Optional[float] = None):
+        self.session_factory = session_factory
+        self.interval = settings.project_stats_reconcile_interval if interval is None else interval
+        self._task: Optional[asyncio.Task] = None
+        # Only one worker recounts each interval
+        self.lease = WorkerLease("project_stats_reconciler", ttl=self.interval * 1.5, session_factory=session_factory)
+        self.stats = {"runs": 0, "projects_checked": 0, "rows_repaired": 0, "errors": 0}
+
+    async def reconcile_projects(self, db, project_ids: Sequence[Any]) -> int:
+        """Recount ``project_ids``; returns the number of rows created or corrected"""
+        stored = {
+            row.project_id: row
+            for row in (await db.execute(
+                select(ProjectStats).where(ProjectStats.project_id.in_(project_ids)).with_for_update()
+            )).scalars().all()
+        }
+        repaired = 0
+        for counted in (await db.execute(count_query(project_ids))).mappings().all():
+            values = {name: counted[name] for name in COUNTERS}
+            row = stored.get(counted["project_id"])
+            if row is None:
+                db.add(ProjectStats(project_id=counted["project_id"], **values))
+                repaired += 1
+                continue
+            drifted = {name: (getattr(row, name), value) for name, value in values.items() if getattr(row, name) != value}
+            if drifted:
+                repaired += 1
+                logger.info(f"Project stats drift repaired for {row.project_id}: {drifted}")
+            for name, value in values.items():
+                setattr(row, name, value)
+        await db.commit()
+        return repaired
+
+    async def reconcile(self) -> int:
+        """Recount every project; returns the number of rows created or corrected"""
+        repaired = checked = 0
+        try:
+            async with self.session_factory() as db:
+                last_id = None
+                while True:
+                    query = select(Project.id).order_by(Project.id).limit(BATCH_SIZE)
+                    if last_id is not None:
+                        query = query.where(Project.id > last_id)
+                    project_ids = (await db.execute(query)).scalars().all()
+                    if not project_ids:
+                        break
+                    repaired += await self.reconcile_projects(db, project_ids)
+                    checked += len(project_ids)
+                    last_id = project_ids[-1]
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.warning(f"Project stats reconciliation failed: {e}")
+        self.stats["runs"] += 1
+        self.stats["projects_checked"] += checked
+        self.stats["rows_repaired"] += repaired
+        if repaired:
+            logger.info(f"Project stats reconciled: {checked} projects checked, {repaired} rows repaired")
+        return repaired
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info("Project stats reconciler started")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.sleep(self.interval)
+                await self.lease.run(self.reconcile)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Project stats reconciler error: {e}")
+
+
+# Global reconciler instance
+project_stats_reconciler = ProjectStatsReconciler()
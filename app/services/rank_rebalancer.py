@@ -0,0 +1,101 @@
+"""
+Background respacing of column and card ordering keys
+
+Inserting repeatedly between the same two rows lengthens their ordering
+keys (``app.core.ordering``). ``RankRebalancer`` periodically finds boards
+and columns with a key longer than ``rank_rebalance_length`` and rewrites
+all of their siblings' keys evenly spaced, in the same order, one parent
+per transaction, on one worker at a time (``app.core.worker_lease``). The
+rewrite goes through the ORM, so board versions and the change log pick it
+up like any other edit.
+"""
+import asyncio
+import logging
+from typing import Any, Optional
+
+from sqlalchemy import func, select
+
+from app.config import settings
+from app.core.database import async_session_factory
+from app.core.ordering import evenly_spaced_keys
+from app.core.worker_lease import WorkerLease
+from app.models.card import Card
+from app.models.column import Column
+
+logger = logging.getLogger(__name__)
+
+# Parents respaced per run and model, so one run stays short
+BATCH_SIZE = 100
+
+
+class RankRebalancer:
+    """Periodically respaces ordering keys that grew past the length limit"""
+
+    def __init__(self, session_factory=async_session_factory, interval: float = 600, max_length: Optional[int] = None):
+        self.session_factory = session_factory
+        self.interval = interval
+        self.max_length = settings.rank_rebalance_length if max_length is None else max_length
+        self._task: Optional[asyncio.Task] = None
+        # Only one worker rebalances each interval
+        self.lease = WorkerLease("rank_rebalancer", ttl=interval * 1.5, session_factory=session_factory)
+        self.stats = {"runs": 0, "parents_rebalanced": 0, "errors": 0}
+
+    async def rebalance_parent(self, db, model, parent, parent_id: Any) -> int:
+        """Respace the keys of every ``model`` row under ``parent_id``; returns rows rewritten"""
+        rows = (await db.execute(
+            select(model).where(parent == parent_id).order_by(model.rank, model.id).with_for_update()
+        )).scalars().all()
+        for row, key in zip(rows, evenly_spaced_keys(len(rows))):
+            row.rank = key
+        await db.commit()
+        return len(rows)
+
+    async def rebalance(self) -> int:
+        """Respace every parent with an overlong key; returns the number of parents"""
+        rebalanced = 0
+        try:
+            async with self.session_factory() as db:
+                for model, parent in ((Column, Column.board_id), (Card, Card.column_id)):
+                    parent_ids = (await db.execute(
+                        select(parent)
+                        .where(func.length(model.rank) > self.max_length)
+                        .distinct()
+                        .limit(BATCH_SIZE)
+                    )).scalars().all()
+                    for parent_id in parent_ids:
+                        await self.rebalance_parent(db, model, parent, parent_id)
+                        rebalanced += 1
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.warning(f"Ordering key rebalance failed: {e}")
+        self.stats["runs"] += 1
+        self.stats["parents_rebalanced"] += rebalanced
+        return rebalanced
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info("Ordering key rebalancer started")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.sleep(self.interval)
+                await self.lease.run(self.rebalance)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Ordering key rebalancer error: {e}")
+
+
+# Global rebalancer instance
+rank_rebalancer = RankRebalancer()
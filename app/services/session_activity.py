@@ -0,0 +1,126 @@
+"""
+Batched session last-activity writer
+
+Request handlers only record which sessions were active; a background task
+writes them in a single ``UPDATE ... FROM (VALUES ...)`` every few seconds
+instead of committing one UPDATE per request. Pending updates are flushed
+on shutdown.
+"""
+import asyncio
+import logging
+import uuid
+from datetime import datetime
+from typing import Dict, Optional
+
+from sqlalchemy import DateTime, column, update, values
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.config import settings
+from app.core.database import async_session_factory
+from app.models.session import UserSession
+
+logger = logging.getLogger(__name__)
+
+
+class SessionActivityFlusher:
+    """Collects touched session ids and writes them in bulk"""
+
+    def __init__(
+        self,
+        session_factory=async_session_factory,
+        interval: Optional[float] = None,
+        max_batch: int = 1000,
+    ):
+        self.session_factory = session_factory
+        self.interval = settings.session_activity_flush_interval if interval is None else interval
+        self.max_batch = max_batch
+        self._pending: Dict[uuid.UUID, datetime] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+        self.stats = {"touches": 0, "flushes": 0, "rows_written": 0, "errors": 0}
+
+    def touch(self, session_id: uuid.UUID, at: Optional[datetime] = None) -> None:
+        """Record activity for a session; cheap, never touches the database"""
+        at = at or datetime.utcnow()
+        previous = self._pending.get(session_id)
+        if previous is None or at > previous:
+            self._pending[session_id] = at
+        self.stats["touches"] += 1
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def _build_update(self, batch: Dict[uuid.UUID, datetime]):
+        touched = values(
+            column("id", UUID(as_uuid=True)),
+            column("last_activity", DateTime),
+            name="touched",
+        ).data(list(batch.items()))
+        return (
+            update(UserSession)
+            .where(UserSession.id == touched.c.id)
+            # Never move last_activity backwards (another worker may be ahead)
+            .where(UserSession.last_activity < touched.c.last_activity)
+            .values(last_activity=touched.c.last_activity)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def flush(self) -> int:
+        """Write all pending activity; returns number of rows updated"""
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+            pending, self._pending = self._pending, {}
+            items = list(pending.items())
+            written = 0
+            try:
+                async with self.session_factory() as db:
+                    for start in range(0, len(items), self.max_batch):
+                        result = await db.execute(self._build_update(dict(items[start:start + self.max_batch])))
+                        written += result.rowcount or 0
+                    await db.commit()
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.warning(f"Session activity flush failed, will retry: {e}")
+                # Put the batch back unless newer touches already superseded it
+                for session_id, at in items:
+                    newer = self._pending.get(session_id)
+                    if newer is None or at > newer:
+                        self._pending[session_id] = at
+                return 0
+            self.stats["flushes"] += 1
+            self.stats["rows_written"] += written
+            return written
+
+    async def start(self) -> None:
+        """Start the periodic flush task"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info("Session activity flusher started")
+
+    async def stop(self) -> None:
+        """Stop the periodic task and flush what is left"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+        logger.info("Session activity flusher stopped")
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.sleep(self.interval)
+                await self.flush()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Session activity flusher error: {e}")
+
+
+# Global flusher instance
+session_activity_flusher = SessionActivityFlusher()
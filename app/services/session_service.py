@@ -11,7 +11,14 @@ from sqlalchemy.orm import selectinload
 from app.models.session import UserSession
 from app.models.user import User
 from app.core.exceptions import AuthenticationError
-from app.core.cache import cache
+from app.core.principal import Principal, principal_cache_key, principal_user_tag
+from app.cache import cache_manager
+from app.services.session_activity import session_activity_flusher
+
+# How long a resolved principal may be served from cache
+PRINCIPAL_CACHE_TTL = 300
+# Minimum interval between last_activity writes for one session
+ACTIVITY_UPDATE_INTERVAL = 300
 
 
 class SessionService:
@@ -47,14 +54,7 @@ class SessionService:
         return session
     
     async def get_session_by_token(self, session_token: str) -> Optional[UserSession]:
-        """Get session by session token (cached)"""
-        # Try cache first
-        cache_key = f"session:{session_token}"
-        cached_session = cache.get(cache_key)
-        if cached_session:
-            return cached_session
-
-        # Query database
+        """Get session by session token"""
         result = await self.db.execute(
             select(UserSession)
             .options(selectinload(UserSession.user))
@@ -65,14 +65,81 @@ class SessionService:
                 )
             )
         )
-        session = result.scalar_one_or_none()
+        return result.scalar_one_or_none()
 
-        # Cache valid sessions for 5 minutes
-        if session and session.is_valid():
-            cache.set(cache_key, session, ttl=300)
+    async def _cache_principal(self, session_token: str, principal: Principal) -> None:
+        ttl = min(PRINCIPAL_CACHE_TTL, int(principal.seconds_until_expiry()))
+        if ttl > 0:
+            await cache_manager.set(
+                principal_cache_key(session_token),
+                principal.to_cache(),
+                ttl=ttl,
+                tags=(principal_user_tag(principal.user_id),),
+            )
+
+    async def invalidate_principal(self, session_token: str) -> None:
+        """Drop the cached principal for a token on every worker"""
+        await cache_manager.delete(principal_cache_key(session_token))
+
+    async def get_principal(self, session_token: str) -> Optional[Principal]:
+        """Resolve a session token to a principal (cached, no ORM hydration)"""
+        cached = await cache_manager.get(principal_cache_key(session_token))
+        principal = Principal.from_cache(cached) if cached else None
+
+        if principal is None:
+            result = await self.db.execute(
+                select(
+                    UserSession.id,
+                    UserSession.user_id,
+                    UserSession.expires_at,
+                    UserSession.last_activity,
+                    User.email,
+                    User.email_verified,
+                )
+                .join(User, User.id == UserSession.user_id)
+                .where(
+                    and_(
+                        UserSession.session_token == session_token,
+                        UserSession.is_active == True
+                    )
+                )
+            )
+            row = result.one_or_none()
+            if row is None:
+                return None
+            principal = Principal(
+                user_id=row.user_id,
+                email=row.email,
+                email_verified=bool(row.email_verified),
+                session_id=row.id,
+                expires_at=row.expires_at,
+                last_activity=row.last_activity,
+            )
+            if not principal.is_expired():
+                await self._cache_principal(session_token, principal)
+
+        if principal.is_expired():
+            # Expired sessions are removed by cleanup_expired_sessions
+            if cached:
+                await self.invalidate_principal(session_token)
+            return None
+
+        # Record activity at most every 5 minutes; written by the background flusher
+        now = datetime.utcnow()
+        if (now - principal.last_activity).total_seconds() > ACTIVITY_UPDATE_INTERVAL:
+            session_activity_flusher.touch(principal.session_id, now)
+            principal = principal.with_activity(now)
+            await self._cache_principal(session_token, principal)
+
+        return principal
+
+    async def get_user_from_token(self, session_token: str) -> Optional[User]:
+        """Resolve a session token to its user"""
+        principal = await self.get_principal(session_token)
+        if principal is None:
+            return None
+        return await self.db.get(User, principal.user_id)
 
-        return session
-    
     async def get_session_by_refresh_token(self, refresh_token: str) -> Optional[UserSession]:
         """Get session by refresh token"""
         result = await self.db.execute(
@@ -88,24 +155,21 @@ class SessionService:
         return result.scalar_one_or_none()
     
     async def validate_session(self, session_token: str) -> Optional[UserSession]:
-        """Validate session and return if valid (optimized)"""
+        """Validate session and return if valid (never commits)"""
         session = await self.get_session_by_token(session_token)
 
         if not session:
             return None
 
         if not session.is_valid():
-            # Session is expired or inactive, deactivate it
-            session.deactivate()
-            await self.db.commit()
+            # Expired sessions are removed by cleanup_expired_sessions
+            await self.invalidate_principal(session_token)
             return None
 
-        # Only update activity if it's been more than 5 minutes since last update
-        # This reduces database writes significantly
-        import datetime
-        if (datetime.datetime.utcnow() - session.last_activity).total_seconds() > 300:
-            session.update_activity()
-            await self.db.commit()
+        # Only record activity if it's been more than 5 minutes since last update
+        now = datetime.utcnow()
+        if (now - session.last_activity).total_seconds() > ACTIVITY_UPDATE_INTERVAL:
+            session_activity_flusher.touch(session.id, now)
 
         return session
     
@@ -119,6 +183,7 @@ class SessionService:
         # Extend session
         session.refresh_session(extend_hours=24)
         await self.db.commit()
+        await self.invalidate_principal(session.session_token)
         
         return session
     
@@ -131,6 +196,7 @@ class SessionService:
         
         session.deactivate()
         await self.db.commit()
+        await self.invalidate_principal(session_token)
         
         return True
     
@@ -152,6 +218,7 @@ class SessionService:
             count += 1
         
         await self.db.commit()
+        await cache_manager.invalidate_tags(principal_user_tag(user_id))
         return count
     
     async def get_user_sessions(self, user_id: uuid.UUID, active_only: bool = True) -> List[UserSession]:
@@ -0,0 +1,134 @@
+"""
+Compare the JSON-aggregation board snapshot with the ORM board snapshot.
+
+Usage:
+  python -m scripts.bench_board_snapshot [--iterations 50] [--board-id UUID] [--user-id UUID]
+
+Behavior:
+  - Connects to DATABASE_URL (PostgreSQL) through the SQLAlchemy engine
+  - Without ids, picks the board with the most cards and a member of its
+    organization
+  - "orm": KanbanService.get_board_with_columns plus json.dumps, i.e. the
+    response body the endpoint produced before
+  - "json": KanbanService.get_board_snapshot_json, the bytes PostgreSQL returns
+  - Checks both documents are equal (ignoring assignment order) and prints
+    mean / p95 latency in milliseconds and the body size
+  - Read-only; needs a populated database
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from typing import Awaitable, Callable, List
+
+from sqlalchemy import func, select
+
+from app.core.database import async_session_factory, close_db
+from app.models.board import Board
+from app.models.card import Card
+from app.models.column import Column
+from app.models.organization import OrganizationMember
+from app.models.project import Project
+from app.services.kanban_service import KanbanService
+
+
+async def _pick_ids(board_id: str | None, user_id: str | None) -> tuple[str, str]:
+    async with async_session_factory() as db:
+        if board_id is None:
+            board_id = (await db.execute(
+                select(Column.board_id)
+                .join(Card, Card.column_id == Column.id)
+                .group_by(Column.board_id)
+                .order_by(func.count(Card.id).desc())
+                .limit(1)
+            )).scalar_one_or_none()
+            if board_id is None:
+                sys.exit("No boards with cards in the database")
+        if user_id is None:
+            user_id = (await db.execute(
+                select(OrganizationMember.user_id)
+                .join(Project, Project.organization_id == OrganizationMember.organization_id)
+                .join(Board, Board.project_id == Project.id)
+                .where(Board.id == board_id)
+                .limit(1)
+            )).scalar_one_or_none()
+            if user_id is None:
+                sys.exit("Board has no organization members")
+    return str(board_id), str(user_id)
+
+
+async def orm_body(board_id: str, user_id: str) -> bytes:
+    async with async_session_factory() as db:
+        data = await KanbanService(db).get_board_with_columns(board_id, user_id)
+    return json.dumps(data).encode("utf-8")
+
+
+async def json_body(board_id: str, user_id: str) -> bytes:
+    async with async_session_factory() as db:
+        body = await KanbanService(db).get_board_snapshot_json(board_id, user_id)
+    if body is None:
+        sys.exit("DATABASE_URL is not PostgreSQL; the JSON snapshot is unavailable")
+    return body
+
+
+def _normalized(body: bytes) -> dict:
+    document = json.loads(body)
+    for column in document["columns"]:
+        for card in column["cards"]:
+            card["assignments"].sort(key=lambda a: a["id"])
+            for assignment in card["assignments"]:
+                assignment["user"].pop("full_name")
+    return document
+
+
+async def _time(call: Callable[[], Awaitable], iterations: int) -> List[float]:
+    for _ in range(3):  # warm up pools and statement caches
+        await call()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await call()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+async def run(iterations: int, board_id: str | None, user_id: str | None) -> int:
+    try:
+        board_id, user_id = await _pick_ids(board_id, user_id)
+        orm, fast = await orm_body(board_id, user_id), await json_body(board_id, user_id)
+        cards = sum(len(column["cards"]) for column in json.loads(fast)["columns"])
+        print(f"board={board_id} user={user_id} cards={cards} iterations={iterations}")
+        if _normalized(orm) != _normalized(fast):
+            print("WARNING: ORM and JSON snapshots differ")
+
+        print(f"{'path':<6} {'mean ms':>9} {'p95 ms':>9} {'bytes':>10}")
+        results = {}
+        for name, call, body in (
+            ("orm", lambda: orm_body(board_id, user_id), orm),
+            ("json", lambda: json_body(board_id, user_id), fast),
+        ):
+            samples = await _time(call, iterations)
+            results[name] = statistics.mean(samples)
+            p95 = statistics.quantiles(samples, n=20)[-1]
+            print(f"{name:<6} {results[name]:>9.2f} {p95:>9.2f} {len(body):>10}")
+        print(f"speedup {results['orm'] / results['json']:.1f}x")
+    finally:
+        await close_db()
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--board-id")
+    parser.add_argument("--user-id")
+    args = parser.parse_args()
+    return asyncio.run(run(args.iterations, args.board_id, args.user_id))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,156 @@
+"""
+Compare the asyncpg fast path with the SQLAlchemy ORM path for hot reads.
+
+Usage:
+  python -m scripts.bench_fast_path [--iterations 200] [--board-id UUID] [--user-id UUID]
+
+Behavior:
+  - Connects to DATABASE_URL with both the SQLAlchemy engine and the asyncpg pool
+  - Without ids, benchmarks the first board found and a member of its organization
+  - Runs board snapshot, card list, notification counts and membership lookup
+    through both paths and prints mean / p95 latency in milliseconds
+  - Read-only; needs a populated database
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from typing import Awaitable, Callable, Dict, List
+
+from sqlalchemy import func, select, and_
+from sqlalchemy.orm import selectinload
+
+from app.core.database import async_session_factory, close_db
+from app.core.permissions import get_user_role_for_board
+from app.database import fast_queries
+from app.database.connection_pool import close_database, init_database
+from app.models.board import Board
+from app.models.card import Card, CardAssignment
+from app.models.column import Column
+from app.models.notification import Notification
+from app.models.organization import OrganizationMember
+from app.models.project import Project
+from app.schemas.card import CardResponse
+from app.services.kanban_service import KanbanService
+
+
+async def _pick_ids(board_id: str | None, user_id: str | None) -> tuple[str, str]:
+    async with async_session_factory() as db:
+        if board_id is None:
+            board_id = (await db.execute(select(Board.id).limit(1))).scalar_one_or_none()
+            if board_id is None:
+                sys.exit("No boards in the database")
+        if user_id is None:
+            user_id = (await db.execute(
+                select(OrganizationMember.user_id)
+                .join(Project, Project.organization_id == OrganizationMember.organization_id)
+                .join(Board, Board.project_id == Project.id)
+                .where(Board.id == board_id)
+                .limit(1)
+            )).scalar_one_or_none()
+            if user_id is None:
+                sys.exit("Board has no organization members")
+    return str(board_id), str(user_id)
+
+
+def _orm_cases(board_id: str, user_id: str) -> Dict[str, Callable[[], Awaitable]]:
+    async def board_snapshot():
+        async with async_session_factory() as db:
+            return await KanbanService(db).get_board_with_columns(board_id, user_id)
+
+    async def card_list():
+        async with async_session_factory() as db:
+            query = (
+                select(Card)
+                .options(
+                    selectinload(Card.assignments).selectinload(CardAssignment.user),
+                    selectinload(Card.checklist_items),
+                )
+                .join(Column).where(Column.board_id == board_id)
+                .offset(0).limit(100)
+            )
+            cards = (await db.execute(query)).scalars().all()
+            return [CardResponse.from_orm(card) for card in cards]
+
+    async def notification_counts():
+        async with async_session_factory() as db:
+            total = (await db.execute(
+                select(func.count(Notification.id)).where(Notification.user_id == user_id)
+            )).scalar()
+            unread = (await db.execute(
+                select(func.count(Notification.id)).where(
+                    and_(Notification.user_id == user_id, Notification.read == False)
+                )
+            )).scalar()
+            return total, unread
+
+    async def membership():
+        async with async_session_factory() as db:
+            # Force the ORM branch by marking the session as having written
+            db.sync_session.info["wrote"] = True
+            return await get_user_role_for_board(user_id, board_id, db)
+
+    return {
+        "board_snapshot": board_snapshot,
+        "card_list": card_list,
+        "notification_counts": notification_counts,
+        "membership": membership,
+    }
+
+
+def _fast_cases(board_id: str, user_id: str) -> Dict[str, Callable[[], Awaitable]]:
+    return {
+        "board_snapshot": lambda: fast_queries.board_snapshot(board_id, user_id),
+        "card_list": lambda: fast_queries.list_cards(user_id, board_id=board_id, skip=0, limit=100),
+        "notification_counts": lambda: fast_queries.notification_counts(user_id),
+        "membership": lambda: fast_queries.membership_role(user_id, "board", board_id),
+    }
+
+
+async def _time(call: Callable[[], Awaitable], iterations: int) -> List[float]:
+    for _ in range(10):  # warm up pools and statement caches
+        await call()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await call()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+async def run(iterations: int, board_id: str | None, user_id: str | None) -> int:
+    await init_database()
+    try:
+        board_id, user_id = await _pick_ids(board_id, user_id)
+        orm, fast = _orm_cases(board_id, user_id), _fast_cases(board_id, user_id)
+
+        print(f"board={board_id} user={user_id} iterations={iterations}")
+        print(f"{'query':<22} {'orm mean':>9} {'orm p95':>9} {'fast mean':>10} {'fast p95':>9} {'speedup':>8}")
+        for name in orm:
+            orm_samples = await _time(orm[name], iterations)
+            fast_samples = await _time(fast[name], iterations)
+            orm_mean, fast_mean = statistics.mean(orm_samples), statistics.mean(fast_samples)
+            orm_p95 = statistics.quantiles(orm_samples, n=20)[-1]
+            fast_p95 = statistics.quantiles(fast_samples, n=20)[-1]
+            print(f"{name:<22} {orm_mean:>9.2f} {orm_p95:>9.2f} {fast_mean:>10.2f} {fast_p95:>9.2f} "
+                  f"{orm_mean / fast_mean:>7.1f}x")
+    finally:
+        await close_database()
+        await close_db()
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--board-id")
+    parser.add_argument("--user-id")
+    args = parser.parse_args()
+    return asyncio.run(run(args.iterations, args.board_id, args.user_id))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
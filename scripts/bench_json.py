@@ -0,0 +1,150 @@
+"""
+Compare response serialization paths on a card list payload.
+
+Usage:
+  python -m scripts.bench_json [--cards 5000] [--iterations 20]
+
+Behavior:
+  - Builds --cards synthetic card rows shaped like GET /cards/list rows
+    (UUIDs and datetimes as Python objects, two assignees and three
+    checklist items each); needs no database
+  - "stdlib": CardResponse(**row) per row, then jsonable_encoder and
+    json.dumps, i.e. the path a list endpoint took before
+  - "model": CardResponse(**row) per row, then FastAPI's response_model
+    validation and serialization, rendered by FastJSONResponse
+  - "orjson": FastJSONResponse over the plain rows (compact views)
+  - "adapter": model_list_response(CardResponse, rows), one TypeAdapter
+    validation and dump_json pass (the full card list endpoints)
+  - Checks every path produces the same document and prints mean / p95
+    latency in milliseconds and the body size
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.core.responses import FastJSONResponse, model_list_response
+from app.schemas.card import CardResponse
+
+
+def build_rows(count: int) -> List[Dict[str, Any]]:
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    column_ids = [uuid.uuid4() for _ in range(5)]
+    users = [
+        {"id": uuid.uuid4(), "email": f"user{i}@example.com", "first_name": f"User{i}", "last_name": "Test"}
+        for i in range(20)
+    ]
+    rows = []
+    for i in range(count):
+        created = start + timedelta(minutes=i)
+        rows.append({
+            "id": uuid.uuid4(),
+            "column_id": column_ids[i % len(column_ids)],
+            "title": f"Card {i}",
+            "description": "Lorem ipsum dolor sit amet, consectetur adipiscing elit.",
+            "position": i,
+            "priority": ("low", "medium", "high")[i % 3],
+            "status": "todo",
+            "due_date": created + timedelta(days=7) if i % 2 else None,
+            "created_by": users[i % len(users)]["id"],
+            "created_at": created,
+            "updated_at": created,
+            "labels": [{"name": "backend", "color": "#DBEAFE"}],
+            "assignments": [
+                {
+                    "id": uuid.uuid4(),
+                    "user_id": user["id"],
+                    "assigned_by": users[0]["id"],
+                    "assigned_at": created,
+                    "user": {**user, "id": str(user["id"]), "avatar_url": None},
+                }
+                for user in (users[i % 20], users[(i + 7) % 20])
+            ],
+            "checklist_items": [
+                {
+                    "id": str(uuid.uuid4()),
+                    "text": f"Step {step}",
+                    "completed": step == 0,
+                    "position": step,
+                    "ai_generated": False,
+                    "confidence": None,
+                    "metadata": None,
+                    "created_at": created.isoformat(),
+                    "updated_at": created.isoformat(),
+                }
+                for step in range(3)
+            ],
+        })
+    return rows
+
+
+def stdlib_body(rows: List[Dict[str, Any]]) -> bytes:
+    cards = [CardResponse(**row) for row in rows]
+    return json.dumps(jsonable_encoder(cards)).encode("utf-8")
+
+
+_response_model = TypeAdapter(List[CardResponse])
+
+
+def model_body(rows: List[Dict[str, Any]]) -> bytes:
+    cards = [CardResponse(**row) for row in rows]
+    return FastJSONResponse(_response_model.dump_python(_response_model.validate_python(cards), mode="json")).body
+
+
+def orjson_body(rows: List[Dict[str, Any]]) -> bytes:
+    return FastJSONResponse(rows).body
+
+
+def adapter_body(rows: List[Dict[str, Any]]) -> bytes:
+    return model_list_response(CardResponse, rows).body
+
+
+def _time(call: Callable[[], bytes], iterations: int) -> List[float]:
+    call()  # warm up the adapters' schema caches
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        call()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def run(cards: int, iterations: int) -> int:
+    rows = build_rows(cards)
+    paths = (("stdlib", stdlib_body), ("model", model_body), ("orjson", orjson_body), ("adapter", adapter_body))
+    bodies = {name: body(rows) for name, body in paths}
+    # Datetime text differs only in the UTC suffix ("Z" from pydantic, "+00:00" otherwise)
+    documents = {name: json.loads(body.replace(b"Z\"", b"+00:00\"")) for name, body in bodies.items()}
+    if any(document != documents["stdlib"] for document in documents.values()):
+        print("WARNING: serialization paths produce different documents")
+
+    print(f"cards={cards} iterations={iterations}")
+    print(f"{'path':<8} {'mean ms':>9} {'p95 ms':>9} {'bytes':>10}")
+    results = {}
+    for name, body in paths:
+        samples = _time(lambda: body(rows), iterations)
+        results[name] = statistics.mean(samples)
+        p95 = statistics.quantiles(samples, n=20)[-1] if len(samples) > 1 else samples[0]
+        print(f"{name:<8} {results[name]:>9.2f} {p95:>9.2f} {len(bodies[name]):>10}")
+    print(f"adapter speedup over stdlib {results['stdlib'] / results['adapter']:.1f}x")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cards", type=int, default=5000)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+    return run(args.cards, args.iterations)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
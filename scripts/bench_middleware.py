@@ -0,0 +1,158 @@
+"""
+Measure per-request overhead of the HTTP middleware stack.
+
+Usage:
+  python -m scripts.bench_middleware [--requests 5000] [--stream]
+
+Behavior:
+  - Builds a minimal FastAPI app with one JSON (or streaming) endpoint
+  - "none": the app without middleware, used as the zero point
+  - "before": rate limiting, request id, timing and monitoring as
+    @app.middleware("http") functions (BaseHTTPMiddleware), as main.py had them
+  - "after": the pure ASGI middleware classes in the order main.py uses
+  - Drives each app directly through the ASGI interface (no sockets) and
+    prints mean latency and overhead per request in microseconds
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+import uuid
+from typing import Callable, Dict, List
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from app.core.rate_limiting import MemoryRateLimitBackend, RateLimiter, RateLimitMiddleware
+from app.middleware.request_context import RequestIDMiddleware, TimingMiddleware
+from app.monitoring import MetricsCollector, MonitoringMiddleware
+
+
+def _base_app(stream: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/api/v1/items/{item_id}")
+    async def read_item(item_id: int):
+        if stream:
+            async def chunks():
+                for _ in range(4):
+                    yield b"x" * 256
+            return StreamingResponse(chunks(), media_type="text/plain")
+        return {"id": item_id, "name": "item"}
+
+    return app
+
+
+def build_none(stream: bool) -> FastAPI:
+    return _base_app(stream)
+
+
+def build_before(stream: bool) -> FastAPI:
+    app = _base_app(stream)
+    limiter = RateLimiter(backend=MemoryRateLimitBackend())
+    collector = MetricsCollector()
+
+    @app.middleware("http")
+    async def rate_limit_middleware(request: Request, call_next):
+        allowed, info = await limiter.check_rate_limit(request)
+        if not allowed:
+            return JSONResponse(status_code=429, content={"detail": "Rate limit exceeded"})
+        response = await call_next(request)
+        response.headers["X-RateLimit-Limit"] = str(info["limit"])
+        response.headers["X-RateLimit-Remaining"] = str(info["requests_remaining"])
+        response.headers["X-RateLimit-Reset"] = str(info["reset_time"])
+        return response
+
+    @app.middleware("http")
+    async def monitoring_middleware(request: Request, call_next):
+        start_time = time.time()
+        response = await call_next(request)
+        collector.record_request(request.method, request.url.path, response.status_code, time.time() - start_time)
+        return response
+
+    @app.middleware("http")
+    async def add_process_time_header(request: Request, call_next):
+        start_time = time.time()
+        response = await call_next(request)
+        response.headers["X-Process-Time"] = str(time.time() - start_time)
+        return response
+
+    @app.middleware("http")
+    async def add_request_id(request: Request, call_next):
+        response = await call_next(request)
+        response.headers["X-Request-ID"] = uuid.uuid4().hex
+        return response
+
+    return app
+
+
+def build_after(stream: bool) -> FastAPI:
+    app = _base_app(stream)
+    app.add_middleware(RateLimitMiddleware, limiter=RateLimiter(backend=MemoryRateLimitBackend()))
+    app.add_middleware(MonitoringMiddleware, collector=MetricsCollector())
+    app.add_middleware(TimingMiddleware)
+    app.add_middleware(RequestIDMiddleware)
+    return app
+
+
+async def _call(app, scope: Dict) -> None:
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    await app(dict(scope), receive, send)
+
+
+async def run(app: FastAPI, requests: int) -> float:
+    """Return mean seconds per request"""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.4"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/api/v1/items/42",
+        "raw_path": b"/api/v1/items/42",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"bench")],
+        "client": ("10.0.0.1", 1234),
+        "server": ("bench", 80),
+        "state": {},
+    }
+    # Warm up route matching, pydantic serialisers and the limiter key
+    for _ in range(200):
+        await _call(app, scope)
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        await _call(app, scope)
+    return (time.perf_counter() - start) / requests
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--stream", action="store_true", help="benchmark a StreamingResponse endpoint")
+    args = parser.parse_args()
+
+    builders: List[tuple[str, Callable[[bool], FastAPI]]] = [
+        ("none", build_none),
+        ("before", build_before),
+        ("after", build_after),
+    ]
+    results = {name: asyncio.run(run(build(args.stream), args.requests)) for name, build in builders}
+
+    baseline = results["none"]
+    print(f"{'stack':<8} {'us/request':>12} {'overhead us':>12}")
+    for name, _ in builders:
+        mean = results[name]
+        print(f"{name:<8} {mean * 1e6:>12.1f} {(mean - baseline) * 1e6:>12.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,126 @@
+"""
+Measure EnhancedRolePermissions.check_permission throughput.
+
+Usage:
+  python -m scripts.bench_permissions [--checks 20000] [--query-latency-ms 0.5]
+
+Behavior:
+  - Runs check_permission against an in-process session stand-in that answers
+    membership, organization settings and card ownership queries after
+    sleeping --query-latency-ms, so no database is needed
+  - Every check uses a fresh session (one request), as endpoints do
+  - "uncached": decision caching disabled (decision_ttl=0)
+  - "cached": the default decision cache
+  - Prints checks per second and queries issued per check for a role-only
+    permission, a settings-dependent permission and a card ownership check
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+import uuid
+from types import SimpleNamespace
+from typing import Dict, Optional
+
+from app.cache import cache_manager
+from app.services.enhanced_role_permissions import EnhancedRolePermissions, Permission
+
+ORGANIZATION_ID = str(uuid.uuid4())
+CARD_ID = str(uuid.uuid4())
+
+ORG_SETTINGS = SimpleNamespace(
+    allow_admin_create_projects=True,
+    allow_member_create_projects=False,
+    allow_admin_schedule_meetings=True,
+    allow_member_schedule_meetings=True,
+)
+
+
+class BenchSession:
+    """AsyncSession stand-in answering the queries check_permission issues"""
+
+    queries = 0
+
+    def __init__(self, user_id: str, role: str, latency: float):
+        self.user_id = user_id
+        self.role = role
+        self.latency = latency
+        self.info = {}
+
+    async def execute(self, statement):
+        BenchSession.queries += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        sql = str(statement)
+        if "organization_members" in sql:
+            rows, value = [(ORGANIZATION_ID, self.role)], None
+        elif "user_organization_context" in sql:
+            rows, value = [], None
+        elif "organization_settings" in sql:
+            rows, value = [], ORG_SETTINGS
+        else:
+            # Card / board ownership
+            rows, value = [], self.user_id
+
+        class Result:
+            def all(self):
+                return rows
+
+            def scalar_one_or_none(self):
+                return value
+
+        return Result()
+
+
+# case -> (role, permission, resource id)
+CASES: Dict[str, tuple] = {
+    "role_only": ("member", Permission.CREATE_CARD, None),
+    "org_settings": ("owner", Permission.SCHEDULE_MEETING, None),
+    "card_owner": ("member", Permission.UPDATE_OWN_CARD, CARD_ID),
+}
+
+
+async def _check(user_id: str, role: str, permission: Permission, resource_id: Optional[str],
+                 latency: float, decision_ttl: Optional[int]) -> bool:
+    service = EnhancedRolePermissions(BenchSession(user_id, role, latency), decision_ttl=decision_ttl)
+    return await service.check_permission(user_id, ORGANIZATION_ID, permission, resource_id)
+
+
+async def _run(checks: int, latency: float, decision_ttl: Optional[int]) -> Dict[str, tuple]:
+    cache_manager.local.clear()
+    results = {}
+    for name, (role, permission, resource_id) in CASES.items():
+        user_id = str(uuid.uuid4())
+        # Warm up the membership map and statement compilation
+        assert await _check(user_id, role, permission, resource_id, 0, decision_ttl)
+        BenchSession.queries = 0
+        start = time.perf_counter()
+        for _ in range(checks):
+            await _check(user_id, role, permission, resource_id, latency, decision_ttl)
+        elapsed = time.perf_counter() - start
+        results[name] = (checks / elapsed, BenchSession.queries / checks)
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--checks", type=int, default=20000)
+    parser.add_argument("--query-latency-ms", type=float, default=0.5)
+    args = parser.parse_args()
+
+    latency = args.query_latency_ms / 1000
+    uncached = asyncio.run(_run(args.checks, latency, decision_ttl=0))
+    cached = asyncio.run(_run(args.checks, latency, decision_ttl=None))
+
+    print(f"checks={args.checks} query latency={args.query_latency_ms}ms")
+    print(f"{'case':<14} {'uncached/s':>11} {'q/check':>8} {'cached/s':>11} {'q/check':>8} {'speedup':>8}")
+    for name in CASES:
+        (slow, slow_queries), (fast, fast_queries) = uncached[name], cached[name]
+        print(f"{name:<14} {slow:>11.0f} {slow_queries:>8.2f} {fast:>11.0f} {fast_queries:>8.2f} "
+              f"{fast / slow:>7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,86 @@
+"""
+Membership map tests
+"""
+import uuid
+
+import pytest
+
+from app.cache import cache_manager
+from app.core import memberships
+from app.core.memberships import load_memberships, membership_cache_key
+from app.core.permissions import get_user_role_for_project, get_user_role_in_organization
+from app.models.organization import OrganizationMember
+
+
+class ScriptedDB:
+    """AsyncSession stand-in answering queries from a list of results"""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.queries = 0
+        self.info = {}
+
+    async def execute(self, statement):
+        self.queries += 1
+        value = self.results.pop(0)
+
+        class Result:
+            def scalar_one_or_none(self):
+                return value
+
+            def all(self):
+                return value
+
+        return Result()
+
+
+def membership_results(roles, context=None):
+    return [list(roles.items()), context]
+
+
+@pytest.mark.asyncio
+async def test_map_is_loaded_once_and_shared_through_cache():
+    user_id, org_id = uuid.uuid4(), uuid.uuid4()
+    db = ScriptedDB(*membership_results({org_id: "admin"}, context=org_id))
+
+    memberships_map = await load_memberships(user_id, db)
+    assert memberships_map.role_in(org_id) == "admin"
+    assert memberships_map.current_organization_id == str(org_id)
+    assert await get_user_role_in_organization(str(user_id), str(org_id), db) == "admin"
+    assert await get_user_role_in_organization(str(user_id), str(uuid.uuid4()), db) is None
+    assert db.queries == 2
+
+    # Another request (session) is answered by the shared cache
+    other = ScriptedDB()
+    assert (await load_memberships(user_id, other)).role_in(org_id) == "admin"
+    assert other.queries == 0
+
+
+@pytest.mark.asyncio
+async def test_project_role_goes_through_project_lookup_and_map():
+    user_id, org_id = uuid.uuid4(), uuid.uuid4()
+    db = ScriptedDB(org_id, *membership_results({org_id: "member"}))
+
+    assert await get_user_role_for_project(str(user_id), str(uuid.uuid4()), db) == "member"
+    assert db.queries == 3
+
+
+@pytest.mark.asyncio
+async def test_membership_writes_invalidate_after_commit():
+    user_id, org_id = uuid.uuid4(), uuid.uuid4()
+    db = ScriptedDB(*membership_results({org_id: "viewer"}))
+    await load_memberships(user_id, db)
+    assert await cache_manager.get(membership_cache_key(user_id)) is not None
+
+    class FlushedSession:
+        new = [OrganizationMember(organization_id=uuid.uuid4(), user_id=user_id, role="member")]
+        dirty = deleted = ()
+        info = db.info
+
+    memberships._collect_membership_changes(FlushedSession, None)
+    assert str(user_id) not in db.info["memberships"]
+
+    memberships._invalidate_after_commit(FlushedSession)
+    for task in list(cache_manager._background):
+        await task
+    assert await cache_manager.get(membership_cache_key(user_id)) is None
@@ -0,0 +1,108 @@
+"""
+Permission decision cache tests
+"""
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from app.models.card import Card, CardAssignment
+from app.models.organization import OrganizationMember
+from app.models.project import Project
+from app.services import enhanced_role_permissions as erp
+from app.services.enhanced_role_permissions import (
+    ROLE_PERMISSIONS,
+    EnhancedRolePermissions,
+    Permission,
+    permission_org_tag,
+    permission_projects_tag,
+    permission_resource_tag,
+)
+
+
+class ScriptedDB:
+    """AsyncSession stand-in answering queries from a list of results"""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.queries = 0
+        self.info = {}
+
+    async def execute(self, statement):
+        self.queries += 1
+        value = self.results.pop(0)
+
+        class Result:
+            def scalar_one_or_none(self):
+                return value
+
+            def all(self):
+                return value
+
+        return Result()
+
+
+def membership_results(org_id, role):
+    return [[(str(org_id), role)], None]
+
+
+def test_role_permissions_are_frozen():
+    assert all(isinstance(permissions, frozenset) for permissions in ROLE_PERMISSIONS.values())
+    assert Permission.DELETE_ANY_CARD in ROLE_PERMISSIONS["admin"]
+    assert Permission.DELETE_ANY_CARD not in ROLE_PERMISSIONS["member"]
+
+
+@pytest.mark.asyncio
+async def test_resource_decisions_are_reused_across_requests():
+    user_id, org_id, card_id = str(uuid.uuid4()), str(uuid.uuid4()), str(uuid.uuid4())
+    db = ScriptedDB(*membership_results(org_id, "member"), uuid.UUID(user_id))
+    service = EnhancedRolePermissions(db)
+
+    assert await service.check_permission(user_id, org_id, Permission.UPDATE_OWN_CARD, card_id)
+    assert await service.check_permission(user_id, org_id, Permission.CREATE_CARD)
+    assert not await service.check_permission(user_id, org_id, Permission.DELETE_ANY_CARD, card_id)
+    assert db.queries == 3
+
+    # A later request only needs the cached membership map and decision
+    other = ScriptedDB()
+    assert await EnhancedRolePermissions(other).check_permission(
+        user_id, org_id, Permission.UPDATE_OWN_CARD, card_id
+    )
+    assert other.queries == 0
+
+    # Disabled cache goes back to the database
+    uncached = ScriptedDB(*membership_results(org_id, "member"), uuid.uuid4())
+    assert not await EnhancedRolePermissions(uncached, decision_ttl=0).check_permission(
+        user_id, org_id, Permission.UPDATE_OWN_CARD, card_id
+    )
+
+
+def test_flushes_collect_invalidation_tags():
+    user_id, org_id, old_org_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    member = OrganizationMember(organization_id=org_id, user_id=user_id, role="admin")
+    assignment = CardAssignment(card_id=uuid.uuid4(), user_id=user_id)
+    card = Card(id=uuid.uuid4(), title="t", created_by=user_id)
+    project = Project(organization_id=old_org_id, name="p", created_by=user_id)
+    project.organization_id = org_id
+
+    session = SimpleNamespace(new=[member, assignment], dirty=[card, project], deleted=[], info={})
+    erp._collect_permission_changes(session, None)
+
+    # New memberships change the role in the decision keys and clear nothing;
+    # a new assignment only affects the assignee's project list
+    assert session.info["permission_changes"] == {
+        permission_projects_tag(user_id),
+        permission_resource_tag(card.id),
+        permission_org_tag(org_id),
+    }
+
+
+@pytest.mark.asyncio
+async def test_modify_checks_reuse_the_cached_creator_lookup():
+    user_id, org_id, card_id = str(uuid.uuid4()), str(uuid.uuid4()), str(uuid.uuid4())
+    db = ScriptedDB(*membership_results(org_id, "member"), uuid.UUID(user_id))
+    service = EnhancedRolePermissions(db)
+
+    assert await service.can_modify_resource(user_id, org_id, "card", card_id)
+    assert await service.can_modify_resource(user_id, org_id, "card", card_id)
+    assert db.queries == 3
@@ -0,0 +1,65 @@
+"""
+Principal cache tests
+"""
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.cache import cache_manager
+from app.core.principal import Principal, principal_cache_key
+from app.services.session_service import SessionService
+
+
+class NoQueryDB:
+    """AsyncSession stand-in that fails the test on any round trip"""
+
+    async def execute(self, *args, **kwargs):
+        raise AssertionError("unexpected database query")
+
+    async def commit(self):
+        raise AssertionError("unexpected commit")
+
+
+def make_principal(**overrides):
+    now = datetime.utcnow()
+    values = dict(
+        user_id=uuid.uuid4(),
+        email="ada@example.com",
+        email_verified=True,
+        session_id=uuid.uuid4(),
+        expires_at=now + timedelta(hours=1),
+        last_activity=now,
+    )
+    values.update(overrides)
+    return Principal(**values)
+
+
+def test_principal_round_trips_through_cache_format():
+    principal = make_principal()
+    assert Principal.from_cache(principal.to_cache()) == principal
+    assert principal.id == principal.user_id
+
+
+def test_principal_cache_key_does_not_contain_token():
+    assert "secret-token" not in principal_cache_key("secret-token")
+
+
+@pytest.mark.asyncio
+async def test_cached_principal_needs_no_database():
+    principal = make_principal()
+    service = SessionService(NoQueryDB())
+    await service._cache_principal("token-1", principal)
+
+    assert await service.get_principal("token-1") == principal
+
+
+@pytest.mark.asyncio
+async def test_logout_all_invalidates_cached_principals():
+    principal = make_principal()
+    service = SessionService(NoQueryDB())
+    await service._cache_principal("token-2", principal)
+
+    await cache_manager.invalidate_user_cache(str(principal.user_id))
+
+    assert await cache_manager.get(principal_cache_key("token-2")) is None
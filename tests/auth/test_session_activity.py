@@ -0,0 +1,70 @@
+"""
+Batched session activity writer tests
+"""
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.services.session_activity import SessionActivityFlusher
+
+
+class RecordingSession:
+    def __init__(self, log, fail=False):
+        self.log = log
+        self.fail = fail
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement):
+        if self.fail:
+            raise RuntimeError("database unavailable")
+        self.log.append(statement)
+
+        class Result:
+            rowcount = 1
+
+        return Result()
+
+    async def commit(self):
+        self.log.append("commit")
+
+
+def test_touch_keeps_latest_timestamp():
+    flusher = SessionActivityFlusher(session_factory=None)
+    session_id = uuid.uuid4()
+    now = datetime.utcnow()
+    flusher.touch(session_id, now)
+    flusher.touch(session_id, now - timedelta(minutes=1))
+
+    assert flusher.pending == 1
+    assert flusher._pending[session_id] == now
+
+
+@pytest.mark.asyncio
+async def test_flush_writes_one_statement_and_one_commit():
+    log = []
+    flusher = SessionActivityFlusher(session_factory=lambda: RecordingSession(log))
+    for _ in range(5):
+        flusher.touch(uuid.uuid4())
+
+    await flusher.flush()
+
+    assert len(log) == 2 and log[-1] == "commit"
+    assert "FROM (VALUES" in str(log[0].compile(dialect=postgresql.dialect()))
+    assert flusher.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_pending_activity():
+    flusher = SessionActivityFlusher(session_factory=lambda: RecordingSession([], fail=True))
+    flusher.touch(uuid.uuid4())
+
+    assert await flusher.flush() == 0
+    assert flusher.pending == 1
+    assert flusher.stats["errors"] == 1
@@ -0,0 +1,126 @@
+"""
+Two-tier cache tests (L1 only; Redis is not required)
+"""
+import asyncio
+import time
+
+import pytest
+
+from app.cache import CacheManager, InvalidationBus, LocalLRUCache
+
+
+def test_lru_evicts_by_entry_count():
+    cache = LocalLRUCache(max_entries=2, max_bytes=1024 * 1024)
+    cache.set("user:1", {"id": 1})
+    cache.set("user:2", {"id": 2})
+    assert cache.get("user:1") == {"id": 1}  # user:1 becomes most recent
+
+    cache.set("user:3", {"id": 3})
+
+    assert cache.get("user:2") is None
+    assert cache.get("user:1") == {"id": 1}
+    assert cache.stats()["namespaces"]["user"]["evictions"] == 1
+
+
+def test_lru_evicts_by_bytes():
+    cache = LocalLRUCache(max_entries=100, max_bytes=100)
+    cache.set("blob:a", "x" * 60)
+    cache.set("blob:b", "y" * 60)
+
+    assert "blob:a" not in cache
+    assert cache.current_bytes <= 100
+    # A single value larger than the budget is never stored
+    assert cache.set("blob:c", "z" * 200) is False
+
+
+def test_lru_tag_invalidation_and_expiry():
+    cache = LocalLRUCache()
+    cache.set("org_members:1", [1, 2], tags=("org:1",))
+    cache.set("projects:1", [3], tags=("org:1",))
+    cache.set("projects:2", [4], tags=("org:2",))
+
+    cache.invalidate_tags("org:1")
+    assert cache.get("org_members:1") is None
+    assert cache.get("projects:1") is None
+    assert cache.get("projects:2") == [4]
+
+    cache.set("session:abc", "value", ttl=-1)
+    assert cache.get("session:abc") is None
+    assert cache.stats()["namespaces"]["session"]["expirations"] == 1
+
+
+def test_idle_generations_are_dropped_without_reviving_entries(monkeypatch):
+    cache = LocalLRUCache(generation_retention=60)
+    cache.invalidate_tags("org:1")
+    cache.set("projects:1", [3], tags=("org:1",), ttl=3600)
+    stale_generation = cache.generations["org:1"]
+
+    later = time.time() + 61
+    monkeypatch.setattr(time, "time", lambda: later)
+    assert cache.prune_generations() == 1
+    assert cache.generations == {}
+    # Stamped with the dropped generation: reads as stale
+    assert cache.get("projects:1") is None
+    # A later bump still moves the scope past every earlier generation
+    assert cache.bump("org:1") > stale_generation
+
+
+@pytest.mark.asyncio
+async def test_get_or_set_single_flight():
+    manager = CacheManager(local=LocalLRUCache())
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"value": 42}
+
+    results = await asyncio.gather(*(manager.get_or_set("dashboard:1", loader) for _ in range(10)))
+
+    assert calls == 1
+    assert all(result == {"value": 42} for result in results)
+    assert manager.stats["coalesced_loads"] == 9
+
+
+@pytest.mark.asyncio
+async def test_get_or_set_refreshes_early_near_expiry():
+    manager = CacheManager(local=LocalLRUCache(), early_refresh_beta=1.0)
+    manager.local.set("stats:1", "stale", ttl=5, delta=1e6)
+
+    async def loader():
+        return "fresh"
+
+    # A recompute time far above the remaining TTL makes XFetch refresh early
+    assert await manager.get_or_set("stats:1", loader) == "fresh"
+    assert manager.stats["early_refreshes"] == 1
+
+
+@pytest.mark.asyncio
+async def test_invalidation_reaches_other_workers():
+    bus = InvalidationBus()
+    worker_a = CacheManager(local=LocalLRUCache(), bus=bus)
+    worker_b = CacheManager(local=LocalLRUCache(), bus=bus)
+    await worker_a.set("org_members:1", ["alice"], tags=("org:1",))
+    await worker_b.set("org_members:1", ["alice"], tags=("org:1",))
+    await worker_b.set("session:abc", "principal")
+
+    await worker_a.invalidate_organization_cache("1")
+    await worker_a.delete("session:abc")
+
+    assert await worker_a.get("org_members:1") is None
+    assert await worker_b.get("org_members:1") is None
+    assert await worker_b.get("session:abc") is None
+
+
+@pytest.mark.asyncio
+async def test_invalidation_during_load_is_not_overwritten():
+    manager = CacheManager(local=LocalLRUCache())
+
+    async def loader():
+        # Membership changes while the old value is being computed
+        await manager.invalidate_namespace("org_members")
+        return ["stale"]
+
+    assert await manager.get_or_set("org_members:1", loader) == ["stale"]
+    assert await manager.get("org_members:1") is None
@@ -0,0 +1,61 @@
+"""
+Shared fixtures for the SQLite database tests
+
+Each test module lists the tables it needs in ``TABLES``; ``sqlite_session``
+creates them in a fresh in-memory database. ``AsyncShim`` lets code written
+against ``AsyncSession`` run on that synchronous session.
+"""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.core.database import Base
+
+
+class AsyncShim:
+    """AsyncSession stand-in running statements on a sync Session
+
+    It is its own async context manager, so ``lambda: shim`` works as a
+    session factory for background services.
+    """
+
+    def __init__(self, session):
+        self.session = session
+        self.bind = session.get_bind()
+        self.commits = 0
+
+    async def execute(self, statement, params=None):
+        return self.session.execute(statement, params)
+
+    async def run_sync(self, fn):
+        return fn(self.session)
+
+    def add(self, obj):
+        self.session.add(obj)
+
+    async def commit(self):
+        self.commits += 1
+        self.session.commit()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+@pytest.fixture
+def sqlite_session(request):
+    """Session on an in-memory SQLite database holding the module's ``TABLES``"""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=request.module.TABLES)
+    session = Session(engine, expire_on_commit=False)
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def async_db(sqlite_session):
+    """``AsyncShim`` over ``sqlite_session``"""
+    return AsyncShim(sqlite_session)
@@ -0,0 +1,66 @@
+"""
+JSON board snapshot tests (no database required)
+"""
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.core.exceptions import InsufficientPermissionsError, ResourceNotFoundError
+from app.database.board_snapshot import BOARD_SNAPSHOT_SQL, board_snapshot_json
+
+
+class SnapshotDB:
+    """AsyncSession stand-in with a dialect and one result row"""
+
+    def __init__(self, dialect, row=None):
+        self.bind = SimpleNamespace(dialect=SimpleNamespace(name=dialect))
+        self.row = row
+        self.params = None
+
+    async def execute(self, statement, params):
+        self.params = params
+        row = self.row
+
+        class Result:
+            def first(self):
+                return row
+
+        return Result()
+
+
+def test_snapshot_sql_keeps_response_order_and_binds_uuids():
+    sql = str(BOARD_SNAPSHOT_SQL.compile(dialect=postgresql.dialect()))
+
+    assert "ORDER BY col.ordinal" in sql and "ORDER BY c.ordinal" in sql
+    assert sql.count("row_number() OVER (ORDER BY rank)") == 2
+    assert sql.count("%(board_id)s") == 1 and sql.count("%(user_id)s") == 1
+
+
+@pytest.mark.asyncio
+async def test_snapshot_returns_bytes_and_checks_membership():
+    board_id, user_id = uuid.uuid4(), uuid.uuid4()
+    db = SnapshotDB("postgresql", SimpleNamespace(role="member", snapshot='{"id": "b"}'))
+
+    assert await board_snapshot_json(db, str(board_id), user_id) == b'{"id": "b"}'
+    assert db.params == {"board_id": board_id, "user_id": user_id}
+
+    with pytest.raises(InsufficientPermissionsError):
+        await board_snapshot_json(SnapshotDB("postgresql", SimpleNamespace(role=None, snapshot="{}")), board_id, user_id)
+    with pytest.raises(ResourceNotFoundError):
+        await board_snapshot_json(SnapshotDB("postgresql"), board_id, user_id)
+    with pytest.raises(ResourceNotFoundError):
+        await board_snapshot_json(SnapshotDB("postgresql"), "not-a-uuid", user_id)
+
+
+@pytest.mark.asyncio
+async def test_other_databases_fall_back_to_orm():
+    assert await board_snapshot_json(SnapshotDB("sqlite"), uuid.uuid4(), uuid.uuid4()) is None
+
+
+def test_snapshot_sql_formats_timestamps_in_utc():
+    sql = str(BOARD_SNAPSHOT_SQL.compile(dialect=postgresql.dialect()))
+
+    for column in ("b.created_at", "c.updated_at", "c.due_date", "a.assigned_at"):
+        assert f"to_char({column} AT TIME ZONE 'UTC'" in sql
@@ -0,0 +1,139 @@
+"""
+Board version and ETag tests
+"""
+import uuid
+
+import pytest
+from sqlalchemy import select
+
+from app.core.board_versions import board_etag, bump_board_versions, etag_matches, project_cards_etag
+import app.core.ordering  # noqa: F401  (assigns ordering keys to new rows on flush)
+from app.models.board import Board
+from app.models.board_change import BoardChange
+from app.models.card import Card, CardAssignment, ChecklistItem
+from app.models.column import Column
+from app.models.project import Project
+from app.models.project_stats import ProjectStats
+from app.models.user import User
+from app.services.board_changes import get_board_changes
+
+TABLES = [
+    User.__table__, Board.__table__, BoardChange.__table__, Column.__table__,
+    Card.__table__, CardAssignment.__table__, ChecklistItem.__table__, Project.__table__, ProjectStats.__table__,
+]
+
+
+def board_version(session, board_id):
+    return session.execute(select(Board.version).where(Board.id == board_id)).scalar_one()
+
+
+def test_card_and_column_changes_bump_the_board(sqlite_session):
+    session = sqlite_session
+    user_id = uuid.uuid4()
+
+    board = Board(project_id=uuid.uuid4(), name="Board", created_by=user_id)
+    other = Board(project_id=uuid.uuid4(), name="Other", created_by=user_id)
+    session.add_all([board, other])
+    session.flush()
+    assert board_version(session, board.id) == 0
+
+    todo = Column(board=board, name="Todo", position=0)
+    done = Column(board=board, name="Done", position=1)
+    session.add_all([todo, done])
+    session.flush()
+    assert board_version(session, board.id) == 1
+
+    card = Card(column_id=todo.id, title="Card", position=0, created_by=user_id)
+    session.add(card)
+    session.flush()
+    assert board_version(session, board.id) == 2
+
+    # Moving a card bumps once even though two columns changed
+    card.column_id = done.id
+    session.flush()
+    assert board_version(session, board.id) == 3
+
+    assignment = CardAssignment(card_id=card.id, user_id=user_id)
+    session.add(assignment)
+    session.flush()
+    assert board_version(session, board.id) == 4
+
+    session.delete(assignment)
+    session.flush()
+    assert board_version(session, board.id) == 5
+    assert board_version(session, other.id) == 0
+
+
+@pytest.mark.asyncio
+async def test_changes_since_cursor_include_tombstones(sqlite_session, async_db):
+    session = sqlite_session
+
+    user = User(email="a@example.com", password_hash="x", first_name="Ada", last_name="L")
+    board = Board(project_id=uuid.uuid4(), name="Board", created_by=uuid.uuid4())
+    todo = Column(board=board, name="Todo", position=0)
+    session.add_all([user, board, todo])
+    session.flush()
+    first = Card(column_id=todo.id, title="First", position=0, created_by=user.id)
+    second = Card(column_id=todo.id, title="Second", position=1, created_by=user.id)
+    session.add_all([first, second])
+    session.flush()
+    assignment = CardAssignment(card_id=first.id, user_id=user.id)
+    session.add(assignment)
+    session.flush()
+    session.refresh(board)
+    cursor = board.version
+
+    first.title = "First, renamed"
+    session.flush()
+    first.position = 5
+    session.delete(assignment)
+    session.flush()
+    session.refresh(board)
+
+    changes = await get_board_changes(async_db, board, cursor)
+    assert changes["resync"] is False
+    assert changes["cursor"] == board.version == cursor + 2
+    assert [card["title"] for card in changes["cards"]] == ["First, renamed"]
+    # Index in rank order, not the stored position
+    assert changes["cards"][0]["position"] == 0
+    assert changes["deleted"]["assignments"] == [str(assignment.id)]
+    assert changes["columns"] == [] and changes["assignments"] == []
+
+    unchanged = await get_board_changes(async_db, board, board.version)
+    assert unchanged["cards"] == [] and unchanged["resync"] is False
+
+    assert (await get_board_changes(async_db, board, None))["resync"]
+    assert (await get_board_changes(async_db, board, board.version + 1))["resync"]
+
+    # Cursor older than the retained log
+    session.execute(BoardChange.__table__.delete().where(BoardChange.version <= cursor + 1))
+    assert (await get_board_changes(async_db, board, cursor))["resync"]
+
+
+def test_etags():
+    board_id = uuid.uuid4()
+    etag = board_etag(board_id, 7)
+
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(board_etag(board_id, 6), etag)
+    assert not etag_matches(None, etag)
+
+    project_id = uuid.uuid4()
+    a, b = uuid.uuid4(), uuid.uuid4()
+    assert project_cards_etag(project_id, [(a, 1), (b, 2)]) == project_cards_etag(project_id, [(b, 2), (a, 1)])
+    assert project_cards_etag(project_id, [(a, 1), (b, 2)]) != project_cards_etag(project_id, [(a, 1), (b, 3)])
+    full = project_cards_etag(project_id, [(a, 1)])
+    titles = project_cards_etag(project_id, [(a, 1)], ("id", "title"))
+    assert len({full, titles, project_cards_etag(project_id, [(a, 1)], ("id", "status"))}) == 3
+    assert titles == project_cards_etag(project_id, [(a, 1)], ("id", "title"))
+
+
+@pytest.mark.asyncio
+async def test_bulk_bump_without_ids_is_a_no_op():
+    class NoQueries:
+        async def execute(self, statement):
+            raise AssertionError("no statement expected")
+
+    await bump_board_versions(NoQueries(), [])
@@ -0,0 +1,168 @@
+"""
+Batch card operation tests (SQLite, no server required)
+"""
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.dialects.postgresql import asyncpg
+
+import app.services.card_batch as card_batch
+from app.core.exceptions import InsufficientPermissionsError, ResourceNotFoundError
+from app.core.memberships import MembershipMap
+from app.models.board import Board
+from app.models.board_change import BoardChange
+from app.models.card import Card, CardAssignment, ChecklistItem
+from app.models.column import Column
+from app.models.organization import OrganizationMember
+from app.models.project import Project
+from app.models.project_stats import ProjectStats
+from app.models.user import User
+from app.schemas.card import CardBatchOperation
+from app.services.card_batch import CardBatchService, _CardState, values_update
+
+TABLES = [
+    User.__table__, OrganizationMember.__table__, Project.__table__, Board.__table__,
+    BoardChange.__table__, Column.__table__, Card.__table__, CardAssignment.__table__,
+    ChecklistItem.__table__, ProjectStats.__table__,
+]
+
+
+@pytest.fixture
+def board(sqlite_session, monkeypatch):
+    session = sqlite_session
+    organization_id = uuid.uuid4()
+    user = User(email="m@example.com", password_hash="x", first_name="Mia", last_name="M")
+    other = User(email="o@example.com", password_hash="x", first_name="Oli", last_name="O")
+    session.add_all([user, other])
+    session.flush()
+    session.add_all([
+        OrganizationMember(organization_id=organization_id, user_id=user.id, role="member"),
+        OrganizationMember(organization_id=organization_id, user_id=other.id, role="member"),
+    ])
+    project = Project(organization_id=organization_id, name="Project", created_by=user.id)
+    session.add(project)
+    session.flush()
+    board = Board(project_id=project.id, name="Board", created_by=user.id)
+    todo = Column(board=board, name="To Do", position=0)
+    done = Column(board=board, name="Done", position=1)
+    session.add_all([board, todo, done])
+    session.flush()
+    cards = [Card(column_id=todo.id, title=f"Card {i}", position=i, created_by=user.id) for i in range(6)]
+    foreign = Card(column_id=todo.id, title="Not mine", position=6, created_by=other.id)
+    session.add_all([*cards, foreign])
+    session.commit()
+
+    monkeypatch.setattr(
+        card_batch, "load_memberships",
+        lambda user_id, db: _async(MembershipMap(user_id, {str(organization_id): "member"})),
+    )
+    return SimpleNamespace(
+        session=session, engine=session.get_bind(), user=user, other=other, board=board,
+        todo=todo, done=done, cards=cards, foreign=foreign,
+    )
+
+
+async def _async(value):
+    return value
+
+
+def titles(session, column):
+    return session.execute(
+        select(Card.title).where(Card.column_id == column.id).order_by(Card.rank)
+    ).scalars().all()
+
+
+def count_statements(engine):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    return statements, record
+
+
+@pytest.mark.asyncio
+async def test_batch_applies_in_order_with_one_commit(board, async_db):
+    session = board.session
+    cards = [SimpleNamespace(id=card.id) for card in board.cards]
+    version = session.execute(select(Board.version).where(Board.id == board.board.id)).scalar_one()
+    operations = [
+        CardBatchOperation(op="move", card_id=cards[0].id, target_column_id=board.done.id),
+        CardBatchOperation(op="move", card_id=cards[1].id, target_column_id=board.done.id, position=0),
+        CardBatchOperation(op="update", card_id=cards[2].id, title="Renamed", priority="high"),
+        CardBatchOperation(op="assign", card_id=cards[2].id, user_ids=[board.user.id]),
+        CardBatchOperation(op="delete", card_id=cards[3].id),
+    ]
+
+    result = await CardBatchService(async_db).apply(board.user, operations)
+
+    assert async_db.commits == 1
+    assert titles(session, board.done) == ["Card 1", "Card 0"]
+    assert titles(session, board.todo) == ["Renamed", "Card 4", "Card 5", "Not mine"]
+    assert session.execute(select(Card.status).where(Card.id == cards[0].id)).scalar_one() == "completed"
+    assert session.execute(select(Card.completed_at).where(Card.id == cards[0].id)).scalar_one() is not None
+    assert session.execute(select(CardAssignment.user_id)).scalars().all() == [board.user.id]
+    assert result["deleted"] == [str(cards[3].id)]
+    # One version bump for the whole batch
+    assert result["boards"] == [{"board_id": str(board.board.id), "version": version + 1}]
+    logged = session.execute(select(BoardChange.version).distinct()).scalars().all()
+    assert max(logged) == version + 1
+
+
+@pytest.mark.asyncio
+async def test_statement_count_does_not_grow_with_the_batch(board, async_db):
+    user = SimpleNamespace(id=board.user.id)
+    card_ids, done_id = [card.id for card in board.cards], board.done.id
+    counts = []
+    for group in (card_ids[:2], card_ids[2:6]):
+        statements, record = count_statements(board.engine)
+        await CardBatchService(async_db).apply(user, [
+            CardBatchOperation(op="move", card_id=card_id, target_column_id=done_id) for card_id in group
+        ])
+        event.remove(board.engine, "before_cursor_execute", record)
+        counts.append(len(statements))
+    assert counts[0] == counts[1]
+
+
+@pytest.mark.asyncio
+async def test_rejected_operation_applies_nothing(board, async_db):
+    operations = [
+        CardBatchOperation(op="move", card_id=board.cards[0].id, target_column_id=board.done.id),
+        # Members may only delete their own cards
+        CardBatchOperation(op="delete", card_id=board.foreign.id),
+    ]
+    with pytest.raises(InsufficientPermissionsError):
+        await CardBatchService(async_db).apply(board.user, operations)
+    board.session.rollback()
+    assert titles(board.session, board.done) == []
+
+    with pytest.raises(InsufficientPermissionsError):
+        await CardBatchService(async_db).apply(board.user, [
+            CardBatchOperation(op="assign", card_id=board.cards[0].id, user_ids=[board.other.id]),
+        ])
+    with pytest.raises(ResourceNotFoundError):
+        await CardBatchService(async_db).apply(board.user, [
+            CardBatchOperation(op="move", card_id=board.cards[0].id, target_column_id=uuid.uuid4()),
+        ])
+    assert async_db.commits == 0
+
+
+def test_postgres_bulk_update_is_one_values_statement():
+    def state(**changes):
+        return _CardState(
+            id=uuid.uuid4(), column_id=uuid.uuid4(), created_by=uuid.uuid4(), board_id=uuid.uuid4(),
+            project_id=uuid.uuid4(), organization_id=uuid.uuid4(), data_protected=False,
+            pending_sign_off=False, changes=changes,
+        )
+
+    compiled = values_update([state(rank="i", column_id=uuid.uuid4()), state(title="New")]).compile(
+        dialect=asyncpg.dialect()
+    )
+    sql = str(compiled)
+    assert sql.startswith("UPDATE cards SET") and "FROM (VALUES" in sql
+    assert "rank=coalesce(CAST(batch.rank AS VARCHAR(255)), cards.rank)" in sql
+    # Unchanged fields (including JSON labels) are SQL NULLs, so only the changes are bound
+    assert len(compiled.params) == 5
@@ -0,0 +1,94 @@
+"""
+Sparse card fieldset tests (SQLite, no server required)
+"""
+import uuid
+
+import pytest
+from sqlalchemy import event, select, update
+
+import app.core.ordering  # noqa: F401  (assigns ranks to new rows)
+from app.core.exceptions import ValidationError
+from app.core.pagination import decode_cursor, keyset
+from app.database.card_views import COMPACT_FIELDS, fetch_card_views, parse_fields
+from app.models.board import Board
+from app.models.board_change import BoardChange
+from app.models.card import Card, CardAssignment, ChecklistItem
+from app.models.column import Column
+from app.models.comment import Comment
+from app.models.project import Project
+from app.models.project_stats import ProjectStats
+from app.models.user import User
+
+TABLES = [
+    User.__table__, Board.__table__, BoardChange.__table__, Column.__table__, Card.__table__,
+    CardAssignment.__table__, ChecklistItem.__table__, Comment.__table__, Project.__table__, ProjectStats.__table__,
+]
+
+
+@pytest.fixture
+def column(sqlite_session):
+    session = sqlite_session
+    user = User(email="c@example.com", password_hash="x", first_name="Cam", last_name="C")
+    session.add(user)
+    session.flush()
+    board = Board(project_id=uuid.uuid4(), name="Board", created_by=user.id)
+    column = Column(board=board, name="To Do", position=0)
+    session.add_all([board, column])
+    session.flush()
+    cards = [Card(column_id=column.id, title=f"Card {i}", position=i, created_by=user.id) for i in range(3)]
+    session.add_all(cards)
+    session.flush()
+    session.add_all([
+        ChecklistItem(card_id=cards[0].id, text="a", position=0, completed=True, created_by=user.id),
+        ChecklistItem(card_id=cards[0].id, text="b", position=1, created_by=user.id),
+        Comment(card_id=cards[0].id, user_id=user.id, content="hi"),
+        CardAssignment(card_id=cards[1].id, user_id=user.id, assigned_by=user.id),
+    ])
+    session.commit()
+    return session, session.get_bind(), column, cards
+
+
+def test_parse_fields():
+    assert parse_fields() is None
+    assert parse_fields("compact") == COMPACT_FIELDS
+    assert parse_fields("full", "title, comment_count,title") == ("id", "title", "comment_count")
+    for view, fields in (("tiny", None), ("full", "title,password_hash")):
+        with pytest.raises(ValidationError):
+            parse_fields(view, fields)
+
+
+@pytest.mark.asyncio
+async def test_compact_view_is_one_statement_with_counts(column, async_db):
+    session, engine, column, cards = column
+    query = select(Card).where(Card.column_id == column.id).order_by(Card.rank)
+    # A stale stored position; the view reports the index in rank order
+    session.execute(update(Card).where(Card.id == cards[0].id).values(position=9))
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    result, cursor = await fetch_card_views(async_db, query, COMPACT_FIELDS)
+
+    assert len(statements) == 1 and cursor is None
+    assert [card["title"] for card in result] == ["Card 0", "Card 1", "Card 2"]
+    assert [card["position"] for card in result] == [0, 1, 2]
+    assert set(result[0]) == set(COMPACT_FIELDS)
+    assert (result[0]["checklist_total"], result[0]["checklist_completed"], result[0]["comment_count"]) == (2, 1, 1)
+    assert (result[1]["checklist_total"], result[1]["comment_count"]) == (0, 0)
+    assert result[0]["labels"] == []
+
+
+@pytest.mark.asyncio
+async def test_fields_load_only_requested_relations_and_page(column, async_db):
+    session, engine, column, cards = column
+    query = keyset(select(Card).where(Card.column_id == column.id), (Card.created_at, Card.id), None).limit(2 + 1)
+    fields = parse_fields(fields="title,assignments")
+
+    result, cursor = await fetch_card_views(async_db, query, fields, 2, ("created_at", "id"))
+
+    # The page key is selected for the cursor but not returned
+    assert all(set(card) == {"id", "title", "assignments"} for card in result)
+    assert len(result) == 2
+    for card in result:
+        expected = ["c@example.com"] if card["id"] == cards[1].id else []
+        assert [a["user"]["email"] for a in card["assignments"]] == expected
+    assert decode_cursor(cursor, (Card.created_at, Card.id))[1] == result[-1]["id"]
@@ -0,0 +1,190 @@
+"""
+Dashboard statistics tests (SQLite, no server required)
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event, update
+
+import app.core.ordering  # noqa: F401  (assigns ranks to new rows)
+import app.core.project_stats  # noqa: F401  (maintains the project card counters)
+from app.api.v1 import analytics
+from app.api.v1.endpoints import dashboard_api
+from app.database.dashboard_stats import dashboard_stats_query, fetch_dashboard_stats
+from app.models.board import Board
+from app.models.board_change import BoardChange
+from app.models.card import Card, CardAssignment
+from app.models.column import Column
+from app.models.organization import Organization, OrganizationMember
+from app.models.organization_settings import MeetingSchedule
+from app.models.project import Project
+from app.models.project_stats import ProjectStats
+from app.models.user import User
+
+TABLES = [
+    User.__table__, Organization.__table__, OrganizationMember.__table__, Project.__table__,
+    Board.__table__, BoardChange.__table__, Column.__table__, Card.__table__, CardAssignment.__table__,
+    MeetingSchedule.__table__, ProjectStats.__table__,
+]
+
+
+def add_project(session, organization, user, status, card_statuses):
+    project = Project(organization_id=organization.id, name=f"{status} project", status=status, created_by=user.id)
+    session.add(project)
+    session.flush()
+    board = Board(project_id=project.id, name="Board", created_by=user.id)
+    column = Column(board=board, name="To Do", position=0)
+    session.add_all([board, column])
+    session.flush()
+    cards = [
+        Card(column_id=column.id, title=f"Card {i}", position=i, status=card_status, created_by=user.id)
+        for i, card_status in enumerate(card_statuses)
+    ]
+    session.add_all(cards)
+    session.flush()
+    return cards
+
+
+@pytest.fixture
+def org(sqlite_session):
+    session = sqlite_session
+    owner = User(email="owner@example.com", password_hash="x", first_name="Olive", last_name="O")
+    member = User(email="member@example.com", password_hash="x", first_name="Max", last_name="M")
+    session.add_all([owner, member])
+    session.flush()
+    organization = Organization(name="Acme", created_by=owner.id)
+    other = Organization(name="Other", created_by=member.id)
+    session.add_all([organization, other])
+    session.flush()
+    session.add_all([
+        OrganizationMember(organization_id=organization.id, user_id=owner.id, role="owner"),
+        OrganizationMember(organization_id=organization.id, user_id=member.id, role="member"),
+        OrganizationMember(organization_id=other.id, user_id=member.id, role="owner"),
+        MeetingSchedule(
+            organization_id=organization.id, title="Standup", organizer_id=owner.id,
+            scheduled_at=datetime(2026, 1, 5, tzinfo=timezone.utc),
+        ),
+    ])
+    cards = add_project(session, organization, owner, "active", ["completed", "in_progress", "todo"])
+    add_project(session, organization, owner, "archived", [])
+    add_project(session, other, member, "active", ["todo"])
+    session.add_all([
+        CardAssignment(card_id=cards[0].id, user_id=member.id, assigned_by=owner.id),
+        CardAssignment(card_id=cards[1].id, user_id=member.id, assigned_by=owner.id),
+        CardAssignment(card_id=cards[1].id, user_id=owner.id, assigned_by=owner.id),
+    ])
+    session.commit()
+    return session, session.get_bind(), organization, owner, member
+
+
+async def run_counted(engine, call):
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        return await call(), len(statements)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+@pytest.mark.asyncio
+async def test_analytics_dashboard_is_one_statement(org, async_db):
+    session, engine, organization, owner, member = org
+
+    stats, statements = await run_counted(
+        engine, lambda: analytics.get_dashboard_stats(current_user=member, db=async_db)
+    )
+
+    assert statements == 1
+    assert stats == {
+        "total_projects": 3,
+        "total_boards": 3,
+        "total_cards": 4,
+        "organizations": 2,
+        "completion_rate": 25.0,
+        "active_projects": 2,
+        "completed_tasks": 1,
+        "pending_tasks": 3,
+        "team_members": 2,
+    }
+
+
+@pytest.mark.asyncio
+async def test_owner_dashboard_statement_count(org, async_db):
+    session, engine, organization, owner, member = org
+
+    data, statements = await run_counted(engine, lambda: dashboard_api.get_owner_dashboard(
+        organization_id=organization.id, current_user=owner, db=async_db
+    ))
+
+    # Role check, statistics, recent projects, role distribution
+    assert statements == 4
+    assert data["stats"] == {
+        "total_projects": 2,
+        "total_members": 2,
+        "total_tasks": 3,
+        "completed_tasks": 1,
+        "pending_tasks": 2,
+        "total_meetings": 1,
+        "completion_rate": 33.33,
+    }
+    assert data["role_distribution"] == {"owner": 1, "member": 1}
+
+
+@pytest.mark.asyncio
+async def test_admin_dashboard_statement_count(org, async_db):
+    session, engine, organization, owner, member = org
+
+    data, statements = await run_counted(engine, lambda: dashboard_api.get_admin_dashboard(
+        organization_id=organization.id, current_user=owner, db=async_db
+    ))
+
+    # Role check, statistics, recent tasks
+    assert statements == 3
+    assert data["stats"]["total_tasks"] == 3
+    assert data["stats"]["total_members"] == 2
+    assert data["stats"]["my_tasks"] == 1
+    assert [task["title"] for task in data["recent_tasks"]] == ["Card 1"]
+
+
+@pytest.mark.asyncio
+async def test_member_dashboard_counts_only_assigned_cards(org, async_db):
+    session, engine, organization, owner, member = org
+
+    data, statements = await run_counted(engine, lambda: dashboard_api.get_member_dashboard(
+        organization_id=organization.id, current_user=member, db=async_db
+    ))
+
+    # Role check, statistics, recent tasks, projects with assigned tasks
+    assert statements == 4
+    assert data["stats"] == {
+        "total_tasks": 2,
+        "completed_tasks": 1,
+        "in_progress_tasks": 1,
+        "todo_tasks": 0,
+        "completion_rate": 50.0,
+    }
+    assert [project["name"] for project in data["accessible_projects"]] == ["active project"]
+
+    with pytest.raises(ValueError):
+        dashboard_stats_query(Project.organization_id == organization.id, assigned_only=True)
+
+
+@pytest.mark.asyncio
+async def test_overdue_follows_the_clock_not_the_counters(org, async_db):
+    session, engine, organization, owner, member = org
+    past = datetime.now(timezone.utc) - timedelta(hours=1)
+    # Due dates that pass after the counters were written: open cards only
+    session.execute(update(Card).values(due_date=past))
+    session.commit()
+
+    stats = await fetch_dashboard_stats(async_db, dashboard_stats_query(Project.organization_id == organization.id))
+    assigned = await fetch_dashboard_stats(async_db, dashboard_stats_query(
+        Project.organization_id == organization.id, user_id=member.id, assigned_only=True
+    ))
+
+    assert stats["overdue_tasks"] == 2
+    assert assigned["overdue_tasks"] == 1
@@ -0,0 +1,77 @@
+"""
+asyncpg fast path tests (no database required)
+"""
+import uuid
+
+import pytest
+
+from app.core.permissions import get_user_role_in_organization
+from app.database import fast_queries
+from app.models.user import display_name
+
+
+class RoleSession:
+    """AsyncSession stand-in answering the ORM membership queries"""
+
+    def __init__(self, organization_id, role):
+        # The user's memberships, then their selected organization
+        self.results = [[(organization_id, role)], None]
+        self.queries = 0
+        self.info = {}
+
+    async def execute(self, statement):
+        self.queries += 1
+        value = self.results.pop(0)
+
+        class Result:
+            def scalar_one_or_none(self):
+                return value
+
+            def all(self):
+                return value
+
+        return Result()
+
+
+def test_card_list_sql_numbers_parameters_per_filter_combination():
+    sql = fast_queries.build_card_list_sql("board", assigned=True, with_status=False, with_priority=True)
+
+    assert "col.board_id = $1" in sql
+    assert "a.user_id = $2" in sql
+    assert "c.priority = $3" in sql
+    assert "OFFSET $4 LIMIT $5" in sql
+    assert "c.status = " not in sql
+    assert "ORDER BY c.created_at, c.id" in sql
+
+
+def test_card_list_sql_continues_after_a_cursor():
+    sql = fast_queries.build_card_list_sql("column", with_status=True, after_cursor=True)
+
+    assert "(c.created_at, c.id) > ($3, $4)" in sql
+    assert "LIMIT $5" in sql
+    assert "OFFSET" not in sql
+
+
+def test_default_card_list_is_scoped_to_user_organizations():
+    sql = fast_queries.build_card_list_sql("organizations")
+    assert "organization_members WHERE user_id = $1" in sql
+
+
+@pytest.mark.asyncio
+async def test_fast_path_unavailable_without_pool():
+    assert not fast_queries.fast_path_allowed()
+    with pytest.raises(fast_queries.FastPathUnavailable):
+        await fast_queries.notification_counts(uuid.uuid4())
+
+
+@pytest.mark.asyncio
+async def test_role_lookup_falls_back_to_orm():
+    organization_id = uuid.uuid4()
+    db = RoleSession(organization_id, "admin")
+    assert await get_user_role_in_organization(str(uuid.uuid4()), str(organization_id), db) == "admin"
+    assert db.queries == 2
+
+
+def test_full_name_leaves_out_a_missing_last_name():
+    assert display_name("Uma", None) == "Uma"
+    assert display_name("Uma", "U") == "Uma U"
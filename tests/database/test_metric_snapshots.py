@@ -0,0 +1,226 @@
+"""
+Metric snapshot collection, downsampling and series tests (SQLite, no server required)
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select, update
+
+import app.core.ordering  # noqa: F401  (assigns ranks to new rows)
+import app.core.project_stats  # noqa: F401  (maintains the project card counters)
+from app.api.v1 import analytics
+from app.core.exceptions import ValidationError
+from app.models.analytics import MetricSnapshot
+from app.models.attachment import Attachment
+from app.models.board import Board
+from app.models.board_change import BoardChange
+from app.models.card import Card, CardAssignment, ChecklistItem, stamp_completions
+from app.models.column import Column
+from app.models.comment import Comment
+from app.models.organization import Organization, OrganizationMember
+from app.models.organization_settings import MeetingSchedule
+from app.models.project import Project
+from app.models.project_stats import ProjectStats
+from app.models.session import UserSession
+from app.models.user import User
+from app.services.metric_snapshots import MetricSnapshotCollector, choose_resolution, metric_series
+
+TABLES = [
+    User.__table__, Organization.__table__, OrganizationMember.__table__, Project.__table__,
+    Board.__table__, BoardChange.__table__, Column.__table__, Card.__table__, CardAssignment.__table__,
+    ChecklistItem.__table__, Comment.__table__, Attachment.__table__, ProjectStats.__table__,
+    UserSession.__table__, MeetingSchedule.__table__, MetricSnapshot.__table__,
+]
+
+NOW = datetime(2026, 3, 10, 2, 0, 30, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def org(sqlite_session, async_db):
+    session = sqlite_session
+    user = User(email="u@example.com", password_hash="x", first_name="Uma", last_name="U")
+    session.add(user)
+    session.flush()
+    organization = Organization(name="Acme", created_by=user.id)
+    session.add(organization)
+    session.flush()
+    session.add(OrganizationMember(organization_id=organization.id, user_id=user.id, role="owner"))
+    project = Project(organization_id=organization.id, name="Project", created_by=user.id)
+    session.add(project)
+    session.flush()
+    board = Board(project_id=project.id, name="Board", created_by=user.id)
+    column = Column(board=board, name="To Do", position=0)
+    session.add_all([board, column])
+    session.commit()
+    collector = MetricSnapshotCollector(session_factory=lambda: async_db)
+    return session, organization, user, column, collector
+
+
+def add_samples(session, organization, resolution, samples):
+    session.add_all([
+        MetricSnapshot(
+            organization_id=organization.id, metric_type=metric_type, metric_name=metric_type,
+            metric_value=value, resolution=resolution, snapshot_date=at,
+        )
+        for metric_type, at, value in samples
+    ])
+    session.commit()
+
+
+def stored(session, resolution, metric_type):
+    rows = session.execute(
+        select(MetricSnapshot.snapshot_date, MetricSnapshot.metric_value)
+        .where(MetricSnapshot.resolution == resolution, MetricSnapshot.metric_type == metric_type)
+        .order_by(MetricSnapshot.snapshot_date)
+    ).all()
+    return [(at.replace(tzinfo=timezone.utc), value) for at, value in rows]
+
+
+def at(day, hour, minute):
+    return datetime(2026, 3, day, hour, minute, tzinfo=timezone.utc)
+
+
+def completed_at(session, card):
+    return session.execute(select(Card.completed_at).where(Card.id == card.id)).scalar_one()
+
+
+def test_completion_time_follows_status(org):
+    session, organization, user, column, collector = org
+    orm = Card(column_id=column.id, title="ORM", position=0, created_by=user.id)
+    bulk = Card(column_id=column.id, title="Bulk", position=1, created_by=user.id)
+    session.add_all([orm, bulk])
+    session.commit()
+
+    orm.status = "completed"
+    session.commit()
+    first = completed_at(session, orm)
+    orm.title = "Edited"
+    orm.status = "completed"
+    session.commit()
+    assert first is not None and completed_at(session, orm) == first
+    orm.status = "todo"
+    session.commit()
+    assert completed_at(session, orm) is None
+
+    stamped = []
+    for status in ("completed", "completed", "in_progress"):
+        session.execute(update(Card).where(Card.id == bulk.id).values(status=status))
+        session.execute(stamp_completions([bulk.id]))
+        session.commit()
+        stamped.append(completed_at(session, bulk))
+    assert stamped[0] is not None and stamped[1] == stamped[0] and stamped[2] is None
+
+
+@pytest.mark.asyncio
+async def test_collect_samples_the_last_interval_once(org):
+    session, organization, user, column, collector = org
+    window = at(10, 1, 59)
+    session.add_all([
+        Card(column_id=column.id, title="New", position=0, created_by=user.id, created_at=window + timedelta(seconds=5)),
+        Card(column_id=column.id, title="Old", position=1, created_by=user.id, created_at=window - timedelta(hours=1)),
+        Card(
+            column_id=column.id, title="Done", position=2, status="completed", created_by=user.id,
+            created_at=window - timedelta(hours=1), completed_at=window + timedelta(seconds=30),
+        ),
+        # Completed earlier, only edited in the window
+        Card(
+            column_id=column.id, title="Edited", position=3, status="completed", created_by=user.id,
+            created_at=window - timedelta(hours=2), completed_at=window - timedelta(hours=1),
+            updated_at=window + timedelta(seconds=40),
+        ),
+        UserSession.create_session(user.id),
+    ])
+    session.commit()
+    session.execute(UserSession.__table__.update().values(last_activity=window.replace(tzinfo=None)))
+    session.commit()
+
+    assert await collector.collect(now=NOW) == 4
+    assert await collector.collect(now=NOW) == 4
+
+    assert stored(session, "minute", "cards_created") == [(window, 1.0)]
+    assert stored(session, "minute", "cards_completed") == [(window, 1.0)]
+    assert stored(session, "minute", "active_users") == [(window, 1.0)]
+    assert stored(session, "minute", "completion_rate") == [(window, pytest.approx(50))]
+
+
+@pytest.mark.asyncio
+async def test_downsample_rolls_up_ended_buckets_and_prunes_rolled_rows(org):
+    session, organization, user, column, collector = org
+    add_samples(session, organization, "minute", [
+        ("cards_created", at(9, 23, 58), 2), ("cards_created", at(9, 23, 59), 3),
+        ("cards_created", at(10, 0, 0), 4), ("cards_created", at(10, 0, 30), 1),
+        ("active_users", at(9, 23, 59), 5), ("active_users", at(10, 0, 0), 3),
+        ("completion_rate", at(9, 23, 58), 40), ("completion_rate", at(9, 23, 59), 60),
+    ])
+
+    await collector.downsample(now=NOW)
+
+    assert stored(session, "hour", "cards_created") == [(at(9, 23, 0), 5.0), (at(10, 0, 0), 5.0)]
+    assert stored(session, "hour", "active_users") == [(at(9, 23, 0), 5.0), (at(10, 0, 0), 3.0)]
+    assert stored(session, "hour", "completion_rate") == [(at(9, 23, 0), 50.0)]
+    assert stored(session, "day", "cards_created") == [(at(9, 0, 0), 5.0)]
+    # Nothing is past its retention yet
+    assert len(stored(session, "minute", "cards_created")) == 4
+
+    later = at(12, 0, 30)
+    await collector.downsample(now=later)
+
+    assert stored(session, "day", "cards_created") == [(at(9, 0, 0), 5.0), (at(10, 0, 0), 5.0)]
+    assert stored(session, "minute", "cards_created") == [(at(10, 0, 30), 1.0)]
+    assert collector.stats["rows_pruned"] == 7
+
+
+@pytest.mark.asyncio
+async def test_series_completes_the_tail_from_finer_rows(org, async_db):
+    session, organization, user, column, collector = org
+    add_samples(session, organization, "minute", [
+        ("cards_created", at(9, 23, 58), 2), ("cards_created", at(10, 0, 5), 4),
+    ])
+    await collector.downsample(now=NOW)
+    # Not rolled up yet
+    add_samples(session, organization, "minute", [("cards_created", at(10, 1, 15), 7)])
+
+    days = await metric_series(async_db, organization.id, "cards_created", at(9, 6, 0), NOW, resolution="day")
+    assert days["resolution"] == "day"
+    assert [(point["timestamp"][:10], point["value"]) for point in days["points"]] == [
+        ("2026-03-09", 2), ("2026-03-10", 11),
+    ]
+
+    hours = await metric_series(async_db, organization.id, "cards_created", at(9, 22, 0), NOW, resolution="hour")
+    assert [point["value"] for point in hours["points"]] == [0, 2, 4, 7, 0]
+
+    rates = await metric_series(async_db, organization.id, "completion_rate", at(10, 0, 0), NOW, resolution="hour")
+    assert {point["value"] for point in rates["points"]} == {None}
+
+
+@pytest.mark.asyncio
+async def test_series_rejects_bad_requests(org, async_db):
+    session, organization, user, column, collector = org
+
+    with pytest.raises(ValidationError):
+        await metric_series(async_db, organization.id, "unknown", at(9, 0, 0), NOW)
+    with pytest.raises(ValidationError):
+        await metric_series(async_db, organization.id, "cards_created", at(1, 0, 0), NOW, resolution="minute")
+
+    assert choose_resolution(NOW - timedelta(hours=6), NOW, now=NOW) == "minute"
+    assert choose_resolution(NOW - timedelta(days=30), NOW, now=NOW) == "hour"
+    assert choose_resolution(NOW - timedelta(days=365), NOW, now=NOW) == "day"
+
+
+@pytest.mark.asyncio
+async def test_performance_reads_the_rollups(org, async_db):
+    session, organization, user, column, collector = org
+    now = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+    add_samples(session, organization, "minute", [
+        ("cards_created", now - timedelta(minutes=5), 3),
+        ("active_users", now - timedelta(minutes=5), 2),
+    ])
+
+    data = await analytics.get_organization_performance(
+        organization_id=organization.id, current_user=user, db=async_db
+    )
+
+    assert data["total_projects"] == 1
+    assert data["total_members"] == 1
+    assert data["active_members"] == 2
+    assert sum(trend["cards_created"] for trend in data["performance_trends"]) == 3
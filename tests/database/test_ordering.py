@@ -0,0 +1,139 @@
+"""
+Fractional ordering key tests
+"""
+import random
+import uuid
+
+import pytest
+from sqlalchemy import event, select
+
+from app.core.ordering import evenly_spaced_keys, key_between, keys_after, rank_at
+from app.models.board import Board
+from app.models.board_change import BoardChange
+from app.models.card import Card, CardAssignment, ChecklistItem
+from app.models.column import Column
+from app.models.project import Project
+from app.models.project_stats import ProjectStats
+from app.models.user import User
+from app.services.rank_rebalancer import RankRebalancer
+
+TABLES = [
+    User.__table__, Board.__table__, BoardChange.__table__, Column.__table__,
+    Card.__table__, CardAssignment.__table__, ChecklistItem.__table__, Project.__table__, ProjectStats.__table__,
+]
+
+
+def test_key_between_orders_and_stays_short():
+    assert key_between(None, None) == "i"
+    assert key_between("a", "b") == "ai"
+    assert key_between("a", "a1") == "a0i"
+    assert key_between(None, "1") == "0i"
+    assert key_between("z", None) == "z1"
+    for before, after in (("a", "a0"), ("b", "a"), ("a", "a")):
+        with pytest.raises(ValueError):
+            key_between(before, after)
+
+    # Random inserts keep keys sorted, distinct and valid
+    rng = random.Random(7)
+    keys = []
+    for _ in range(500):
+        index = rng.randint(0, len(keys))
+        before = keys[index - 1] if index else None
+        after = keys[index] if index < len(keys) else None
+        key = key_between(before, after)
+        assert (before is None or before < key) and (after is None or key < after)
+        assert not key.endswith("0")
+        keys.insert(index, key)
+    assert keys == sorted(keys)
+
+    # Appending grows keys by one character per 35 rows
+    assert max(len(key) for key in keys_after(None, 350)) <= 11
+
+
+def test_evenly_spaced_keys():
+    for count in (0, 1, 35, 36, 1000):
+        keys = evenly_spaced_keys(count)
+        assert len(keys) == count == len(set(keys))
+        assert keys == sorted(keys) and not any(key.endswith("0") for key in keys)
+    assert evenly_spaced_keys(1) == ["i"]
+    assert max(len(key) for key in evenly_spaced_keys(1000)) == 2
+
+
+@pytest.mark.asyncio
+async def test_new_rows_are_appended_and_a_move_writes_one_row(sqlite_session, async_db):
+    session, engine = sqlite_session, sqlite_session.get_bind()
+    user_id = uuid.uuid4()
+
+    board = Board(project_id=uuid.uuid4(), name="Board", created_by=user_id)
+    session.add(board)
+    session.flush()
+    # Listed out of order: new rows keep the order of their positions
+    done = Column(board=board, name="Done", position=1)
+    todo = Column(board=board, name="Todo", position=0)
+    session.add_all([done, todo])
+    session.flush()
+    assert todo.rank < done.rank
+
+    cards = [Card(column_id=todo.id, title=f"Card {i}", position=i, created_by=user_id) for i in range(5)]
+    session.add_all(cards)
+    session.flush()
+    later = Card(column_id=todo.id, title="Later", position=0, created_by=user_id)
+    session.add(later)
+    session.flush()
+    cards.append(later)
+    assert sorted(cards, key=lambda card: card.rank) == cards
+
+    writes = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count_writes(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("UPDATE CARDS"):
+            writes.append(parameters)
+
+    # Move the last card between the first two
+    moved = cards[-1]
+    moved.rank = await rank_at(async_db, Card, todo.id, 1, exclude_id=moved.id)
+    session.flush()
+    order = session.execute(select(Card.title).where(Card.column_id == todo.id).order_by(Card.rank)).scalars().all()
+    assert order == ["Card 0", "Later", "Card 1", "Card 2", "Card 3", "Card 4"]
+
+    # To the front of another column, and appended to it
+    cards[3].rank = await rank_at(async_db, Card, done.id, 0, exclude_id=cards[3].id)
+    cards[3].column_id = done.id
+    session.flush()
+    cards[4].rank = await rank_at(async_db, Card, done.id, None, exclude_id=cards[4].id)
+    cards[4].column_id = done.id
+    session.flush()
+    order = session.execute(select(Card.title).where(Card.column_id == done.id).order_by(Card.rank)).scalars().all()
+    assert order == ["Card 3", "Card 4"]
+    assert len(writes) == 3
+    event.remove(engine, "before_cursor_execute", count_writes)
+
+    # Index past the end appends
+    assert await rank_at(async_db, Card, todo.id, 99) > max(card.rank for card in cards[:3])
+    session.commit()
+
+
+@pytest.mark.asyncio
+async def test_rebalancer_respaces_long_keys_in_order(sqlite_session, async_db):
+    session = sqlite_session
+    user_id = uuid.uuid4()
+
+    board = Board(project_id=uuid.uuid4(), name="Board", created_by=user_id)
+    column = Column(board=board, name="Todo", position=0, rank="i")
+    session.add_all([board, column])
+    session.flush()
+    # Repeated inserts at the front grow the keys
+    rank = "i"
+    for i in range(200):
+        rank = key_between(None, rank)
+        session.add(Card(column_id=column.id, title=f"Card {i}", position=0, rank=rank, created_by=user_id))
+    session.commit()
+    before = session.execute(select(Card.id).order_by(Card.rank)).scalars().all()
+
+    rebalancer = RankRebalancer(session_factory=lambda: async_db, max_length=4)
+    assert await rebalancer.rebalance() == 1
+    ranks = session.execute(select(Card.rank).order_by(Card.rank)).scalars().all()
+    assert max(len(rank) for rank in ranks) == 2
+    assert session.execute(select(Card.id).order_by(Card.rank)).scalars().all() == before
+    assert await rebalancer.rebalance() == 0
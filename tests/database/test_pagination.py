@@ -0,0 +1,79 @@
+"""
+Keyset (cursor) pagination tests (SQLite, no server required)
+"""
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from app.core.database import Base
+from app.core.exceptions import ValidationError
+from app.core.pagination import decode_cursor, encode_cursor, keyset, trim_page
+from app.models.notification import Notification
+from app.models.user import User
+from app.services.in_app_notification_service import NOTIFICATION_PAGE_KEY
+
+
+def test_cursor_round_trips_typed_values():
+    created = datetime(2026, 10, 16, 12, 30, tzinfo=timezone.utc)
+    notification_id = uuid.uuid4()
+    cursor = encode_cursor([created, notification_id])
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor, NOTIFICATION_PAGE_KEY) == [created, notification_id]
+    for bad in ("not a cursor", encode_cursor([created]), encode_cursor(["yesterday", "x"])):
+        with pytest.raises(ValidationError):
+            decode_cursor(bad, NOTIFICATION_PAGE_KEY)
+
+
+def test_pages_cover_every_row_once_despite_timestamp_ties():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[User.__table__, Notification.__table__])
+
+    with Session(engine) as session:
+        user = User(email="p@example.com", password_hash="x", first_name="Pat", last_name="P")
+        session.add(user)
+        session.flush()
+        start = datetime(2026, 10, 1, tzinfo=timezone.utc)
+        # Three notifications per timestamp, so created_at alone is not a key
+        session.add_all([
+            Notification(user_id=user.id, title=f"N{i}", message="m", type="info",
+                         created_at=start + timedelta(minutes=i // 3))
+            for i in range(10)
+        ])
+        session.commit()
+        expected = session.execute(
+            select(Notification.id).order_by(Notification.created_at.desc(), Notification.id.desc())
+        ).scalars().all()
+
+        seen, after, pages = [], None, 0
+        while True:
+            query = select(Notification).where(Notification.user_id == user.id)
+            rows = session.execute(
+                keyset(query, NOTIFICATION_PAGE_KEY, after, descending=True).limit(4 + 1)
+            ).scalars().all()
+            rows, cursor = trim_page(rows, 4, lambda row: (row.created_at, row.id))
+            seen.extend(row.id for row in rows)
+            pages += 1
+            if cursor is None:
+                break
+            after = decode_cursor(cursor, NOTIFICATION_PAGE_KEY)
+
+        assert pages == 3
+        assert seen == expected
+
+        # A row inserted at the head does not shift the later pages
+        first = session.execute(
+            keyset(select(Notification), NOTIFICATION_PAGE_KEY, None, descending=True).limit(5)
+        ).scalars().all()
+        _, cursor = trim_page(first, 4, lambda row: (row.created_at, row.id))
+        session.add(Notification(user_id=user.id, title="New", message="m", type="info",
+                                 created_at=start + timedelta(hours=1)))
+        session.commit()
+        second = session.execute(
+            keyset(select(Notification.id), NOTIFICATION_PAGE_KEY,
+                   decode_cursor(cursor, NOTIFICATION_PAGE_KEY), descending=True).limit(4)
+        ).scalars().all()
+        assert second == expected[4:8]
@@ -0,0 +1,48 @@
+"""
+Connection pool instrumentation tests
+"""
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import QueuePool
+
+from app.core.db_pool import PoolMetrics, instrument_engine
+
+
+def test_checkouts_are_tracked_and_released():
+    engine = create_engine("sqlite://", poolclass=QueuePool, pool_size=2, max_overflow=1)
+    metrics = instrument_engine(engine, "test-tracked")
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        assert metrics.snapshot()["checked_out"] == 1
+        assert len(metrics._held) == 1
+
+    snapshot = metrics.snapshot()
+    assert snapshot["checked_out"] == 0
+    assert snapshot["size"] == 2 and snapshot["max_overflow"] == 1
+    assert not metrics._held
+
+
+def test_long_held_connection_is_reported_once():
+    metrics = PoolMetrics("test-leaks", leak_threshold=60)
+    metrics.on_checkout(None, "record", None)
+    checked_out_at = metrics._held[id("record")]
+
+    assert metrics.find_leaks(checked_out_at + 30) == []
+    assert len(metrics.find_leaks(checked_out_at + 90)) == 1
+    metrics.find_leaks(checked_out_at + 120)
+    assert metrics.leaked == 1
+
+    metrics.on_checkin(None, "record")
+    assert metrics.find_leaks(checked_out_at + 200) == []
+
+
+def test_wait_statistics():
+    metrics = PoolMetrics("test-waits")
+    for ms in range(1, 101):
+        metrics.record_wait(ms / 1000, overflow=ms > 90)
+
+    snapshot = metrics.snapshot()
+    assert snapshot["checkouts"] == 100
+    assert snapshot["overflow_checkouts"] == 10
+    assert snapshot["checkout_wait_max_ms"] == 100
+    assert 94 <= snapshot["checkout_wait_p95_ms"] <= 96
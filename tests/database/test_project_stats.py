@@ -0,0 +1,167 @@
+"""
+Project card counter tests (SQLite, no server required)
+"""
+import uuid
+import pytest
+from sqlalchemy import delete, event, insert, select, update
+
+import app.core.ordering  # noqa: F401  (assigns ranks to new rows)
+from app.core.project_stats import (
+    COUNTERS, count_query, get_project_counters, record_card_changes, snapshot_cards,
+)
+from app.models.attachment import Attachment
+from app.models.board import Board
+from app.models.board_change import BoardChange
+from app.models.card import Card, CardAssignment, ChecklistItem
+from app.models.column import Column
+from app.models.comment import Comment
+from app.models.project import Project
+from app.models.project_stats import ProjectStats
+from app.models.user import User
+from app.services.project_stats_reconciler import ProjectStatsReconciler
+
+TABLES = [
+    User.__table__, Project.__table__, Board.__table__, BoardChange.__table__,
+    Column.__table__, Card.__table__, CardAssignment.__table__, ChecklistItem.__table__,
+    Comment.__table__, Attachment.__table__, ProjectStats.__table__,
+]
+
+
+@pytest.fixture
+def projects(sqlite_session):
+    session = sqlite_session
+    user = User(email="u@example.com", password_hash="x", first_name="Uma", last_name="U")
+    session.add(user)
+    session.flush()
+    columns = []
+    for name in ("Alpha", "Beta"):
+        project = Project(organization_id=uuid.uuid4(), name=name, created_by=user.id)
+        session.add(project)
+        session.flush()
+        board = Board(project_id=project.id, name="Board", created_by=user.id)
+        column = Column(board=board, name="To Do", position=0)
+        session.add_all([board, column])
+        session.flush()
+        columns.append(column)
+    session.commit()
+    return session, user, columns
+
+
+def stored(session, project_id):
+    row = session.get(ProjectStats, project_id, populate_existing=True)
+    return {name: getattr(row, name) for name in COUNTERS}
+
+
+def counted(session, project_id):
+    row = session.execute(count_query([project_id])).mappings().one()
+    return {name: row[name] for name in COUNTERS}
+
+
+def test_counters_follow_card_writes(projects):
+    session, user, (alpha, beta) = projects
+    cards = [
+        Card(column_id=alpha.id, title="One", position=0, priority="high", created_by=user.id),
+        Card(column_id=alpha.id, title="Two", position=1, status="in_progress", created_by=user.id),
+        Card(column_id=alpha.id, title="Three", position=2, status="completed", priority="urgent", created_by=user.id),
+    ]
+    session.add_all(cards)
+    session.commit()
+    assert stored(session, alpha.board.project_id) == {
+        "total": 3, "todo": 1, "in_progress": 1, "completed": 1,
+        "priority_low": 0, "priority_medium": 1, "priority_high": 1, "priority_urgent": 1,
+    }
+
+    cards[0].status = "completed"
+    cards[1].priority = "low"
+    session.commit()
+    cards[2].column = beta
+    session.commit()
+    session.delete(cards[1])
+    session.commit()
+
+    for column in (alpha, beta):
+        assert stored(session, column.board.project_id) == counted(session, column.board.project_id)
+    assert stored(session, alpha.board.project_id)["total"] == 1
+    assert stored(session, beta.board.project_id)["priority_urgent"] == 1
+
+
+def test_concurrent_first_writes_both_count(projects):
+    session, user, (alpha, _) = projects
+    project_id = alpha.board.project_id
+    engine = session.get_bind()
+    other = []
+
+    # Another transaction writes the project's first card and row between
+    # this flush's row lookup and its insert
+    @event.listens_for(engine, "after_cursor_execute")
+    def interleave(conn, cursor, statement, parameters, context, executemany):
+        if not other and statement.startswith("SELECT project_stats.project_id"):
+            other.append(uuid.uuid4())
+            conn.execute(insert(Card.__table__).values(
+                id=other[0], column_id=alpha.id, title="Other", position=1, rank="b",
+                priority="medium", status="todo", created_by=user.id,
+            ))
+            conn.execute(insert(ProjectStats.__table__).values(
+                project_id=project_id, total=1, todo=1, priority_medium=1,
+            ))
+
+    try:
+        session.add(Card(column_id=alpha.id, title="Mine", position=0, created_by=user.id))
+        session.commit()
+    finally:
+        event.remove(engine, "after_cursor_execute", interleave)
+
+    assert other
+    assert stored(session, project_id)["total"] == 2
+    assert stored(session, project_id) == counted(session, project_id)
+
+
+@pytest.mark.asyncio
+async def test_bulk_statements_are_recorded(projects, async_db):
+    session, user, (alpha, beta) = projects
+    cards = [Card(column_id=alpha.id, title=f"Card {i}", position=i, created_by=user.id) for i in range(4)]
+    session.add_all(cards)
+    session.commit()
+
+    moved = [card.id for card in cards[:2]]
+    before = await snapshot_cards(async_db, moved)
+    session.execute(update(Card).where(Card.id.in_(moved)).values(column_id=beta.id, status="in_progress"))
+    await record_card_changes(async_db, before)
+
+    deleted = [cards[2].id]
+    before = await snapshot_cards(async_db, deleted)
+    session.execute(delete(Card).where(Card.id.in_(deleted)))
+    await record_card_changes(async_db, before)
+    session.commit()
+
+    counters = await get_project_counters(async_db, beta.board.project_id)
+    assert counters["total"] == 2
+    assert counters["in_progress"] == 2
+    assert stored(session, alpha.board.project_id) == counted(session, alpha.board.project_id)
+    assert stored(session, alpha.board.project_id)["total"] == 1
+
+
+@pytest.mark.asyncio
+async def test_reconciler_repairs_drift(projects, async_db):
+    session, user, (alpha, beta) = projects
+    session.add(Card(column_id=alpha.id, title="Card", position=0, created_by=user.id))
+    session.commit()
+    project_id = alpha.board.project_id
+    # Written around the listeners, so the counters miss it
+    session.execute(update(Card).where(Card.column_id == alpha.id).values(status="completed"))
+    session.execute(update(ProjectStats).where(ProjectStats.project_id == project_id).values(total=7))
+    session.commit()
+
+    reconciler = ProjectStatsReconciler(session_factory=lambda: async_db, interval=60)
+    repaired = await reconciler.reconcile()
+
+    # Alpha was corrected, Beta never had cards and gets its row
+    assert repaired == 2
+    assert stored(session, project_id) == counted(session, project_id)
+    assert stored(session, project_id)["total"] == 1
+    assert stored(session, project_id)["completed"] == 1
+    assert session.execute(
+        select(ProjectStats.total).where(ProjectStats.project_id == beta.board.project_id)
+    ).scalar_one() == 0
+    assert reconciler.stats["projects_checked"] == 2
+    assert await reconciler.reconcile() == 0
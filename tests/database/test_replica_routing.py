@@ -0,0 +1,110 @@
+"""
+Read replica routing tests
+"""
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from app.core.db_routing import (
+    READ_AFTER_COOKIE,
+    ReadYourWritesMiddleware,
+    Replica,
+    ReplicaRouter,
+    mark_write,
+    read_your_writes_pending,
+)
+
+
+class FakeSession:
+    def __init__(self, name, fail=False):
+        self.name = name
+        self.fail = fail
+        self.info = {}
+        self.closed = False
+
+    async def connection(self):
+        if self.fail:
+            raise OSError("connection refused")
+
+    async def rollback(self):
+        pass
+
+    async def close(self):
+        self.closed = True
+
+
+def make_router(*replicas):
+    return ReplicaRouter(lambda: FakeSession("primary"), list(replicas), strategy="least_connections", retry_after=30)
+
+
+@pytest.mark.asyncio
+async def test_least_connections_prefers_idle_replica():
+    busy = Replica("busy", lambda: FakeSession("busy"))
+    idle = Replica("idle", lambda: FakeSession("idle"))
+    router = make_router(busy, idle)
+
+    async with router.session() as first:
+        assert first.name == "busy"
+        async with router.session() as second:
+            assert second.name == "idle"
+    assert busy.in_use == 0 and idle.in_use == 0
+
+
+@pytest.mark.asyncio
+async def test_unreachable_replica_falls_back_and_is_skipped():
+    down = Replica("down", lambda: FakeSession("down", fail=True))
+    router = make_router(down)
+
+    async with router.session() as session:
+        assert session.name == "primary"
+    assert not down.is_available(time.monotonic())
+    assert router.stats["fallbacks"] == 1
+
+    async with router.session() as session:
+        assert session.name == "primary"
+    assert router.stats["fallbacks"] == 1
+
+
+@pytest.mark.asyncio
+async def test_sticky_reads_go_to_primary():
+    router = make_router(Replica("replica", lambda: FakeSession("replica")))
+
+    async with router.session(use_primary=True) as session:
+        assert session.name == "primary"
+
+
+def test_read_after_marker_must_be_recent():
+    now = time.time()
+
+    def request(value):
+        return Request({"type": "http", "headers": [(b"x-db-read-after", value.encode())]})
+
+    assert read_your_writes_pending(request(str(now + 2)), now=now)
+    assert not read_your_writes_pending(request(str(now - 1)), now=now)
+    assert not read_your_writes_pending(request(str(now + 3600)), now=now)
+
+
+def test_middleware_marks_only_writing_requests():
+    app = FastAPI()
+
+    @app.get("/read")
+    async def read():
+        return {}
+
+    @app.post("/write")
+    async def write():
+        mark_write()
+        return {}
+
+    app.add_middleware(ReadYourWritesMiddleware, window=5)
+    client = TestClient(app)
+
+    assert READ_AFTER_COOKIE not in client.get("/read").cookies
+    response = client.post("/write")
+    assert READ_AFTER_COOKIE in response.cookies
+    assert read_your_writes_pending(Request({"type": "http", "headers": [
+        (b"x-db-read-after", response.headers["x-db-read-after"].encode())
+    ]}))
@@ -0,0 +1,45 @@
+"""
+Cached statement layer tests
+"""
+import uuid
+
+from sqlalchemy import Column, Integer, MetaData, String, Table, create_engine, lambda_stmt, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.pool import QueuePool
+
+from app.core.db_pool import instrument_engine
+from app.database import statements
+
+
+def test_statements_share_cache_key_across_values():
+    first = statements.card_with_project(uuid.uuid4())
+    second = statements.card_with_project(uuid.uuid4())
+
+    assert first._generate_cache_key().key == second._generate_cache_key().key
+    assert str(first.compile(dialect=postgresql.dialect())) == str(second.compile(dialect=postgresql.dialect()))
+
+
+def test_statements_bind_their_arguments():
+    organization_id, user_id = uuid.uuid4(), uuid.uuid4()
+    compiled = statements.org_member(organization_id, user_id).compile(dialect=postgresql.dialect())
+
+    assert set(compiled.params.values()) == {organization_id, user_id}
+
+
+def test_compiled_cache_hits_are_counted():
+    engine = create_engine("sqlite://", poolclass=QueuePool)
+    metrics = instrument_engine(engine, "test-statement-cache")
+    items = Table("items", MetaData(), Column("id", Integer, primary_key=True), Column("name", String))
+    items.create(engine)
+
+    def by_id(item_id):
+        return lambda_stmt(lambda: select(items.c.name).where(items.c.id == item_id))
+
+    with engine.connect() as conn:
+        for item_id in range(5):
+            conn.execute(by_id(item_id))
+
+    snapshot = metrics.snapshot()
+    assert snapshot["statement_cache_misses"] == 1
+    assert snapshot["statement_cache_hits"] == 4
+    assert snapshot["statement_cache_hit_ratio"] == 0.8
@@ -0,0 +1,51 @@
+"""
+Single-worker lease tests (SQLite, no server required)
+"""
+import pytest
+
+from app.core.worker_lease import WorkerLease
+from app.models.user import User
+
+TABLES = [User.__table__]
+
+
+class FakeRedis:
+    """Runs the acquire script's logic on a dict, ignoring expiry"""
+
+    def __init__(self):
+        self.values = {}
+
+    def register_script(self, script):
+        async def acquire(keys, args):
+            holder = self.values.get(keys[0])
+            if holder is not None and holder != args[0]:
+                return 0
+            self.values[keys[0]] = args[0]
+            return 1
+        return acquire
+
+
+async def job():
+    return 3
+
+
+@pytest.mark.asyncio
+async def test_only_the_lease_holder_runs_the_job():
+    redis = FakeRedis()
+    first = WorkerLease("pruner", ttl=90, redis=redis)
+    second = WorkerLease("pruner", ttl=90, redis=redis)
+
+    assert await first.run(job) == 3
+    assert await second.run(job) is None
+    # The holder renews its own lease
+    assert await first.run(job) == 3
+    assert (first.stats, second.stats) == ({"runs": 2, "skipped": 0}, {"runs": 0, "skipped": 1})
+    assert await WorkerLease("rebalancer", ttl=90, redis=redis).run(job) == 3
+
+
+@pytest.mark.asyncio
+async def test_runs_locally_without_redis_or_postgres(async_db):
+    lease = WorkerLease("pruner", ttl=90, session_factory=lambda: async_db)
+
+    assert await lease.run(job) == 3
+    assert lease.stats["runs"] == 1
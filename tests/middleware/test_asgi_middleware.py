@@ -0,0 +1,85 @@
+"""
+Pure ASGI middleware tests
+"""
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core.rate_limiting import MemoryRateLimitBackend, RateLimit, RateLimiter, RateLimitMiddleware
+from app.middleware.request_context import RequestIDMiddleware, TimingMiddleware
+from app.monitoring import MonitoringMiddleware
+
+
+class RecordingCollector:
+    def __init__(self):
+        self.calls = []
+
+    def record_request(self, method, endpoint, status_code, duration):
+        self.calls.append((method, endpoint, status_code))
+
+
+def build_app(limiter=None, collector=None):
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def read_item(item_id: int):
+        return {"id": item_id}
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for part in (b"a", b"b", b"c"):
+                yield part
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    app.add_middleware(RateLimitMiddleware, limiter=limiter or RateLimiter(backend=MemoryRateLimitBackend()))
+    app.add_middleware(MonitoringMiddleware, collector=collector or RecordingCollector())
+    app.add_middleware(TimingMiddleware)
+    app.add_middleware(RequestIDMiddleware)
+    return app
+
+
+def test_stack_adds_headers_and_streams_body():
+    client = TestClient(build_app())
+
+    response = client.get("/stream")
+
+    assert response.text == "abc"
+    assert float(response.headers["x-process-time"]) >= 0
+    assert len(response.headers["x-request-id"]) == 32
+    assert "x-ratelimit-remaining" in response.headers
+
+
+def test_request_id_is_propagated_only_when_safe():
+    client = TestClient(build_app())
+
+    assert client.get("/items/1", headers={"X-Request-ID": "lb-1234"}).headers["x-request-id"] == "lb-1234"
+    assert client.get("/items/1", headers={"X-Request-ID": "bad id\n"}).headers["x-request-id"] != "bad id\n"
+
+
+def test_monitoring_labels_by_route_template():
+    collector = RecordingCollector()
+    client = TestClient(build_app(collector=collector))
+
+    client.get("/items/1")
+    client.get("/items/2")
+    client.get("/missing")
+
+    assert collector.calls == [
+        ("GET", "/items/{item_id}", 200),
+        ("GET", "/items/{item_id}", 200),
+        ("GET", "unmatched", 404),
+    ]
+
+
+def test_rate_limit_rejects_with_429():
+    limiter = RateLimiter(backend=MemoryRateLimitBackend())
+    limiter.limits['general'] = RateLimit(requests=1, window=60)
+    client = TestClient(build_app(limiter=limiter))
+
+    assert client.get("/items/1").status_code == 200
+    response = client.get("/items/1")
+
+    assert response.status_code == 429
+    assert "retry-after" in response.headers
+    assert "x-request-id" in response.headers
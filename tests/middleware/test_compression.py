@@ -0,0 +1,144 @@
+"""
+Response compression middleware tests
+"""
+import gzip
+
+from fastapi import FastAPI, Response
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+import app.middleware.compression as compression
+from app.cache import CacheManager, LocalLRUCache
+from app.middleware.compression import CompressionMiddleware, negotiate
+
+BIG = {"cards": [{"id": i, "title": f"Card {i}", "description": "x" * 40} for i in range(200)]}
+
+
+def build_app(**options):
+    app = FastAPI()
+
+    @app.get("/big")
+    async def big():
+        return BIG
+
+    @app.get("/small")
+    async def small():
+        return {"ok": True}
+
+    @app.get("/board")
+    async def board(response: Response):
+        response.headers["ETag"] = '"board-1-v7"'
+        return BIG
+
+    @app.get("/profile")
+    async def profile(user: str, response: Response):
+        # Same ETag whoever asks, like a version-only ETag on a per-user body
+        response.headers["ETag"] = '"profile-v1"'
+        return {"user": user, "cards": BIG["cards"]}
+
+    @app.get("/image")
+    async def image():
+        return Response(b"\x89PNG" + b"\0" * 5000, media_type="image/png")
+
+    @app.get("/encoded")
+    async def encoded():
+        return PlainTextResponse(gzip.compress(b"a" * 5000), headers={"Content-Encoding": "gzip"})
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for i in range(3):
+                yield f"line {i}\n".encode()
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    cache = CacheManager(local=LocalLRUCache())
+    middleware = CompressionMiddleware(app, minimum_size=500, cache=cache, **options)
+    return middleware, TestClient(middleware)
+
+
+def raw_get(client, path, encoding="gzip"):
+    # The test client decodes gzip bodies; headers still show the wire format
+    return client.get(path, headers={"Accept-Encoding": encoding})
+
+
+def test_negotiation_honours_q_values_and_preference():
+    available = ("zstd", "br", "gzip")
+    assert negotiate("gzip, br, zstd", available) == "zstd"
+    assert negotiate("gzip;q=1.0, br;q=0.5", available) == "gzip"
+    assert negotiate("*;q=0.1, gzip;q=0", available) == "zstd"
+    assert negotiate("identity", available) is None
+    assert negotiate("", available) is None
+    # brotli not installed: fall back to what is available
+    assert negotiate("br, gzip;q=0.5", ("gzip",)) == "gzip"
+
+
+def test_large_json_is_gzipped_with_vary_and_length():
+    _, client = build_app()
+
+    response = raw_get(client, "/big")
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) < len(response.content)
+    assert response.json() == BIG
+
+
+def test_small_binary_and_encoded_bodies_pass_through():
+    _, client = build_app()
+
+    assert "content-encoding" not in raw_get(client, "/small").headers
+    assert "content-encoding" not in raw_get(client, "/image").headers
+    assert "content-encoding" not in raw_get(client, "/big", encoding="identity").headers
+    encoded = raw_get(client, "/encoded")
+    assert encoded.headers["content-encoding"] == "gzip" and encoded.content == b"a" * 5000
+
+
+def test_streamed_bodies_are_compressed_chunk_by_chunk():
+    middleware, client = build_app()
+
+    response = raw_get(client, "/stream")
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert response.text == "line 0\nline 1\nline 2\n"
+    assert middleware.stats["streamed"] == 1
+
+
+def test_etagged_bodies_are_compressed_once(monkeypatch):
+    middleware, client = build_app(levels={"gzip": 9})
+    calls = []
+    original = compression.compress
+    monkeypatch.setattr(compression, "compress", lambda *args: calls.append(args[1:]) or original(*args))
+
+    first = raw_get(client, "/board")
+    second = raw_get(client, "/board")
+
+    assert first.content == second.content and first.json() == BIG
+    assert first.headers["etag"] == 'W/"board-1-v7"'
+    # Level is capped, and the second response reuses the cached body
+    assert calls == [("gzip", 6)]
+    assert middleware.stats["reused"] == 1
+
+
+def test_reuse_follows_the_produced_body_not_the_etag():
+    middleware, client = build_app()
+
+    alice = raw_get(client, "/profile?user=alice")
+    bob = raw_get(client, "/profile?user=bob")
+    again = raw_get(client, "/profile?user=alice")
+
+    assert (alice.json()["user"], bob.json()["user"]) == ("alice", "bob")
+    assert again.content == alice.content
+    assert middleware.stats["reused"] == 1
+
+
+def test_reused_bodies_live_in_the_cache_layer():
+    middleware, client = build_app()
+
+    raw_get(client, "/board")
+    assert len(middleware.cache.local) == 1
+    middleware.cache.local.invalidate_namespace("compressed")
+    raw_get(client, "/board")
+
+    assert middleware.stats["reused"] == 0
+    assert middleware.stats["compressed"] == 2
@@ -0,0 +1,84 @@
+"""
+orjson response class tests
+"""
+import json
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pydantic
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.responses import FastJSONResponse, json_timestamp, model_list_response
+from app.schemas.card import CardResponse
+
+
+def card_row(**overrides):
+    now = datetime(2026, 10, 16, 12, 0, tzinfo=timezone.utc)
+    return {
+        "id": uuid.uuid4(), "column_id": uuid.uuid4(), "title": "Card", "position": 0, "priority": "high",
+        "created_by": uuid.uuid4(), "created_at": now, "updated_at": now, "labels": [], **overrides,
+    }
+
+
+def test_renders_types_the_stdlib_encoder_rejects():
+    item_id = uuid.uuid4()
+    when = datetime(2026, 10, 16, 12, 30, tzinfo=timezone.utc)
+    body = FastJSONResponse({
+        "id": item_id, "at": when, "amount": Decimal("1.5"), 3: {"a"}, "card": CardResponse(**card_row(title="x")),
+    }).body
+
+    document = json.loads(body)
+    assert document["id"] == str(item_id)
+    assert document["at"] == when.isoformat()
+    assert document["amount"] == 1.5 and document["3"] == ["a"]
+    assert document["card"]["title"] == "x"
+
+
+def test_dict_endpoints_use_the_default_response_class():
+    app = FastAPI(default_response_class=FastJSONResponse)
+
+    @app.get("/items/{item_id}")
+    async def read_item(item_id: uuid.UUID):
+        return {"id": item_id}
+
+    item_id = uuid.uuid4()
+    response = TestClient(app).get(f"/items/{item_id}")
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == {"id": str(item_id)}
+
+
+def test_model_list_response_validates_rows_once():
+    rows = [card_row(title=f"Card {i}") for i in range(3)]
+
+    response = model_list_response(CardResponse, rows, headers={"X-Next-Cursor": "abc"})
+
+    assert response.headers["x-next-cursor"] == "abc"
+    expected = [json.loads(CardResponse(**row).model_dump_json()) for row in rows]
+    assert json.loads(response.body) == expected
+    with pytest.raises(pydantic.ValidationError):
+        model_list_response(CardResponse, [card_row(id="not-a-uuid")])
+
+
+def test_application_routes_render_with_orjson(monkeypatch):
+    import app.core.responses as responses
+    from app.main import app
+
+    rendered = []
+    dumps = responses.dumps
+    monkeypatch.setattr(responses, "dumps", lambda content: rendered.append(content) or dumps(content))
+
+    response = TestClient(app).get("/api/v1/")
+    assert response.status_code == 200
+    assert rendered and rendered[0]["success"] is True
+
+
+def test_timestamps_render_like_postgres_json():
+    at = datetime(2026, 3, 10, 2, 0, 30, tzinfo=timezone.utc)
+
+    assert json_timestamp(at) == "2026-03-10T02:00:30+00:00"
+    assert json_timestamp(at.replace(microsecond=120000)) == "2026-03-10T02:00:30.12+00:00"
+    assert json_timestamp(at.replace(microsecond=5, tzinfo=None)) == "2026-03-10T02:00:30.000005"
+    assert json_timestamp(None) is None
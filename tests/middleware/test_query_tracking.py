@@ -0,0 +1,63 @@
+"""
+Per-request query tracking tests
+"""
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app.core.query_tracking import QueryTrackingMiddleware, fingerprint
+from app.monitoring.performance_monitor import PerformanceMonitor
+
+
+def build_app(monitor, server_timing=True):
+    engine = create_engine("sqlite://")
+    app = FastAPI()
+
+    @app.get("/boards/{board_id}")
+    async def read_board(board_id: int):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            for card_id in range(6):
+                conn.execute(text("SELECT :id AS card"), {"id": card_id})
+        return {"id": board_id}
+
+    @app.get("/health")
+    async def health():
+        return {"ok": True}
+
+    app.add_middleware(QueryTrackingMiddleware, monitor=monitor, server_timing=server_timing)
+    return app
+
+
+def test_fingerprint_ignores_values():
+    assert fingerprint("SELECT * FROM cards WHERE id = $1 AND position > 3") == \
+        fingerprint("SELECT *  FROM cards\n WHERE id = $2 AND position > 10")
+    assert fingerprint("SELECT x FROM t WHERE id IN (%s, %s, %s) AND name = 'a'") == \
+        "SELECT x FROM t WHERE id IN (?) AND name = ?"
+    assert fingerprint("SELECT data::jsonb FROM t") == "SELECT data::jsonb FROM t"
+
+
+def test_queries_are_counted_and_n_plus_one_flagged():
+    monitor = PerformanceMonitor()
+    client = TestClient(build_app(monitor))
+
+    response = client.get("/boards/1")
+
+    assert response.headers["server-timing"].startswith("db;dur=")
+    assert response.headers["server-timing"].endswith('desc="7 queries"')
+
+    stats = monitor.get_route_query_stats()["GET:/boards/{board_id}"]
+    assert stats["requests"] == 1
+    assert stats["max_queries"] == 7
+    assert stats["n_plus_one_requests"] == 1
+    assert stats["repeated_statements"] == {"SELECT ? AS card": 6}
+
+
+def test_requests_without_queries_are_not_recorded():
+    monitor = PerformanceMonitor()
+    client = TestClient(build_app(monitor, server_timing=False))
+
+    response = client.get("/health")
+
+    assert "server-timing" not in response.headers
+    assert monitor.get_route_query_stats() == {}
@@ -0,0 +1,106 @@
+"""
+GCRA rate limiter tests (in-memory backend)
+"""
+import pytest
+from starlette.requests import Request
+
+from app.core import rate_limiting
+from app.core.rate_limiting import (
+    MemoryRateLimitBackend,
+    RateLimit,
+    RateLimiter,
+    gcra,
+)
+
+
+def make_request(path="/api/v1/projects", ip="10.0.0.1", headers=None):
+    raw_headers = [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "headers": raw_headers,
+        "client": (ip, 1234),
+        "query_string": b"",
+    })
+
+
+def test_gcra_allows_burst_then_rejects():
+    limit = RateLimit(requests=3, window=60)
+    tat = None
+    for expected_remaining in (2, 1, 0):
+        result, tat = gcra(tat, 1000.0, limit)
+        assert result.allowed and result.remaining == expected_remaining
+
+    result, new_tat = gcra(tat, 1000.0, limit)
+    assert not result.allowed and new_tat is None
+    assert result.retry_after == pytest.approx(20.0)
+
+    # One emission interval later exactly one request fits again
+    result, _ = gcra(tat, 1020.0, limit)
+    assert result.allowed and result.remaining == 0
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_keeps_one_value_per_key_and_sweeps_idle():
+    backend = MemoryRateLimitBackend()
+    limit = RateLimit(requests=100, window=60)
+    for _ in range(50):
+        await backend.hit("ip:1", limit)
+    assert len(backend) == 1
+
+    backend._tat["ip:1"] = 0  # drained long ago
+    assert await backend.sweep() == 1
+    assert len(backend) == 0
+
+
+@pytest.mark.asyncio
+async def test_limiter_keys_by_ip_and_blocks_auth_abuse():
+    limiter = RateLimiter(backend=MemoryRateLimitBackend())
+    limiter.limits['auth_login'] = RateLimit(requests=2, window=300)
+    request = make_request(path="/api/v1/auth/login")
+
+    assert (await limiter.check_rate_limit(request))[0]
+    assert (await limiter.check_rate_limit(request))[0]
+    allowed, info = await limiter.check_rate_limit(request)
+
+    assert not allowed
+    assert info['retry_after'] >= 1
+    assert limiter._is_ip_blocked("10.0.0.1")
+    # Other clients are unaffected
+    assert (await limiter.check_rate_limit(make_request(path="/api/v1/auth/login", ip="10.0.0.2")))[0]
+
+
+@pytest.mark.asyncio
+async def test_unknown_api_keys_are_looked_up_within_the_ip_quota(monkeypatch):
+    lookups = []
+
+    async def get_or_set(key, loader, ttl=None):
+        lookups.append(key)
+        return {}
+
+    async def get(key):
+        return None
+
+    monkeypatch.setattr(rate_limiting.cache_manager, "get", get)
+    monkeypatch.setattr(rate_limiting.cache_manager, "get_or_set", get_or_set)
+    limiter = RateLimiter(backend=MemoryRateLimitBackend())
+    limiter.limits['api_key_lookup'] = RateLimit(requests=2, window=60)
+
+    for attempt in range(5):
+        allowed, _ = await limiter.check_rate_limit(make_request(headers={"X-API-Key": f"random-{attempt}"}))
+        assert allowed
+
+    # Past the lookup quota the IP quota applies without touching the database
+    assert len(lookups) == 2
+
+
+@pytest.mark.asyncio
+async def test_limiter_fails_open_when_key_resolution_fails(monkeypatch):
+    async def get(key):
+        raise ConnectionError("cache down")
+
+    monkeypatch.setattr(rate_limiting.cache_manager, "get", get)
+    limiter = RateLimiter(backend=MemoryRateLimitBackend())
+
+    assert await limiter.check_rate_limit(make_request(headers={"X-API-Key": "key"})) == (True, {})